@@ -29,6 +29,7 @@ from langchain_openai import ChatOpenAI
 # Import existing PSS SDK
 from sdk.client import Client as PixelStarshipsClient
 from sdk.device import Device
+from sdk.metrics import RequestMetrics
 from sdk.security import (
     checksum_create_battle9,
     checksum_accept_battle5,
@@ -91,6 +92,7 @@ class AccountState:
     battle_result: str | None = None
     layout_analysis: dict | None = None
     crew_stats: dict | None = None
+    request_metrics: dict | None = None
     errors: list[str] = field(default_factory=list)
     steps_completed: list[str] = field(default_factory=list)
     current_step: str = "initialized"
@@ -173,8 +175,17 @@ class AccountWorker:
             self.state.errors.append(str(e))
             logging.error(f"Account {self.config.account_id} failed: {e}")
         
+        self._record_metrics()
         return self.state
     
+    def _record_metrics(self):
+        """Keep the client's per-endpoint request metrics (redacted) in the state."""
+        metrics = getattr(self.state.client, "metrics", None)
+        if not isinstance(metrics, RequestMetrics):
+            return  # dry run: no real client
+        self.state.request_metrics = metrics.summary()
+        logging.info(f"Account {self.config.account_id} request metrics:\n{metrics.table()}")
+    
     def _login(self):
         """Login to PSS - dry run for testing."""
         self.state.current_step = "login"
@@ -336,6 +347,7 @@ def finalize_workflow(state: SupervisorState) -> dict:
                 "errors": state["account_states"][acc_id].errors,
                 "battle_id": state["account_states"][acc_id].battle_id,
                 "layout_score": state["account_states"][acc_id].layout_analysis,
+                "request_metrics": state["account_states"][acc_id].request_metrics,
             }
             for acc_id in state["account_states"]
         }
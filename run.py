@@ -6,12 +6,17 @@ from configparser import NoSectionError
 import smtplib
 from email.message import EmailMessage
 import argparse
+import atexit
 import logging
 import io
+import time
 from pathlib import Path
-from sdk.client import Client
+from sdk.async_client import DEFAULT_MAX_IN_FLIGHT, AsyncClient
+from sdk.cassette import Cassette, RecordingSession, ReplaySession
+from sdk.client import ONE_MINUTE, Client
 from sdk.device import Device
 from sdk.redaction import redact_secrets
+from sdk.request_scheduler import RequestScheduler
 
 
 logfilepath = "tachikoma.log"
@@ -146,6 +151,62 @@ def main():
         default=False,
         help="run end-to-end ship battle (CreateStarBattle5 -> VerifyBattle2 -> FinaliseBattle15)",
     )
+    parser.add_argument(
+        "--use-consumables",
+        dest="use_consumables",
+        action="store_true",
+        default=False,
+        help="spend grey consumables on crew below 30%% training and hero consumables at full fatigue",
+    )
+    parser.add_argument(
+        "--concurrent-reads",
+        dest="concurrent_reads",
+        type=int,
+        default=DEFAULT_MAX_IN_FLIGHT,
+        help="independent reads fetched concurrently before the automation loop (0 disables)",
+    )
+    parser.add_argument(
+        "--time-budget",
+        dest="time_budget",
+        type=float,
+        default=None,
+        help="wall-clock seconds for the run's requests; retries and timeouts stop at this limit",
+    )
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        dest="record",
+        default=None,
+        metavar="CASSETTE",
+        help="record the run's HTTP traffic (redacted, gzip) to this cassette file; reads run sequentially",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        dest="replay",
+        default=None,
+        metavar="CASSETTE",
+        help="serve the run's HTTP traffic from a recorded cassette instead of the network; "
+        "reads run sequentially and the request budget is lifted",
+    )
+    parser.add_argument(
+        "--replay-timing",
+        dest="replay_timing",
+        action="store_true",
+        default=False,
+        help="with --replay, delay each response by its recorded latency and keep the request budget",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        dest="metrics_file",
+        default="run_metrics.json",
+        help="write per-endpoint request metrics (redacted) as JSON here (empty string disables)",
+    )
+    parser.add_argument(
+        "--design-cache-dir",
+        dest="design_cache_dir",
+        default=".design_cache",
+        help="directory for the versioned design cache and layout memo (empty string disables both)",
+    )
     args = parser.parse_args()
 
     # Validate SMTP configuration before Device/Client creation or network activity
@@ -209,7 +270,33 @@ def main():
     settings["checksum_key"] = "5343"
     settings["savy_checksum"] = "Savvy!s0d@"
 
+    if args.design_cache_dir:
+        settings["design_cache_dir"] = args.design_cache_dir
+    if args.use_consumables:
+        settings["use_consumables"] = True
+
     client = Client(device=device, settings=settings)
+    if args.time_budget:
+        client.resilience.deadline = time.monotonic() + args.time_budget
+
+    cassette = None
+    if args.record:
+        cassette = Cassette.record(args.record)
+        atexit.register(cassette.close)  # also on early exits (e.g. failed login)
+        client.session = RecordingSession(client.session, cassette)
+    elif args.replay:
+        replay = ReplaySession.load(args.replay, emulate_timing=args.replay_timing)
+        replay.install_clock()
+        client.session = replay
+        if not args.replay_timing:
+            # The recorded run already waited on the request budget; a replay
+            # that waits again measures the limiter, not the client.
+            client.scheduler = RequestScheduler(calls=sys.maxsize, period=ONE_MINUTE)
+        logging.info(f"Replaying HTTP traffic from {args.replay}")
+    if cassette is not None or args.replay:
+        # Prefetch workers build timestamped/checksummed URLs in thread order,
+        # which would make a replay's requests differ from run to run.
+        args.concurrent_reads = 0
 
     if args.login_email:
         if args.password_file:
@@ -255,6 +342,15 @@ def main():
         logging.error(f"purchaseScorchedPodIfAffordable failed: {redact_secrets(str(e))}")
         runtime_failed = True
 
+    # Fetch the run's independent reads concurrently; the actions below are
+    # then served from the request cache.
+    if args.concurrent_reads > 0:
+        try:
+            with AsyncClient(client, max_in_flight=args.concurrent_reads) as reads:
+                reads.prefetch()
+        except Exception as e:
+            logging.debug(f"prefetch failed: {redact_secrets(str(e))}")
+
     # Run the normal automation loop
     while client:
         try:
@@ -373,7 +469,16 @@ def main():
         logging.error(f"upgradeCharacters failed: {redact_secrets(str(e))}")
         runtime_failed = True
 
+    if cassette is not None:
+        cassette.close()
+        logging.info(f"Recorded {cassette.interactions} request(s) to {args.record}")
+
     char_name = client.info.get("@Name", "") if isinstance(getattr(client, "info", None), dict) else ""
+    logging.info(f"[{char_name}] Request budget: {client.scheduler.summary()}")
+    logging.info(f"[{char_name}] Transport: {client.resilience.summary()}")
+    logging.info(f"[{char_name}] Request metrics:\n{client.metrics.table()}")
+    if args.metrics_file and not client.metrics.write_json(args.metrics_file):
+        logging.warning(f"Could not write request metrics to {args.metrics_file}")
     logging.info(f'[{char_name}] Finished...')
 
     # Send log file via SMTP only if SMTP is enabled
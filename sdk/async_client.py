@@ -0,0 +1,142 @@
+"""Concurrent reads for one account — asyncio on top of ``Client``'s transport.
+
+``Client`` issues one blocking request at a time, so a run's independent
+reads (designs, tasks, characters, researches, rooms, items, ...) take the
+sum of their round trips.  ``AsyncClient`` runs ``Client`` read methods
+concurrently from an asyncio event loop while keeping everything that makes
+``Client`` safe to use:
+
+- every request still goes through ``Client.request``, so the shared
+  ``MAX_CALLS_PER_MINUTE`` budget on ``Client._send`` and the per-run
+  ``RequestCache`` (including coalescing of identical reads) apply unchanged;
+- at most ``max_in_flight`` requests are outstanding at once — calls run on a
+  worker pool of exactly that many threads, each making one request at a
+  time;
+- only methods listed in ``READ_METHODS`` can be scheduled, so a mutation can
+  never race another call.
+
+``prefetch`` is the run-level entry point: it fetches the cacheable reads of
+a run concurrently up front, and the actions that follow are served from the
+request cache instead of waiting on the network again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable
+
+from .redaction import redact_secrets
+
+# Concurrent requests per account.  Stays below the session's connection
+# pool size (10) so no connection is opened and discarded.
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Client methods that only read state and may run concurrently.
+READ_METHODS = frozenset({
+    "getShipByUserId",
+    "listAllCharactersOfUser",
+    "listRoomsViaAccessToken",
+    "listItemsOfAShip",
+    "listAllResearches",
+    "listTasksOfAUser",
+    "listUserStarSystems",
+    "listStarSystemMarkersAndUserMarkers",
+    "listSystemMessagesForUser3",
+    "listActionTypes2",
+    "listConditionTypes2",
+    "listSituations",
+    "listRoomDesigns2",
+    "listAllCharacterDesigns2",
+    "listAllResearchDesigns2",
+    "listAllTrainingDesigns2",
+    "listAllTaskDesigns2",
+    "listAllDesigns4",
+})
+
+# Reads a run makes that ``RequestCache`` keeps (see ``DEFAULT_TTLS``), so
+# fetching them early saves their round trips later in the run.
+DEFAULT_PREFETCH = (
+    "getShipByUserId",
+    "listAllCharactersOfUser",
+    "listRoomsViaAccessToken",
+    "listItemsOfAShip",
+    "listAllResearches",
+    "listTasksOfAUser",
+    "listUserStarSystems",
+    "listRoomDesigns2",
+    "listAllCharacterDesigns2",
+    "listAllResearchDesigns2",
+    "listAllTrainingDesigns2",
+    "listAllTaskDesigns2",
+)
+
+
+class AsyncClient:
+    """Runs independent ``Client`` reads concurrently under an in-flight cap.
+
+    All calls share one worker pool of ``max_in_flight`` threads; use the
+    instance as a context manager (or call ``close``) to release it.
+    """
+
+    def __init__(self, client, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="tachikoma-read",
+        )
+
+    def __enter__(self) -> "AsyncClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _run(self, fn, *args) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def get(self, url: str) -> Any:
+        """``Client.request(url, "GET")`` without blocking the event loop."""
+        return await self._run(self.client.request, url, "GET")
+
+    async def call(self, name: str, *args) -> Any:
+        """Run one ``READ_METHODS`` method of the client.
+
+        Raises:
+            ValueError: If ``name`` is not in ``READ_METHODS``.
+        """
+        if name not in READ_METHODS:
+            raise ValueError(f"not a concurrent read method: {name}")
+        return await self._run(getattr(self.client, name), *args)
+
+    async def gather(self, names: Iterable[str]) -> dict[str, Any]:
+        """Call the named read methods concurrently.
+
+        Returns a mapping of method name to its return value, or to the
+        exception it raised — one failing read never cancels the others.
+
+        Raises:
+            ValueError: If a name is not in ``READ_METHODS``.
+        """
+        names = list(dict.fromkeys(names))
+        unknown = [name for name in names if name not in READ_METHODS]
+        if unknown:
+            raise ValueError(f"not a concurrent read method: {', '.join(unknown)}")
+        results = await asyncio.gather(
+            *(self.call(name) for name in names), return_exceptions=True,
+        )
+        return dict(zip(names, results))
+
+    def prefetch(self, names: Iterable[str] = DEFAULT_PREFETCH) -> dict[str, Any]:
+        """Blocking entry point: run ``gather(names)`` and log failed reads."""
+        results = asyncio.run(self.gather(names))
+        for name, result in results.items():
+            if isinstance(result, BaseException):
+                logging.debug(f"prefetch {name} failed: {redact_secrets(str(result))}")
+        return results
@@ -0,0 +1,353 @@
+"""Deterministic ship-vs-ship battle simulator — offline, no HTTP.
+
+Evaluates loadouts and layouts without spending real battles.  Ships are
+built from saved ``GetShipByUserId`` snapshots (via ``ship_layout``) and
+fight on a fixed timestep of ``TICK_SECONDS``:
+
+- each weapon room fires when its reload completes; reloads come from
+  ``game_formulas.room_reload`` and are scheduled on an event queue, so the
+  loop jumps straight to the next volley instead of stepping idle ticks;
+- a volley misses with probability ``dodge_evasion(target.dodge)``;
+- hull damage is reduced by the target's armor (``effective_damage``);
+- a hit with fire damage sets a fire that burns for ``FIRE_DURATION_SECONDS``
+  and deals ``fire_damage_reduced`` per second, applied tick by tick.
+
+Randomness comes only from a ``random.Random`` seeded per battle, so the same
+ships and seed always produce the same result.  ``run_batch`` fans many
+seeds out across a process pool.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Optional
+
+from .game_formulas import (
+    damage_reduction,
+    dodge_evasion,
+    effective_damage,
+    fire_damage_reduced,
+    room_reload,
+)
+from .models import Ship
+from .ship_layout import RoomInfo, get_attr, index_room_designs, parse_rooms, snapshot_ship
+
+# One game tick (PSS runs battles at 40 ticks per second).
+TICK_SECONDS = 0.025
+# Battles are called a draw after this long.
+MAX_BATTLE_SECONDS = 180.0
+FIRE_DURATION_SECONDS = 10.0
+
+# Used when a weapon's room design does not carry reload/damage data.
+DEFAULT_RELOAD_SECONDS = 10.0
+DEFAULT_DAMAGE = 1.0
+
+
+def _float(value, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+@dataclass(frozen=True)
+class SimWeapon:
+    """A weapon room as the simulator sees it."""
+    room: RoomInfo
+    base_reload: float = DEFAULT_RELOAD_SECONDS  # seconds
+    damage: float = DEFAULT_DAMAGE               # hull damage per volley
+    fire_damage: float = 0.0                     # fire damage per second on hit
+    crew_stat: float = 0.0                       # summed Weapon stat of the crew inside
+    max_power: float = 1.0
+    power: float = 1.0
+
+    @property
+    def reload_seconds(self) -> float:
+        return room_reload(self.base_reload, self.crew_stat, self.max_power, self.power)
+
+
+@dataclass(frozen=True)
+class SimShip:
+    """Everything the simulator needs about one ship."""
+    name: str
+    hp: float
+    armor: float = 0.0      # armor points, as in game_formulas.damage_reduction
+    dodge: float = 0.0      # combined engine dodge stat
+    sprinkler: float = 0.0  # summed sprinkler crew stat
+    weapons: tuple[SimWeapon, ...] = ()
+
+    @classmethod
+    def from_rooms(
+        cls,
+        name: str,
+        rooms: Iterable[RoomInfo],
+        room_designs: Optional[Mapping[str, dict]] = None,
+        hp: Optional[float] = None,
+        armor: Optional[float] = None,
+        dodge: float = 0.0,
+        sprinkler: float = 0.0,
+        crew_stats: Optional[Mapping[str, float]] = None,
+    ) -> "SimShip":
+        """Build a ship from parsed rooms.
+
+        Args:
+            name: Ship name for reporting.
+            rooms: RoomInfo list from ``ship_layout.parse_rooms``.
+            room_designs: Optional RoomDesignId -> design dict; weapon reload
+                (``@ReloadTime``, in ticks), power (``@MaxSystemPower``) and
+                ``MissileDesign`` ``@HullDamage``/``@FireDamage`` are read from
+                it when present.
+            hp: Ship hull HP (the ship's ``@Hp``); required, since room HP
+                says nothing about the hull.
+            armor: Armor points for ``damage_reduction``; defaults to the
+                summed ``@Capacity`` of the armor rooms' designs, which is
+                the armor value each block adds (room HP is not armor).
+            dodge: Combined engine dodge stat.
+            sprinkler: Summed sprinkler crew stat.
+            crew_stats: Room ID -> summed Weapon stat of the crew inside.
+
+        Raises:
+            ValueError: If ``hp`` is not given.
+        """
+        if hp is None:
+            raise ValueError(f"hull HP of {name!r} is required")
+        rooms = list(rooms)
+        designs = room_designs or {}
+        stats = crew_stats or {}
+        weapons = []
+        for room in rooms:
+            if room.category != "weapon" or room.status == "constructing":
+                continue
+            design = designs.get(room.design_id, {})
+            missile = design.get("MissileDesign") if isinstance(design, dict) else None
+            missile = missile if isinstance(missile, dict) else {}
+            reload_ticks = _float(get_attr(design, "@ReloadTime", 0))
+            max_power = _float(get_attr(design, "@MaxSystemPower", 1), 1.0) or 1.0
+            weapons.append(SimWeapon(
+                room=room,
+                base_reload=reload_ticks * TICK_SECONDS if reload_ticks > 0 else DEFAULT_RELOAD_SECONDS,
+                damage=_float(get_attr(missile, "@HullDamage", DEFAULT_DAMAGE), DEFAULT_DAMAGE),
+                fire_damage=_float(get_attr(missile, "@FireDamage", 0)),
+                crew_stat=float(stats.get(room.room_id, 0.0)),
+                max_power=max_power,
+                power=max_power,
+            ))
+        if armor is None:
+            armor = sum(
+                _float(get_attr(designs.get(room.design_id, {}), "@Capacity", 0))
+                for room in rooms
+                if room.category == "armor" and room.status != "constructing"
+            )
+        return cls(
+            name=name,
+            hp=float(hp),
+            armor=float(armor),
+            dodge=dodge,
+            sprinkler=sprinkler,
+            weapons=tuple(weapons),
+        )
+
+
+def ship_from_snapshot(snapshot: dict, room_designs: list[dict], **overrides) -> SimShip:
+    """Build a SimShip from a saved GetShipByUserId payload (parsed with xmltodict).
+
+    ``snapshot`` may be the whole response or just its ``Ship`` node.
+    Extra keyword arguments are passed to ``SimShip.from_rooms``; pass ``hp``
+    when the snapshot has no ``@Hp``.
+    """
+    ship = Ship.from_xml(snapshot_ship(snapshot))
+    designs_by_id = index_room_designs(room_designs)
+    overrides.setdefault("hp", ship.hp or None)
+    return SimShip.from_rooms(
+        ship.name, parse_rooms(ship, room_designs), designs_by_id, **overrides
+    )
+
+
+@dataclass
+class _Side:
+    ship: SimShip
+    hp: float
+    reload_ticks: tuple[int, ...]
+    shots: int = 0
+    hits: int = 0
+    damage_dealt: float = 0.0
+    # Active fires on this ship: (damage per tick, ticks left)
+    fires: list[list[float]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SimResult:
+    """Outcome of one simulated battle."""
+    seed: int
+    winner: Optional[str]   # "a", "b", or None for a draw/timeout
+    seconds: float
+    hp_a: float
+    hp_b: float
+    shots_a: int
+    shots_b: int
+    hits_a: int
+    hits_b: int
+    damage_a: float         # damage dealt by ship A
+    damage_b: float
+    reduction_a: float      # damage_reduction % of ship A's armor
+    reduction_b: float
+
+
+def simulate(
+    ship_a: SimShip,
+    ship_b: SimShip,
+    seed: int = 0,
+    max_seconds: float = MAX_BATTLE_SECONDS,
+) -> SimResult:
+    """Simulate one battle between two ships; deterministic for a given seed."""
+    rng = random.Random(seed)
+    max_ticks = int(math.ceil(max_seconds / TICK_SECONDS))
+
+    def side(ship: SimShip) -> _Side:
+        ticks = tuple(max(1, math.ceil(w.reload_seconds / TICK_SECONDS)) for w in ship.weapons)
+        return _Side(ship=ship, hp=ship.hp, reload_ticks=ticks)
+
+    sides = (side(ship_a), side(ship_b))
+    evasion = tuple(dodge_evasion(s.ship.dodge) / 100.0 for s in sides)
+
+    # Reload completions: (tick, side index, weapon index).  Weapons start
+    # unloaded, so the first volley comes after one full reload.
+    events: list[tuple[int, int, int]] = [
+        (ticks, index, w)
+        for index, s in enumerate(sides)
+        for w, ticks in enumerate(s.reload_ticks)
+    ]
+    heapq.heapify(events)
+
+    tick = 0
+    while tick < max_ticks and sides[0].hp > 0 and sides[1].hp > 0:
+        burning = sides[0].fires or sides[1].fires
+        next_event = events[0][0] if events else max_ticks
+        # With no fire to tick, jump straight to the next volley.
+        step_to = min(next_event, max_ticks) if not burning else tick + 1
+        if step_to <= tick:
+            step_to = tick + 1
+        elapsed = step_to - tick
+        tick = step_to
+
+        for s in sides:
+            if s.fires:
+                remaining = []
+                for fire in s.fires:
+                    burn = min(elapsed, int(fire[1]))
+                    s.hp -= fire[0] * burn
+                    fire[1] -= burn
+                    if fire[1] > 0:
+                        remaining.append(fire)
+                s.fires = remaining
+
+        while events and events[0][0] == tick:
+            _, index, w = heapq.heappop(events)
+            attacker, target = sides[index], sides[1 - index]
+            weapon = attacker.ship.weapons[w]
+            attacker.shots += 1
+            if rng.random() >= evasion[1 - index]:
+                attacker.hits += 1
+                damage = effective_damage(weapon.damage, target.ship.armor)
+                target.hp -= damage
+                attacker.damage_dealt += damage
+                if weapon.fire_damage > 0:
+                    per_second = fire_damage_reduced(weapon.fire_damage, target.ship.sprinkler)
+                    target.fires.append([
+                        per_second * TICK_SECONDS,
+                        int(FIRE_DURATION_SECONDS / TICK_SECONDS),
+                    ])
+            heapq.heappush(events, (tick + attacker.reload_ticks[w], index, w))
+
+        if not events and not (sides[0].fires or sides[1].fires):
+            break
+
+    a, b = sides
+    if a.hp <= 0 and b.hp <= 0:
+        winner = None
+    elif b.hp <= 0:
+        winner = "a"
+    elif a.hp <= 0:
+        winner = "b"
+    else:
+        winner = None
+    return SimResult(
+        seed=seed,
+        winner=winner,
+        seconds=min(tick, max_ticks) * TICK_SECONDS,
+        hp_a=max(0.0, a.hp),
+        hp_b=max(0.0, b.hp),
+        shots_a=a.shots,
+        shots_b=b.shots,
+        hits_a=a.hits,
+        hits_b=b.hits,
+        damage_a=a.damage_dealt,
+        damage_b=b.damage_dealt,
+        reduction_a=damage_reduction(a.ship.armor),
+        reduction_b=damage_reduction(b.ship.armor),
+    )
+
+
+@dataclass(frozen=True)
+class BatchSummary:
+    """Aggregate of many simulated battles."""
+    results: tuple[SimResult, ...]
+
+    @property
+    def battles(self) -> int:
+        return len(self.results)
+
+    def win_rate(self, side: Optional[str] = "a") -> float:
+        if not self.results:
+            return 0.0
+        return sum(1 for r in self.results if r.winner == side) / len(self.results)
+
+    @property
+    def draw_rate(self) -> float:
+        return self.win_rate(None)
+
+    @property
+    def mean_seconds(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(r.seconds for r in self.results) / len(self.results)
+
+
+def _simulate_chunk(args: tuple[SimShip, SimShip, list[int], float]) -> list[SimResult]:
+    ship_a, ship_b, seeds, max_seconds = args
+    return [simulate(ship_a, ship_b, seed, max_seconds) for seed in seeds]
+
+
+def run_batch(
+    ship_a: SimShip,
+    ship_b: SimShip,
+    battles: int = 1000,
+    base_seed: int = 0,
+    processes: Optional[int] = None,
+    max_seconds: float = MAX_BATTLE_SECONDS,
+) -> BatchSummary:
+    """Run ``battles`` simulations with seeds ``base_seed .. base_seed + battles - 1``.
+
+    Args:
+        processes: Worker processes; ``None`` uses the CPU count and ``1``
+            runs in-process.  Results are identical either way.
+    """
+    seeds = list(range(base_seed, base_seed + battles))
+    if processes == 1 or battles < 2:
+        return BatchSummary(tuple(_simulate_chunk((ship_a, ship_b, seeds, max_seconds))))
+
+    workers = processes or os.cpu_count() or 1
+    # A few chunks per worker keeps the pool busy without pickling the
+    # ships once per battle.
+    size = max(1, math.ceil(len(seeds) / (workers * 4)))
+    chunks = [seeds[i:i + size] for i in range(0, len(seeds), size)]
+    results: list[SimResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_simulate_chunk, [(ship_a, ship_b, c, max_seconds) for c in chunks]):
+            results.extend(chunk)
+    return BatchSummary(tuple(results))
@@ -0,0 +1,241 @@
+"""Record a run's HTTP traffic to a cassette and replay it offline.
+
+``RecordingSession`` wraps ``Client.session`` and appends every request /
+response pair — method, URL, status, body, elapsed time and offset from the
+start of the run — to a gzip-compressed JSON-lines cassette.  URLs, request
+bodies and response bodies go through ``redact_secrets`` before they are
+written, so a cassette carries no access tokens, refresh tokens, device keys
+or e-mail addresses.
+
+``ReplaySession`` serves a cassette back without a network: each request is
+matched by method and its ``cache_key`` (endpoint path plus stable query
+parameters, so tokens, timestamps and checksums do not matter) to the
+recorded responses for that key, in recorded order.  With
+``emulate_timing`` each response is delayed by its recorded elapsed time.
+``ReplayClock`` drives ``DotNet.validDateTime`` from the cassette: it starts
+at the recorded start time and moves to each served response's recorded
+time, so timestamps and checksums computed during a replay are the same on
+every run.
+
+    with Cassette.record("run.cassette.gz") as cassette:
+        client.session = RecordingSession(client.session, cassette)
+        ...
+
+    client.session = ReplaySession.load("run.cassette.gz")
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import IO, Any, Callable, Optional
+
+import requests
+
+from .dotnet import DotNet
+from .redaction import redact_secrets
+from .request_cache import cache_key
+
+_FORMAT = 1
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """The cassette has no recorded response for a request."""
+
+
+def _key(method: str, url: str) -> tuple:
+    return (method.upper(), cache_key(redact_secrets(url)))
+
+
+def _body_text(body: Any) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", "replace")
+    elif not isinstance(body, str):
+        body = json.dumps(body, sort_keys=True)
+    return redact_secrets(body)
+
+
+class Cassette:
+    """Append-only writer for a gzip JSON-lines cassette."""
+
+    def __init__(self, stream: IO[str], started: datetime.datetime,
+                 clock: Callable[[], float] = time.monotonic):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._origin = clock()
+        self.started = started
+        self.interactions = 0
+        self._write({"format": _FORMAT, "started": started.strftime(_TIME_FORMAT)})
+
+    @classmethod
+    def record(cls, path: str | Path) -> "Cassette":
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return cls(gzip.open(path, "wt", encoding="utf-8"), DotNet.validDateTime())
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._stream.close()
+
+    def _write(self, record: dict) -> None:
+        self._stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def add(self, method: str, url: str, data: Any, response: Any, elapsed: float) -> None:
+        """Append one interaction (redacted)."""
+        content = getattr(response, "content", None)
+        if not isinstance(content, (bytes, str)):
+            content = getattr(response, "text", None)
+            content = content if isinstance(content, str) else ""
+        content_type = getattr(response, "headers", {}).get("Content-Type")
+        record = {
+            "method": method.upper(),
+            "url": redact_secrets(url),
+            "request": _body_text(data),
+            "status": getattr(response, "status_code", 200),
+            "content_type": content_type if isinstance(content_type, str) else None,
+            "body": _body_text(content),
+            "elapsed": round(elapsed, 4),
+            "offset": round(self._clock() - self._origin, 4),
+        }
+        with self._lock:
+            self._write(record)
+            self.interactions += 1
+
+
+class RecordingSession:
+    """``requests.Session`` stand-in that records what the wrapped session returns."""
+
+    def __init__(self, session: Any, cassette: Cassette):
+        self._session = session
+        self.cassette = cassette
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+    def request(self, method: str, url: str, data: Any = None, json: Any = None, **kwargs) -> Any:
+        start = time.perf_counter()
+        response = self._session.request(method, url, data=data, json=json, **kwargs)
+        self.cassette.add(method, url, json if json is not None else data, response, time.perf_counter() - start)
+        return response
+
+    def get(self, url: str, **kwargs) -> Any:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data: Any = None, json: Any = None, **kwargs) -> Any:
+        return self.request("POST", url, data=data, json=json, **kwargs)
+
+
+class ReplayClock:
+    """Deterministic ``DotNet.validDateTime`` source for a replay."""
+
+    def __init__(self, started: datetime.datetime):
+        self.started = started
+        self._offset = 0.0
+        self._lock = threading.Lock()
+
+    def advance_to(self, offset: float) -> None:
+        with self._lock:
+            self._offset = max(self._offset, offset)
+
+    def __call__(self) -> datetime.datetime:
+        with self._lock:
+            return self.started + datetime.timedelta(seconds=self._offset)
+
+
+class ReplaySession:
+    """Serves recorded responses by (method, cache key), in recorded order.
+
+    When a key's recorded responses run out, the last one is served again.
+
+    Raises:
+        CassetteMiss: (from ``request``) if a request was never recorded.
+    """
+
+    def __init__(self, interactions: list[dict], started: datetime.datetime,
+                 emulate_timing: bool = False, sleep: Callable[[float], None] = time.sleep):
+        self.clock = ReplayClock(started)
+        self.emulate_timing = emulate_timing
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._queues: dict[tuple, deque[dict]] = defaultdict(deque)
+        self._last: dict[tuple, dict] = {}
+        for interaction in interactions:
+            self._queues[_key(interaction["method"], interaction["url"])].append(interaction)
+        self.served = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: str | Path, emulate_timing: bool = False) -> "ReplaySession":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != _FORMAT:
+                raise ValueError(f"unsupported cassette format: {header.get('format')!r}")
+            interactions = [json.loads(line) for line in f if line.strip()]
+        started = datetime.datetime.strptime(header["started"], _TIME_FORMAT)
+        return cls(interactions, started, emulate_timing=emulate_timing)
+
+    def install_clock(self) -> Callable[[], None]:
+        """Drive ``DotNet.validDateTime`` from the cassette; returns an undo function."""
+        previous = DotNet.clock
+        DotNet.clock = self.clock
+
+        def restore() -> None:
+            DotNet.clock = previous
+        return restore
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        key = _key(method, url)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                interaction = queue.popleft()
+                self._last[key] = interaction
+            else:
+                interaction = self._last.get(key)
+            if interaction is None:
+                self.misses += 1
+                raise CassetteMiss(f"no recorded response for {method.upper()} {redact_secrets(url)}")
+            self.served += 1
+        if self.emulate_timing and interaction["elapsed"] > 0:
+            self._sleep(interaction["elapsed"])
+        self.clock.advance_to(interaction["offset"])
+        return _response(interaction, url)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data: Any = None, json: Any = None, **kwargs) -> requests.Response:
+        return self.request("POST", url, data=data, json=json, **kwargs)
+
+    def mount(self, prefix: str, adapter: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _response(interaction: dict, url: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = interaction["status"]
+    response._content = (interaction["body"] or "").encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = url
+    if interaction.get("content_type"):
+        response.headers["Content-Type"] = interaction["content_type"]
+    response.elapsed = datetime.timedelta(seconds=interaction["elapsed"])
+    return response
@@ -5,16 +5,10 @@ import re
 import time
 import datetime
 import collections
-import xmltodict
 import requests
 import random
 import logging
-import math
 import hashlib
-from itertools import accumulate
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
-from ratelimit import limits, sleep_and_retry
 from sdk.device import Device
 from .security import (
     ChecksumEmailAuthorize,
@@ -23,6 +17,21 @@ from .security import (
 )
 from .dotnet import DotNet
 from .redaction import redact_secrets, safe_log_message  # noqa: F401
+from .design_catalog import DesignCatalog
+from .crew_leveling import MAX_CHARACTER_LEVEL, plan_optimal_upgrades, upgrade_ladder
+from .design_store import DesignStore, design_versions
+from .design_stream import parse_all_designs
+from .endpoints import ALL_DESIGNS4_VERSIONS, ENDPOINTS
+from .layout_memo import LayoutMemo, layout_fingerprint
+from .models import TRAINING_STATS, Character, Item, Ship
+from .metrics import RequestMetrics
+from .request_cache import RequestCache, endpoint_name
+from .request_scheduler import Priority, RequestScheduler, endpoint_priority
+from .resilience import DEFAULT_TIMEOUT, Resilience, ResilientHTTPAdapter, TimeoutHTTPAdapter  # noqa: F401
+from .research_index import ResearchIndex
+from .response import ClassifiedResponse, Outcome, parse_xml
+from .token_manager import TokenManager, access_token_of, is_signed, with_access_token
+from .training_planner import ResearchGates, TrainingActionKind, plan_training
 
 
 def lowercase_urlencode(params: dict) -> str:
@@ -74,26 +83,59 @@ def _extract_collection(data, item_key: str) -> list[dict]:
 
 
 
-DEFAULT_TIMEOUT = 5  # seconds
-ONE_MINUTE = 60
-MAX_CALLS_PER_MINUTE = 30
+# Marker for a design-cache miss (a cached collection may legitimately be None).
+_MISSING = object()
+
+# ListAllDesigns4 collections: (response key, Client attribute, version attribute).
+_ALL_DESIGN_COLLECTIONS = (
+    ("Files", "files", "@FileVersion"),
+    ("Sprites", "sprites", "@SpriteVersion"),
+    ("Backgrounds", "backgrounds", "@BackgroundVersion"),
+    ("ShipDesigns", "shipDesigns", "@ShipDesignVersion"),
+    ("RoomDesigns", "roomDesigns", "@RoomDesignVersion"),
+    ("CharacterDesigns", "characterDesigns", "@CharacterDesignVersion"),
+    ("CharacterDesignActions", "characterDesignActions", "@CharacterDesignActionVersion"),
+    ("ItemDesigns", "itemDesigns", "@ItemDesignVersion"),
+    ("CraftDesigns", "craftDesigns", "@CraftDesignVersion"),
+    ("MissileDesigns", "missileDesigns", "@MissileDesignVersion"),
+    ("StarSystems", "starSystems", "@StarSystemVersion"),
+    ("StarSystemLinks", "starSystemsLinks", "@StarSystemLinkVersion"),
+    ("NewsDesigns", "newsDesigns", "@NewsDesignVersion"),
+    ("Leagues", "leagues", "@LeagueVersion"),
+    ("AchievementDesigns", "achievementDesigns", "@AchievementDesignVersion"),
+    ("RoomDesignPurchases", "roomDesignPurchases", "@RoomDesignPurchaseVersion"),
+    ("RoomDesignSprites", "roomDesignSprites", "@RoomDesignSpriteVersion"),
+    ("MissionDesigns", "missionDesigns", "@MissionDesignVersion"),
+    ("Animations", "animations", "@AnimationVersion"),
+    ("ResearchDesigns", "researchDesigns", "@ResearchDesignVersion"),
+    ("TrainingDesigns", "trainingDesigns", "@TrainingDesignVersion"),
+    ("ChallengeDesigns", "challengeDesigns", "@ChallengeDesignVersion"),
+    ("RewardDesigns", "rewardDesigns", "@RewardDesignVersion"),
+    ("DivisionDesigns", "divisionDesigns", "@DivisionDesignVersion"),
+    ("CollectionDesigns", "collectionDesigns", "@CollectionDesignVersion"),
+    ("DrawDesigns", "drawDesigns", "@DrawDesignVersion"),
+    ("PromotionDesigns", "promotionDesigns", "@PromotionDesignVersion"),
+    ("SituationDesigns", "situationDesigns", "@SituationDesignVersion"),
+    ("ItemDesignActions", "itemDesignActions", "@ItemDesignActionVersion"),
+    ("SeasonDesigns", "seasonDesigns", "@SeasonDesignVersion"),
+    ("Assets", "assets", "@AssetVersion"),
+    ("StarSystemMarkerGenerators", "starSystemMarkerGenerators", "@MarkerGeneratorDesignVersion"),
+)
 
+# DesignCatalog inputs: (Client attribute, DesignCatalog argument, item key).
+_CATALOG_SOURCES = (
+    ("roomDesigns", "room_designs", "RoomDesign"),
+    ("allCharacterDesigns", "character_designs", "CharacterDesign"),
+    ("itemDesigns", "item_designs", "ItemDesign"),
+    ("allResearchDesigns", "research_designs", "ResearchDesign"),
+    ("trainingDesigns", "training_designs", "TrainingDesign"),
+    ("shipDesigns", "ship_designs", "ShipDesign"),
+    ("allTaskDesigns", "task_designs", "TaskDesign"),
+)
 
-@sleep_and_retry
-@limits(calls=MAX_CALLS_PER_MINUTE, period=ONE_MINUTE)
-class TimeoutHTTPAdapter(HTTPAdapter):
-    def __init__(self, *args, **kwargs):
-        self.timeout = DEFAULT_TIMEOUT
-        if "timeout" in kwargs:
-            self.timeout = kwargs["timeout"]
-            del kwargs["timeout"]
-        super().__init__(*args, **kwargs)
 
-    def send(self, request, **kwargs):
-        timeout = kwargs.get("timeout")
-        if timeout is None:
-            kwargs["timeout"] = self.timeout
-        return super().send(request, **kwargs)
+ONE_MINUTE = 60
+MAX_CALLS_PER_MINUTE = 30
 
 
 class User(object):
@@ -126,7 +168,6 @@ class Client(object):
     baseUrl = "https://api.pixelstarships.com"
 
     # runtime data
-    accessToken = None
     checksum = None
     freeStarbuxToday = 0
     freeStarbuxMax = 10
@@ -146,43 +187,136 @@ class Client(object):
     info = {"@Name": ""}
     user: User
 
-    # tcp session, backoff timer, and rate limiter
-    retry_strategy = Retry(
-        total=10,
-        backoff_factor=1,
-        status_forcelist=[500, 502, 503, 504, 520],
-        allowed_methods=["GET", "POST"],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session = requests.Session()
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
+    # Shared request budget; requests wait for it in priority order.
+    scheduler = RequestScheduler(calls=MAX_CALLS_PER_MINUTE, period=ONE_MINUTE)
 
     def __init__(self, device, settings=None):
         self.device = device
         self.settings = settings or {}
-
-    @sleep_and_retry
-    @limits(calls=MAX_CALLS_PER_MINUTE, period=ONE_MINUTE)
-    def request(self, url, method, data=None):
-        r = self.session.request(method, url, headers=self.headers, data=data)
-
-        if "errorMessage" in r.text:
+        # tcp session with this client's own retry budgets, timeouts and
+        # circuit breakers, so one account's failures do not stall another's.
+        self.resilience = Resilience.default()
+        self.adapter = ResilientHTTPAdapter(self.resilience)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        # Access token with single-flight re-login; proactive refresh when
+        # settings["access_token_lifetime"] (seconds) is known.
+        self.tokens = TokenManager(self._renewAccessToken, lifetime=self.settings.get("access_token_lifetime"))
+        # Optional persistent design cache (settings["design_cache_dir"]).
+        cache_dir = self.settings.get("design_cache_dir")
+        self.designStore = (
+            DesignStore(cache_dir, getattr(device, "languageKey", None) or "en")
+            if cache_dir else None
+        )
+        # Optional persistent memo of layout reports (settings["layout_memo_file"],
+        # next to the design cache by default).
+        memo_file = self.settings.get("layout_memo_file") or (
+            f"{cache_dir}/layout_memo.json" if cache_dir else None
+        )
+        self.layoutMemo = LayoutMemo(memo_file) if memo_file else None
+        # Per-endpoint latency/bytes/parse-time counters for the run summary.
+        self.metrics = RequestMetrics()
+        # Per-run read-through cache for idempotent reads (settings["request_cache"]).
+        self.requestCache = RequestCache() if self.settings.get("request_cache", True) else None
+
+    @property
+    def accessToken(self):
+        return self.tokens.token
+
+    @accessToken.setter
+    def accessToken(self, token):
+        self.tokens.set(token)
+
+    def request(self, url, method, data=None, priority: Priority | None = None,
+                deadline: float | None = None, rebuild=None):
+        """Send a request through the read cache and the request scheduler.
+
+        ``priority`` defaults to the endpoint's ``ENDPOINT_PRIORITIES`` entry;
+        ``deadline`` is a ``time.monotonic()`` time after which the request is
+        dropped with ``DeadlineExceeded`` instead of waiting for the budget.
+        After an access-token refresh the request is replayed with the new
+        token substituted into ``url``.  A URL with a ``checksum`` is only
+        replayed when ``rebuild`` (a callable returning a fresh URL) is given,
+        since the checksum usually covers the token; without it the request
+        is sent with the token it was built with and not replayed.
+        """
+        def send():
+            return self._send(url, method, data, priority=priority, deadline=deadline, rebuild=rebuild)
+
+        if self.requestCache is None:
+            return send()
+        return self.requestCache.fetch(method, url, send)
+
+    def _endpoint_url(self, name: str, **values) -> str:
+        """URL of ``ENDPOINTS[name]``; ``accessToken`` defaults to the session's."""
+        endpoint = ENDPOINTS[name]
+        if "accessToken" in endpoint.params:
+            values.setdefault("accessToken", self.accessToken)
+        return endpoint.url(self.baseUrl, **values)
+
+    def _endpoint_request(self, name: str, **values):
+        """Send ``ENDPOINTS[name]`` with the table's HTTP method."""
+        return self.request(self._endpoint_url(name, **values), ENDPOINTS[name].method)
+
+    def _send(self, url, method, data=None, priority=None, deadline=None, rebuild=None):
+        waited = self.scheduler.acquire(endpoint_priority(url) if priority is None else priority, deadline)
+        sent_token = access_token_of(url)
+        # A signed URL can't take a new token without a new checksum.
+        replayable = rebuild is not None or not is_signed(url)
+        if sent_token is not None:
+            token = self.tokens.ensure_fresh()
+            if token and token != sent_token and replayable:
+                url = rebuild() if rebuild else with_access_token(url, token)
+                sent_token = token
+        r = self._transmit(method, url, data, waited)
+
+        if r.outcome is Outcome.STORAGE_FULL:
             # "storage is full" is a benign condition, log as warning not error
-            if "storage is full" in r.text.lower():
-                logging.warning("[%s] {%s} - storage is full", self.info["@Name"], redact_secrets(url))
-            elif "Please upgrade your lab room." not in r.text:
-                d = xmltodict.parse(r.content, xml_attribs=True)
-                logging.error("[%s] {%s} - {%s}", self.info["@Name"], redact_secrets(url), redact_secrets(str(d)))
+            logging.warning("[%s] {%s} - storage is full", self.info["@Name"], redact_secrets(url))
+        elif r.is_error and r.outcome is not Outcome.LAB_UPGRADE_REQUIRED:
+            logging.error(
+                "[%s] {%s} - {%s: %s}", self.info["@Name"], redact_secrets(url), r.root,
+                redact_secrets(r.error_message),
+            )
 
-        if "Failed to authorize access token" in r.text:
+        if r.outcome is Outcome.UNAUTHORIZED:
             logging.info(
                 "[%s] Attempting to reauthorized access token.", self.info["@Name"]
             )
             self.user.isAuthorized = False
-            self.quickReload()
-            r = self.session.request(method, url, headers=self.headers, data=data)
+            # One re-login per expired token, shared by every caller that hit it.
+            token = self.tokens.refresh(sent_token if sent_token is not None else self.accessToken)
+            if token and replayable:
+                if rebuild:
+                    url = rebuild()
+                elif sent_token is not None:
+                    url = with_access_token(url, token)
+                r = self._transmit(method, url, data)
+
+        return r
 
+    def _transmit(self, method, url, data=None, waited=0.0):
+        """One round trip on the session, recorded in ``self.metrics``."""
+        endpoint = endpoint_name(url)
+        retries = self.resilience.budget.used(endpoint)
+        start = time.perf_counter()
+        try:
+            raw = self.session.request(method, url, headers=self.headers, data=data)
+        except Exception as e:
+            self.metrics.record_request(
+                endpoint, url, time.perf_counter() - start, limiter_wait=waited,
+                retries=self.resilience.budget.used(endpoint) - retries, error=type(e).__name__,
+            )
+            raise
+        latency = time.perf_counter() - start
+        r = ClassifiedResponse(raw, on_parse=lambda seconds: self.metrics.record_parse(endpoint, seconds))
+        status = getattr(raw, "status_code", 200)
+        error = r.outcome.value if r.is_error else (f"http_{status}" if isinstance(status, int) and status >= 400 else None)
+        self.metrics.record_request(
+            endpoint, url, latency, nbytes=len(r.body), limiter_wait=waited,
+            retries=self.resilience.budget.used(endpoint) - retries, error=error,
+        )
         return r
 
     def parseUserLoginData(self, r):
@@ -191,7 +325,7 @@ class Client(object):
             return False
 
         try:
-            d = xmltodict.parse(r.content, xml_attribs=True)
+            d = parse_xml(r)
         except Exception:
             logging.error("Failed to login.")
             return False
@@ -348,7 +482,7 @@ class Client(object):
 
         r = self.session.post(url, json=json)
         if r:
-            d = xmltodict.parse(r.content, xml_attribs=True)
+            d = parse_xml(r)
             token = self._extract_access_token(r)
             if token is None:
                 logging.error("{%s}", redact_secrets(str(d)))
@@ -444,8 +578,12 @@ class Client(object):
         return datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
 
     def quickReload(self):
-        self.accessToken = None
+        """Re-establish the session, sharing any refresh already in flight."""
+        return self.tokens.refresh(self.accessToken)
+
+    def _renewAccessToken(self):
         self.create_device_session()
+        return self.accessToken
 
     def login(self, email=None, password=None):
         """Orchestrate the three-stage authentication sequence.
@@ -501,42 +639,122 @@ class Client(object):
         url = f"https://api.pixelstarships.com/SettingService/GetLatestVersion3?languageKey={self.device.languageKey}&deviceType=DeviceTypeIPhone"
         r = self.request(url, "GET")
         if r.content:
-            self.latestVersion = xmltodict.parse(r.content, xml_attribs=True)
+            self.latestVersion = parse_xml(r)
 
     def getTodayLiveOps2(self):
         url = f"https://api.pixelstarships.com/LiveOpsService/GetTodayLiveOps2?languageKey={self.device.languageKey}&deviceType=DeviceTypeIPhone"
         r = self.request(url, "GET")
         if r:
-            self.todayLiveOps = xmltodict.parse(r.content, xml_attribs=True)
+            self.todayLiveOps = parse_xml(r)
+
+    def _design_version(self, key: str) -> str:
+        """Return a design version from GetLatestVersion3 (e.g. "@RoomDesignVersion")."""
+        return design_versions(getattr(self, "latestVersion", None)).get(key, "")
+
+    def _load_designs(self, collection: str, version: str):
+        """Return a cached design collection, or _MISSING if not cached at this version."""
+        if self.designStore is None or not version:
+            return _MISSING
+        return self.designStore.get(collection, version, _MISSING)
+
+    def _store_designs(self, collection: str, version: str, data) -> None:
+        if self.designStore is not None and version:
+            self.designStore.put(collection, version, data)
+
+    def _fetch_designs(self, collection: str, version_key: str, service: str):
+        """Fetch a single design collection, serving it from the design cache when possible.
+
+        Returns the parsed response, or None if the request failed.
+        """
+        version = self._design_version(version_key)
+        cached = self._load_designs(collection, version)
+        if cached is not _MISSING:
+            logging.debug(f"[{collection}] served from design cache (version {version})")
+            return cached
+
+        r = self._endpoint_request(collection, languageKey=self.device.languageKey, designVersion=version)
+        if not r:
+            return None
+        data = parse_xml(r)
+        if isinstance(data, dict) and service in data and "errorMessage" not in r.text:
+            self._store_designs(collection, version, data)
+        return data
+
+    def designCatalog(self) -> DesignCatalog:
+        """Return a DesignCatalog over the currently loaded design collections.
+
+        The catalog is rebuilt only when one of the source attributes has been
+        replaced (i.e. a design list was reloaded), so repeated lookups within
+        a run share the same indexes.
+        """
+        sources = tuple(getattr(self, attr, None) for attr, _arg, _key in _CATALOG_SOURCES)
+        cached = getattr(self, "_designCatalog", None)
+        if cached is not None and all(a is b for a, b in zip(cached[0], sources)):
+            return cached[1]
+        catalog = DesignCatalog(**{
+            arg: _extract_collection(source, key)
+            for (_attr, arg, key), source in zip(_CATALOG_SOURCES, sources)
+        })
+        self._designCatalog = (sources, catalog)
+        return catalog
 
     def listRoomDesigns2(self):
-        url = f"https://api.pixelstarships.com/RoomService/ListRoomDesigns2?languageKey={self.device.languageKey}&designVersion={self.latestVersion['SettingService']['GetLatestSetting']['Setting']['@RoomDesignVersion']}"
-        r = self.request(url, "GET")
-        if r:
-            self.roomDesigns = xmltodict.parse(r.content, xml_attribs=True)
+        data = self._fetch_designs(
+            "ListRoomDesigns2", "@RoomDesignVersion", "RoomService",
+        )
+        if data is None:
+            return False
+        self.roomDesigns = data
+        return isinstance(data, dict) and "RoomService" in data
 
     def listAllTaskDesigns2(self):
-        url = f"https://api.pixelstarships.com/TaskService/ListAllTaskDesigns2?languageKey={self.device.languageKey}&designVersion={self.latestVersion['SettingService']['GetLatestSetting']['Setting']['@RoomDesignVersion']}"
-        r = self.request(url, "GET")
-        if r:
-            self.allTaskDesigns = xmltodict.parse(r.content, xml_attribs=True)
+        # The endpoint is queried with the room design version (as the official
+        # client does), but the cache is keyed by the task design version.
+        version = self._design_version("@RoomDesignVersion")
+        cache_version = self._design_version("@TaskDesignVersion") or version
+        cached = self._load_designs("ListAllTaskDesigns2", cache_version)
+        if cached is not _MISSING:
+            self.allTaskDesigns = cached
+            return True
+        r = self._endpoint_request("ListAllTaskDesigns2", languageKey=self.device.languageKey, designVersion=version)
+        if not r:
+            return False
+        self.allTaskDesigns = parse_xml(r)
+        if not isinstance(self.allTaskDesigns, dict) or "TaskService" not in self.allTaskDesigns:
+            return False
+        if "errorMessage" not in r.text:
+            self._store_designs("ListAllTaskDesigns2", cache_version, self.allTaskDesigns)
+        return True
 
     def listAllTrainingDesigns2(self):
-        url = f"https://api.pixelstarships.com/TrainingService/ListAllTrainingDesigns2?languageKey={self.device.languageKey}&designVersion={self.latestVersion['SettingService']['GetLatestSetting']['Setting']['@RoomDesignVersion']}"
-        r = self.request(url, "GET")
-        if r:
-            self.trainingDesigns = xmltodict.parse(r.content, xml_attribs=True)
+        # Same convention as listAllTaskDesigns2: query with the room design
+        # version, cache by the training design version.
+        version = self._design_version("@RoomDesignVersion")
+        cache_version = self._design_version("@TrainingDesignVersion") or version
+        cached = self._load_designs("ListAllTrainingDesigns2", cache_version)
+        if cached is not _MISSING:
+            self.trainingDesigns = cached
+            return True
+        r = self._endpoint_request("ListAllTrainingDesigns2", languageKey=self.device.languageKey, designVersion=version)
+        if not r:
+            return False
+        self.trainingDesigns = parse_xml(r)
+        if not isinstance(self.trainingDesigns, dict) or "TrainingService" not in self.trainingDesigns:
+            return False
+        if "errorMessage" not in r.text:
+            self._store_designs("ListAllTrainingDesigns2", cache_version, self.trainingDesigns)
+        return True
 
     def getShipByUserId(self, userId=0):
-        url = f"https://api.pixelstarships.com/ShipService/GetShipByUserId?userId={userId if userId else self.user.id}&accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("GetShipByUserId", userId=userId if userId else self.user.id)
         if r:
-            self.shipByUserId = xmltodict.parse(r.content, xml_attribs=True)
+            self.shipByUserId = parse_xml(r)
 
             if "ShipService" not in self.shipByUserId:
                 logging.error("ShipService data not avaialble.")
                 return False
 
+            self.ship = Ship.from_xml(self.shipByUserId["ShipService"]["GetShipByUserId"]["Ship"])
             self.rooms = self.shipByUserId["ShipService"]["GetShipByUserId"]["Ship"][
                 "Rooms"
             ]["Room"]
@@ -547,30 +765,24 @@ class Client(object):
         return False
 
     def listAchievementsOfAUser(self):
-        url = f"https://api.pixelstarships.com/AchievementService/ListAchievementsOfAUser?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("ListAchievementsOfAUser")
         if r:
-            self.achievementsOfAUser = xmltodict.parse(r.content, xml_attribs=True)
+            self.achievementsOfAUser = parse_xml(r)
 
     def listImportantMessagesForUser(self):
-        url = f"https://api.pixelstarships.com/MessageService/ListImportantMessagesForUser?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("ListImportantMessagesForUser")
         if r:
-            self.importantMessagesForUser = xmltodict.parse(r.content, xml_attribs=True)
+            self.importantMessagesForUser = parse_xml(r)
 
     def listUserStarSystems(self):
-        url = f"https://api.pixelstarships.com/GalaxyService/ListUserStarSystems?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("ListUserStarSystems")
         if r:
-            self.userStarSystems = xmltodict.parse(r.content, xml_attribs=True)
+            self.userStarSystems = parse_xml(r)
 
     def listStarSystemMarkersAndUserMarkers(self):
-        url = f"https://api.pixelstarships.com/GalaxyService/ListStarSystemMarkersAndUserMarkers?accessToken={self.accessToken}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("ListStarSystemMarkersAndUserMarkers")
         if r:
-            self.starSystemMarkersAndUserMarkers = xmltodict.parse(
-                r.content, xml_attribs=True
-            )
+            self.starSystemMarkersAndUserMarkers = parse_xml(r)
 
     def collectAvailableMarkers(self) -> int:
         """List star system markers and collect all those owned by this user.
@@ -619,10 +831,9 @@ class Client(object):
         return collected
 
     def listTasksOfAUser(self):
-        url = f"https://api.pixelstarships.com/TaskService/ListTasksOfAUser?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("ListTasksOfAUser")
         if r:
-            self.tasksOfAUser = xmltodict.parse(r.content, xml_attribs=True)
+            self.tasksOfAUser = parse_xml(r)
 
     def listCompletedMissionEvents(self):
         ts = f"{DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
@@ -637,110 +848,109 @@ class Client(object):
         url = f"https://api.pixelstarships.com/MissionService/ListCompletedMissionEvents?clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
         r = self.request(url, "GET")
         if r:
-            self.completedMissionEvents = xmltodict.parse(r.content, xml_attribs=True)
+            self.completedMissionEvents = parse_xml(r)
 
     def listSituations(self):
-        url = f"https://api.pixelstarships.com/SituationService/ListSituations?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("ListSituations")
         if r:
-            self.situations = xmltodict.parse(r.content, xml_attribs=True)
+            self.situations = parse_xml(r)
 
     def listPvPBattles2(self, take=25, skip=0):
         if self.user.isAuthorized:
-            url = f"https://api.pixelstarships.com/BattleService/ListPvPBattles2?take={take}&skip={skip}&accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-            r = self.request(url, "GET")
+            r = self._endpoint_request("ListPvPBattles2", take=take, skip=skip)
             if r:
-                self.pvpBattles = xmltodict.parse(r.content, xml_attribs=True)
+                self.pvpBattles = parse_xml(r)
                 return True
         return False
 
     def listMissionBattles(self, take=25, skip=0):
         if self.user.isAuthorized:
-            url = f"https://api.pixelstarships.com/BattleService/ListMissionBattles?take={take}&skip={skip}&accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-            r = self.request(url, "GET")
+            r = self._endpoint_request("ListMissionBattles", take=take, skip=skip)
             if r:
-                self.missionBattles = xmltodict.parse(r.content, xml_attribs=True)
+                self.missionBattles = parse_xml(r)
                 return True
         return False
 
     def listActionTypes2(self):
         if self.user.isAuthorized:
-            url = f"https://api.pixelstarships.com/RoomService/ListActionTypes2?languageKey={self.device.languageKey}&designVersion={self.latestVersion['SettingService']['GetLatestSetting']['Setting']['@ResearchDesignVersion']}"
-            r = self.request(url, "GET")
+            r = self._endpoint_request(
+                "ListActionTypes2", languageKey=self.device.languageKey,
+                designVersion=self.latestVersion["SettingService"]["GetLatestSetting"]["Setting"]["@ResearchDesignVersion"],
+            )
             if r:
-                self.actionTypes = xmltodict.parse(r.content, xml_attribs=True)
+                self.actionTypes = parse_xml(r)
                 return True
         return False
 
     def listConditionTypes2(self):
         if self.user.isAuthorized:
-            url = f"https://api.pixelstarships.com/RoomService/ListConditionTypes2?languageKey={self.device.languageKey}&designVersion={self.latestVersion['SettingService']['GetLatestSetting']['Setting']['@ResearchDesignVersion']}"
-            r = self.request(url, "GET")
+            r = self._endpoint_request(
+                "ListConditionTypes2", languageKey=self.device.languageKey,
+                designVersion=self.latestVersion["SettingService"]["GetLatestSetting"]["Setting"]["@ResearchDesignVersion"],
+            )
             if r:
-                self.conditionTypes = xmltodict.parse(r.content, xml_attribs=True)
+                self.conditionTypes = parse_xml(r)
                 return True
         return False
 
     def listAllResearches(self):
-        url = f"https://api.pixelstarships.com/ResearchService/ListAllResearches?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("ListAllResearches")
         if r:
-            self.allResearches = xmltodict.parse(r.content, xml_attribs=True)
+            self.allResearches = parse_xml(r)
 
     def listItemsOfAShip(self):
         if self.user.isAuthorized:
-            url = f"https://api.pixelstarships.com/ItemService/ListItemsOfAShip?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-            r = self.request(url, "GET")
+            r = self._endpoint_request("ListItemsOfAShip")
             if r:
-                self.itemsOfAShip = xmltodict.parse(r.content, xml_attribs=True)
+                self.itemsOfAShip = parse_xml(r)
+                self.items = [
+                    Item.from_xml(item) for item in ENDPOINTS["ListItemsOfAShip"].records(self.itemsOfAShip)
+                ]
                 return True
         return False
 
     def listRoomsViaAccessToken(self):
-        url = f"https://api.pixelstarships.com/RoomService/ListRoomsViaAccessToken?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
+        r = self._endpoint_request("ListRoomsViaAccessToken")
         if r:
-            self.roomsViaAccessToken = xmltodict.parse(r.content, xml_attribs=True)
+            self.roomsViaAccessToken = parse_xml(r)
 
     def listAllCharactersOfUser(self):
-        url = f"https://api.pixelstarships.com/CharacterService/ListAllCharactersOfUser?accessToken={self.accessToken}&clientDateTime={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
-        r = self.request(url, "GET")
-        self.allCharactersOfUser = xmltodict.parse(r.content, xml_attribs=True)
+        r = self._endpoint_request("ListAllCharactersOfUser")
+        self.allCharactersOfUser = parse_xml(r)
 
         if "CharacterService" not in self.allCharactersOfUser:
             logging.error("Failed to get list of characters on the ship.")
             return False
+        self.characters = [
+            Character.from_xml(character)
+            for character in ENDPOINTS["ListAllCharactersOfUser"].records(self.allCharactersOfUser)
+        ]
         return True
 
     def getRoomName(self, roomDesignId):
         if not hasattr(self, "roomDesigns"):
             self.listAllDesigns4()
 
-        room_designs = _extract_collection(getattr(self, "roomDesigns", None), "RoomDesign")
-        for design in room_designs:
-            if roomDesignId == design.get("@RoomDesignId"):
-                self.roomName = "".join(design.get("@RoomName", ""))
-                return True
-
-        self.roomName = ""
-        return False
+        design = self.designCatalog().room(roomDesignId)
+        self.roomName = "".join(design.get("@RoomName", "")) if design else ""
+        return design is not None
 
     def finishTraining(self, characterId):
         url = f"{self.baseUrl}/TrainingService/FinishTraining?characterId={characterId}&accessToken={self.accessToken}"
         r = self.request(url, "POST")
         if r:
-            if "errorMessage" in r.text:
+            if r.is_error:
                 return False
-            self.trainingFinish = xmltodict.parse(r.content, xml_attribs=True)
+            self.trainingFinish = parse_xml(r)
         return True
 
     def getTrainingUpdate(self, characterId):
         url = f"{self.baseUrl}/TrainingService/GetTrainingUpdate?characterId={characterId}&accessToken={self.accessToken}"
         r = self.request(url, "POST")
-        if r and "errorMessage" in r.text:
+        if r and r.is_error:
             return False
         if r:
-            self.trainingUpdate = xmltodict.parse(r.content, xml_attribs=True)
+            self.trainingUpdate = parse_xml(r)
         return True
 
     def listAllDesigns4(self):
@@ -753,156 +963,51 @@ class Client(object):
         if "SettingService" not in self.latestVersion:
             return False
         versions = self.latestVersion["SettingService"]["GetLatestSetting"]["Setting"]
-        url = f"{self.baseUrl}/DesignService/ListAllDesigns4?LanguageKey=en&ListFileVersion={versions['@FileVersion']}&ListSpriteVersion={versions['@SpriteVersion']}&ListBackgroundVersion={versions['@BackgroundVersion']}&ListAllShipDesignVersion={versions['@ShipDesignVersion']}&ListRoomDesignVersion={versions['@RoomDesignVersion']}&ListAllCharacterDesignVersion={versions['@CharacterDesignVersion']}&ListAllCharacterDesignActionVersion={versions['@CharacterDesignActionVersion']}&ListItemDesignVersion={versions['@ItemDesignVersion']}&ListCraftDesignVersion={versions['@CraftDesignVersion']}&ListMissileDesignVersion={versions['@MissileDesignVersion']}&ListStarSystemVersion={versions['@StarSystemVersion']}&ListStarSystemLinkVersion={versions['@StarSystemLinkVersion']}&ListAllNewsDesignVersion={versions['@NewsDesignVersion']}&ListLeagueVersion={versions['@LeagueVersion']}&ListAchievementDesignVersion={versions['@AchievementDesignVersion']}&ListRoomDesignPurchaseVersion={versions['@RoomDesignPurchaseVersion']}&ListRoomDesignSpriteVersion={versions['@RoomDesignSpriteVersion']}&ListAllMissionDesignVersion={versions['@MissionDesignVersion']}&ListAnimationVersion={versions['@AnimationVersion']}&ListAllResearchDesignVersion={versions['@ResearchDesignVersion']}&ListAllTrainingDesignVersion={versions['@TrainingDesignVersion']}&ListAllChallengeDesignVersion={versions['@ChallengeDesignVersion']}&ListAllRewardDesignVersion={versions['@RewardDesignVersion']}&ListAllDivisionDesignVersion={versions['@DivisionDesignVersion']}&ListAllCollectionDesignVersion={versions['@CollectionDesignVersion']}&ListAllDrawDesignVersion={versions['@DrawDesignVersion']}&ListAllPromotionDesignVersion={versions['@PromotionDesignVersion']}&ListAllSituationDesignVersion={versions['@SituationDesignVersion']}&ListAllTaskDesignVersion={versions['@TaskDesignVersion']}&ListActionTypeVersion={versions['@ActionTypeVersion']}&ListConditionTypeVersion={versions['@ConditionTypeVersion']}&ListItemDesignActionVersion={versions['@ItemDesignActionVersion']}&ListSeasonDesignVersion={versions['@SeasonDesignVersion']}&ListAssetVersion={versions['@AssetVersion']}&ListMarkerGeneratorDesignVersion={versions['@MarkerGeneratorDesignVersion']}"
-        r = self.request(url, "GET")
-        if r:
-            allDesignVersion = xmltodict.parse(r.content, xml_attribs=True)
+        # Serve from the design cache when every collection is cached at its
+        # current version; otherwise download everything and refresh the cache.
+        cached = {}
+        for key, attr, version_key in _ALL_DESIGN_COLLECTIONS:
+            data = self._load_designs(f"ListAllDesigns4.{key}", versions.get(version_key, ""))
+            if data is _MISSING:
+                break
+            cached[attr] = data
+        else:
+            logging.debug("[ListAllDesigns4] served from design cache")
+            for attr, data in cached.items():
+                setattr(self, attr, data)
+            return True
 
-            if (
-                "DesignService" not in allDesignVersion
-                and "ListAllDesigns" not in allDesignVersion["DesignService"]
-            ):
+        r = self._endpoint_request(
+            "ListAllDesigns4", LanguageKey="en",
+            **{param: versions[attr] for param, attr in ALL_DESIGNS4_VERSIONS},
+        )
+        if r:
+            # Stream the collections instead of building the whole document.
+            start = time.perf_counter()
+            allDesigns = parse_all_designs(r.content)
+            self.metrics.record_parse("ListAllDesigns4", time.perf_counter() - start)
+            if not allDesigns:
                 return False
-            designs = [
-                "Files",
-                "Sprites",
-                "Backgrounds",
-                "ShipDesigns",
-                "RoomDesigns",
-                "CharacterDesigns",
-                "CharacterDesignActions",
-                "ItemDesigns",
-                "CraftDesigns",
-                "MissileDesigns",
-                "StarSystems",
-                "StarSystemLinks",
-                "NewsDesigns",
-                "Leagues",
-                "AchievementDesigns",
-                "RoomDesignPurchases",
-                "RoomDesignSprites",
-                "MissionDesigns",
-                "Animations",
-                "ResearchDesigns",
-                "TrainingDesigns",
-                "ChallengeDesigns",
-                "RewardDesigns",
-                "DivisionDesigns",
-                "CollectionDesigns",
-                "DrawDesigns",
-                "PromotionDesigns",
-                "SituationDesigns",
-                "ItemDesignActions",
-                "SeasonDesigns",
-                "Assets",
-                "StarSystemMarkerGenerators",
-            ]
-            for design in designs:
-                if design not in allDesignVersion["DesignService"]["ListAllDesigns"]:
+            for key, _attr, _version_key in _ALL_DESIGN_COLLECTIONS:
+                if key not in allDesigns:
                     logging.error("Missing design data.")
                     return False
-            self.files = allDesignVersion["DesignService"]["ListAllDesigns"]["Files"]
-            self.sprites = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "Sprites"
-            ]
-            self.backgrounds = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "Backgrounds"
-            ]
-            self.shipDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "ShipDesigns"
-            ]
-            self.roomDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "RoomDesigns"
-            ]
-            self.characterDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "CharacterDesigns"
-            ]
-            self.characterDesignActions = allDesignVersion["DesignService"][
-                "ListAllDesigns"
-            ]["CharacterDesignActions"]
-            self.itemDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "ItemDesigns"
-            ]
-            self.craftDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "CraftDesigns"
-            ]
-            self.missileDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "MissileDesigns"
-            ]
-            self.starSystems = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "StarSystems"
-            ]
-            self.starSystemsLinks = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "StarSystemLinks"
-            ]
-            self.newsDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "NewsDesigns"
-            ]
-            self.leagues = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "Leagues"
-            ]
-            self.achievementDesigns = allDesignVersion["DesignService"][
-                "ListAllDesigns"
-            ]["AchievementDesigns"]
-            self.roomDesignPurchases = allDesignVersion["DesignService"][
-                "ListAllDesigns"
-            ]["RoomDesignPurchases"]
-            self.roomDesignSprites = allDesignVersion["DesignService"][
-                "ListAllDesigns"
-            ]["RoomDesignSprites"]
-            self.missionDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "MissionDesigns"
-            ]
-            self.animations = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "Animations"
-            ]
-            self.researchDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "ResearchDesigns"
-            ]
-            self.trainingDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "TrainingDesigns"
-            ]
-            self.challengeDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "ChallengeDesigns"
-            ]
-            self.rewardDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "RewardDesigns"
-            ]
-            self.divisionDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "DivisionDesigns"
-            ]
-            self.collectionDesigns = allDesignVersion["DesignService"][
-                "ListAllDesigns"
-            ]["CollectionDesigns"]
-            self.drawDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "DrawDesigns"
-            ]
-            self.promotionDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "PromotionDesigns"
-            ]
-            self.situationDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "SituationDesigns"
-            ]
-            self.itemDesignActions = allDesignVersion["DesignService"][
-                "ListAllDesigns"
-            ]["ItemDesignActions"]
-            self.seasonDesigns = allDesignVersion["DesignService"]["ListAllDesigns"][
-                "SeasonDesigns"
-            ]
-            self.assets = allDesignVersion["DesignService"]["ListAllDesigns"]["Assets"]
-            self.starSystemMarkerGenerators = allDesignVersion["DesignService"][
-                "ListAllDesigns"
-            ]["StarSystemMarkerGenerators"]
+            for key, attr, version_key in _ALL_DESIGN_COLLECTIONS:
+                setattr(self, attr, allDesigns[key])
+                self._store_designs(
+                    f"ListAllDesigns4.{key}", versions.get(version_key, ""), allDesigns[key],
+                )
         return True
 
     def listAllCharacterDesigns2(self):
         if self.latestVersion:
-            url = f"{self.baseUrl}/CharacterService/ListAllCharacterDesigns2?languageKey={self.device.languageKey}&designVersion={self.latestVersion['SettingService']['GetLatestSetting']['Setting']['@CharacterDesignVersion']}"
-            r = self.request(url, "GET")
-            if r:
-                self.allCharacterDesigns = xmltodict.parse(r.content, xml_attribs=True)
+            data = self._fetch_designs(
+                "ListAllCharacterDesigns2", "@CharacterDesignVersion", "CharacterService",
+            )
+            if data is not None:
+                self.allCharacterDesigns = data
 
-            if "CharacterService" not in self.allCharacterDesigns:
+            if "CharacterService" not in getattr(self, "allCharacterDesigns", {}):
                 logging.error(
                     "[%s] CharacterService data not avaialble.", self.info["@Name"]
                 )
@@ -913,9 +1018,8 @@ class Client(object):
     def addTraining(self, trainingDesignId, characterId):
         url = f"{self.baseUrl}/TrainingService/AddTraining?trainingDesignId={trainingDesignId}&characterId={characterId}&trainingStartDate={DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}&accessToken={self.accessToken}"
         r = self.request(url, "POST")
-        if r:
-            if "errorMessage" in r.text:
-                return False
+        if r and r.is_error:
+            return False
         return True
 
     def manageTraining(self):
@@ -951,407 +1055,79 @@ class Client(object):
             logging.info("Training design data unavailable; skipping training.")
             return True
 
-        roles = {
-            "weapons": {
-                "characters": ["Galactic Succubus", "Galactic Snow Maiden", "Delish"],
-                "primaryRoom": ["Academy", "Lunar College"],
-                "primaryT1": "Read Expert Weapon Theory",
-                "primaryT2": "Weapons Summit",
-                "primaryT3": "Weapons PHD",
-                "secondaryRoom": ["GYM", "Galaxy Gym"],
-                "secondaryT1": "Bench Press",
-                "secondaryT2": "Muscle Beach",
-                "secondaryT3": "Olympic Weightlifting",
-            },
-            "shields": {
-                "characters": ["Mistycball", "C.P.U.", "r2e"],
-                "primaryRoom": ["Academy", "Lunar College"],
-                "primaryT1": "Big Book of Science",
-                "primaryT2": "Scientific Summit",
-                "primaryT3": "Science PHD",
-                "secondaryRoom": ["Galaxy Gym", "GYM"],
-                "secondaryT1": "Bench Press",
-                "secondaryT2": "Muscle Beach",
-                "secondaryT3": "Olympic Weightlifting",
-            },
-            "engines": {
-                "characters": ["The Conjoint Archon", "Galactic Sprite"],
-                "primaryRoom": ["GYM", "Galaxy Gym"],
-                "primaryT1": "Bench Press",
-                "primaryT2": "Muscle Beach",
-                "primaryT3": "Olympic Weightlifting",
-                "secondaryRoom": ["Academy", "Lunar College"],
-                "secondaryT1": "Study Expert Engineering Manual",
-                "secondaryT2": "Engineering Summit",
-                "secondaryT3": "Engineering PHD",
-            },
-            "rushers": {
-                "characters": ["Huge Hellaloya", "Cyber Duck"],
-                "primaryRoom": ["GYM", "Galaxy Gym"],
-                "primaryT1": "Steam Yoga",
-                "primaryT2": "Crew vs Wild",
-                "primaryT3": "Space Marine",
-                "secondaryRoom": ["Galaxy Gym", "GYM"],
-                "secondaryT1": "Bench Press",
-                "secondaryT2": "Muscle Beach",
-                "secondaryT3": "Olympic Weightlifting",
-            },
-            "defenders": {
-                "characters": [
-                    "Admiral Serena",
-                    "Ancestral Spirit",
-                    "Green Ranger - Oliver",
-                    "Huntress",
-                    "Turkey Hero",
-                    "1st engineer Tully",
-                    "King Dong",
-                ],
-                "primaryRoom": ["GYM", "Galexy Gym"],
-                "primaryT1": "Bench Press",
-                "primaryT2": "Muscle Beach",
-                "primaryT3": "Olympic Weightlifting",
-                "secondaryRoom": ["Galaxy Gym", "GYM"],
-                "secondaryT1": "Kickbox",
-                "secondaryT2": "BBJ",
-                "secondaryT3": "Shaolin Tradition",
-            },
-            "pilots": {
-                "characters": [],
-                "primaryRoom": ["Academy", "Lunar College"],
-                "primaryT1": "Read Expert Pilot Handbook",
-                "primaryT2": "Pilot Summit",
-                "primaryT3": "Pilot Expert",
-                "secondaryRoom": ["Galaxy Gym", "GYM"],
-                "secondaryT1": "Bench Press",
-                "secondaryT2": "Muscle Beach",
-                "secondaryT3": "Olympic Weightlifting",
-            },
-        }
-        characters = _extract_collection(getattr(self, "allCharactersOfUser", None), "Character")
-        rooms = _extract_collection(getattr(self, "roomsViaAccessToken", None), "Room")
-        for character in characters:
-            trainingName = ""
-            room = {}
-            for r_item in rooms:
-                if character.get("@RoomId") == r_item.get("@RoomId"):
-                    room = r_item
-                    break
-            if room.get("@RoomDesignId"):
-                self.getRoomName(room["@RoomDesignId"])
-
-            logging.debug(
-                "{0!r} in {1!r}".format(character["@CharacterName"], self.roomName)
+        characters = [
+            Character.from_xml(c)
+            for c in _extract_collection(getattr(self, "allCharactersOfUser", None), "Character")
+        ]
+        if not characters:
+            return True
+
+        if not hasattr(self, "roomDesigns"):
+            self.listAllDesigns4()
+        catalog = self.designCatalog()
+        room_names = {}
+        for room in _extract_collection(getattr(self, "roomsViaAccessToken", None), "Room"):
+            design = catalog.room(room.get("@RoomDesignId", ""))
+            room_names.setdefault(
+                room.get("@RoomId"), "".join(design.get("@RoomName", "")) if design else ""
             )
-            if any(
-                primaryRoom in self.roomName
-                for primaryRoom in ["Academy", "GYM", "Galaxy Gym", "Lunar College"]
-            ):
-                roleData = {}
-                for data in roles.values():
-                    if character["@CharacterName"] in data["characters"]:
-                        roleData = data
-
-                stats = [
-                    "@HpImprovement",
-                    "@PilotImprovement",
-                    "@RepairImprovement",
-                    "@WeaponImprovement",
-                    "@ScienceImprovement",
-                    "@EngineImprovement",
-                    "@AttackImprovement",
-                    "@AbilityImprovement",
-                    "@StaminaImprovement",
-                ]
-                count = 0
-                for stat in stats:
-                    count = count + int(character[stat])
-
-                characterDesign = {}
-                for characterDesign in self.allCharacterDesigns["CharacterService"][
-                    "ListAllCharacterDesigns"
-                ]["CharacterDesigns"]["CharacterDesign"]:
-                    if (
-                        character["@CharacterDesignId"]
-                        == characterDesign["@CharacterDesignId"]
-                    ):
-                        break
 
-                trainingEndDate = None
-                if character["@TrainingEndDate"]:
-                    trainingEndDate = datetime.datetime.strptime(
-                        character["@TrainingEndDate"], "%Y-%m-%dT%H:%M:%S"
+        plan = plan_training(
+            characters,
+            room_names,
+            catalog,
+            ResearchGates.from_lookup(self.hasResearch),
+            datetime.datetime.now(datetime.timezone.utc),
+            consumable_id=self.findConsumableDesignId,
+            # Spends the player's items, so only with settings["use_consumables"].
+            use_consumables=self.settings.get("use_consumables", False),
+        )
+        for notice in plan.notices:
+            logging.error(f"[{self.info['@Name']}] {notice.message}")
+
+        for action in plan.actions:
+            character = action.character
+            if action.kind is TrainingActionKind.FINISH:
+                logging.debug(f"[{self.info['@Name']}] {action.describe()}")
+                if self.finishTraining(character.character_id):
+                    self._logFinishedTraining(action, catalog)
+            elif action.kind is TrainingActionKind.START:
+                if self.addTraining(action.training_design_id, character.character_id):
+                    logging.info(
+                        f"[{self.info['@Name']}] Starting training {action.training_name} for {character.name} in {action.room_name} with {action.percent:.2f}% training complete, {character.fatigue} fatigue."
                     )
-
-                percent = math.ceil(
-                    count / int(characterDesign["@TrainingCapacity"]) * 100
+                logging.info(
+                    f"[{self.info['@Name']}] Considering training {action.training_name} for {character.name} in {action.room_name} with {action.percent:.2f}% training complete, {character.fatigue} fatigue."
                 )
-                # Check research prerequisites for each tier
-                has_101_research = self.hasResearch("Fitness", 101) or self.hasResearch("Education", 101)
-                has_201_research = self.hasResearch("Fitness", 201) or self.hasResearch("Education", 201)
-                has_202_research = self.hasResearch("Fitness", 202) or self.hasResearch("Education", 202)
-                has_203_research = self.hasResearch("Fitness", 203) or self.hasResearch("Education", 203)
-                
-                if (
-                    roleData
-                    and any(
-                        primaryRoom in self.roomName
-                        for primaryRoom in roleData["primaryRoom"]
-                    )
-                    and (percent < 51)
-                    and has_101_research
-                    and (
-                        not trainingEndDate
-                        or (
-                            trainingEndDate
-                            < (datetime.datetime.utcnow() - datetime.timedelta(hours=1))
-                        )
-                    )
-                ):
-                    trainingName = roleData["primaryT1"]
-                    logging.debug(
-                        f"[{self.info['@Name']}] Use Green (T1) {trainingName} primary training for {character['@CharacterName']} in {self.roomName} with {percent:.2f}% training complete, ability {characterDesign['@SpecialAbilityType']}, and {character['@Fatigue']} fatigue."
-                    )
-                elif (
-                    roleData
-                    and any(
-                        primaryRoom in self.roomName
-                        for primaryRoom in roleData["primaryRoom"]
-                    )
-                    and (50 < percent < 65)
-                    and has_201_research
-                    and (
-                        not trainingEndDate
-                        or (
-                            trainingEndDate
-                            < (
-                                datetime.datetime.utcnow()
-                                - datetime.timedelta(hours=3, minutes=15)
-                            )
-                        )
-                    )
-                ):
-                    trainingName = roleData["primaryT2"]
-                    logging.debug(
-                        f"[{self.info['@Name']}] Use Blue (T2) {trainingName} primary training for {character['@CharacterName']} in {self.roomName} with {percent:.2f}% training complete, ability {characterDesign['@SpecialAbilityType']}, and {character['@Fatigue']} fatigue."
-                    )
-                elif (
-                    roleData
-                    and any(
-                        primaryRoom in self.roomName
-                        for primaryRoom in roleData["primaryRoom"]
-                    )
-                    and (64 < percent < 72)
-                    and has_203_research
-                    and (
-                        not trainingEndDate
-                        or (
-                            trainingEndDate
-                            < (
-                                datetime.datetime.utcnow()
-                                - datetime.timedelta(hours=12, minutes=15)
-                            )
-                        )
-                    )
-                ):
-                    trainingName = roleData["primaryT3"]
-                    logging.debug(
-                        f"[{self.info['@Name']}] Use Yellow (T3) {trainingName} primary training for {character['@CharacterName']} in {self.roomName} with {percent:.2f}% training complete, ability {characterDesign['@SpecialAbilityType']}, and {character['@Fatigue']} fatigue."
-                    )
-                elif (
-                    roleData
-                    and percent > 71
-                    and not any(
-                        secondaryRoom in self.roomName
-                        for secondaryRoom in roleData["secondaryRoom"]
-                    )
-                ):
-                    logging.error(
-                        f"[{self.info['@Name']}] Move {character['@CharacterName']} with {math.ceil(percent)}% training and {character['@Fatigue']} fatigue in {self.roomName} to the {' or '.join(roleData['secondaryRoom'])} to complete training complete for ability {characterDesign['@SpecialAbilityType']}."
-                    )
-
-                elif (
-                    roleData
-                    and any(
-                        secondaryRoom in self.roomName
-                        for secondaryRoom in roleData["secondaryRoom"]
-                    )
-                    and (71 < percent < 74)
-                    and (
-                        not trainingEndDate
-                        or (
-                            trainingEndDate
-                            < (datetime.datetime.utcnow() - datetime.timedelta(hours=1))
-                        )
-                    )
-                ):
-                    trainingName = roleData["secondaryT1"]
-                    logging.debug(
-                        f"[{self.info['@Name']}] Use Green (T1) {trainingName} primary training for {character['@CharacterName']} in {self.roomName} with {percent:.2f}% training complete, ability {characterDesign['@SpecialAbilityType']}, and {character['@Fatigue']} fatigue."
-                    )
-                elif (
-                    roleData
-                    and any(
-                        secondaryRoom in self.roomName
-                        for secondaryRoom in roleData["secondaryRoom"]
-                    )
-                    and (73 < percent < 85)
-                    and has_201_research
-                    and (
-                        not trainingEndDate
-                        or (
-                            trainingEndDate
-                            < (
-                                datetime.datetime.utcnow()
-                                - datetime.timedelta(hours=3, minutes=15)
-                            )
-                        )
-                    )
-                ):
-                    trainingName = roleData["secondaryT2"]
-                    logging.debug(
-                        f"[{self.info['@Name']}] Use Blue (T2) {trainingName} primary training for {character['@CharacterName']} in {self.roomName} with {percent:.2f}% training complete, ability {characterDesign['@SpecialAbilityType']}, and {character['@Fatigue']} fatigue."
-                    )
-                elif (
-                    roleData
-                    and any(
-                        secondaryRoom in self.roomName
-                        for secondaryRoom in roleData["secondaryRoom"]
-                    )
-                    and (84 < percent < 90)
-                    and has_203_research
-                    and (
-                        not trainingEndDate
-                        or (
-                            trainingEndDate
-                            < (
-                                datetime.datetime.utcnow()
-                                - datetime.timedelta(hours=12, minutes=15)
-                            )
-                        )
-                    )
-                ):
-                    trainingName = roleData["secondaryT3"]
-                    logging.debug(
-                        f"[{self.info['@Name']}] Use Yellow (T3) {trainingName} primary training for {character['@CharacterName']} in {self.roomName} with {percent:.2f}% training complete, ability {characterDesign['@SpecialAbilityType']}, and {character['@Fatigue']} fatigue."
-                    )
-                elif roleData and percent > 89:
-                    logging.error(
-                        f"[{self.info['@Name']}] Training complete for {character['@CharacterName']} with {math.ceil(percent)}% training and {character['@Fatigue']} fatigue in {self.roomName} for ability {characterDesign['@SpecialAbilityType']}, please move this crew to its designated room."
-                    )
-
-                if trainingName:
-                    if self.finishTraining(character["@CharacterId"]):
-                        statTotal = 0
-                        statChange = ""
-                        for stat in stats:
-                            statTotal = statTotal + int(
-                                self.trainingFinish["TrainingService"][
-                                    "FinishTraining"
-                                ]["Character"][stat]
-                            )
-                            if int(character[stat]) < int(
-                                self.trainingFinish["TrainingService"][
-                                    "FinishTraining"
-                                ]["Character"][stat]
-                            ):
-                                if statChange:
-                                    statChange = ", ".join(
-                                        stat
-                                        + " increased by "
-                                        + str(
-                                            int(
-                                                self.trainingFinish["TrainingService"][
-                                                    "FinishTraining"
-                                                ]["Character"][stat]
-                                                - int(character[stat])
-                                            )
-                                        )
-                                    )
-                        newPercent = (
-                            statTotal / int(characterDesign["@TrainingCapacity"]) * 100
-                        )
-                        newFatigue = int(
-                            self.trainingFinish["TrainingService"]["FinishTraining"][
-                                "Character"
-                            ]["@Fatigue"]
-                        )
-
-                        logging.info(
-                            f"[{self.info['@Name']}] Completed training for {character['@CharacterName']} in {self.roomName} with {statChange}, {newPercent - percent:.2f}% training increase and {newFatigue - int(character['@Fatigue'])} fatigue increase."
-                        )
-
-                    trainingDesignId = None
-                    for design in training_designs:
-                        if design.get("@TrainingName") == trainingName:
-                            trainingDesignId = design.get("@TrainingDesignId")
-
-                    if self.addTraining(trainingDesignId, character["@CharacterId"]):
-                        logging.info(
-                            f"[{self.info['@Name']}] Starting training {trainingName} for {character['@CharacterName']} in {self.roomName} with {percent:.2f}% training complete, ability {characterDesign['@SpecialAbilityType']}, {character['@Fatigue']} fatigue."
-                        )
-                    if character["@CharacterName"]:
-                        logging.info(
-                            f"[{self.info['@Name']}] Considering training {trainingName} for {character['@CharacterName']} in {self.roomName} with {percent:.2f}% training complete, ability {characterDesign['@SpecialAbilityType']}, {character['@Fatigue']} fatigue."
-                        )
-
-                # Step 1 & 2: Use grey consumables for early TP (before 30%)
-                # Step 5: Use hero consumables at 100 fatigue for guaranteed TP
-                fatigue = int(character.get("@Fatigue", "0"))
-                character_id = character.get("@CharacterId")
-                if character_id and percent < 30 and fatigue == 0:
-                    # Step 2: Spam grey cons in primary stat until 30% TP
-                    # Map training stat to consumable stat type
-                    stat_to_cons = {
-                        "WeaponImprovement": "WPN",
-                        "ScienceImprovement": "SCI",
-                        "EngineImprovement": "ENG",
-                        "PilotImprovement": "PLT",
-                        "HpImprovement": "HP",
-                        "AttackImprovement": "ATK",
-                        "AbilityImprovement": "ABL",
-                        "StaminaImprovement": "STA",
-                        "RepairImprovement": "STA",
-                    }
-                    primary_stat = None
-                    for stat in stats:
-                        if int(character[stat]) > 0:
-                            primary_stat = stat_to_cons.get(stat)
-                            break
-                    
-                    if primary_stat:
-                        grey_cons_id = self.findConsumableDesignId(primary_stat, "Common")
-                        if grey_cons_id:
-                            logging.info(f"[{self.info['@Name']}] Using grey {primary_stat} consumable for {character['@CharacterName']} ({percent:.1f}% TP)")
-                            self.useConsumable(grey_cons_id, int(character_id))
-
-                # Step 5: Hero consumables at 100 fatigue for guaranteed TP
-                elif character_id and percent > 89 and fatigue >= 100:
-                    # Need to find which stats are not yet maxed
-                    for stat in stats:
-                        current_val = int(character[stat])
-                        max_val = int(characterDesign.get(stat, "0"))
-                        if current_val < max_val:
-                            stat_to_cons = {
-                                "WeaponImprovement": "WPN",
-                                "ScienceImprovement": "SCI",
-                                "EngineImprovement": "ENG",
-                                "PilotImprovement": "PLT",
-                                "HpImprovement": "HP",
-                                "AttackImprovement": "ATK",
-                                "AbilityImprovement": "ABL",
-                                "StaminaImprovement": "STA",
-                                "RepairImprovement": "STA",
-                            }
-                            cons_type = stat_to_cons.get(stat)
-                            if cons_type:
-                                hero_cons_id = self.findConsumableDesignId(cons_type, "Hero")
-                                if hero_cons_id:
-                                    logging.info(f"[{self.info['@Name']}] Using hero {cons_type} consumable for {character['@CharacterName']} at 100 fatigue ({percent:.1f}% TP)")
-                                    self.useConsumable(hero_cons_id, int(character_id))
-                                    break
+            else:
+                logging.info(f"[{self.info['@Name']}] {action.describe()}")
+                self.useConsumable(action.consumable_design_id, int(character.character_id))
 
         return True
 
+    def _logFinishedTraining(self, action, catalog):
+        record = (
+            getattr(self, "trainingFinish", None) or {}
+        ).get("TrainingService", {}).get("FinishTraining", {}).get("Character")
+        if not isinstance(record, dict):
+            return
+        before = action.character
+        after = Character.from_xml(record)
+        statChange = ", ".join(
+            f"{stat} increased by {new - old}"
+            for stat, old, new in zip(TRAINING_STATS, before.improvements, after.improvements)
+            if new > old
+        )
+        design = catalog.character(before.design_id) or {}
+        try:
+            capacity = int(design.get("@TrainingCapacity", "0"))
+        except (ValueError, TypeError):
+            capacity = 0
+        newPercent = after.training_points / capacity * 100 if capacity else 0.0
+        logging.info(
+            f"[{self.info['@Name']}] Completed training for {before.name} in {action.room_name} with {statChange or 'no stat change'}, {newPercent - action.percent:.2f}% training increase and {after.fatigue - before.fatigue} fatigue increase."
+        )
+
     def getCharacterRooms(self):
         if not hasattr(self, "allCharactersOfUser"):
             if not self.listAllCharactersOfUser():
@@ -1369,7 +1145,8 @@ class Client(object):
 
     def upgradeCharacter(self, characterId):
         url = f"{self.baseUrl}/CharacterService/UpgradeCharacter?characterId={characterId}&accessToken={self.accessToken}"
-        self.request(url, "POST")
+        r = self.request(url, "POST")
+        return bool(r) and not r.is_error
 
     def upgradeCharacters(self):
         try:
@@ -1384,188 +1161,44 @@ class Client(object):
             if not hasattr(self, "allCharacterDesigns"):
                 self.listAllCharacterDesigns2()
 
-            crewCostsPerLevel = [
-                0,
-                90,
-                270,
-                450,
-                630,
-                810,
-                1020,
-                1230,
-                1440,
-                1650,
-                1860,
-                2130,
-                2400,
-                2670,
-                2940,
-                3210,
-                3540,
-                3870,
-                4200,
-                4530,
-                4860,
-                5220,
-                5580,
-                5940,
-                6300,
-                6660,
-                7050,
-                7440,
-                7830,
-                8220,
-                8610,
-                9030,
-                9450,
-                9870,
-                10290,
-                10710,
-                11160,
-                11610,
-                12060,
-                12510,
-            ]
-            crewCosts = list(accumulate(crewCostsPerLevel))
-            legendaryCrewCosts = [cost * 3 for cost in crewCosts]
-
-            legendaryCrewGasCosts = [
-                0,
-                130000,
-                162500,
-                195000,
-                227500,
-                260000,
-                292500,
-                325000,
-                357500,
-                390000,
-                422500,
-                455000,
-                487500,
-                520000,
-                552500,
-                585000,
-                617500,
-                650000,
-                682500,
-                715000,
-                747500,
-                780000,
-                812500,
-                845000,
-                877500,
-                910000,
-                942000,
-                975000,
-                1007500,
-                1040000,
-                1072500,
-                1105000,
-                1137500,
-                1170000,
-                1202500,
-                1235000,
-                1267500,
-                1300000,
-                1332500,
-                1365000,
-            ]
-            crewGasCosts = [
-                0,
-                0,
-                17,
-                33,
-                65,
-                130,
-                325,
-                650,
-                1300,
-                3200,
-                6500,
-                9700,
-                13000,
-                19500,
-                26000,
-                35700,
-                43800,
-                52000,
-                61700,
-                71500,
-                84500,
-                104000,
-                117000,
-                130000,
-                156000,
-                175000,
-                201000,
-                227000,
-                253000,
-                279000,
-                312000,
-                351000,
-                383000,
-                422000,
-                468000,
-                507000,
-                552000,
-                604000,
-                650000,
-                715000,
+            characters = [
+                Character.from_xml(c)
+                for c in _extract_collection(getattr(self, "allCharactersOfUser", {}), "Character")
             ]
+            catalog = self.designCatalog()
+            now = datetime.datetime.now(datetime.timezone.utc)
 
-            characters = _extract_collection(getattr(self, "allCharactersOfUser", {}), "Character")
-            character_designs = _extract_collection(getattr(self, "allCharacterDesigns", {}), "CharacterDesign")
-
+            candidates = []
             for character in characters:
-                if character.get("@RoomId") != "0" and character.get("@Level") != "40":
-                    for characterDesign in character_designs:
-                        if (
-                            character.get("@CharacterDesignId")
-                            == characterDesign.get("@CharacterDesignId")
-                        ):
-                            character_names.append(character.get("@CharacterName", ""))
-                            logging.debug(f"{len(crewCosts)=} {len(legendaryCrewCosts)=}")
-                            try:
-                                lvl = int(character.get("@Level", 0))
-                                xp = int(character.get("@Xp", 0))
-                            except (ValueError, TypeError):
-                                continue
-
-                            rarity = characterDesign.get("@Rarity", "")
-                            xp_cost = (
-                                legendaryCrewCosts[lvl]
-                                if rarity == "Legendary"
-                                else crewCosts[lvl]
+                if character.room_id != "0" and character.level != MAX_CHARACTER_LEVEL:
+                    characterDesign = catalog.character(character.design_id)
+                    if characterDesign:
+                        character_names.append(character.name)
+                        if upgrade_ladder(character, characterDesign, now):
+                            candidates.append(character)
+
+            if candidates:
+                # Refresh gas once, then spend it on the best combination of level-ups.
+                self.collectAllResources()
+                try:
+                    gas_avail = int(self.gasTotal)
+                except (ValueError, TypeError):
+                    gas_avail = 0
+
+                plan = plan_optimal_upgrades(
+                    candidates, catalog.character_designs, gas_avail, now
+                )
+                for purchase in plan.purchases:
+                    logging.info(
+                        f"[{self.info.get('@Name', '')}] Upgrading {purchase.character_name} from level {purchase.from_level} to {purchase.to_level} costing {purchase.gas_cost}/{gas_avail} gas and {purchase.xp_required} xp."
+                    )
+                    for level in range(purchase.from_level, purchase.to_level):
+                        if not self.upgradeCharacter(purchase.character_id):
+                            # Later levels depend on this one; don't send them blind.
+                            logging.warning(
+                                f"[{self.info.get('@Name', '')}] Upgrading {purchase.character_name} to level {level + 1} failed; skipping the remaining {purchase.to_level - level - 1} level(s)."
                             )
-                            if xp >= xp_cost:
-                                self.collectAllResources()
-                                date_str = character.get("@AvailableDate", "")
-                                try:
-                                    date_to_check = datetime.datetime.strptime(
-                                        date_str.split(".")[0], "%Y-%m-%dT%H:%M:%S"
-                                    )
-                                except ValueError:
-                                    date_to_check = datetime.datetime.now()
-                                current_datetime = datetime.datetime.now()
-                                gas_cost = (
-                                    legendaryCrewGasCosts[lvl]
-                                    if rarity == "Legendary"
-                                    else crewGasCosts[lvl]
-                                )
-                                try:
-                                    gas_avail = int(self.gasTotal)
-                                except (ValueError, TypeError):
-                                    gas_avail = 0
-
-                                if gas_cost <= gas_avail and date_to_check <= current_datetime:
-                                    char_id = character.get("@CharacterId")
-                                    char_name = character.get("@CharacterName", "")
-                                    logging.info(
-                                        f"[{self.info.get('@Name', '')}] Upgrading {char_name} to level {lvl + 1} costing {gas_cost}/{self.gasTotal} gas and {xp}/{xp_cost} xp."
-                                    )
-                                    if char_id:
-                                        self.upgradeCharacter(char_id)
+                            break
 
             if character_names:
                 logging.info(
@@ -1581,7 +1214,7 @@ class Client(object):
             url = f"https://api.pixelstarships.com/RoomService/ListAllRoomActionsOfShip?accessToken={self.accessToken}&clientDateTime={'{0:%Y-%m-%dT%H:%M:%S}'.format(DotNet.validDateTime())}"
             r = self.request(url, "GET")
             if r:
-                self.allRoomActionsOfShip = xmltodict.parse(r.content, xml_attribs=True)
+                self.allRoomActionsOfShip = parse_xml(r)
                 return True
         return False
 
@@ -1593,7 +1226,7 @@ class Client(object):
         url = f"https://api.pixelstarships.com/MessageService/ListSystemMessagesForUser3?fromMessageId={fromMessageId}&take={take}&accessToken={self.accessToken}"
         r = self.request(url, "GET")
         if r:
-            self.systemMessagesForUser = xmltodict.parse(r.content, xml_attribs=True)
+            self.systemMessagesForUser = parse_xml(r)
         if "MessageService" not in self.systemMessagesForUser:
             logging.error("MessageService data unavailable.")
             return False
@@ -1606,9 +1239,7 @@ class Client(object):
             logging.debug(redact_secrets(url))
             r = self.request(url, "POST")
             if r:
-                self.systemMessagesForUser = xmltodict.parse(
-                    r.content, xml_attribs=True
-                )
+                self.systemMessagesForUser = parse_xml(r)
             return True
         return False
 
@@ -1616,7 +1247,7 @@ class Client(object):
         url = f"https://api.pixelstarships.com/MessageService/ListMessagesForChannelKey?channelKey=channelKey={channelKey}&accessToken={self.accessToken}"
         r = self.request(url, "GET")
         if r:
-            self.messagesForChannelKey = xmltodict.parse(r.content, xml_attribs=True)
+            self.messagesForChannelKey = parse_xml(r)
         # Perform error handling and return values based on the results
         # return True
         # return False
@@ -1625,13 +1256,13 @@ class Client(object):
         url = f"https://api.pixelstarships.com/LadderService/FindUserRanking?accessToken={self.accessToken}"
         r = self.request(url, "GET")
         if r:
-            self.userRanking = xmltodict.parse(r.content, xml_attribs=True)
+            self.userRanking = parse_xml(r)
 
     def activateItem3(self, itemId=0, targetId=0):
         url = f"https://api.pixelstarships.com/ItemService/ActivateItem3?itemId={itemId}&targetId={targetId}&"
         r = self.request(url, "POST")
         if r:
-            self.item = xmltodict.parse(r.content, xml_attribs=True)
+            self.item = parse_xml(r)
 
     def useConsumable(self, consumableItemDesignId: int, characterId: int) -> bool:
         """Use a consumable item on a character.
@@ -1687,21 +1318,7 @@ class Client(object):
         if not hasattr(self, "itemDesigns") or not self.itemDesigns:
             self.listAllDesigns4()
             
-        items = _extract_collection(getattr(self, "itemDesigns", {}), "ItemDesign")
-        if not items:
-            return 0
-            
-        for item in items:
-            item_name = item.get("@ItemName", "")
-            item_subtype = item.get("@ItemSubType", "")
-            # Look for consumables matching the stat type and tier
-            if item_subtype == "Consumable" or "Consumable" in item_name:
-                if statType.upper() in item_name.upper() and tier.capitalize() in item_name.capitalize():
-                    try:
-                        return int(item.get("@ItemDesignId", "0"))
-                    except (ValueError, TypeError):
-                        pass
-        return 0
+        return self.designCatalog().consumable_design_id(statType, tier)
 
     def print_market_data(self, v):
         if not isinstance(v, dict):
@@ -1727,10 +1344,10 @@ class Client(object):
             r = self.request(url, "GET")
             if not r or not r.content:
                 return False
-            if "errorMessage=" in r.text:
-                logging.error(f"An error occurred: {r.text}.")
+            if r.is_error:
+                logging.error(f"An error occurred: {r.error_message}.")
                 return False
-            d = xmltodict.parse(r.content, xml_attribs=True)
+            d = parse_xml(r)
             if not isinstance(d, dict):
                 return False
 
@@ -1765,7 +1382,7 @@ class Client(object):
             r = self.request(url, "POST")
             if not r or not r.content:
                 return False
-            d = xmltodict.parse(r.content, xml_attribs=True)
+            d = parse_xml(r)
             if not isinstance(d, dict):
                 return False
         except Exception as e:
@@ -1875,22 +1492,25 @@ class Client(object):
                     "checksum_key/savy_checksum not configured"
                 )
                 return False
-            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
-            checksum = checksum_collect_marker2(
-                marker_id=str(starSystemMarkerId),
-                client_date_time=ts,
-                access_token=self.accessToken,
-                checksum_key=checksum_key,
-                savy_checksum=savy_checksum,
-            )
-            url = "https://api.pixelstarships.com/GalaxyService/CollectMarker2?starSystemMarkerId={}&clientDateTime={}&checksum={}&accessToken={}".format(
-                starSystemMarkerId,
-                ts,
-                checksum,
-                self.accessToken,
-            )
-            r = self.request(url, "POST")
-            if "errorMessage=" in r.text:
+
+            def collect_url():
+                ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+                checksum = checksum_collect_marker2(
+                    marker_id=str(starSystemMarkerId),
+                    client_date_time=ts,
+                    access_token=self.accessToken,
+                    checksum_key=checksum_key,
+                    savy_checksum=savy_checksum,
+                )
+                return "https://api.pixelstarships.com/GalaxyService/CollectMarker2?starSystemMarkerId={}&clientDateTime={}&checksum={}&accessToken={}".format(
+                    starSystemMarkerId,
+                    ts,
+                    checksum,
+                    self.accessToken,
+                )
+
+            r = self.request(collect_url(), "POST", rebuild=collect_url)
+            if r.is_error:
                 return False
 
             self.dronesCollected[starSystemMarkerId] = 1
@@ -1914,17 +1534,23 @@ class Client(object):
 
     def collectReward2(self, messageId):
         from sdk.security import ChecksumTimeForDate, ChecksumPasswordWithString
-        url = f"https://api.pixelstarships.com/MessageService/CollectReward2?messageId={messageId}&clientDateTime={'{0:%Y-%m-%dT%H:%M:%S}'.format(DotNet.validDateTime())}&checksum={str(ChecksumTimeForDate(DotNet.get_time()) + ChecksumPasswordWithString(self.accessToken))}&accessToken={self.accessToken}"
-        self.request(url, "POST")
+
+        def reward_url():
+            return f"https://api.pixelstarships.com/MessageService/CollectReward2?messageId={messageId}&clientDateTime={'{0:%Y-%m-%dT%H:%M:%S}'.format(DotNet.validDateTime())}&checksum={str(ChecksumTimeForDate(DotNet.get_time()) + ChecksumPasswordWithString(self.accessToken))}&accessToken={self.accessToken}"
+
+        self.request(reward_url(), "POST", rebuild=reward_url)
 
     def AddStarbux2(self, quantity=1):
         from sdk.security import checksum_add_starbux2
-        ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
-        checksum = checksum_add_starbux2(str(quantity), ts, self.accessToken)
-        url = f"https://api.pixelstarships.com/UserService/AddStarbux2?quantity={quantity}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
-        r = self.request(url, "POST")
+
+        def starbux_url():
+            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+            checksum = checksum_add_starbux2(str(quantity), ts, self.accessToken)
+            return f"https://api.pixelstarships.com/UserService/AddStarbux2?quantity={quantity}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+
+        r = self.request(starbux_url(), "POST", rebuild=starbux_url)
         if r:
-            self.starbux = xmltodict.parse(r.content, xml_attribs=True)
+            self.starbux = parse_xml(r)
 
     def grabFlyingStarbux(self):
         if (
@@ -1982,23 +1608,24 @@ class Client(object):
         """
         from sdk.security import checksum_character_draw
         
-        ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
         settings = self.settings or {}
         checksum_key = settings.get("checksum_key", "5343")
         savy_checksum = settings.get("savy_checksum", "Savvy!s0d@")
-        
-        checksum = checksum_character_draw(
-            draw_design_id=drawDesignId,
-            client_date_time=ts,
-            checksum_key=checksum_key,
-            savy_checksum=savy_checksum,
-        )
-        
-        url = f"https://api.pixelstarships.com/CharacterService/Draw?drawDesignId={drawDesignId}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
-        r = self.request(url, "POST")
+
+        def draw_url():
+            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+            checksum = checksum_character_draw(
+                draw_design_id=drawDesignId,
+                client_date_time=ts,
+                checksum_key=checksum_key,
+                savy_checksum=savy_checksum,
+            )
+            return f"https://api.pixelstarships.com/CharacterService/Draw?drawDesignId={drawDesignId}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+
+        r = self.request(draw_url(), "POST", rebuild=draw_url)
         
         if r:
-            result = xmltodict.parse(r.content, xml_attribs=True)
+            result = parse_xml(r)
             logging.info(f'[{self.info["@Name"]}] Draw purchase result: {result}')
             
             # Check for error
@@ -2029,7 +1656,6 @@ class Client(object):
         """
         from sdk.security import checksum_purchase_catalog2
 
-        ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
         settings = self.settings or {}
         checksum_key = settings.get("checksum_key", "5343")
         savy_checksum = settings.get("savy_checksum", "Savvy!s0d@")
@@ -2037,19 +1663,21 @@ class Client(object):
         if not self.accessToken:
             raise ConfigurationError("purchaseCatalogItem requires accessToken (must be logged in)")
 
-        checksum = checksum_purchase_catalog2(
-            argument=argument,
-            client_date_time=ts,
-            access_token=self.accessToken,
-            checksum_key=checksum_key,
-            savy_checksum=savy_checksum,
-        )
+        def purchase_url():
+            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+            checksum = checksum_purchase_catalog2(
+                argument=argument,
+                client_date_time=ts,
+                access_token=self.accessToken,
+                checksum_key=checksum_key,
+                savy_checksum=savy_checksum,
+            )
+            return f"https://api.pixelstarships.com/ShopService/PurchaseCatalog2?argument={argument}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
 
-        url = f"https://api.pixelstarships.com/ShopService/PurchaseCatalog2?argument={argument}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
-        r = self.request(url, "POST")
+        r = self.request(purchase_url(), "POST", rebuild=purchase_url)
 
         if r:
-            result = xmltodict.parse(r.content, xml_attribs=True)
+            result = parse_xml(r)
             logging.info(f'[{self.info["@Name"]}] PurchaseCatalog2 result: {result}')
 
             # Check for error
@@ -2114,7 +1742,6 @@ class Client(object):
         """
         from sdk.security import checksum_get_catalog_quantity
 
-        ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
         settings = self.settings or {}
         checksum_key = settings.get("checksum_key", "5343")
         savy_checksum = settings.get("savy_checksum", "Savvy!s0d@")
@@ -2122,18 +1749,20 @@ class Client(object):
         if not self.accessToken:
             raise ConfigurationError("getCatalogQuantity requires accessToken (must be logged in)")
 
-        checksum = checksum_get_catalog_quantity(
-            client_date_time=ts,
-            access_token=self.accessToken,
-            checksum_key=checksum_key,
-            savy_checksum=savy_checksum,
-        )
+        def quantity_url():
+            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+            checksum = checksum_get_catalog_quantity(
+                client_date_time=ts,
+                access_token=self.accessToken,
+                checksum_key=checksum_key,
+                savy_checksum=savy_checksum,
+            )
+            return f"https://api.pixelstarships.com/LibeOpsService/GetCatalogQuantity?clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
 
-        url = f"https://api.pixelstarships.com/LibeOpsService/GetCatalogQuantity?clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
-        r = self.request(url, "POST")
+        r = self.request(quantity_url(), "POST", rebuild=quantity_url)
 
         if r:
-            result = xmltodict.parse(r.content, xml_attribs=True)
+            result = parse_xml(r)
             logging.info(f'[{self.info["@Name"]}] GetCatalogQuantity result: {result}')
             return result
 
@@ -2145,21 +1774,20 @@ class Client(object):
             if not self.listAllResearchDesigns2():
                 return False
 
-        for i in self.allResearchDesigns["ResearchService"]["ListAllResearchDesigns"][
-            "ResearchDesigns"
-        ]["ResearchDesign"]:
-            if i["@ResearchDesignId"] == researchDesignId:
-                url = f"https://api.pixelstarships.com/ResearchService/SpeedUpResearchUsingBoostGauge?researchId={researchId}&accessToken={self.accessToken}&clientDateTime={'{0:%Y-%m-%dT%H:%M:%S}'.format(DotNet.validDateTime())}"
-                r = self.request(url, "POST")
-                if r and "@errorMessage" in r.text:
-                    logging.info(
-                        f"[{self.info['@Name']}] Failed to speed up research for {''.join(i['@ResearchName'])}."
-                    )
-                    return False
+        i = self.designCatalog().research(researchDesignId)
+        if i:
+            url = f"https://api.pixelstarships.com/ResearchService/SpeedUpResearchUsingBoostGauge?researchId={researchId}&accessToken={self.accessToken}&clientDateTime={'{0:%Y-%m-%dT%H:%M:%S}'.format(DotNet.validDateTime())}"
+            r = self.request(url, "POST")
+            if r and "@errorMessage" in r.text:
                 logging.info(
-                    f"[{self.info['@Name']}] Speeding up research for {''.join(i['@ResearchName'])}."
+                    f"[{self.info['@Name']}] Failed to speed up research for {''.join(i['@ResearchName'])}."
                 )
-                return True
+                return False
+            self.invalidateResearchIndex()
+            logging.info(
+                f"[{self.info['@Name']}] Speeding up research for {''.join(i['@ResearchName'])}."
+            )
+            return True
         return False
 
     # Determine the boost gauge before attempting to speed up a room
@@ -2168,20 +1796,19 @@ class Client(object):
             if not self.listRoomDesigns2():
                 return False
 
-        room_designs = _extract_collection(getattr(self, "roomDesigns", None), "RoomDesign")
-        for i in room_designs:
-            if i.get("@RoomDesignId") == roomDesignId:
-                url = f"https://api.pixelstarships.com/RoomService/SpeedUpRoomConstructionUsingBoostGauge?roomId={roomId}&clientDateTime={'{0:%Y-%m-%dT%H:%M:%S}'.format(DotNet.validDateTime())}&accessToken={self.accessToken}"
-                r = self.request(url, "POST")
-                if r and "errorMessage" in r.text:
-                    logging.info(
-                        f"[{self.info['@Name']}] Failed to speed contruction for {''.join(i['@RoomName'])}."
-                    )
-                    return False
+        i = self.designCatalog().room(roomDesignId)
+        if i:
+            url = f"https://api.pixelstarships.com/RoomService/SpeedUpRoomConstructionUsingBoostGauge?roomId={roomId}&clientDateTime={'{0:%Y-%m-%dT%H:%M:%S}'.format(DotNet.validDateTime())}&accessToken={self.accessToken}"
+            r = self.request(url, "POST")
+            if r and "errorMessage" in r.text:
                 logging.info(
-                    f"[{self.info['@Name']}] Speeding up contruction for {''.join(i['@RoomName'])}."
+                    f"[{self.info['@Name']}] Failed to speed contruction for {''.join(i['@RoomName'])}."
                 )
-                return True
+                return False
+            logging.info(
+                f"[{self.info['@Name']}] Speeding up contruction for {''.join(i['@RoomName'])}."
+            )
+            return True
         return False
 
     def rushResearchOrConstruction(self):
@@ -2214,30 +1841,26 @@ class Client(object):
 
         upgradeList = []
         rootDesigns = collections.defaultdict(list)
-        designExceptionList = []
-        rootDesignExceptionList = []
+        designExceptions = set()
+        rootDesignExceptions = set()
         researchingFlag = False
 
         try:
-            all_researches = _extract_collection(getattr(self, "allResearches", None), "Research")
-            all_research_designs = _extract_collection(getattr(self, "allResearchDesigns", None), "ResearchDesign")
-
-            for research in all_researches:
-                for design in all_research_designs:
-                    if (
-                        research.get("@ResearchDesignId") == design.get("@ResearchDesignId")
-                        and design.get("@ResearchDesignId") not in designExceptionList
-                    ):
-                        if research.get("@ResearchState") == "Researching":
-                            logging.info(
-                                f"[{self.info['@Name']}] {''.join(design.get('@ResearchName', ''))} is currently being researched."
-                            )
-                            researchingFlag = True
-                        designExceptionList.append(design.get("@ResearchDesignId"))
-            for design in all_research_designs:
+            catalog = self.designCatalog()
+
+            for designId, state in self.researchIndex().states.items():
+                design = catalog.research(designId)
+                if design is not None and designId not in designExceptions:
+                    if state == "Researching":
+                        logging.info(
+                            f"[{self.info['@Name']}] {''.join(design.get('@ResearchName', ''))} is currently being researched."
+                        )
+                        researchingFlag = True
+                    designExceptions.add(designId)
+            for design in catalog.research_designs:
                 if (
-                    design.get("@ResearchDesignId") not in designExceptionList
-                    and design.get("@RootResearchDesignId") not in rootDesignExceptionList
+                    design.get("@ResearchDesignId") not in designExceptions
+                    and design.get("@RootResearchDesignId") not in rootDesignExceptions
                 ):
                     rootDesigns[design.get("@RootResearchDesignId")].append(design)
                     upgradeList.append(
@@ -2248,7 +1871,7 @@ class Client(object):
                             design.get("@ResearchName", ""),
                         ]
                     )
-                    rootDesignExceptionList.append(design.get("@RootResearchDesignId"))
+                    rootDesignExceptions.add(design.get("@RootResearchDesignId"))
             self.collectAllResources()
             if not researchingFlag:
                 for researchItem in upgradeList:
@@ -2280,21 +1903,7 @@ class Client(object):
         Returns:
             Research level (0 if not found)
         """
-        if not hasattr(self, "allResearches") or not self.allResearches:
-            self.listAllResearches()
-        
-        all_researches = _extract_collection(getattr(self, "allResearches", None), "Research")
-        if not all_researches:
-            return 0
-            
-        for research in all_researches:
-            if research.get("@ResearchName", "").startswith(researchName.split()[0]):
-                try:
-                    level = int(research.get("@ResearchLevel", "0"))
-                    return level
-                except (ValueError, TypeError):
-                    pass
-        return 0
+        return self.researchIndex().level(researchName)
 
     def hasResearch(self, researchName: str, minLevel: int = 1) -> bool:
         """Check if a research has reached at least the minimum level.
@@ -2306,7 +1915,29 @@ class Client(object):
         Returns:
             True if research level >= minLevel
         """
-        return self.getResearchLevel(researchName) >= minLevel
+        return self.researchIndex().has(researchName, minLevel)
+
+    def researchIndex(self) -> ResearchIndex:
+        """Return the research snapshot for the current ListAllResearches data.
+
+        Fetches ListAllResearches if it has not been loaded.  The snapshot is
+        rebuilt when allResearches is replaced and dropped by
+        invalidateResearchIndex().
+        """
+        if not getattr(self, "allResearches", None):
+            self.listAllResearches()
+        source = getattr(self, "allResearches", None)
+        cached = getattr(self, "_researchIndex", None)
+        if cached is not None and cached[0] is source:
+            return cached[1]
+        index = ResearchIndex(_extract_collection(source, "Research"))
+        self._researchIndex = (source, index)
+        return index
+
+    def invalidateResearchIndex(self):
+        """Forget research state after a research is started or sped up."""
+        self._researchIndex = None
+        self.allResearches = None
 
     def upgradeRooms(self):
         try:
@@ -2314,8 +1945,8 @@ class Client(object):
                 self.listRoomDesigns2()
 
             raw_rd = getattr(self, "roomDesigns", None)
-            room_designs = _extract_collection(raw_rd, "RoomDesign")
-            if not room_designs:
+            catalog = self.designCatalog()
+            if not catalog.room_designs:
                 logging.info("Room design data unavailable; skipping room upgrades.")
                 if raw_rd is None or not isinstance(raw_rd, dict) or "errorMessage" in str(raw_rd):
                     return False
@@ -2330,48 +1961,45 @@ class Client(object):
                     roomId = room.get("@RoomId")
                     roomStatus = room.get("@RoomStatus")
                     roomDesignId = room.get("@RoomDesignId")
-                    roomName = ""
+                    roomName = catalog.room_name(roomDesignId)
                     upgradeRoomDesignId = ""
                     upgradeRoomName = ""
 
-                    for roomDesignData in room_designs:
-                        if roomDesignId == roomDesignData.get("@RoomDesignId"):
-                            roomName = "".join(roomDesignData.get("@RoomName", ""))
-                        if roomDesignId == roomDesignData.get("@UpgradeFromRoomDesignId"):
-                            upgradeRoomDesignId = roomDesignData.get("@RoomDesignId")
-                            upgradeRoomName = "".join(roomDesignData.get("@RoomName", ""))
-                            cost_str = roomDesignData.get("@PriceString", "")
-                            cost = cost_str.split(":") if cost_str else [""]
-                            if (cost[0] == "mineral") and (
-                                len(cost) > 1 and int(cost[1]) > int(self.mineralTotal)
-                            ):
-                                continue
-
-                            if (cost[0] == "gas") and (
-                                len(cost) > 1 and int(cost[1]) > int(self.gasTotal)
-                            ):
-                                continue
-
-                            if (
-                                roomName
-                                and upgradeRoomName
-                                and (roomStatus != "Upgrading")
-                                and upgradeRoomDesignId != "0"
-                            ):
+                    for roomDesignData in catalog.upgrades_from(roomDesignId):
+                        upgradeRoomDesignId = roomDesignData.get("@RoomDesignId")
+                        upgradeRoomName = "".join(roomDesignData.get("@RoomName", ""))
+                        cost_str = roomDesignData.get("@PriceString", "")
+                        cost = cost_str.split(":") if cost_str else [""]
+                        if (cost[0] == "mineral") and (
+                            len(cost) > 1 and int(cost[1]) > int(self.mineralTotal)
+                        ):
+                            continue
+
+                        if (cost[0] == "gas") and (
+                            len(cost) > 1 and int(cost[1]) > int(self.gasTotal)
+                        ):
+                            continue
+
+                        if (
+                            roomName
+                            and upgradeRoomName
+                            and (roomStatus != "Upgrading")
+                            and upgradeRoomDesignId != "0"
+                        ):
+                            logging.info(
+                                f'[{self.info["@Name"]}] Upgradng {roomName} to {upgradeRoomName}.'
+                            )
+                            url = f"https://api.pixelstarships.com/RoomService/UpgradeRoom2?roomId={roomId}&upgradeRoomDesignId={upgradeRoomDesignId}&accessToken={self.accessToken}"
+                            r = self.request(url, "POST")
+                            roomName = ""
+                            upgradeRoomName = ""
+                            if r and "concurrent" in r.text:
                                 logging.info(
-                                    f'[{self.info["@Name"]}] Upgradng {roomName} to {upgradeRoomName}.'
+                                    f'[{self.info["@Name"]}] You have reached the maximum number of concurrent constructions allowed.'
                                 )
-                                url = f"https://api.pixelstarships.com/RoomService/UpgradeRoom2?roomId={roomId}&upgradeRoomDesignId={upgradeRoomDesignId}&accessToken={self.accessToken}"
-                                r = self.request(url, "POST")
-                                roomName = ""
-                                upgradeRoomName = ""
-                                if r and "concurrent" in r.text:
-                                    logging.info(
-                                        f'[{self.info["@Name"]}] You have reached the maximum number of concurrent constructions allowed.'
-                                    )
-                                    self.max_room_upgrades = True
-                                    break
-                                self.collectAllResources()
+                                self.max_room_upgrades = True
+                                break
+                            self.collectAllResources()
                     if self.max_room_upgrades:
                         break
             return True
@@ -2382,24 +2010,27 @@ class Client(object):
     def listUpgradingRooms(self):
         self.getShipByUserId()
         shipByUserId = getattr(self, "shipByUserId", None)
-        room_designs = _extract_collection(getattr(self, "roomDesigns", None), "RoomDesign")
-        if shipByUserId and room_designs:
+        catalog = self.designCatalog()
+        if shipByUserId and catalog.room_designs:
             if "ShipService" not in shipByUserId:
                 logging.debug(f"{shipByUserId=}")
             rooms = _extract_collection(shipByUserId, "Room")
             for room in rooms:
                 if room.get("@RoomStatus") == "Upgrading":
-                    for roomDesignData in room_designs:
-                        if room.get("@RoomDesignId") == roomDesignData.get("@RoomDesignId"):
-                            logging.info(
-                                f"[{self.info['@Name']}] {''.join(roomDesignData.get('@RoomName', ''))} is currently being upgraded."
-                            )
+                    roomDesignData = catalog.room(room.get("@RoomDesignId"))
+                    if roomDesignData:
+                        logging.info(
+                            f"[{self.info['@Name']}] {''.join(roomDesignData.get('@RoomName', ''))} is currently being upgraded."
+                        )
 
     def listAllResearchDesigns2(self):
         if self.latestVersion:
-            url = f"https://api.pixelstarships.com/ResearchService/ListAllResearchDesigns2?languageKey={self.device.languageKey}&designVersion={self.latestVersion['SettingService']['GetLatestSetting']['Setting']['@ResearchDesignVersion']}"
-            r = self.request(url, "GET")
-            self.allResearchDesigns = xmltodict.parse(r.content, xml_attribs=True)
+            data = self._fetch_designs(
+                "ListAllResearchDesigns2", "@ResearchDesignVersion", "ResearchService",
+            )
+            if data is None:
+                return False
+            self.allResearchDesigns = data
             if "ResearchService" not in self.allResearchDesigns:
                 return False
 
@@ -2408,11 +2039,12 @@ class Client(object):
     def addResearch(self, researchDesignId):
         url = f"https://api.pixelstarships.com/ResearchService/AddResearch?researchDesignId={researchDesignId}&researchStartDate={'{0:%Y-%m-%dT%H:%M:%S}'.format(DotNet.validDateTime())}&accessToken={self.accessToken}"
         r = self.request(url, "POST")
-        if r and "Please upgrade your lab room." in r.text:
+        if r and r.outcome is Outcome.LAB_UPGRADE_REQUIRED:
             logging.info(f"Skipped research design {researchDesignId}: lab upgrade required.")
             return "LAB_UPGRADE_REQUIRED"
-        if not r or "errorMessage" in r.text:
+        if not r or r.is_error:
             return False
+        self.invalidateResearchIndex()
         return True
 
     def rebuildAmmo(self):
@@ -2455,17 +2087,20 @@ class Client(object):
                 logging.info(
                     f'[{self.info["@Name"]}] Restocking {ammoCategory.lower()} items.'
                 )
-            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
-            checksum = checksum_rebuild_ammo3(
-                ammo_category=ammoCategory,
-                client_date_time=ts,
-                access_token=self.accessToken,
-                checksum_key=checksum_key,
-                savy_checksum=savy_checksum,
-            )
-            url = f"{self.baseUrl}/RoomService/RebuildAmmo3?ammoCategory={ammoCategory}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+            def ammo_url(ammoCategory=ammoCategory):
+                ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+                checksum = checksum_rebuild_ammo3(
+                    ammo_category=ammoCategory,
+                    client_date_time=ts,
+                    access_token=self.accessToken,
+                    checksum_key=checksum_key,
+                    savy_checksum=savy_checksum,
+                )
+                return f"{self.baseUrl}/RoomService/RebuildAmmo3?ammoCategory={ammoCategory}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+
+            url = ammo_url()
             logging.debug(redact_secrets(f"{url=}"))
-            r = self.request(url, "POST")
+            r = self.request(url, "POST", rebuild=ammo_url)
             if "errorMessage=" in r.text:
                 logging.warning(f'[{self.info["@Name"]}] RebuildAmmo3 {ammoCategory} failed: {r.text[:200]}')
         return True
@@ -2493,17 +2128,20 @@ class Client(object):
         if not self.accessToken:
             raise ConfigurationError("UpdateMarkerMovement requires accessToken (must be logged in)")
 
-        ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
-        checksum = checksum_update_marker_movement(
-            marker_id=marker_id,
-            client_date_time=ts,
-            access_token=self.accessToken,
-            checksum_key=checksum_key,
-            savy_checksum=savy_checksum,
-        )
-        url = f"{self.baseUrl}/GalaxyService/UpdateMarkerMovement?starSystemMarkerId={marker_id}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+        def movement_url():
+            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+            checksum = checksum_update_marker_movement(
+                marker_id=marker_id,
+                client_date_time=ts,
+                access_token=self.accessToken,
+                checksum_key=checksum_key,
+                savy_checksum=savy_checksum,
+            )
+            return f"{self.baseUrl}/GalaxyService/UpdateMarkerMovement?starSystemMarkerId={marker_id}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+
+        url = movement_url()
         logging.debug(redact_secrets(f"{url=}"))
-        r = self.request(url, "POST")
+        r = self.request(url, "POST", rebuild=movement_url)
         if "errorMessage=" in r.text:
             logging.warning(f'[{self.info["@Name"]}] UpdateMarkerMovement failed: {r.text[:200]}')
             return False
@@ -2532,17 +2170,20 @@ class Client(object):
         if not self.accessToken:
             raise ConfigurationError("CollectMarker2 requires accessToken (must be logged in)")
 
-        ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
-        checksum = checksum_collect_marker2(
-            marker_id=marker_id,
-            client_date_time=ts,
-            access_token=self.accessToken,
-            checksum_key=checksum_key,
-            savy_checksum=savy_checksum,
-        )
-        url = f"{self.baseUrl}/GalaxyService/CollectMarker2?starSystemMarkerId={marker_id}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+        def marker_url():
+            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+            checksum = checksum_collect_marker2(
+                marker_id=marker_id,
+                client_date_time=ts,
+                access_token=self.accessToken,
+                checksum_key=checksum_key,
+                savy_checksum=savy_checksum,
+            )
+            return f"{self.baseUrl}/GalaxyService/CollectMarker2?starSystemMarkerId={marker_id}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+
+        url = marker_url()
         logging.debug(redact_secrets(f"{url=}"))
-        r = self.request(url, "POST")
+        r = self.request(url, "POST", rebuild=marker_url)
         if "errorMessage=" in r.text:
             logging.warning(f'[{self.info["@Name"]}] CollectMarker2 failed: {r.text[:200]}')
             return False
@@ -2635,20 +2276,23 @@ class Client(object):
         if not self.accessToken:
             return None
 
-        ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
-        checksum = checksum_go_to(
-            star_system_id=star_system_id,
-            client_date_time=ts,
-            access_token=self.accessToken,
-            checksum_key=checksum_key,
-            savy_checksum=savy_checksum,
-        )
-        url = (
-            f"{self.baseUrl}/GalaxyService/GoTo?starSystemId={star_system_id}"
-            f"&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
-        )
+        def go_to_url():
+            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+            checksum = checksum_go_to(
+                star_system_id=star_system_id,
+                client_date_time=ts,
+                access_token=self.accessToken,
+                checksum_key=checksum_key,
+                savy_checksum=savy_checksum,
+            )
+            return (
+                f"{self.baseUrl}/GalaxyService/GoTo?starSystemId={star_system_id}"
+                f"&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}"
+            )
+
+        url = go_to_url()
         logging.debug(redact_secrets(f"{url=}"))
-        r = self.request(url, "POST")
+        r = self.request(url, "POST", rebuild=go_to_url)
         if not r or "errorMessage=" in r.text:
             logging.warning(
                 f"[{self.info.get('@Name', '')}] GoTo({star_system_id}) failed: "
@@ -2657,7 +2301,7 @@ class Client(object):
             return None
 
         try:
-            parsed = xmltodict.parse(r.content, xml_attribs=True)
+            parsed = parse_xml(r)
             ship = parsed.get("GalaxyService", {}).get("GoTo", {}).get("Ship", {})
             arrival = ship.get("@StarSystemArrivalDate", "")
             current_ss = ship.get("@StarSystemId", "")
@@ -2693,19 +2337,22 @@ class Client(object):
         if not self.accessToken:
             return False
 
-        ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
-        checksum = checksum_speedup_travelling(
-            client_date_time=ts,
-            access_token=self.accessToken,
-            checksum_key=checksum_key,
-            savy_checksum=savy_checksum,
-        )
-        url = (
-            f"{self.baseUrl}/GalaxyService/SpeedUpTravelling"
-            f"?checksum={checksum}&clientDateTime={ts}&accessToken={self.accessToken}"
-        )
+        def travel_url():
+            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+            checksum = checksum_speedup_travelling(
+                client_date_time=ts,
+                access_token=self.accessToken,
+                checksum_key=checksum_key,
+                savy_checksum=savy_checksum,
+            )
+            return (
+                f"{self.baseUrl}/GalaxyService/SpeedUpTravelling"
+                f"?checksum={checksum}&clientDateTime={ts}&accessToken={self.accessToken}"
+            )
+
+        url = travel_url()
         logging.debug(redact_secrets(f"{url=}"))
-        r = self.request(url, "POST")
+        r = self.request(url, "POST", rebuild=travel_url)
         if not r or "errorMessage=" in r.text:
             logging.warning(
                 f"[{self.info.get('@Name', '')}] SpeedUpTravelling failed: "
@@ -2934,7 +2581,13 @@ class Client(object):
 
         Reads ship data (getShipByUserId) and room designs (listAllDesigns4)
         to evaluate armor coverage, repair proximity, weapon distribution,
-        and power balance.  Logs a formatted report with recommendations.
+        power balance and boarder exposure.  Logs a formatted report with
+        recommendations.
+
+        With a layout memo configured, an unchanged layout (same rooms and
+        room-design version) is reported from the memo without loading room
+        designs or re-running the analysis, and a changed layout logs how
+        far its defense score moved since the last analysis.
 
         This is a read-only analysis — it does not modify the ship.
         """
@@ -2949,18 +2602,35 @@ class Client(object):
                     logging.warning(f"[{self.info.get('@Name', '')}] Cannot analyze layout: ship data unavailable")
                     return False
 
-            # Ensure room designs are loaded
-            if not hasattr(self, "roomDesigns") or not self.roomDesigns:
-                if not self.listRoomDesigns2():
-                    logging.warning(f"[{self.info.get('@Name', '')}] Cannot analyze layout: room designs unavailable")
-                    return False
-
             # Extract ship data
             ship = self.shipByUserId["ShipService"]["GetShipByUserId"]["Ship"]
             ship_name = ship.get("@ShipName", "")
             ship_level = int(ship.get("@ShipLevel", 0))
             ship_design_id = ship.get("@ShipDesignId", "")
 
+            # Serve an unchanged layout from the memo
+            memo = getattr(self, "layoutMemo", None)
+            design_version = self._design_version("@RoomDesignVersion")
+            memo_key = None
+            if memo is not None and design_version:
+                ship_model = Ship.from_xml(ship)
+                memo_key = layout_fingerprint(ship_model, ship_model.rooms, design_version)
+                ship_key = ship_model.ship_id or ship_name
+                cached = memo.get(memo_key)
+                if cached is not None:
+                    logging.info(f"[{ship_name}] Layout unchanged since the last analysis.")
+                    for line in cached["report"].split("\n"):
+                        logging.info(f"[{ship_name}] {line}")
+                    memo.record_score(ship_key, memo_key, cached["defense_score"])
+                    memo.save()
+                    return True
+
+            # Ensure room designs are loaded
+            if not hasattr(self, "roomDesigns") or not self.roomDesigns:
+                if not self.listRoomDesigns2():
+                    logging.warning(f"[{self.info.get('@Name', '')}] Cannot analyze layout: room designs unavailable")
+                    return False
+
             # Extract room designs
             room_design_list = _extract_collection(self.roomDesigns, "RoomDesign")
 
@@ -2975,6 +2645,18 @@ class Client(object):
             for line in report.split("\n"):
                 logging.info(f"[{ship_name}] {line}")
 
+            if memo_key is not None:
+                previous = memo.previous_score(ship_key)
+                if previous is not None:
+                    delta = analysis.defense_score - previous
+                    logging.info(
+                        f"[{ship_name}] Layout changed: defense score {previous:.0f} → "
+                        f"{analysis.defense_score:.0f} ({delta:+.1f})"
+                    )
+                memo.put(memo_key, {"report": report, "defense_score": analysis.defense_score})
+                memo.record_score(ship_key, memo_key, analysis.defense_score)
+                memo.save()
+
             return True
         except Exception as e:
             logging.error(f"analyzeShipLayout failed: {redact_secrets(str(e))}")
@@ -3017,16 +2699,16 @@ class Client(object):
             self.listTasksOfAUser()
             self.listAllTaskDesigns2()
             tasks = _extract_collection(getattr(self, "tasksOfAUser", {}), "Task")
-            task_designs = _extract_collection(getattr(self, "allTaskDesigns", {}), "TaskDesign")
+            catalog = self.designCatalog()
 
             for task in tasks:
                 logging.debug(f"{task=}")
                 if task.get("@Collected") == "true":
-                    for taskDesign in task_designs:
-                        if taskDesign.get("@TaskDesignId") == task.get("@TaskDesignId"):
-                            logging.info(
-                                f"[{self.info.get('@Name', '')}] Completed task to {taskDesign.get('@Description', '')}."
-                            )
+                    taskDesign = catalog.task(task.get("@TaskDesignId"))
+                    if taskDesign:
+                        logging.info(
+                            f"[{self.info.get('@Name', '')}] Completed task to {taskDesign.get('@Description', '')}."
+                        )
             return True
         except Exception as e:
             logging.error(f"listFinishTasks failed: {redact_secrets(str(e))}")
@@ -3051,17 +2733,17 @@ class Client(object):
             self.listTasksOfAUser()
             self.listAllTaskDesigns2()
             tasks = _extract_collection(getattr(self, "tasksOfAUser", {}), "Task")
-            task_designs = _extract_collection(getattr(self, "allTaskDesigns", {}), "TaskDesign")
+            catalog = self.designCatalog()
 
             for task in tasks:
                 if task.get("@Collected") == "false" and task.get("@ProgressValue") != "0":
-                    for taskDesign in task_designs:
-                        if taskDesign.get("@TaskDesignId") == task.get("@TaskDesignId"):
-                            if task.get("@ProgressValue") == taskDesign.get("@ObjectiveAmount"):
-                                if self.collectTaskCompletion(task.get("@TaskDesignId")):
-                                    logging.info(
-                                        f"[{self.info.get('@Name', '')}] Collecting reward for objective: {taskDesign.get('@Name', '')}."
-                                    )
+                    taskDesign = catalog.task(task.get("@TaskDesignId"))
+                    if taskDesign:
+                        if task.get("@ProgressValue") == taskDesign.get("@ObjectiveAmount"):
+                            if self.collectTaskCompletion(task.get("@TaskDesignId")):
+                                logging.info(
+                                    f"[{self.info.get('@Name', '')}] Collecting reward for objective: {taskDesign.get('@Name', '')}."
+                                )
             return True
         except Exception as e:
             logging.error(f"collectTaskReward failed: {redact_secrets(str(e))}")
@@ -3091,19 +2773,15 @@ class Client(object):
         if not self.accessToken:
             self.quickReload()
 
-        from sdk.security import checksum_heartbeat4
-        ts_str = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
-        checksum = checksum_heartbeat4(
-            ticks=DotNet.get_time(),
-            access_token=self.accessToken,
-        )
-        url = f"{self.baseUrl}/UserService/HeartBeat4?clientDateTime={ts_str}&checksum={checksum}&accessToken={self.accessToken}"
-        r = self.session.request("POST", url, headers=self.headers)
-        d = xmltodict.parse(r.content, xml_attribs=True)
+        def heartbeat_url():
+            # The checksum covers the token, so a replay needs a new URL.
+            return self._endpoint_url("HeartBeat4")
 
-        if "errorMessage" in r.text:
-            logging.error(f"[{self.info['@Name']}] {d}")
+        r = self.request(heartbeat_url(), ENDPOINTS["HeartBeat4"].method, rebuild=heartbeat_url)
+        if r.is_error:
+            logging.error(f"[{self.info['@Name']}] {r.error_message}")
             return False
+        d = parse_xml(r)
 
         if "UserService" in d and d["UserService"]["HeartBeat"]["@success"] == "true":
             self.user.lastHeartBeat = datetime.datetime.utcnow()
@@ -3156,7 +2834,7 @@ class Client(object):
             return False
 
         if r:
-            self.createBattle9Result = xmltodict.parse(r.content, xml_attribs=True)
+            self.createBattle9Result = parse_xml(r)
             # Log the raw response for debugging
             logging.debug(f'[{self.info["@Name"]}] CreateBattle9 response: {redact_secrets(r.text[:300])}')
             # Extract battleId from response for subsequent calls.
@@ -3224,7 +2902,7 @@ class Client(object):
             return False
 
         if r:
-            self.acceptBattle5Result = xmltodict.parse(r.content, xml_attribs=True)
+            self.acceptBattle5Result = parse_xml(r)
             return True
         return False
 
@@ -3251,32 +2929,34 @@ class Client(object):
             if not self.accessToken:
                 raise ConfigurationError("CreateStarBattle5 requires accessToken (must be logged in)")
 
-            ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
             email = self.info.get("@Email", "unknown@unknown.com")
         
             from sdk.security import checksum_create_star_battle5
-        
-            checksum = checksum_create_star_battle5(
-                client_hp=str(clientHp),
-                client_date_time=ts,
-                access_token=self.accessToken,
-                search_number=str(searchNumber),
-                value=str(value),
-                device_key=self.device.key,
-                email=email,
-                checksum_key=checksum_key,
-                savy_checksum=savy_checksum,
-            )
 
-            url = f"{self.baseUrl}/BattleService/CreateStarBattle5?clientHp={clientHp}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}&searchNumber={searchNumber}&value={value}"
+            def battle_url():
+                ts = "{0:%Y-%m-%dT%H:%M:%S}".format(DotNet.validDateTime())
+                checksum = checksum_create_star_battle5(
+                    client_hp=str(clientHp),
+                    client_date_time=ts,
+                    access_token=self.accessToken,
+                    search_number=str(searchNumber),
+                    value=str(value),
+                    device_key=self.device.key,
+                    email=email,
+                    checksum_key=checksum_key,
+                    savy_checksum=savy_checksum,
+                )
+                return f"{self.baseUrl}/BattleService/CreateStarBattle5?clientHp={clientHp}&clientDateTime={ts}&checksum={checksum}&accessToken={self.accessToken}&searchNumber={searchNumber}&value={value}"
+
+            url = battle_url()
             logging.debug(redact_secrets(f"{url=}"))
-            r = self.request(url, "POST")
+            r = self.request(url, "POST", rebuild=battle_url)
             if r and "errorMessage=" in r.text:
                 logging.warning(f'[{self.info["@Name"]}] CreateStarBattle5 failed: {r.text[:200]}')
                 return False
         
             if r:
-                self.createStarBattle5Result = xmltodict.parse(r.content, xml_attribs=True)
+                self.createStarBattle5Result = parse_xml(r)
                 # Extract battleId from response for subsequent calls
                 try:
                     battle_id = self.createStarBattle5Result["BattleService"]["CreateStarBattle5"]["@battleId"]
@@ -3347,7 +3027,7 @@ class Client(object):
             return False
         
         if r:
-            self.verifyBattle2Result = xmltodict.parse(r.content, xml_attribs=True)
+            self.verifyBattle2Result = parse_xml(r)
         return True
 
     def finaliseBattle15(
@@ -3408,7 +3088,7 @@ class Client(object):
             return False
         
         if r:
-            self.finaliseBattle15Result = xmltodict.parse(r.content, xml_attribs=True)
+            self.finaliseBattle15Result = parse_xml(r)
             logging.info(f'[{self.info["@Name"]}] Battle finalised successfully: {battleId}')
         return True
 
@@ -3457,24 +3137,20 @@ class Client(object):
                     return -1.0
                 logging.debug(f"[{self.info.get('@Name', '')}] Ship designs loaded successfully")
 
-            designs = self.shipDesigns.get("ShipDesign", [])
-            if isinstance(designs, dict):
-                designs = [designs]
-        
-            for design in designs:
-                if design.get("@ShipDesignId") == ship.get("@ShipDesignId"):
-                    # Look for max HP fields in ship design
-                    for hp_field in ["@MaxHp", "@Hp", "@HullHp", "@HullMaxHp", "@HpMax"]:
-                        mx = design.get(hp_field)
-                        if mx is not None:
-                            try:
-                                mx_i = int(mx)
-                                if mx_i > 0:
-                                    cur_i = int(ship.get("@Hp", 0))
-                                    logging.debug(f"[{self.info.get('@Name', '')}] Ship HP from design: {cur_i}/{mx_i} = {cur_i/mx_i:.2%} (from {hp_field})")
-                                    return cur_i / mx_i
-                            except (ValueError, TypeError):
-                                continue
+            design = self.designCatalog().ship(ship_design_id)
+            if design:
+                # Look for max HP fields in ship design
+                for hp_field in ["@MaxHp", "@Hp", "@HullHp", "@HullMaxHp", "@HpMax"]:
+                    mx = design.get(hp_field)
+                    if mx is not None:
+                        try:
+                            mx_i = int(mx)
+                            if mx_i > 0:
+                                cur_i = int(ship.get("@Hp", 0))
+                                logging.debug(f"[{self.info.get('@Name', '')}] Ship HP from design: {cur_i}/{mx_i} = {cur_i/mx_i:.2%} (from {hp_field})")
+                                return cur_i / mx_i
+                        except (ValueError, TypeError):
+                            continue
         
             logging.warning(f"[{self.info.get('@Name', '')}] No max HP found in ship design")
             return -1.0
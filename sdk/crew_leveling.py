@@ -6,7 +6,9 @@ import math
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional
+
+from .models import Character
 
 
 class UpgradeBlockReason(Enum):
@@ -85,15 +87,14 @@ STANDARD_XP_REQUIRED = {
 # Gas required for NEXT level (level -> gas needed for that level-up)
 STANDARD_GAS_REQUIRED = {
     1: 0,
-    2: 0,
-    3: 17,
-    4: 33,
-    5: 65,
-    6: 130,
-    7: 325,
-    8: 650,
-    9: 1300,
-    9: 3200,  # Note: level 9 appears twice in original, keeping last
+    2: 17,
+    3: 33,
+    4: 65,
+    5: 130,
+    6: 325,
+    7: 650,
+    8: 1300,
+    9: 3200,
     10: 6500,
     11: 9700,
     12: 13000,
@@ -102,29 +103,29 @@ STANDARD_GAS_REQUIRED = {
     15: 35700,
     16: 43800,
     17: 52000,
-    17: 61700,  # Note: level 17 appears twice, keeping last
-    18: 71500,
-    19: 84500,
-    20: 104000,
-    21: 117000,
-    22: 130000,
-    23: 156000,
-    24: 175000,
-    25: 201000,
-    26: 227000,
-    27: 253000,
-    28: 279000,
-    29: 312000,
-    30: 351000,
-    31: 383000,
-    32: 422000,
-    33: 468000,
-    34: 507000,
-    35: 552000,
-    36: 604000,
-    37: 650000,
-    38: 715000,
-    39: 0,  # Max level - no upgrade
+    18: 61700,
+    19: 71500,
+    20: 84500,
+    21: 104000,
+    22: 117000,
+    23: 130000,
+    24: 156000,
+    25: 175000,
+    26: 201000,
+    27: 227000,
+    28: 253000,
+    29: 279000,
+    30: 312000,
+    31: 351000,
+    32: 383000,
+    33: 422000,
+    34: 468000,
+    35: 507000,
+    36: 552000,
+    37: 604000,
+    38: 650000,
+    39: 715000,
+    # Level 40 is max - no upgrade possible
 }
 
 # Legendary multiplier (3x for XP, separate gas table for legendary)
@@ -133,47 +134,46 @@ LEGENDARY_XP_MULTIPLIER = 3
 
 # Legendary gas costs (from original implementation)
 LEGENDARY_GAS_REQUIRED = {
-    1: 0,
-    2: 130000,
-    3: 162500,
-    4: 195000,
-    5: 227500,
-    5: 260000,  # Note: duplicate level 5 in original, keeping last
+    1: 130000,
+    2: 162500,
+    3: 195000,
+    4: 227500,
+    5: 260000,
     6: 292500,
     7: 325000,
     8: 357500,
     9: 390000,
     10: 422500,
     11: 455000,
-    11: 487500,  # Note: duplicate level 11, keeping last
-    12: 520000,
-    13: 552500,
-    13: 585000,  # Note: duplicate level 13, keeping last
-    14: 617500,
-    15: 650000,
-    16: 682500,
-    17: 715000,
-    17: 747500,  # Note: duplicate level 17, keeping last
-    18: 780000,
-    19: 812500,
-    19: 845000,  # Note: duplicate level 19, keeping last
-    20: 877500,
-    21: 910000,
-    21: 942000,  # Note: duplicate level 21, keeping last
-    22: 975000,
-    23: 1007500,
-    24: 1040000,
-    24: 1072500,  # Note: duplicate level 24, keeping last
-    25: 1105000,
-    26: 1137500,
-    26: 1170000,  # Note: duplicate level 26, keeping last
-    27: 1202500,
-    28: 1235000,
-    29: 1267500,
-    30: 1300000,
-    31: 1332500,
-    31: 1365000,  # Note: duplicate level 31, keeping last
-    32: 0,  # Max level
+    12: 487500,
+    13: 520000,
+    14: 552500,
+    15: 585000,
+    16: 617500,
+    17: 650000,
+    18: 682500,
+    19: 715000,
+    20: 747500,
+    21: 780000,
+    22: 812500,
+    23: 845000,
+    24: 877500,
+    25: 910000,
+    26: 942000,
+    27: 975000,
+    28: 1007500,
+    29: 1040000,
+    30: 1072500,
+    31: 1105000,
+    32: 1137500,
+    33: 1170000,
+    34: 1202500,
+    35: 1235000,
+    36: 1267500,
+    37: 1300000,
+    38: 1332500,
+    39: 1365000,
+    # Level 40 is max - no upgrade possible
 }
 
 
@@ -286,6 +286,15 @@ def get_xp_required(level: int, is_legendary: bool) -> int:
     return xp
 
 
+def total_xp_required(level: int, is_legendary: bool) -> int:
+    """Total XP (``@Xp``) a character needs before upgrading from given level.
+
+    ``@Xp`` is the character's lifetime XP, so the threshold for each level-up
+    is the running sum of ``get_xp_required`` up to and including ``level``.
+    """
+    return sum(get_xp_required(lvl, is_legendary) for lvl in range(1, min(level, MAX_CHARACTER_LEVEL) + 1))
+
+
 def get_gas_required(level: int, is_legendary: bool) -> int:
     """Get gas required to upgrade from given level to next level."""
     if level >= MAX_CHARACTER_LEVEL:
@@ -296,7 +305,7 @@ def get_gas_required(level: int, is_legendary: bool) -> int:
 
 
 def evaluate_upgrade(
-    character: dict,
+    character: Character | dict,
     character_design: dict,
     gas_available: int,
     now: datetime,
@@ -307,7 +316,7 @@ def evaluate_upgrade(
     Pure function — no HTTP, no mutations, no side effects.
     
     Args:
-        character: Character dict from ListAllCharactersOfUser (with @CharacterId, @CharacterName, @Level, @Xp, @AvailableDate, @CharacterDesignId, @RoomId)
+        character: Character model, or the Character dict from ListAllCharactersOfUser (with @CharacterId, @CharacterName, @Level, @Xp, @AvailableDate, @CharacterDesignId, @RoomId)
         character_design: CharacterDesign dict from ListAllCharacterDesigns2 (with @CharacterDesignId, @Rarity)
         gas_available: Current gas total on ship
         now: Current UTC time (timezone-aware)
@@ -315,13 +324,14 @@ def evaluate_upgrade(
     Returns:
         UpgradeDecision with eligibility and details
     """
-    character_id = character.get("@CharacterId", "")
-    character_name = character.get("@CharacterName", "Unknown")
-    current_level = int(character.get("@Level", 0))
-    xp_available = int(character.get("@Xp", 0))
-    available_date_str = character.get("@AvailableDate", "")
-    room_id = character.get("@RoomId", "0")
-    design_id = character.get("@CharacterDesignId", "")
+    if not isinstance(character, Character):
+        character = Character.from_xml(character)
+    character_id = character.character_id
+    character_name = character.name or "Unknown"
+    current_level = character.level
+    xp_available = character.xp
+    available_date_str = character.available_date
+    room_id = character.room_id
     
     rarity = character_design.get("@Rarity", "Standard")
     is_legendary = rarity == "Legendary"
@@ -430,7 +440,7 @@ def plan_upgrades(
     Plan all upgrades before sending any requests.
     
     Args:
-        characters: List of character dicts from ListAllCharactersOfUser
+        characters: List of Character models or character dicts from ListAllCharactersOfUser
         character_designs: List of CharacterDesign dicts from ListAllCharacterDesigns2
         gas_total: Current gas total on ship
         now: Current UTC time (defaults to datetime.now(timezone.utc))
@@ -457,7 +467,10 @@ def plan_upgrades(
         if count >= max_upgrades:
             break
         
-        design_id = character.get("@CharacterDesignId", "")
+        if isinstance(character, Character):
+            design_id = character.design_id
+        else:
+            design_id = character.get("@CharacterDesignId", "")
         design = designs_by_id.get(design_id)
         if not design:
             continue
@@ -469,4 +482,174 @@ def plan_upgrades(
             remaining_gas -= decision.gas_required
             count += 1
     
-    return eligible, remaining_gas
\ No newline at end of file
+    return eligible, remaining_gas
+
+# =============================================================================
+# Gas-budget upgrade optimizer
+# =============================================================================
+
+# value(character, design, from_level, to_level) -> how much a purchase is worth
+UpgradeValue = Callable[[Character, dict, int, int], float]
+
+
+def levels_gained(character: Character, design: dict, from_level: int, to_level: int) -> float:
+    """Default value function: every level-up is worth the same."""
+    return float(to_level - from_level)
+
+
+@dataclass(frozen=True)
+class LevelPurchase:
+    """Levels bought for one character in an optimized plan."""
+    character_id: str
+    character_name: str
+    from_level: int
+    to_level: int
+    gas_cost: int
+    xp_required: int  # total_xp_required threshold of the last level bought
+    value: float
+
+    @property
+    def levels(self) -> int:
+        return self.to_level - self.from_level
+
+
+@dataclass(frozen=True)
+class UpgradePlan:
+    """Result of ``plan_optimal_upgrades``."""
+    purchases: tuple[LevelPurchase, ...]
+    gas_budget: int
+    gas_spent: int
+    value: float
+
+    @property
+    def remaining_gas(self) -> int:
+        return self.gas_budget - self.gas_spent
+
+    @property
+    def level_ups(self) -> int:
+        return sum(p.levels for p in self.purchases)
+
+
+def upgrade_ladder(
+    character: Character | dict,
+    character_design: dict,
+    now: datetime,
+    level_cap: int = MAX_CHARACTER_LEVEL,
+) -> list[tuple[int, int]]:
+    """Cumulative gas cost and XP threshold of buying 1, 2, ... levels for a character.
+
+    Entry ``k - 1`` is ``(gas, xp)`` for ``k`` consecutive level-ups: the gas
+    summed over those levels and the ``total_xp_required`` threshold of the
+    last one.  ``@Xp`` is lifetime XP and is not spent by an upgrade, so only
+    levels whose threshold it already reaches are listed.
+    """
+    if not isinstance(character, Character):
+        character = Character.from_xml(character)
+    if character.room_id == "0":
+        return []
+    available_date = parse_server_datetime(character.available_date)
+    if available_date and available_date > now:
+        return []
+
+    is_legendary = character_design.get("@Rarity", "Standard") == "Legendary"
+    ladder: list[tuple[int, int]] = []
+    gas = 0
+    for level in range(character.level, min(level_cap, MAX_CHARACTER_LEVEL)):
+        xp = total_xp_required(level, is_legendary)
+        if character.xp < xp:
+            break
+        gas += get_gas_required(level, is_legendary)
+        ladder.append((gas, xp))
+    return ladder
+
+
+def plan_optimal_upgrades(
+    characters: list,
+    character_designs: list,
+    gas_budget: int,
+    now: Optional[datetime] = None,
+    value: UpgradeValue = levels_gained,
+    level_cap: int = MAX_CHARACTER_LEVEL,
+) -> UpgradePlan:
+    """Choose how many levels to buy per character to maximize ``value`` under a gas budget.
+
+    A multiple-choice knapsack: each character contributes one option (0..k
+    levels from its ``upgrade_ladder``).  Solved exactly with a Pareto-frontier
+    DP over (gas spent, value) — gas amounts are far too large for a table
+    indexed by gas, but the number of non-dominated states stays small.
+    Ties prefer the cheaper plan, then roster order.
+
+    Args:
+        characters: Character models or dicts from ListAllCharactersOfUser
+        character_designs: CharacterDesign dicts from ListAllCharacterDesigns2
+        gas_budget: Gas available to spend
+        now: Current UTC time (defaults to datetime.now(timezone.utc))
+        value: ``(character, design, from_level, to_level) -> float``
+        level_cap: Highest level to upgrade to (see ``get_crew_level_cap``)
+
+    Returns:
+        UpgradePlan with one LevelPurchase per upgraded character, in roster order.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    designs_by_id = {
+        design.get("@CharacterDesignId", ""): design
+        for design in character_designs
+        if design.get("@CharacterDesignId")
+    }
+
+    # Per-character options: list of (gas, xp, value, to_level).
+    groups: list[tuple[Character, list[tuple[int, int, float, int]]]] = []
+    for character in characters:
+        if not isinstance(character, Character):
+            character = Character.from_xml(character)
+        design = designs_by_id.get(character.design_id)
+        if not design:
+            continue
+        options = []
+        for k, (gas, xp) in enumerate(upgrade_ladder(character, design, now, level_cap), start=1):
+            if gas > gas_budget:
+                break
+            to_level = character.level + k
+            worth = value(character, design, character.level, to_level)
+            if worth > 0:
+                options.append((gas, xp, worth, to_level))
+        if options:
+            groups.append((character, options))
+
+    # Frontier of non-dominated states: (gas, value, choices), where choices
+    # is a linked tuple (parent_choices, group_index, option_index).
+    frontier: list[tuple[int, float, Optional[tuple]]] = [(0, 0.0, None)]
+    for index, (_, options) in enumerate(groups):
+        candidates = list(frontier)
+        for gas, worth, choices in frontier:
+            for option_index, (cost, _xp, gain, _level) in enumerate(options):
+                total = gas + cost
+                if total <= gas_budget:
+                    candidates.append((total, worth + gain, (choices, index, option_index)))
+        candidates.sort(key=lambda state: (state[0], -state[1]))
+        frontier = []
+        for state in candidates:
+            if not frontier or state[1] > frontier[-1][1]:
+                frontier.append(state)
+
+    gas_spent, total_value, choices = frontier[-1]
+    picked: dict[int, int] = {}
+    while choices is not None:
+        choices, index, option_index = choices
+        picked[index] = option_index
+
+    purchases = []
+    for index in sorted(picked):
+        character, options = groups[index]
+        gas, xp, worth, to_level = options[picked[index]]
+        purchases.append(LevelPurchase(
+            character_id=character.character_id,
+            character_name=character.name or "Unknown",
+            from_level=character.level,
+            to_level=to_level,
+            gas_cost=gas,
+            xp_required=xp,
+            value=worth,
+        ))
+    return UpgradePlan(tuple(purchases), gas_budget, gas_spent, total_value)
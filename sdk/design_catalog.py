@@ -0,0 +1,164 @@
+"""Indexed design lookups — pure data, no HTTP.
+
+The design endpoints return flat lists of records (``@RoomDesignId``,
+``@CharacterDesignId``, ...).  Scanning those lists for every crew member or
+room made lookups O(crew × designs).  ``DesignCatalog`` wraps the lists once
+and builds hash maps on first use, so each lookup is O(1).
+
+Indexes are built lazily: a catalog for which only the room maps are used
+never pays for indexing items or research.  The catalog is immutable; build
+a new one when a design collection is reloaded.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Iterable
+
+
+def _index(designs: Iterable[dict], key: str) -> dict[str, dict]:
+    """Map ``design[key]`` to the design, keeping the first occurrence."""
+    index: dict[str, dict] = {}
+    for design in designs:
+        value = design.get(key)
+        if value is not None:
+            index.setdefault(value, design)
+    return index
+
+
+def _name(design: dict | None, key: str) -> str:
+    """Return a name attribute, joining list values as the game client does."""
+    if not design:
+        return ""
+    return "".join(design.get(key, ""))
+
+
+class DesignCatalog:
+    """O(1) lookups over normalized design lists.
+
+    Every argument is a list of design dicts as returned by
+    ``_extract_collection`` (e.g. ``_extract_collection(raw, "RoomDesign")``).
+    """
+
+    def __init__(
+        self,
+        room_designs: Iterable[dict] = (),
+        character_designs: Iterable[dict] = (),
+        item_designs: Iterable[dict] = (),
+        research_designs: Iterable[dict] = (),
+        training_designs: Iterable[dict] = (),
+        ship_designs: Iterable[dict] = (),
+        task_designs: Iterable[dict] = (),
+    ):
+        self.room_designs = list(room_designs)
+        self.character_designs = list(character_designs)
+        self.item_designs = list(item_designs)
+        self.research_designs = list(research_designs)
+        self.training_designs = list(training_designs)
+        self.ship_designs = list(ship_designs)
+        self.task_designs = list(task_designs)
+        self._consumable_ids: dict[tuple[str, str], int] = {}
+
+    # -- forward maps -------------------------------------------------------
+
+    @cached_property
+    def rooms_by_id(self) -> dict[str, dict]:
+        return _index(self.room_designs, "@RoomDesignId")
+
+    @cached_property
+    def characters_by_id(self) -> dict[str, dict]:
+        return _index(self.character_designs, "@CharacterDesignId")
+
+    @cached_property
+    def items_by_id(self) -> dict[str, dict]:
+        return _index(self.item_designs, "@ItemDesignId")
+
+    @cached_property
+    def researches_by_id(self) -> dict[str, dict]:
+        return _index(self.research_designs, "@ResearchDesignId")
+
+    @cached_property
+    def trainings_by_name(self) -> dict[str, dict]:
+        return _index(self.training_designs, "@TrainingName")
+
+    @cached_property
+    def ships_by_id(self) -> dict[str, dict]:
+        return _index(self.ship_designs, "@ShipDesignId")
+
+    @cached_property
+    def tasks_by_id(self) -> dict[str, dict]:
+        return _index(self.task_designs, "@TaskDesignId")
+
+    # -- reverse maps -------------------------------------------------------
+
+    @cached_property
+    def room_upgrades(self) -> dict[str, list[dict]]:
+        """Map ``@UpgradeFromRoomDesignId`` to the designs it upgrades into."""
+        upgrades: dict[str, list[dict]] = {}
+        for design in self.room_designs:
+            source = design.get("@UpgradeFromRoomDesignId")
+            if source is not None:
+                upgrades.setdefault(source, []).append(design)
+        return upgrades
+
+    @cached_property
+    def consumables(self) -> list[tuple[str, dict]]:
+        """Consumable item designs paired with their ``@ItemName``."""
+        result = []
+        for item in self.item_designs:
+            item_name = item.get("@ItemName", "")
+            if item.get("@ItemSubType", "") == "Consumable" or "Consumable" in item_name:
+                result.append((item_name, item))
+        return result
+
+    # -- lookups ------------------------------------------------------------
+
+    def room(self, room_design_id) -> dict | None:
+        return self.rooms_by_id.get(room_design_id)
+
+    def room_name(self, room_design_id) -> str:
+        return _name(self.room(room_design_id), "@RoomName")
+
+    def upgrades_from(self, room_design_id) -> list[dict]:
+        return self.room_upgrades.get(room_design_id, [])
+
+    def character(self, character_design_id) -> dict | None:
+        return self.characters_by_id.get(character_design_id)
+
+    def item(self, item_design_id) -> dict | None:
+        return self.items_by_id.get(item_design_id)
+
+    def research(self, research_design_id) -> dict | None:
+        return self.researches_by_id.get(research_design_id)
+
+    def training(self, training_name) -> dict | None:
+        return self.trainings_by_name.get(training_name)
+
+    def ship(self, ship_design_id) -> dict | None:
+        return self.ships_by_id.get(ship_design_id)
+
+    def task(self, task_design_id) -> dict | None:
+        return self.tasks_by_id.get(task_design_id)
+
+    def consumable_design_id(self, stat_type: str, tier: str) -> int:
+        """Return the first consumable whose name contains ``stat_type`` and ``tier``.
+
+        Matching is case-insensitive on the stat and capitalized on the tier,
+        as in ``Client.findConsumableDesignId``.  Results are memoized.
+        Returns 0 if nothing matches.
+        """
+        key = (stat_type, tier)
+        if key in self._consumable_ids:
+            return self._consumable_ids[key]
+        stat = stat_type.upper()
+        tier_cap = tier.capitalize()
+        result = 0
+        for item_name, item in self.consumables:
+            if stat in item_name.upper() and tier_cap in item_name.capitalize():
+                try:
+                    result = int(item.get("@ItemDesignId", "0"))
+                    break
+                except (ValueError, TypeError):
+                    pass
+        self._consumable_ids[key] = result
+        return result
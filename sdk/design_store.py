@@ -0,0 +1,144 @@
+"""Versioned on-disk design cache — local file I/O only, no HTTP.
+
+Design collections (rooms, crew, research, training, tasks, ...) only change
+when ``GetLatestVersion3`` reports a new version number for them.  This module
+keeps each parsed collection on disk keyed by that version, so a run can serve
+designs locally and only re-download the collections whose version moved.
+
+Layout::
+
+    <root>/<language>/<collection>/<version>.json.gz
+
+Only the newest version of each collection is kept; older files are removed
+when a new version is stored.  A corrupt or unreadable entry is treated as a
+cache miss, never as an error.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+# Characters allowed in a cache path component (collection, version, language).
+_SAFE_COMPONENT = re.compile(r"[^A-Za-z0-9_.-]")
+
+_SUFFIX = ".json.gz"
+
+
+def _component(value: str) -> str:
+    """Sanitize a value for use as a single path component."""
+    cleaned = _SAFE_COMPONENT.sub("_", str(value)).strip(".")
+    return cleaned or "_"
+
+
+def design_versions(latest_version: Any) -> dict[str, str]:
+    """Extract the ``@...Version`` attributes from a GetLatestVersion3 response.
+
+    Args:
+        latest_version: The parsed GetLatestVersion3 response
+            (``{"SettingService": {"GetLatestSetting": {"Setting": {...}}}}``).
+
+    Returns:
+        Mapping of attribute name (e.g. ``"@RoomDesignVersion"``) to version
+        string.  Empty if the response is missing or malformed.
+    """
+    try:
+        setting = latest_version["SettingService"]["GetLatestSetting"]["Setting"]
+    except (KeyError, TypeError):
+        return {}
+    if not isinstance(setting, dict):
+        return {}
+    return {
+        key: str(value)
+        for key, value in setting.items()
+        if key.startswith("@") and key.endswith("Version") and value not in (None, "")
+    }
+
+
+class DesignStore:
+    """Persistent, version-keyed store for parsed design collections."""
+
+    def __init__(self, root: str | os.PathLike, language: str = "en"):
+        self.root = Path(root)
+        self.language = _component(language or "en")
+        self.hits = 0
+        self.misses = 0
+
+    def _collection_dir(self, collection: str) -> Path:
+        return self.root / self.language / _component(collection)
+
+    def _path(self, collection: str, version: str) -> Path:
+        return self._collection_dir(collection) / f"{_component(version)}{_SUFFIX}"
+
+    def get(self, collection: str, version: str, default: Any = None) -> Any:
+        """Return the stored data for ``collection`` at ``version``, or ``default``."""
+        if not version:
+            self.misses += 1
+            return default
+        path = self._path(collection, version)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (OSError, ValueError, EOFError) as e:
+            logging.debug(f"Ignoring unreadable design cache entry {path}: {e}")
+            self.misses += 1
+            return default
+
+        if not isinstance(entry, dict) or entry.get("version") != str(version):
+            self.misses += 1
+            return default
+        self.hits += 1
+        return entry.get("data")
+
+    def put(self, collection: str, version: str, data: Any) -> bool:
+        """Store ``data`` for ``collection`` at ``version``.
+
+        The write is atomic (temp file + rename).  Older versions of the same
+        collection are removed afterwards.  Returns False if the entry could
+        not be written; the cache is best-effort and never raises.
+        """
+        if not version:
+            return False
+        directory = self._collection_dir(collection)
+        path = self._path(collection, version)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                    f.write(json.dumps(
+                        {"version": str(version), "data": data},
+                        separators=(",", ":"),
+                    ).encode("utf-8"))
+                os.replace(tmp_name, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logging.debug(f"Unable to write design cache entry {path}: {e}")
+            return False
+
+        self._prune(directory, keep=path.name)
+        return True
+
+    def _prune(self, directory: Path, keep: str) -> None:
+        """Remove every stored version in ``directory`` except ``keep``."""
+        try:
+            for entry in directory.iterdir():
+                if entry.name != keep and entry.name.endswith(_SUFFIX):
+                    entry.unlink()
+        except OSError as e:
+            logging.debug(f"Unable to prune design cache {directory}: {e}")
@@ -0,0 +1,114 @@
+"""Streaming parser for ListAllDesigns4 — no HTTP, no full document tree.
+
+``xmltodict.parse`` materializes the whole multi-megabyte ListAllDesigns4
+response as one nested dict before any collection can be used.  This module
+walks the document with ``ElementTree.iterparse`` instead and converts one
+design element at a time, discarding each element as soon as it has been
+converted, so peak memory is the records themselves plus one element.
+
+Records keep the xmltodict shape (``{"@RoomDesignId": "1", ...}``) so they
+work unchanged with ``_extract_collection``, ``DesignCatalog`` and the
+design cache.  Attribute names and short values are interned: design lists
+repeat the same keys and small values ("0", "None", "true") many thousands
+of times.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import sys
+import xml.etree.ElementTree as ET
+from typing import IO, Iterator
+
+# Values longer than this are unlikely to repeat and are not interned.
+_INTERN_MAX_LEN = 64
+
+# Depth of elements below the document root: DesignService(1) /
+# ListAllDesigns(2) / <Collection>(3) / <Design>(4).
+_LIST_DEPTH = 2
+_COLLECTION_DEPTH = 3
+_RECORD_DEPTH = 4
+
+
+def _intern(value: str) -> str:
+    return sys.intern(value) if len(value) <= _INTERN_MAX_LEN else value
+
+
+def _element_to_record(elem: ET.Element):
+    """Convert an element to the structure xmltodict would produce for it."""
+    record: dict = {_intern("@" + key): _intern(value) for key, value in elem.attrib.items()}
+    for child in elem:
+        value = _element_to_record(child)
+        tag = _intern(child.tag)
+        if tag in record:
+            existing = record[tag]
+            if isinstance(existing, list):
+                existing.append(value)
+            else:
+                record[tag] = [existing, value]
+        else:
+            record[tag] = value
+    text = (elem.text or "").strip()
+    if text:
+        if not record:
+            return text
+        record["#text"] = text
+    return record or None
+
+
+def iter_design_collections(source: bytes | IO[bytes]) -> Iterator[tuple[str, dict | None]]:
+    """Yield ``(collection, container)`` pairs from a ListAllDesigns4 response.
+
+    ``container`` has the shape xmltodict gives a collection element, e.g.
+    ``{"RoomDesign": [{...}, {...}]}`` (always a list of records), or None
+    for an empty collection.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is malformed.
+        ValueError: If the response carries an ``errorMessage`` attribute.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    stack: list[ET.Element] = []
+    records: dict[str, list] = {}
+    in_list = False
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            depth = len(stack)
+            if depth <= _LIST_DEPTH and "errorMessage" in elem.attrib:
+                raise ValueError(elem.attrib["errorMessage"])
+            if depth == _LIST_DEPTH:
+                in_list = stack[0].tag == "DesignService" and elem.tag == "ListAllDesigns"
+            elif depth == _COLLECTION_DEPTH:
+                records = {}
+            continue
+
+        depth = len(stack)
+        stack.pop()
+        if not in_list:
+            continue
+        if depth == _RECORD_DEPTH:
+            records.setdefault(_intern(elem.tag), []).append(_element_to_record(elem))
+            # Drop the converted element so the tree never grows.
+            stack[-1].remove(elem)
+        elif depth == _COLLECTION_DEPTH:
+            yield elem.tag, (records or None)
+            stack[-1].remove(elem)
+
+
+def parse_all_designs(source: bytes | IO[bytes]) -> dict[str, dict | None] | None:
+    """Parse a ListAllDesigns4 response into ``{collection: container}``.
+
+    Returns None if the document is malformed or reports an error, and an
+    empty dict if it has no ``DesignService/ListAllDesigns`` element.
+    """
+    try:
+        return dict(iter_design_collections(source))
+    except ET.ParseError as e:
+        logging.error(f"Malformed ListAllDesigns4 response: {e}")
+    except ValueError as e:
+        logging.error(f"ListAllDesigns4 returned an error: {e}")
+    return None
@@ -1,9 +1,13 @@
 from datetime import datetime
 
 class DotNet(object):
+    # Optional replacement for the wall clock (e.g. a cassette replay's clock).
+    clock = None
 
     @classmethod
     def validDateTime(self):
+        if self.clock is not None:
+            return self.clock()
         return datetime.utcnow()
 
     @classmethod
@@ -0,0 +1,212 @@
+"""Declarative table of Pixel Starships API endpoints — no network of its own.
+
+Each ``Endpoint`` states what a call looks like (service, name, HTTP method,
+query parameters in wire order, optional checksum) and where its payload sits
+in the response (``root`` path and ``collection`` key).  At import time every
+entry compiles into a URL template and a record extractor, so ``Client``
+methods no longer hand-write f-string URLs, timestamp formatting and
+collection unwrapping:
+
+    endpoint = ENDPOINTS["ListAllResearches"]
+    r = client.request(endpoint.url(base, accessToken=token), endpoint.method)
+    researches = endpoint.records(parse_xml(r))
+
+``clientDateTime`` is filled in with ``DotNet.validDateTime()`` unless given,
+and ``checksum`` is computed from the other values when the endpoint has a
+checksum function.  The name is the one ``endpoint_name(url)`` returns, so
+the request cache (``ttl``), the scheduler (``priority``) and later
+instrumentation or test doubles key off the same table.
+
+The table covers the read calls and ``HeartBeat4`` only; other actions still
+build their own URLs.  ``records`` walks the document ``parse_xml`` already
+built, so it saves the unwrapping code, not parsing time.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional
+
+from .dotnet import DotNet
+from .request_cache import DEFAULT_TTLS
+from .request_scheduler import ENDPOINT_PRIORITIES, Priority
+from .security import checksum_heartbeat4
+
+TIMESTAMP = "clientDateTime"
+CHECKSUM = "checksum"
+
+
+def client_date_time() -> str:
+    """The ``clientDateTime`` value the API expects (server-aligned, seconds)."""
+    return f"{DotNet.validDateTime():%Y-%m-%dT%H:%M:%S}"
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """One API call: how to build its URL and where its records are."""
+    service: str
+    name: str
+    params: tuple[str, ...] = ()
+    method: str = "GET"
+    checksum: Optional[Callable[[Mapping[str, Any]], str]] = None
+    root: tuple[str, ...] = ()       # path to the call's node, e.g. ("ShipService", "GetShipByUserId")
+    collection: Optional[str] = None  # element repeated below ``root``, e.g. "Character"
+    _template: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        query = "&".join(f"{param}={{{param}}}" for param in self.params)
+        path = f"/{self.service}/{self.name}"
+        object.__setattr__(self, "_template", f"{path}?{query}" if query else path)
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """Request-cache lifetime (``DEFAULT_TTLS``), None if never cached."""
+        return DEFAULT_TTLS.get(self.name)
+
+    @property
+    def priority(self) -> Priority:
+        """Scheduler priority (``ENDPOINT_PRIORITIES``)."""
+        return ENDPOINT_PRIORITIES.get(self.name, Priority.NORMAL)
+
+    def url(self, base: str, **values: Any) -> str:
+        """Full URL under ``base`` with ``values`` substituted in wire order.
+
+        Raises:
+            KeyError: If a parameter has no value.
+        """
+        if TIMESTAMP in self.params and TIMESTAMP not in values:
+            values[TIMESTAMP] = client_date_time()
+        if self.checksum is not None and CHECKSUM not in values:
+            values[CHECKSUM] = self.checksum(values)
+        return base + self._template.format_map(values)
+
+    def result(self, document: Any) -> Any:
+        """The node at ``root`` in a parsed response, or None if absent."""
+        node = document
+        for key in self.root:
+            if not isinstance(node, dict):
+                return None
+            node = node.get(key)
+        return node
+
+    def records(self, document: Any) -> list[dict]:
+        """The ``collection`` elements of a parsed response, always as a list.
+
+        The collection is looked up below ``root`` at any depth (the API wraps
+        it in a plural element, e.g. ``Characters/Character``).
+        """
+        return _find_records(self.result(document), self.collection) if self.collection else []
+
+
+def _find_records(node: Any, key: str) -> list[dict]:
+    if not isinstance(node, dict):
+        return []
+    if key in node:
+        value = node[key]
+        if isinstance(value, list):
+            return [item for item in value if isinstance(item, dict)]
+        return [value] if isinstance(value, dict) else []
+    for value in node.values():
+        found = _find_records(value, key)
+        if found:
+            return found
+    return []
+
+
+# ListAllDesigns4 query parameters and the GetLatestSetting attribute that
+# supplies each one, in wire order.
+ALL_DESIGNS4_VERSIONS: tuple[tuple[str, str], ...] = (
+    ("ListFileVersion", "@FileVersion"),
+    ("ListSpriteVersion", "@SpriteVersion"),
+    ("ListBackgroundVersion", "@BackgroundVersion"),
+    ("ListAllShipDesignVersion", "@ShipDesignVersion"),
+    ("ListRoomDesignVersion", "@RoomDesignVersion"),
+    ("ListAllCharacterDesignVersion", "@CharacterDesignVersion"),
+    ("ListAllCharacterDesignActionVersion", "@CharacterDesignActionVersion"),
+    ("ListItemDesignVersion", "@ItemDesignVersion"),
+    ("ListCraftDesignVersion", "@CraftDesignVersion"),
+    ("ListMissileDesignVersion", "@MissileDesignVersion"),
+    ("ListStarSystemVersion", "@StarSystemVersion"),
+    ("ListStarSystemLinkVersion", "@StarSystemLinkVersion"),
+    ("ListAllNewsDesignVersion", "@NewsDesignVersion"),
+    ("ListLeagueVersion", "@LeagueVersion"),
+    ("ListAchievementDesignVersion", "@AchievementDesignVersion"),
+    ("ListRoomDesignPurchaseVersion", "@RoomDesignPurchaseVersion"),
+    ("ListRoomDesignSpriteVersion", "@RoomDesignSpriteVersion"),
+    ("ListAllMissionDesignVersion", "@MissionDesignVersion"),
+    ("ListAnimationVersion", "@AnimationVersion"),
+    ("ListAllResearchDesignVersion", "@ResearchDesignVersion"),
+    ("ListAllTrainingDesignVersion", "@TrainingDesignVersion"),
+    ("ListAllChallengeDesignVersion", "@ChallengeDesignVersion"),
+    ("ListAllRewardDesignVersion", "@RewardDesignVersion"),
+    ("ListAllDivisionDesignVersion", "@DivisionDesignVersion"),
+    ("ListAllCollectionDesignVersion", "@CollectionDesignVersion"),
+    ("ListAllDrawDesignVersion", "@DrawDesignVersion"),
+    ("ListAllPromotionDesignVersion", "@PromotionDesignVersion"),
+    ("ListAllSituationDesignVersion", "@SituationDesignVersion"),
+    ("ListAllTaskDesignVersion", "@TaskDesignVersion"),
+    ("ListActionTypeVersion", "@ActionTypeVersion"),
+    ("ListConditionTypeVersion", "@ConditionTypeVersion"),
+    ("ListItemDesignActionVersion", "@ItemDesignActionVersion"),
+    ("ListSeasonDesignVersion", "@SeasonDesignVersion"),
+    ("ListAssetVersion", "@AssetVersion"),
+    ("ListMarkerGeneratorDesignVersion", "@MarkerGeneratorDesignVersion"),
+)
+
+_TOKEN_AND_TIME = ("accessToken", TIMESTAMP)
+_DESIGNS = ("languageKey", "designVersion")
+
+_TABLE = (
+    # Session
+    Endpoint("UserService", "HeartBeat4", (TIMESTAMP, CHECKSUM, "accessToken"), method="POST",
+             checksum=lambda v: checksum_heartbeat4(ticks=DotNet.get_time(), access_token=v["accessToken"]),
+             root=("UserService", "HeartBeat")),
+    # Ship, crew, rooms and research state
+    Endpoint("ShipService", "GetShipByUserId", ("userId",) + _TOKEN_AND_TIME,
+             root=("ShipService", "GetShipByUserId", "Ship"), collection="Room"),
+    Endpoint("CharacterService", "ListAllCharactersOfUser", _TOKEN_AND_TIME,
+             root=("CharacterService", "ListAllCharactersOfUser"), collection="Character"),
+    Endpoint("RoomService", "ListRoomsViaAccessToken", _TOKEN_AND_TIME,
+             root=("RoomService", "ListRoomsViaAccessToken"), collection="Room"),
+    Endpoint("ItemService", "ListItemsOfAShip", _TOKEN_AND_TIME,
+             root=("ItemService", "ListItemsOfAShip"), collection="Item"),
+    Endpoint("ResearchService", "ListAllResearches", _TOKEN_AND_TIME,
+             root=("ResearchService", "ListAllResearches"), collection="Research"),
+    Endpoint("TaskService", "ListTasksOfAUser", _TOKEN_AND_TIME,
+             root=("TaskService", "ListTasksOfAUser"), collection="Task"),
+    Endpoint("SituationService", "ListSituations", _TOKEN_AND_TIME,
+             root=("SituationService", "ListSituations"), collection="Situation"),
+    Endpoint("AchievementService", "ListAchievementsOfAUser", _TOKEN_AND_TIME,
+             root=("AchievementService", "ListAchievementsOfAUser"), collection="Achievement"),
+    # Messages and galaxy
+    Endpoint("MessageService", "ListImportantMessagesForUser", _TOKEN_AND_TIME,
+             root=("MessageService", "ListImportantMessagesForUser"), collection="Message"),
+    Endpoint("GalaxyService", "ListUserStarSystems", _TOKEN_AND_TIME,
+             root=("GalaxyService", "ListUserStarSystems"), collection="UserStarSystem"),
+    Endpoint("GalaxyService", "ListStarSystemMarkersAndUserMarkers", ("accessToken",),
+             root=("GalaxyService", "ListStarSystemMarkersAndUserMarkers"), collection="StarSystemMarker"),
+    # Battles
+    Endpoint("BattleService", "ListPvPBattles2", ("take", "skip") + _TOKEN_AND_TIME,
+             root=("BattleService", "ListPvPBattles"), collection="Battle"),
+    Endpoint("BattleService", "ListMissionBattles", ("take", "skip") + _TOKEN_AND_TIME,
+             root=("BattleService", "ListMissionBattles"), collection="Battle"),
+    # Designs
+    Endpoint("RoomService", "ListRoomDesigns2", _DESIGNS,
+             root=("RoomService", "ListRoomDesigns"), collection="RoomDesign"),
+    Endpoint("CharacterService", "ListAllCharacterDesigns2", _DESIGNS,
+             root=("CharacterService", "ListAllCharacterDesigns"), collection="CharacterDesign"),
+    Endpoint("ResearchService", "ListAllResearchDesigns2", _DESIGNS,
+             root=("ResearchService", "ListAllResearchDesigns"), collection="ResearchDesign"),
+    Endpoint("TrainingService", "ListAllTrainingDesigns2", _DESIGNS,
+             root=("TrainingService", "ListAllTrainingDesigns"), collection="TrainingDesign"),
+    Endpoint("TaskService", "ListAllTaskDesigns2", _DESIGNS,
+             root=("TaskService", "ListAllTaskDesigns"), collection="TaskDesign"),
+    Endpoint("RoomService", "ListActionTypes2", _DESIGNS,
+             root=("RoomService", "ListActionTypes"), collection="ActionType"),
+    Endpoint("RoomService", "ListConditionTypes2", _DESIGNS,
+             root=("RoomService", "ListConditionTypes"), collection="ConditionType"),
+    Endpoint("DesignService", "ListAllDesigns4", ("LanguageKey",) + tuple(p for p, _ in ALL_DESIGNS4_VERSIONS),
+             root=("DesignService", "ListAllDesigns")),
+)
+
+ENDPOINTS: dict[str, Endpoint] = {endpoint.name: endpoint for endpoint in _TABLE}
@@ -0,0 +1,252 @@
+"""Vectorized Pixel Starships game formulas — NumPy, no HTTP.
+
+Array counterparts of the scalar functions in ``sdk/game_formulas.py``, for
+what-if analyses that evaluate a formula across whole rosters, every level
+1-40 or every room combination at once.  Each function has the same name and
+argument order as its scalar counterpart, accepts scalars or array-likes
+(broadcast together with NumPy rules) and returns an ``ndarray`` whose
+elements equal what the scalar function returns for the same inputs.
+
+Validation follows the scalar functions.  Every function takes an
+``errors`` keyword:
+
+    errors="raise" (default)
+        Raise ``ValueError`` with the scalar function's message if *any*
+        element is invalid — the batch is rejected as a whole.
+    errors="mask"
+        Return a ``numpy.ma.MaskedArray`` with invalid elements masked and
+        valid elements computed normally.
+"""
+
+from __future__ import annotations
+
+from typing import Literal
+
+import numpy as np
+
+from .game_formulas import (
+    _EASE_EXPONENTS,
+    DODGE_CAP_COMBINED,
+    DODGE_CAP_PERCENT,
+    GAS_DRAW_BASE,
+    GAS_DRAW_CAP,
+    TROPHY_BASE,
+    TROPHY_MAX,
+    TROPHY_MIN,
+    EaseType,
+)
+
+Errors = Literal["raise", "mask"]
+
+_LN_0_2 = np.log(0.2)
+
+
+def _floats(*values) -> list[np.ndarray]:
+    return list(np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in values)))
+
+
+def _ints(*values) -> list[np.ndarray]:
+    return list(np.broadcast_arrays(*(np.asarray(v, dtype=np.int64) for v in values)))
+
+
+class _Validator:
+    """Collects invalid-element masks, raising or masking per ``errors``."""
+
+    def __init__(self, shape: tuple[int, ...], errors: Errors):
+        if errors not in ("raise", "mask"):
+            raise ValueError("errors must be 'raise' or 'mask'")
+        self.errors = errors
+        self.invalid = np.zeros(shape, dtype=bool)
+
+    def check(self, invalid: np.ndarray, message: str) -> None:
+        if self.errors == "raise" and np.any(invalid):
+            raise ValueError(message)
+        self.invalid |= invalid
+
+    def result(self, values: np.ndarray) -> np.ndarray:
+        if self.errors == "mask":
+            return np.ma.masked_array(values, mask=self.invalid.copy())
+        return values
+
+
+# ===========================================================================
+# 1. Room Reload
+# ===========================================================================
+
+def room_reload_boosted(base_reload, sum_crew_stat, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.room_reload_boosted``."""
+    base, stat = _floats(base_reload, sum_crew_stat)
+    v = _Validator(base.shape, errors)
+    v.check(base < 0, "base_reload must be non-negative")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return v.result(base / ((100.0 + stat) / 100.0))
+
+
+def room_reload_powered(boosted_reload, max_power, current_power,
+                        *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.room_reload_powered``."""
+    boosted, max_p, current = _floats(boosted_reload, max_power, current_power)
+    v = _Validator(boosted.shape, errors)
+    v.check(current == 0, "current_power must be non-zero (room has no power)")
+    v.check((current < 0) | (max_p < 0), "power values must be non-negative")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return v.result(boosted * (max_p / current))
+
+
+def room_reload(base_reload, sum_crew_stat, max_power, current_power,
+                *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.room_reload``."""
+    base, stat, max_p, current = _floats(base_reload, sum_crew_stat, max_power, current_power)
+    v = _Validator(base.shape, errors)
+    v.check(base < 0, "base_reload must be non-negative")
+    v.check(current == 0, "current_power must be non-zero (room has no power)")
+    v.check((current < 0) | (max_p < 0), "power values must be non-negative")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        boosted = base / ((100.0 + stat) / 100.0)
+        return v.result(boosted * (max_p / current))
+
+
+# ===========================================================================
+# 3. Escape
+# ===========================================================================
+
+def escape_chance(mod, pilot_stat) -> np.ndarray:
+    """Vectorized ``game_formulas.escape_chance`` (no validation)."""
+    mod_a, stat = _floats(mod, pilot_stat)
+    return mod_a * (100.0 + stat) / 100.0
+
+
+def escape_rate(player_escape, enemy_escape, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.escape_rate``; returns int64 percentages."""
+    player, enemy = _floats(player_escape, enemy_escape)
+    total = player + enemy
+    v = _Validator(player.shape, errors)
+    v.check(total == 0, "player + enemy escape cannot both be zero")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(total == 0, 0.0, player / np.where(total == 0, 1.0, total) * 100.0)
+    return v.result((np.floor(rate / 5) * 5).astype(np.int64))
+
+
+# ===========================================================================
+# 4. Dodge
+# ===========================================================================
+
+def dodge_evasion(combined_dodge) -> np.ndarray:
+    """Vectorized ``game_formulas.dodge_evasion`` (no validation)."""
+    (combined,) = _floats(combined_dodge)
+    evasion = 100.0 * (1.0 - np.exp(combined / 100.0 * _LN_0_2))
+    evasion = np.clip(evasion, 0.0, DODGE_CAP_PERCENT)
+    evasion = np.where(combined >= DODGE_CAP_COMBINED, DODGE_CAP_PERCENT, evasion)
+    return np.where(combined <= 0, 0.0, evasion)
+
+
+# ===========================================================================
+# 5. Damage Reduction
+# ===========================================================================
+
+def damage_reduction(armor, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.damage_reduction``."""
+    (armor_a,) = _floats(armor)
+    v = _Validator(armor_a.shape, errors)
+    v.check(armor_a < 0, "armor must be non-negative")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reduction = 100.0 * (1.0 - 100.0 / (100.0 + armor_a))
+    return v.result(np.where(armor_a == 0, 0.0, reduction))
+
+
+def effective_damage(base_damage, armor, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.effective_damage``."""
+    base, armor_a = _floats(base_damage, armor)
+    v = _Validator(base.shape, errors)
+    v.check(armor_a < 0, "armor must be non-negative")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        damage = base * (100.0 / (100.0 + armor_a))
+    return v.result(np.where(armor_a == 0, base, damage))
+
+
+# ===========================================================================
+# 6. Fire Damage
+# ===========================================================================
+
+def fire_damage_reduced(base_fire_damage, sprinkler_stat, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.fire_damage_reduced``."""
+    base, sprinkler = _floats(base_fire_damage, sprinkler_stat)
+    v = _Validator(base.shape, errors)
+    v.check(sprinkler < 0, "sprinkler_stat must be non-negative")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return v.result(base / (1.0 + sprinkler / 100.0))
+
+
+def fire_crew_damage(duration, fire_resistance, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.fire_crew_damage``."""
+    duration_a, resistance = _floats(duration, fire_resistance)
+    v = _Validator(duration_a.shape, errors)
+    v.check(duration_a < 0, "duration must be non-negative")
+    return v.result((duration_a / 200.0) * ((100.0 - resistance) / 100.0))
+
+
+def fire_ap_damage(duration, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.fire_ap_damage``."""
+    (duration_a,) = _floats(duration)
+    v = _Validator(duration_a.shape, errors)
+    v.check(duration_a < 0, "duration must be non-negative")
+    return v.result(duration_a / 500.0)
+
+
+# ===========================================================================
+# 7. Crew Stat by Level
+# ===========================================================================
+
+def crew_stat_at_level(level, level_1_value, max_value, ease: EaseType = "ease_out",
+                       *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.crew_stat_at_level``.
+
+    ``ease`` applies to the whole batch.  An invalid ``ease`` always raises,
+    whatever ``errors`` says, since it is not an element-wise input.
+    """
+    if ease not in _EASE_EXPONENTS:
+        raise ValueError(f"ease must be one of {list(_EASE_EXPONENTS)}")
+    level_a, lvl1, max_a = _floats(level, level_1_value, max_value)
+    v = _Validator(level_a.shape, errors)
+    out_of_range = (level_a < 1) | (level_a > 40)
+    if np.any(out_of_range):
+        v.check(out_of_range, f"level must be 1-40, got {level_a[out_of_range].flat[0]:g}")
+    progress = np.clip((level_a - 1) / 39.0, 0.0, 1.0)
+    values = lvl1 + (max_a - lvl1) * (progress ** _EASE_EXPONENTS[ease])
+    values = np.where(level_a == 1, lvl1, np.where(level_a == 40, max_a, values))
+    return v.result(values)
+
+
+# ===========================================================================
+# 8. Gas Draw Price
+# ===========================================================================
+
+def gas_draw_price(count_3_to_5_star, dna_count=0, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.gas_draw_price``."""
+    count, dna = _ints(count_3_to_5_star, dna_count)
+    v = _Validator(count.shape, errors)
+    v.check(count < 0, "count_3_to_5_star must be non-negative")
+    v.check(dna < 0, "dna_count must be non-negative")
+    exponent = np.maximum(count, dna // 100).astype(np.float64)
+    with np.errstate(over="ignore"):
+        price = GAS_DRAW_BASE * np.power(1.5, exponent)
+    return v.result(np.minimum(price, GAS_DRAW_CAP))
+
+
+# ===========================================================================
+# 9. Trophy Gain/Loss
+# ===========================================================================
+
+def trophy_gain(loser_trophies, winner_trophies, *, errors: Errors = "raise") -> np.ndarray:
+    """Vectorized ``game_formulas.trophy_gain``; returns int64 trophies.
+
+    Rounds half to even, like the scalar function's built-in ``round``.
+    """
+    loser, winner = _floats(loser_trophies, winner_trophies)
+    v = _Validator(loser.shape, errors)
+    v.check(winner == 0, "winner_trophies must be non-zero")
+    v.check((loser < 0) | (winner < 0), "trophy counts must be non-negative")
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        raw = TROPHY_BASE * (loser / np.where(winner == 0, 1.0, winner)) ** 4
+    gained = np.clip(np.rint(raw), TROPHY_MIN, TROPHY_MAX)
+    return v.result(gained.astype(np.int64))
@@ -0,0 +1,200 @@
+"""Persistent memo of ship layout analyses — local file I/O only, no HTTP.
+
+A ship's layout rarely changes between runs, yet ``analyzeShipLayout`` used
+to parse and score it every time.  ``LayoutMemo`` keys each finished report
+by a content hash of the layout (see ``layout_fingerprint``) and keeps the
+most recently used entries in one small JSON file, so an unchanged ship is
+reported straight from the memo.
+
+The memo also remembers the last defense score seen for each ship, so a
+changed layout can report how much its score moved.
+
+Several clients (one per account) may share the file.  ``save`` therefore
+re-reads it under a lock and merges in only what this memo changed, so one
+account's write does not drop another's entries or last scores.
+
+Like ``DesignStore`` the memo is best-effort: an unreadable file is treated
+as empty and a failed write is logged at debug level, never raised.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads in this process are serialized
+    fcntl = None
+
+from .models import Room, Ship
+
+# Reports kept in the memo; the least recently used is dropped first.
+DEFAULT_MAX_ENTRIES = 32
+
+# Bump when the analysis or report format changes so old entries miss.
+_FORMAT = 1
+
+# Serializes read-merge-write cycles between clients in this process; the
+# ``.lock`` file does the same between processes where fcntl exists.
+_SAVE_LOCK = threading.Lock()
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    with _SAVE_LOCK:
+        if fcntl is None:
+            yield
+            return
+        with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def layout_fingerprint(ship: Ship, rooms: Iterable[Room], design_version: str) -> str:
+    """Content hash of a layout as the analysis sees it.
+
+    Covers every room's (design ID, row, column, status, pending upgrade),
+    in a stable order, the room-design version and the ship fields printed
+    in the report header.
+    """
+    room_tuples = sorted(
+        (r.design_id, r.row, r.column, r.status, r.upgrade_design_id) for r in rooms
+    )
+    payload = json.dumps(
+        [_FORMAT, str(design_version), ship.name, ship.level, ship.design_id, room_tuples],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LayoutMemo:
+    """Small persistent LRU store of layout reports plus last scores per ship."""
+
+    def __init__(self, path: str | os.PathLike, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._entries, self._scores = self._read()
+        # Keys used or stored / ships scored since the last save, merged into
+        # the file's current contents by save().
+        self._touched: OrderedDict[str, None] = OrderedDict()
+        self._scored: set[str] = set()
+
+    def _read(self) -> tuple[OrderedDict[str, dict], dict[str, dict]]:
+        entries: OrderedDict[str, dict] = OrderedDict()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            raw_entries = data["entries"]
+            raw_scores = data["scores"]
+            if not isinstance(raw_entries, list) or not isinstance(raw_scores, dict):
+                raise ValueError("unexpected memo layout")
+            for key, entry in raw_entries:
+                if isinstance(entry, dict):
+                    entries[str(key)] = entry
+            return entries, {str(k): v for k, v in raw_scores.items() if isinstance(v, dict)}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.debug(f"Ignoring unreadable layout memo {self.path}: {e}")
+        return OrderedDict(), {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the entry stored for ``key`` (marking it recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._touch(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """Store ``entry`` for ``key``, evicting the least recently used entries."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._touch(key)
+        self._evict(self._entries)
+
+    def _touch(self, key: str) -> None:
+        self._touched[key] = None
+        self._touched.move_to_end(key)
+
+    def _evict(self, entries: OrderedDict[str, dict]) -> None:
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def previous_score(self, ship_key: str) -> Optional[float]:
+        """The last defense score recorded for ``ship_key``, if any."""
+        record = self._scores.get(ship_key)
+        if record is None:
+            return None
+        try:
+            return float(record["defense_score"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def record_score(self, ship_key: str, key: str, defense_score: float) -> None:
+        """Remember ``defense_score`` as the latest for ``ship_key``."""
+        self._scores[ship_key] = {"key": key, "defense_score": defense_score}
+        self._scored.add(ship_key)
+
+    def save(self) -> bool:
+        """Merge this memo's changes into the file and write it atomically.
+
+        Under a lock the file is re-read, the entries used or stored since
+        the last save become its most recent ones and the scores recorded
+        since then replace the stored ones; the merged memo is then written
+        (temp file + rename) and adopted.  Returns False if it could not be
+        written; never raises.
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with _locked(self.path):
+                entries, scores = self._read()
+                for key in self._touched:
+                    if key in self._entries:
+                        entries[key] = self._entries[key]
+                        entries.move_to_end(key)
+                self._evict(entries)
+                for ship_key in self._scored:
+                    scores[ship_key] = self._scores[ship_key]
+                data: dict[str, Any] = {
+                    "entries": [[key, entry] for key, entry in entries.items()],
+                    "scores": scores,
+                }
+                fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(data, f, separators=(",", ":"))
+                    os.replace(tmp_name, self.path)
+                except BaseException:
+                    try:
+                        os.unlink(tmp_name)
+                    except OSError:
+                        pass
+                    raise
+        except (OSError, TypeError, ValueError) as e:
+            logging.debug(f"Unable to write layout memo {self.path}: {e}")
+            return False
+        self._entries, self._scores = entries, scores
+        self._touched.clear()
+        self._scored.clear()
+        return True
@@ -0,0 +1,299 @@
+"""Ship layout optimizer — searches room placements, no HTTP.
+
+``analyze_layout`` reports problems; this module searches for fixes.
+Starting from parsed ``RoomInfo`` rooms and the ship's grid bounds it runs
+simulated annealing over two kinds of legal change:
+
+- *swap* two movable rooms of the same footprint;
+- *move* a movable room to a free spot inside the bounds.
+
+Every candidate is scored incrementally through ``ship_layout.LayoutState``,
+which updates only the ``defense_score`` terms touched by the changed rooms.
+
+The best layout found is turned into a ranked list of concrete
+suggestions — each one a move or swap the player can make in the game
+client, ordered greedily by the score it gains at that point.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from .ship_layout import LayoutState, RoomInfo
+
+# (min_row, max_row, min_col, max_col), inclusive tile bounds.
+Bounds = tuple[int, int, int, int]
+Position = tuple[int, int]
+
+# Annealing schedule, in defense_score points.
+START_TEMPERATURE = 5.0
+END_TEMPERATURE = 0.01
+# Share of proposals that are swaps (the rest are moves).
+SWAP_PROBABILITY = 0.5
+
+
+def default_movable(room: RoomInfo) -> bool:
+    """Rooms the optimizer may relocate: everything except lifts/corridors."""
+    return room.category != "corridor"
+
+
+def layout_bounds(rooms: Iterable[RoomInfo]) -> Bounds:
+    """Smallest bounds containing every tile of ``rooms``."""
+    rooms = list(rooms)
+    if not rooms:
+        return (0, -1, 0, -1)
+    return (
+        min(r.row for r in rooms),
+        max(r.row + r.height - 1 for r in rooms),
+        min(r.column for r in rooms),
+        max(r.column + r.width - 1 for r in rooms),
+    )
+
+
+def _position(state: LayoutState, room_id: str) -> Position:
+    room = state.room(room_id)
+    return (room.row, room.column)
+
+
+@dataclass(frozen=True)
+class MoveSuggestion:
+    """One change the player can make, with the score it gains."""
+    kind: str                                    # "move", "swap" or "rearrange"
+    moves: tuple[tuple[str, str, Position, Position], ...]  # (room ID, name, from, to)
+    gain: float
+    score_after: float
+
+    def describe(self) -> str:
+        parts = [
+            f"{name} (Row {src[0]}, Col {src[1]}) → (Row {dst[0]}, Col {dst[1]})"
+            for _, name, src, dst in self.moves
+        ]
+        verb = {"move": "Move", "swap": "Swap", "rearrange": "Rearrange"}.get(self.kind, self.kind)
+        return f"{verb}: {'; '.join(parts)} (+{self.gain:.1f} defense)"
+
+
+@dataclass(frozen=True)
+class OptimizationResult:
+    """Best layout found and how to get there."""
+    seed: int
+    iterations: int
+    initial_score: float
+    best_score: float
+    positions: dict[str, Position]       # room ID -> (row, column) in the best layout
+    suggestions: tuple[MoveSuggestion, ...] = ()
+
+    @property
+    def gain(self) -> float:
+        return self.best_score - self.initial_score
+
+
+def _anneal(
+    rooms: list[RoomInfo],
+    bounds: Bounds,
+    allowed: Optional[frozenset[Position]],
+    movable: list[str],
+    seed: int,
+    time_budget: float,
+    max_iterations: Optional[int],
+) -> OptimizationResult:
+    rng = random.Random(seed)
+    state = LayoutState(rooms)
+    initial = current = best = state.defense_score
+    best_positions = {room.room_id: (room.row, room.column) for room in rooms}
+
+    by_size: dict[tuple[int, int], list[str]] = {}
+    for room_id in movable:
+        room = state.room(room_id)
+        by_size.setdefault((room.height, room.width), []).append(room_id)
+    swappable = [group for group in by_size.values() if len(group) > 1]
+    min_row, max_row, min_col, max_col = bounds
+
+    start = time.perf_counter()
+    iterations = 0
+    while movable:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        elapsed = time.perf_counter() - start
+        if elapsed >= time_budget:
+            break
+        progress = max(
+            elapsed / time_budget if time_budget > 0 else 1.0,
+            iterations / max_iterations if max_iterations else 0.0,
+        )
+        temperature = START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** progress
+        iterations += 1
+
+        if swappable and rng.random() < SWAP_PROBABILITY:
+            a, b = rng.sample(rng.choice(swappable), 2)
+            moves = {a: _position(state, b), b: _position(state, a)}
+        else:
+            room = state.room(rng.choice(movable))
+            if max_row - room.height + 1 < min_row or max_col - room.width + 1 < min_col:
+                continue
+            target = (
+                rng.randint(min_row, max_row - room.height + 1),
+                rng.randint(min_col, max_col - room.width + 1),
+            )
+            if target == (room.row, room.column) or not state.fits(room, *target, bounds, allowed):
+                continue
+            moves = {room.room_id: target}
+
+        previous = state.relocate(moves)
+        candidate = state.defense_score
+        delta = candidate - current
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            current = candidate
+            if candidate > best + 1e-9:
+                best = candidate
+                best_positions = {room.room_id: (room.row, room.column) for room in state.rooms}
+        else:
+            state.restore(previous)
+
+    return OptimizationResult(
+        seed=seed,
+        iterations=iterations,
+        initial_score=initial,
+        best_score=best,
+        positions=best_positions,
+    )
+
+
+def _anneal_star(args: tuple) -> OptimizationResult:
+    return _anneal(*args)
+
+
+def suggest_moves(
+    rooms: list[RoomInfo],
+    target: dict[str, Position],
+    bounds: Optional[Bounds] = None,
+    allowed: Optional[Iterable[Position]] = None,
+) -> tuple[MoveSuggestion, ...]:
+    """Turn a target layout into ranked, individually legal moves and swaps.
+
+    Starting from ``rooms`` as placed, repeatedly applies the legal single
+    move or pairwise swap toward ``target`` that gains the most score.  If
+    the remaining changes only work together (a rotation of three or more
+    rooms), they are reported as one "rearrange" suggestion.
+    """
+    bounds = bounds or layout_bounds(rooms)
+    allowed_tiles = frozenset(allowed) if allowed is not None else None
+    state = LayoutState(rooms)
+    order = {room.room_id: i for i, room in enumerate(rooms)}
+    remaining = {
+        room_id: tuple(position)
+        for room_id, position in target.items()
+        if room_id in state and tuple(position) != _position(state, room_id)
+    }
+    current = state.defense_score
+    suggestions = []
+
+    def record(kind: str, moves: dict[str, Position]) -> None:
+        nonlocal current
+        previous = state.relocate(moves)
+        score = state.defense_score
+        suggestions.append(MoveSuggestion(
+            kind=kind,
+            moves=tuple(
+                (room_id, previous[room_id].name, (previous[room_id].row, previous[room_id].column),
+                 moves[room_id])
+                for room_id in sorted(moves, key=order.__getitem__)
+            ),
+            gain=score - current,
+            score_after=score,
+        ))
+        current = score
+        for room_id in moves:
+            remaining.pop(room_id, None)
+
+    while remaining:
+        options: list[tuple[str, dict[str, Position]]] = []
+        for room_id, position in sorted(remaining.items(), key=lambda item: order[item[0]]):
+            room = state.room(room_id)
+            if state.fits(room, *position, bounds, allowed_tiles):
+                options.append(("move", {room_id: position}))
+                continue
+            occupant = state.room_at(*position)
+            if (
+                occupant is not None
+                and order[room_id] < order[occupant]
+                and remaining.get(occupant) == (room.row, room.column)
+                and (state.room(occupant).height, state.room(occupant).width) == (room.height, room.width)
+            ):
+                options.append(("swap", {room_id: position, occupant: remaining[occupant]}))
+
+        if not options:
+            record("rearrange", dict(remaining))
+            break
+
+        best: Optional[tuple[float, str, dict[str, Position]]] = None
+        for kind, moves in options:
+            previous = state.relocate(moves)
+            score = state.defense_score
+            state.restore(previous)
+            if best is None or score > best[0]:
+                best = (score, kind, moves)
+        record(best[1], best[2])
+
+    return tuple(suggestions)
+
+
+def optimize_layout(
+    rooms: list[RoomInfo],
+    bounds: Optional[Bounds] = None,
+    seed: int = 0,
+    time_budget: float = 2.0,
+    max_iterations: Optional[int] = None,
+    restarts: int = 1,
+    processes: Optional[int] = 1,
+    allowed: Optional[Iterable[Position]] = None,
+    movable: Callable[[RoomInfo], bool] = default_movable,
+) -> OptimizationResult:
+    """Search for a higher-``defense_score`` placement of ``rooms``.
+
+    Args:
+        rooms: RoomInfo list from ``ship_layout.parse_rooms``.
+        bounds: (min_row, max_row, min_col, max_col) inclusive; defaults to
+            the rooms' current extent.
+        seed: Seed of the first restart; restart ``k`` uses ``seed + k``.
+        time_budget: Seconds per restart.
+        max_iterations: Optional proposal cap per restart.  With a cap and a
+            generous time budget the search is fully deterministic.
+        restarts: Independent annealing runs; the best one wins.
+        processes: Worker processes for restarts (``None``: CPU count,
+            ``1``: in-process).
+        allowed: Optional set of hull tiles rooms may occupy.
+        movable: Predicate selecting rooms the optimizer may relocate.
+
+    Returns:
+        OptimizationResult of the best restart, with ranked suggestions.
+    """
+    bounds = bounds or layout_bounds(rooms)
+    allowed_tiles = frozenset(allowed) if allowed is not None else None
+    movable_ids = [room.room_id for room in rooms if movable(room)]
+    jobs = [
+        (rooms, bounds, allowed_tiles, movable_ids, seed + k, time_budget, max_iterations)
+        for k in range(max(1, restarts))
+    ]
+    if len(jobs) == 1 or processes == 1:
+        results = [_anneal_star(job) for job in jobs]
+    else:
+        workers = min(len(jobs), processes or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_anneal_star, jobs))
+
+    best = max(results, key=lambda r: (r.best_score, -r.seed))
+    suggestions = suggest_moves(rooms, best.positions, bounds, allowed_tiles)
+    return OptimizationResult(
+        seed=best.seed,
+        iterations=sum(r.iterations for r in results),
+        initial_score=best.initial_score,
+        best_score=best.best_score,
+        positions=best.positions,
+        suggestions=suggestions,
+    )
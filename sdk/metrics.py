@@ -0,0 +1,165 @@
+"""Per-endpoint request instrumentation for one run — no network of its own.
+
+``Client`` records every request it sends into a ``RequestMetrics``: the
+endpoint, time spent waiting on the request scheduler, network latency
+(including transport retries), response size, transport retries, XML parse
+time and, for failures, an error class.  At the end of a run ``summary()``
+gives a JSON-ready breakdown of where the wall-clock time went and
+``table()`` a per-endpoint latency histogram for the log.
+
+Only redacted URLs (``redact_secrets``) are kept, so both outputs are safe to
+attach to the emailed log.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from .redaction import redact_secrets
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is
+# everything slower.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _bucket_labels() -> list[str]:
+    labels = [f"<{int(b * 1000)}ms" if b < 1 else f"<{b:g}s" for b in LATENCY_BUCKETS]
+    return labels + [f">={LATENCY_BUCKETS[-1]:g}s"]
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+@dataclass
+class EndpointStats:
+    """Totals for one endpoint."""
+    calls: int = 0
+    retries: int = 0
+    limiter_wait: float = 0.0
+    latency: list[float] = field(default_factory=list)
+    bytes: int = 0
+    parses: int = 0
+    parse_time: float = 0.0
+    errors: Counter = field(default_factory=Counter)
+    url: str = ""
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "limiter_wait_s": round(self.limiter_wait, 4),
+            "latency_total_s": round(sum(self.latency), 4),
+            "latency_p50_s": round(_percentile(self.latency, 0.5), 4),
+            "latency_p95_s": round(_percentile(self.latency, 0.95), 4),
+            "latency_max_s": round(max(self.latency, default=0.0), 4),
+            "bytes": self.bytes,
+            "parses": self.parses,
+            "parse_time_s": round(self.parse_time, 4),
+            "errors": dict(self.errors),
+            "url": self.url,
+        }
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint counters and latency samples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, EndpointStats] = {}
+
+    def _get(self, endpoint: str) -> EndpointStats:
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = EndpointStats()
+        return stats
+
+    def record_request(self, endpoint: str, url: str, latency: float, nbytes: int = 0,
+                       limiter_wait: float = 0.0, retries: int = 0,
+                       error: Optional[str] = None) -> None:
+        """Record one sent request (``error`` is its error class, if it failed)."""
+        with self._lock:
+            stats = self._get(endpoint)
+            stats.calls += 1
+            stats.retries += retries
+            stats.limiter_wait += limiter_wait
+            stats.latency.append(latency)
+            stats.bytes += nbytes
+            if error:
+                stats.errors[error] += 1
+            if not stats.url:
+                stats.url = redact_secrets(url)
+
+    def record_parse(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._get(endpoint)
+            stats.parses += 1
+            stats.parse_time += seconds
+
+    def endpoints(self) -> dict[str, EndpointStats]:
+        with self._lock:
+            return dict(self._stats)
+
+    def summary(self) -> dict[str, Any]:
+        """JSON-ready totals and per-endpoint breakdown, slowest endpoints first."""
+        with self._lock:
+            per_endpoint = {name: stats.as_dict() for name, stats in self._stats.items()}
+        ordered = dict(sorted(per_endpoint.items(), key=lambda kv: -kv[1]["latency_total_s"]))
+        totals = {
+            key: round(sum(e[key] for e in ordered.values()), 4)
+            for key in ("calls", "retries", "limiter_wait_s", "latency_total_s", "bytes", "parse_time_s")
+        }
+        totals["errors"] = sum(sum(e["errors"].values()) for e in ordered.values())
+        return {"totals": totals, "endpoints": ordered}
+
+    def table(self) -> str:
+        """Fixed-width per-endpoint table with a latency histogram."""
+        labels = _bucket_labels()
+        header = (
+            f"{'endpoint':<36} {'calls':>5} {'retry':>5} {'wait s':>7} {'net s':>7} {'p95 s':>6} "
+            f"{'KiB':>8} {'parse s':>7} {'err':>4}  " + " ".join(f"{label:>6}" for label in labels)
+        )
+        lines = [header, "-" * len(header)]
+        for name, stats in sorted(self.endpoints().items(), key=lambda kv: -sum(kv[1].latency)):
+            counts = [0] * len(labels)
+            for latency in stats.latency:
+                counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            lines.append(
+                f"{name[:36]:<36} {stats.calls:>5} {stats.retries:>5} {stats.limiter_wait:>7.2f} "
+                f"{sum(stats.latency):>7.2f} {_percentile(stats.latency, 0.95):>6.2f} "
+                f"{stats.bytes / 1024:>8.1f} {stats.parse_time:>7.3f} {sum(stats.errors.values()):>4}  "
+                + " ".join(f"{count:>6}" for count in counts)
+            )
+        return "\n".join(lines)
+
+    def write_json(self, path: str | os.PathLike) -> bool:
+        """Write ``summary()`` to ``path`` atomically; False if it could not be written."""
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".metrics-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self.summary(), f, indent=2)
+                os.replace(tmp, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            return False
+        return True
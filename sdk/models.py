@@ -0,0 +1,217 @@
+"""Typed models for ship, room, crew, research and item records — no HTTP.
+
+The API returns xmltodict dicts with ``@``-prefixed string values, and code
+that reads them re-parses the same numbers with ``int(...)`` over and over.
+These models are built once per response: numeric fields are converted up
+front and string fields are interned (crew names, room states and IDs repeat
+across the whole account).
+
+All models are slotted, frozen dataclasses.  ``from_xml`` accepts the raw
+record dict and never raises on missing or malformed attributes; numeric
+fields fall back to 0 and string fields to "".
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+# Values longer than this are unlikely to repeat and are not interned.
+_INTERN_MAX_LEN = 64
+
+
+def _str(record: dict, key: str, default: str = "") -> str:
+    value = record.get(key)
+    if value is None:
+        return default
+    if isinstance(value, list):
+        # xmltodict yields a list when an attribute is split across nodes.
+        value = "".join(str(v) for v in value)
+    value = str(value)
+    return sys.intern(value) if len(value) <= _INTERN_MAX_LEN else value
+
+
+def _int(record: dict, key: str, default: int = 0) -> int:
+    value = record.get(key)
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        try:
+            return int(float(value))
+        except (ValueError, TypeError):
+            return default
+
+
+def _records(data: Any, key: str) -> list[dict]:
+    """Normalize ``{key: dict | list}`` to a list of dicts."""
+    if not isinstance(data, dict):
+        return []
+    value = data.get(key)
+    if isinstance(value, dict):
+        return [value]
+    if isinstance(value, list):
+        return [v for v in value if isinstance(v, dict)]
+    return []
+
+
+# Training stat attributes, in the order the game lists them.
+TRAINING_STATS = (
+    "@HpImprovement",
+    "@PilotImprovement",
+    "@RepairImprovement",
+    "@WeaponImprovement",
+    "@ScienceImprovement",
+    "@EngineImprovement",
+    "@AttackImprovement",
+    "@AbilityImprovement",
+    "@StaminaImprovement",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Room:
+    """A room on the ship (GetShipByUserId ``Rooms/Room``)."""
+    room_id: str
+    design_id: str
+    row: int = 0
+    column: int = 0
+    status: str = ""
+    upgrade_design_id: str = ""
+
+    @classmethod
+    def from_xml(cls, record: dict) -> "Room":
+        return cls(
+            room_id=_str(record, "@RoomId"),
+            design_id=_str(record, "@RoomDesignId"),
+            row=_int(record, "@Row"),
+            column=_int(record, "@Column"),
+            status=_str(record, "@RoomStatus"),
+            upgrade_design_id=_str(record, "@UpgradeRoomDesignId"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Research:
+    """A research entry (GetShipByUserId ``Researches/Research`` or ListAllResearches)."""
+    research_id: str
+    design_id: str
+    state: str = ""
+
+    @classmethod
+    def from_xml(cls, record: dict) -> "Research":
+        return cls(
+            research_id=_str(record, "@ResearchId"),
+            design_id=_str(record, "@ResearchDesignId"),
+            state=_str(record, "@ResearchState"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Character:
+    """A crew member (ListAllCharactersOfUser ``Character``)."""
+    character_id: str
+    name: str
+    design_id: str
+    room_id: str = "0"
+    level: int = 0
+    xp: int = 0
+    fatigue: int = 0
+    available_date: str = ""
+    training_end_date: str = ""
+    hp_improvement: int = 0
+    pilot_improvement: int = 0
+    repair_improvement: int = 0
+    weapon_improvement: int = 0
+    science_improvement: int = 0
+    engine_improvement: int = 0
+    attack_improvement: int = 0
+    ability_improvement: int = 0
+    stamina_improvement: int = 0
+
+    @classmethod
+    def from_xml(cls, record: dict) -> "Character":
+        return cls(
+            character_id=_str(record, "@CharacterId"),
+            name=_str(record, "@CharacterName"),
+            design_id=_str(record, "@CharacterDesignId"),
+            room_id=_str(record, "@RoomId", "0"),
+            level=_int(record, "@Level"),
+            xp=_int(record, "@Xp"),
+            fatigue=_int(record, "@Fatigue"),
+            available_date=_str(record, "@AvailableDate"),
+            training_end_date=_str(record, "@TrainingEndDate"),
+            hp_improvement=_int(record, "@HpImprovement"),
+            pilot_improvement=_int(record, "@PilotImprovement"),
+            repair_improvement=_int(record, "@RepairImprovement"),
+            weapon_improvement=_int(record, "@WeaponImprovement"),
+            science_improvement=_int(record, "@ScienceImprovement"),
+            engine_improvement=_int(record, "@EngineImprovement"),
+            attack_improvement=_int(record, "@AttackImprovement"),
+            ability_improvement=_int(record, "@AbilityImprovement"),
+            stamina_improvement=_int(record, "@StaminaImprovement"),
+        )
+
+    @property
+    def improvements(self) -> tuple[int, ...]:
+        """Per-stat training points, in ``TRAINING_STATS`` order."""
+        return (
+            self.hp_improvement, self.pilot_improvement, self.repair_improvement,
+            self.weapon_improvement, self.science_improvement,
+            self.engine_improvement, self.attack_improvement,
+            self.ability_improvement, self.stamina_improvement,
+        )
+
+    @property
+    def training_points(self) -> int:
+        """Total training points spent across all stats."""
+        return (
+            self.hp_improvement + self.pilot_improvement + self.repair_improvement
+            + self.weapon_improvement + self.science_improvement
+            + self.engine_improvement + self.attack_improvement
+            + self.ability_improvement + self.stamina_improvement
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Item:
+    """An item in ship storage (ListItemsOfAShip ``Item``)."""
+    item_id: str
+    design_id: str
+    quantity: int = 0
+
+    @classmethod
+    def from_xml(cls, record: dict) -> "Item":
+        return cls(
+            item_id=_str(record, "@ItemId"),
+            design_id=_str(record, "@ItemDesignId"),
+            quantity=_int(record, "@Quantity"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Ship:
+    """A ship with its rooms and research (GetShipByUserId ``Ship``)."""
+    ship_id: str
+    name: str
+    design_id: str
+    level: int = 0
+    hp: int = 0
+    rooms: tuple[Room, ...] = ()
+    researches: tuple[Research, ...] = ()
+
+    @classmethod
+    def from_xml(cls, record: dict) -> "Ship":
+        return cls(
+            ship_id=_str(record, "@ShipId"),
+            name=_str(record, "@ShipName"),
+            design_id=_str(record, "@ShipDesignId"),
+            level=_int(record, "@ShipLevel"),
+            hp=_int(record, "@Hp"),
+            rooms=tuple(Room.from_xml(r) for r in _records(record.get("Rooms"), "Room")),
+            researches=tuple(
+                Research.from_xml(r) for r in _records(record.get("Researches"), "Research")
+            ),
+        )
@@ -0,0 +1,213 @@
+"""Per-run read-through cache for idempotent API reads — no network of its own.
+
+A single run fetches the same state endpoints (GetShipByUserId,
+ListAllResearches, ListTasksOfAUser, ...) several times from different
+actions.  ``RequestCache`` sits in front of ``Client.request``: reads of the
+endpoints listed in ``DEFAULT_TTLS`` are served from memory while fresh, and
+concurrent identical reads are coalesced into one request.
+
+Anything else is treated as a potential mutation.  Endpoints listed in
+``INVALIDATES`` drop only the reads they affect; endpoints in ``READ_ONLY``
+drop nothing; any other endpoint clears the whole cache, so an endpoint the
+tables do not know about can never leave stale state behind.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+from .response import ClassifiedResponse
+
+# Cache lifetimes in seconds for idempotent reads.
+DEFAULT_TTLS: dict[str, float] = {
+    "GetShipByUserId": 30,
+    "ListAllCharactersOfUser": 30,
+    "ListRoomsViaAccessToken": 30,
+    "ListItemsOfAShip": 30,
+    "ListAllResearches": 60,
+    "ListTasksOfAUser": 60,
+    "ListUserStarSystems": 60,
+    "GetLatestVersion3": 300,
+    "ListRoomDesigns2": 600,
+    "ListAllCharacterDesigns2": 600,
+    "ListAllResearchDesigns2": 600,
+    "ListAllTrainingDesigns2": 600,
+    "ListAllTaskDesigns2": 600,
+}
+
+# Mutating endpoints and the cached reads they make stale.
+INVALIDATES: dict[str, frozenset[str]] = {
+    "UpgradeRoom2": frozenset({"GetShipByUserId", "ListRoomsViaAccessToken"}),
+    "SpeedUpRoomConstructionUsingBoostGauge": frozenset({"GetShipByUserId", "ListRoomsViaAccessToken"}),
+    "CollectAllResources": frozenset({"GetShipByUserId", "ListRoomsViaAccessToken", "ListItemsOfAShip"}),
+    "AddResearch": frozenset({"ListAllResearches", "GetShipByUserId"}),
+    "SpeedUpResearchUsingBoostGauge": frozenset({"ListAllResearches", "GetShipByUserId"}),
+    "UpgradeCharacter": frozenset({"ListAllCharactersOfUser", "GetShipByUserId"}),
+    "AddTraining": frozenset({"ListAllCharactersOfUser"}),
+    "FinishTraining": frozenset({"ListAllCharactersOfUser"}),
+    "CollectTaskCompletion": frozenset({"ListTasksOfAUser", "GetShipByUserId"}),
+    "ActionMessage": frozenset({"GetShipByUserId", "ListItemsOfAShip"}),
+    "CollectReward2": frozenset({"GetShipByUserId", "ListItemsOfAShip"}),
+    "ActivateItem3": frozenset({"ListItemsOfAShip", "ListAllCharactersOfUser"}),
+    "RebuildAmmo3": frozenset({"ListItemsOfAShip", "GetShipByUserId"}),
+}
+
+# Uncached endpoints that never change cached state.
+READ_ONLY: frozenset[str] = frozenset({
+    "HeartBeat4",
+    "PusherAuth",
+    "GetTrainingUpdate",
+    "UpdateMarkerMovement",
+    "GetCatalogQuantity",
+    "GetTodayLiveOps2",
+    "ListSystemMessagesForUser3",
+    "ListImportantMessagesForUser",
+    "ListMessagesForChannelKey",
+    "ListActiveMarketplaceMessages5",
+    "ListAchievementsOfAUser",
+    "ListCompletedMissionEvents",
+    "ListAllRoomActionsOfShip",
+    "ListActionTypes2",
+    "ListConditionTypes2",
+    "ListSituations",
+    "ListStarSystemMarkersAndUserMarkers",
+    "ListPvPBattles2",
+    "ListMissionBattles",
+    "ListFriends",
+    "FindUserRanking",
+    "ListAllDesigns4",
+})
+
+# Query parameters that change on every call without changing the result.
+VOLATILE_PARAMS = frozenset({"clientDateTime", "accessToken", "checksum"})
+
+
+def endpoint_name(url: str) -> str:
+    """Return the endpoint name of an API URL (last path segment)."""
+    return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+
+def cache_key(url: str) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """Build a cache key from the endpoint path and its stable query parameters."""
+    parts = urlsplit(url)
+    params = tuple(sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in VOLATILE_PARAMS
+    ))
+    return parts.path, params
+
+
+def is_cacheable_response(r: Any) -> bool:
+    """Only successful, error-free responses are cached."""
+    if getattr(r, "status_code", None) != 200:
+        return False
+    if isinstance(r, ClassifiedResponse):
+        return not r.is_error
+    return "errorMessage" not in r.text
+
+
+class _InFlight:
+    __slots__ = ("event", "response", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+        self.error: BaseException | None = None
+
+
+class RequestCache:
+    """Thread-safe read-through cache with TTLs and endpoint invalidation."""
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        invalidates: dict[str, frozenset[str]] | None = None,
+        read_only: frozenset[str] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.invalidates = INVALIDATES if invalidates is None else invalidates
+        self.read_only = READ_ONLY if read_only is None else read_only
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple[float, Any]] = {}
+        self._in_flight: dict[tuple, _InFlight] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def fetch(self, method: str, url: str, send: Callable[[], Any]) -> Any:
+        """Return the response for ``method url``, calling ``send`` only when needed."""
+        endpoint = endpoint_name(url)
+        ttl = self.ttls.get(endpoint)
+        if method.upper() != "GET" or ttl is None:
+            try:
+                return send()
+            finally:
+                self._after_uncached(endpoint)
+
+        key = cache_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self.hits += 1
+                return entry[1]
+            waiting = self._in_flight.get(key)
+            if waiting is None:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+                generation = self._generation
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if waiting is not None:
+            waiting.event.wait()
+            if waiting.error is not None:
+                raise waiting.error
+            return waiting.response
+
+        try:
+            r = send()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.response = r
+            with self._lock:
+                # Skip the store if a mutation landed while the read was in flight.
+                if generation == self._generation and is_cacheable_response(r):
+                    self._entries[key] = (self._clock() + ttl, r)
+            return r
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.event.set()
+
+    def _after_uncached(self, endpoint: str) -> None:
+        if endpoint in self.ttls or endpoint in self.read_only:
+            return
+        affected = self.invalidates.get(endpoint)
+        if affected is None:
+            self.clear()
+        else:
+            self.invalidate(*affected)
+
+    def invalidate(self, *endpoints: str) -> None:
+        """Drop cached reads of the given endpoints."""
+        names = set(endpoints)
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if endpoint_name(k[0]) in names]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached read."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
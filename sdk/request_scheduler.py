@@ -0,0 +1,210 @@
+"""Priority-aware request budget for the Pixel Starships API — no network of its own.
+
+The API tolerates about 30 calls per minute per client.  ``RequestScheduler``
+hands out that budget explicitly: every request asks for a token with a
+priority (and optionally a deadline), and when the budget is exhausted the
+waiting requests are released in priority order rather than in whatever
+order their threads wake up.  A decorative read queued early therefore never
+delays a heartbeat or a mining-drone collection queued behind it.
+
+Each token returns to the bucket one ``period`` after it was spent, so no
+``period``-long window ever holds more than ``calls`` requests — the same
+guarantee the previous ``ratelimit`` decorator gave.
+
+Per-priority queue-wait metrics (``metrics`` / ``summary``) show how much of
+a run was spent waiting on the budget.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Optional
+
+from .request_cache import endpoint_name
+
+
+class Priority(IntEnum):
+    """Request priority; lower values are served first."""
+    CRITICAL = 0   # session upkeep: login, heartbeat
+    HIGH = 1       # time-sensitive actions: drones, battles, daily rewards
+    NORMAL = 2
+    LOW = 3        # designs and informational reads
+
+
+ENDPOINT_PRIORITIES: dict[str, Priority] = {
+    "HeartBeat4": Priority.CRITICAL,
+    "DeviceLogin17": Priority.CRITICAL,
+    "UserEmailPasswordAuthorize4": Priority.CRITICAL,
+    "GetLatestVersion3": Priority.CRITICAL,
+    "CollectMarker2": Priority.HIGH,
+    "GoTo": Priority.HIGH,
+    "SpeedUpTravelling": Priority.HIGH,
+    "UpdateMarkerMovement": Priority.HIGH,
+    "CreateBattle9": Priority.HIGH,
+    "AcceptBattle5": Priority.HIGH,
+    "CreateStarBattle5": Priority.HIGH,
+    "VerifyBattle2": Priority.HIGH,
+    "FinaliseBattle15": Priority.HIGH,
+    "CollectDailyReward2": Priority.HIGH,
+    "AddStarbux2": Priority.HIGH,
+    "ListAllDesigns4": Priority.LOW,
+    "ListRoomDesigns2": Priority.LOW,
+    "ListAllCharacterDesigns2": Priority.LOW,
+    "ListAllResearchDesigns2": Priority.LOW,
+    "ListAllTrainingDesigns2": Priority.LOW,
+    "ListAllTaskDesigns2": Priority.LOW,
+    "ListAchievementsOfAUser": Priority.LOW,
+    "ListImportantMessagesForUser": Priority.LOW,
+    "ListFriends": Priority.LOW,
+    "FindUserRanking": Priority.LOW,
+    "ListMessagesForChannelKey": Priority.LOW,
+    "GetTodayLiveOps2": Priority.LOW,
+    "ListPvPBattles2": Priority.LOW,
+    "ListMissionBattles": Priority.LOW,
+    "ListActionTypes2": Priority.LOW,
+    "ListConditionTypes2": Priority.LOW,
+    "ListSituations": Priority.LOW,
+    "ListCompletedMissionEvents": Priority.LOW,
+}
+
+
+def endpoint_priority(url: str) -> Priority:
+    """Default priority of an API URL (``Priority.NORMAL`` if not listed)."""
+    return ENDPOINT_PRIORITIES.get(endpoint_name(url), Priority.NORMAL)
+
+
+class DeadlineExceeded(TimeoutError):
+    """A request's deadline passed while it waited for the budget."""
+
+
+@dataclass
+class WaitStats:
+    """Queue-wait totals for one priority."""
+    requests: int = 0
+    expired: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class RequestScheduler:
+    """Thread-safe sliding token bucket that releases waiters by priority.
+
+    Waiters are ordered by (priority, deadline, arrival); only the head of
+    the queue may take a free token.
+    """
+
+    def __init__(self, calls: int = 30, period: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if calls < 1 or period <= 0:
+            raise ValueError("calls must be >= 1 and period > 0")
+        self.calls = calls
+        self.period = period
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._spent: deque[float] = deque()
+        self._waiting: list[tuple[int, float, int]] = []
+        self._arrivals = itertools.count()
+        self._stats = {priority: WaitStats() for priority in Priority}
+
+    def _refill(self, now: float) -> None:
+        while self._spent and self._spent[0] + self.period <= now:
+            self._spent.popleft()
+
+    def available(self) -> int:
+        """Tokens that could be spent right now."""
+        with self._cond:
+            self._refill(self._clock())
+            return self.calls - len(self._spent)
+
+    def acquire(self, priority: Priority = Priority.NORMAL,
+                deadline: Optional[float] = None) -> float:
+        """Block until this request may be sent; return the seconds waited.
+
+        Args:
+            priority: Queue position relative to other waiters.
+            deadline: Latest ``clock()`` time (``time.monotonic`` by default)
+                at which the request is still worth sending.
+
+        Raises:
+            DeadlineExceeded: If ``deadline`` passes before a token is free.
+        """
+        priority = Priority(priority)
+        with self._cond:
+            start = self._clock()
+            ticket = (int(priority), math.inf if deadline is None else deadline, next(self._arrivals))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    self._refill(now)
+                    full = len(self._spent) >= self.calls
+                    if not full and self._waiting[0] == ticket:
+                        heapq.heappop(self._waiting)
+                        self._spent.append(now)
+                        waited = now - start
+                        self._record(priority, waited)
+                        # The next waiter may be able to go too.
+                        self._cond.notify_all()
+                        return waited
+                    if deadline is not None and now >= deadline:
+                        self._waiting.remove(ticket)
+                        heapq.heapify(self._waiting)
+                        self._stats[priority].expired += 1
+                        self._cond.notify_all()
+                        raise DeadlineExceeded(
+                            f"request budget not available within deadline ({now - start:.1f}s waited)"
+                        )
+                    timeout = self._spent[0] + self.period - now if full else None
+                    if deadline is not None:
+                        timeout = deadline - now if timeout is None else min(timeout, deadline - now)
+                    self._cond.wait(timeout)
+            except BaseException:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                raise
+
+    def _record(self, priority: Priority, waited: float) -> None:
+        stats = self._stats[priority]
+        stats.requests += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+
+    def metrics(self) -> dict[Priority, WaitStats]:
+        """Copy of the queue-wait stats per priority."""
+        with self._cond:
+            return {p: WaitStats(**vars(s)) for p, s in self._stats.items()}
+
+    @property
+    def total_wait(self) -> float:
+        with self._cond:
+            return sum(s.total_wait for s in self._stats.values())
+
+    def summary(self) -> str:
+        """One-line description of the time spent waiting on the budget."""
+        metrics = self.metrics()
+        requests = sum(s.requests for s in metrics.values())
+        parts = [
+            f"{p.name.lower()} {s.requests} req/{s.total_wait:.1f}s"
+            + (f"/{s.expired} expired" if s.expired else "")
+            for p, s in metrics.items() if s.requests or s.expired
+        ]
+        total = sum(s.total_wait for s in metrics.values())
+        detail = f" ({', '.join(parts)})" if parts else ""
+        return f"{requests} request(s), {total:.1f}s waiting on the rate limit{detail}"
+
+    def reset_metrics(self) -> None:
+        with self._cond:
+            self._stats = {priority: WaitStats() for priority in Priority}
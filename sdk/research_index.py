@@ -0,0 +1,89 @@
+"""Research state snapshot — pure data, no HTTP.
+
+``hasResearch`` is asked the same questions for every crew member
+("is Fitness 201 done?").  ``ResearchIndex`` answers them from maps built
+once per ``ListAllResearches`` response instead of re-scanning the list.
+
+A research *family* is the first word of its name ("Fitness 201" →
+"Fitness"), which is how ``Client.getResearchLevel`` has always matched
+research names.  As there, records without ``@ResearchName`` are ignored and
+a record whose ``@ResearchLevel`` does not parse is skipped in favour of the
+next one in the family.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+
+def research_family(name: str) -> str:
+    """Return the family of a research name (its first word)."""
+    words = name.split()
+    return words[0] if words else ""
+
+
+class ResearchIndex:
+    """O(1) research lookups by design ID, family and level.
+
+    Args:
+        researches: Research dicts from ListAllResearches.
+    """
+
+    def __init__(self, researches: Iterable[dict]):
+        # design ID -> research state, in response order
+        self.states: dict[str, str] = {}
+        # family -> level of the first research seen in that family
+        self._levels: dict[str, int] = {}
+        # (family, level) -> research state
+        self._family_states: dict[tuple[str, int], str] = {}
+
+        for research in researches:
+            design_id = research.get("@ResearchDesignId", "")
+            state = research.get("@ResearchState", "")
+            if design_id:
+                self.states.setdefault(design_id, state)
+
+            family = research_family(research.get("@ResearchName") or "")
+            if not family:
+                continue
+            try:
+                level = int(research.get("@ResearchLevel", "0"))
+            except (ValueError, TypeError):
+                continue
+            self._levels.setdefault(family, level)
+            self._family_states.setdefault((family, level), state)
+
+    def __contains__(self, design_id: str) -> bool:
+        return design_id in self.states
+
+    def _family_key(self, research_name: str) -> Optional[str]:
+        family = research_family(research_name)
+        if not family:
+            return None
+        if family in self._levels:
+            return family
+        # Preserve the historical prefix match ("Fit" matches "Fitness").
+        for known in self._levels:
+            if known.startswith(family):
+                return known
+        return None
+
+    def level(self, research_name: str) -> int:
+        """Return the level recorded for the research's family, or 0."""
+        family = self._family_key(research_name)
+        return self._levels[family] if family is not None else 0
+
+    def has(self, research_name: str, min_level: int = 1) -> bool:
+        """True if the research family has reached at least ``min_level``."""
+        return self.level(research_name) >= min_level
+
+    def state(self, research_name: str, level: int) -> Optional[str]:
+        """Return the state of ``family`` at ``level`` (e.g. "Completed"), or None."""
+        family = self._family_key(research_name)
+        if family is None:
+            return None
+        return self._family_states.get((family, level))
+
+    def researching(self) -> list[str]:
+        """Design IDs currently being researched."""
+        return [design_id for design_id, state in self.states.items() if state == "Researching"]
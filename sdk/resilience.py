@@ -0,0 +1,300 @@
+"""Retry budgets, adaptive timeouts and circuit breakers for the HTTP transport.
+
+``Client`` used to mount ``HTTPAdapter(max_retries=Retry(total=10,
+backoff_factor=1))``: during a 5xx storm a single call could sleep through
+minutes of backoff, and with no timeout a stalled connection could hang a
+run until the cron job was killed.  ``ResilientHTTPAdapter`` replaces it and
+bounds the time any one endpoint can take:
+
+- **Retry budgets** — retries are drawn from a per-run pool and a smaller
+  per-endpoint pool (``RetryBudget``), besides a cap per call.  Once a budget
+  is spent, failures are returned immediately.
+- **Adaptive timeouts** — every request gets a timeout derived from the
+  endpoint's recent latencies (``LatencyTracker``: a high percentile times a
+  safety factor, clamped), so slow design downloads are not cut off while a
+  hung heartbeat fails in seconds.
+- **Circuit breakers** — after repeated consecutive failures an endpoint is
+  short-circuited for a cool-down (``CircuitBreaker``) and calls to it fail
+  fast with ``CircuitOpenError``; one trial call is let through afterwards.
+- **Run deadline** — with ``Resilience.deadline`` set, timeouts and backoff
+  never extend past the run's wall-clock limit.
+
+Only idempotent requests (GET) are retried after a read error or a 5xx
+response.  A POST such as ``UpgradeCharacter`` or ``AddStarbux2`` may already
+have been applied by then, so it is retried only when the connection failed
+before the request was sent.
+
+Failures surface as ``requests`` exceptions, so existing error handling in
+``Client`` keeps working unchanged.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError
+
+from .request_cache import endpoint_name
+
+DEFAULT_TIMEOUT = 5  # seconds
+
+# Responses treated as transient server failures.
+RETRY_STATUSES = frozenset({500, 502, 503, 504, 520})
+
+# Methods that are safe to send again after the server may have seen them.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request."""
+
+    def __init__(self, *args, **kwargs):
+        self.timeout = DEFAULT_TIMEOUT
+        if "timeout" in kwargs:
+            self.timeout = kwargs["timeout"]
+            del kwargs["timeout"]
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        timeout = kwargs.get("timeout")
+        if timeout is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The endpoint's circuit breaker is open; the call was not attempted."""
+
+
+def _not_sent(error: Exception) -> bool:
+    """True if ``error`` means the connection failed before the request was sent."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+        return False
+    reason = error.args[0]
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    # NewConnectionError (refused, DNS failure) subclasses ConnectTimeoutError.
+    return isinstance(reason, ConnectTimeoutError)
+
+
+class RetryBudget:
+    """Retries left for the run and for each endpoint."""
+
+    def __init__(self, per_run: int = 30, per_endpoint: int = 6):
+        self.per_run = per_run
+        self.per_endpoint = per_endpoint
+        self._lock = threading.Lock()
+        self._run_used = 0
+        self._used: dict[str, int] = {}
+
+    def take(self, endpoint: str) -> bool:
+        """Spend one retry for ``endpoint``; False if either budget is exhausted."""
+        with self._lock:
+            if self._run_used >= self.per_run or self._used.get(endpoint, 0) >= self.per_endpoint:
+                return False
+            self._run_used += 1
+            self._used[endpoint] = self._used.get(endpoint, 0) + 1
+            return True
+
+    def used(self, endpoint: Optional[str] = None) -> int:
+        with self._lock:
+            return self._run_used if endpoint is None else self._used.get(endpoint, 0)
+
+
+class LatencyTracker:
+    """Recent latencies per endpoint and the timeout they suggest.
+
+    Until ``min_samples`` latencies are known the ``initial`` timeout is
+    used; afterwards ``percentile`` of the last ``window`` latencies times
+    ``factor``, clamped to [``floor``, ``ceiling``].
+    """
+
+    def __init__(self, initial: float = 15.0, floor: float = 2.0, ceiling: float = 30.0,
+                 percentile: float = 0.95, factor: float = 3.0, window: int = 50,
+                 min_samples: int = 5):
+        self.initial = initial
+        self.floor = floor
+        self.ceiling = ceiling
+        self.percentile = percentile
+        self.factor = factor
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def quantile(self, endpoint: str) -> Optional[float]:
+        """The tracked percentile of ``endpoint``'s latency, or None if too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(self.percentile * len(samples)) - 1)]
+
+    def timeout(self, endpoint: str) -> float:
+        q = self.quantile(endpoint)
+        if q is None:
+            return self.initial
+        return min(self.ceiling, max(self.floor, q * self.factor))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker per endpoint.
+
+    Closed: calls pass.  After ``threshold`` consecutive failures the circuit
+    opens for ``cooldown`` seconds and calls fail fast.  After the cool-down
+    one trial call is allowed (half-open): success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures: dict[str, int] = {}
+        self._opened: dict[str, float] = {}
+        self._trial: set[str] = set()
+
+    def allow(self, endpoint: str) -> bool:
+        """True if a call to ``endpoint`` may be attempted now."""
+        with self._lock:
+            opened = self._opened.get(endpoint)
+            if opened is None:
+                return True
+            if self._clock() - opened < self.cooldown or endpoint in self._trial:
+                return False
+            self._trial.add(endpoint)
+            return True
+
+    def is_open(self, endpoint: str) -> bool:
+        with self._lock:
+            return endpoint in self._opened
+
+    def open_endpoints(self) -> list[str]:
+        with self._lock:
+            return sorted(self._opened)
+
+    def success(self, endpoint: str) -> None:
+        with self._lock:
+            self._failures.pop(endpoint, None)
+            self._opened.pop(endpoint, None)
+            self._trial.discard(endpoint)
+
+    def failure(self, endpoint: str) -> None:
+        with self._lock:
+            count = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = count
+            if count >= self.threshold or endpoint in self._trial:
+                self._opened[endpoint] = self._clock()
+            self._trial.discard(endpoint)
+
+
+@dataclass
+class Resilience:
+    """Transport policy shared by every request of a run."""
+    budget: RetryBudget
+    latency: LatencyTracker
+    breaker: CircuitBreaker
+    attempts_per_call: int = 4
+    backoff: float = 0.5       # seconds before the first retry, doubled each time
+    backoff_cap: float = 8.0
+    deadline: Optional[float] = None  # time.monotonic() limit for the whole run
+
+    @classmethod
+    def default(cls) -> "Resilience":
+        return cls(budget=RetryBudget(), latency=LatencyTracker(), breaker=CircuitBreaker())
+
+    def remaining(self, now: float) -> Optional[float]:
+        return None if self.deadline is None else self.deadline - now
+
+    def summary(self) -> str:
+        """One-line description of the retries spent and the open circuits."""
+        opened = self.breaker.open_endpoints()
+        detail = f", circuit open: {', '.join(opened)}" if opened else ""
+        return f"{self.budget.used()}/{self.budget.per_run} retries used{detail}"
+
+
+class ResilientHTTPAdapter(TimeoutHTTPAdapter):
+    """Adapter that retries within budgets, under adaptive timeouts and breakers.
+
+    Non-idempotent requests are retried only on connect failures.
+    """
+
+    def __init__(self, resilience: Resilience, *args,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep, **kwargs):
+        kwargs.setdefault("max_retries", 0)
+        super().__init__(*args, **kwargs)
+        self.resilience = resilience
+        self._clock = clock
+        self._sleep = sleep
+
+    def send(self, request, **kwargs):
+        policy = self.resilience
+        endpoint = endpoint_name(request.url)
+        explicit_timeout = kwargs.pop("timeout", None)
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            if not policy.breaker.allow(endpoint):
+                raise CircuitOpenError(f"circuit open for {endpoint}", request=request)
+            now = self._clock()
+            timeout = explicit_timeout if explicit_timeout is not None else policy.latency.timeout(endpoint)
+            remaining = policy.remaining(now)
+            if remaining is not None:
+                if remaining <= 0:
+                    raise requests.exceptions.Timeout(f"run deadline reached before {endpoint}", request=request)
+                if isinstance(timeout, (int, float)):
+                    timeout = min(timeout, remaining)
+
+            error = None
+            response = None
+            try:
+                response = super().send(request, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            else:
+                policy.latency.record(endpoint, self._clock() - now)
+
+            if error is None and response.status_code not in RETRY_STATUSES:
+                policy.breaker.success(endpoint)
+                return response
+            policy.breaker.failure(endpoint)
+            if not idempotent and (error is None or not _not_sent(error)):
+                # The server may have applied it; sending it again could repeat it.
+                if error is not None:
+                    raise error
+                return response
+
+            attempt += 1
+            delay = min(policy.backoff_cap, policy.backoff * 2 ** (attempt - 1))
+            remaining = policy.remaining(self._clock())
+            if (
+                attempt >= policy.attempts_per_call
+                or (remaining is not None and remaining <= delay)
+                or policy.breaker.is_open(endpoint)
+                or not policy.budget.take(endpoint)
+            ):
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            self._sleep(delay)
@@ -0,0 +1,116 @@
+"""Classified API responses — one look at the body per response.
+
+Pixel Starships reports failures inside a 200 response, as an
+``errorMessage`` attribute somewhere in the XML.  ``Client`` used to decode
+``r.text`` and scan it for several phrases on every request, parse the whole
+body with ``xmltodict`` just to log an error, and then the endpoint method
+decoded and parsed it again.  ``ClassifiedResponse`` wraps the
+``requests.Response`` instead:
+
+- ``outcome``, ``root``, ``error_code`` and ``error_message`` come from a
+  single regex pass over the raw bytes, without decoding or parsing;
+- ``text`` and ``document`` (the ``xmltodict`` parse) are computed once on
+  first use and shared by ``Client.request``, the endpoint method and any
+  later cache hit for the same response.
+
+Every other attribute (``content``, ``status_code``, ``headers``, truthiness,
+...) is the wrapped response's, so existing callers keep working.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+import time
+from enum import Enum
+from functools import cached_property
+from typing import Any, Callable, Optional
+
+import xmltodict
+
+_ROOT = re.compile(rb"<([A-Za-z_][\w.-]*)")
+_ERROR = re.compile(rb'\berror(Message|Code)="([^"]*)"')
+
+
+class Outcome(Enum):
+    """How the server answered, as far as ``Client`` cares."""
+    OK = "ok"
+    ERROR = "error"
+    STORAGE_FULL = "storage_full"          # benign: nothing to collect into
+    LAB_UPGRADE_REQUIRED = "lab_upgrade"   # benign: research gated by the lab
+    UNAUTHORIZED = "unauthorized"          # the access token expired
+
+
+def _classify(message: Optional[str]) -> Outcome:
+    if message is None:
+        return Outcome.OK
+    if "Failed to authorize access token" in message:
+        return Outcome.UNAUTHORIZED
+    if "storage is full" in message.lower():
+        return Outcome.STORAGE_FULL
+    if "Please upgrade your lab room." in message:
+        return Outcome.LAB_UPGRADE_REQUIRED
+    return Outcome.ERROR
+
+
+class ClassifiedResponse:
+    """A ``requests.Response`` with its outcome classified and its body memoized.
+
+    ``on_parse`` is called with the seconds the ``document`` parse took.
+    """
+
+    def __init__(self, response: Any, on_parse: Optional[Callable[[float], None]] = None):
+        self.response = response
+        self.on_parse = on_parse
+        body = getattr(response, "content", None)
+        if not isinstance(body, bytes):
+            # Test doubles may only set ``text``.
+            text = getattr(response, "text", None)
+            body = text.encode("utf-8") if isinstance(text, str) else b""
+        self.body = body
+        match = _ROOT.search(body)
+        self.root: Optional[str] = match.group(1).decode("ascii") if match else None
+        self.error_message: Optional[str] = None
+        self.error_code: Optional[str] = None
+        for kind, value in _ERROR.findall(body):
+            value = html.unescape(value.decode("utf-8", "replace"))
+            if kind == b"Message" and self.error_message is None:
+                self.error_message = value
+            elif kind == b"Code" and self.error_code is None:
+                self.error_code = value
+        self.outcome = _classify(self.error_message)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.response, name)
+
+    def __bool__(self) -> bool:
+        return bool(self.response)
+
+    def __repr__(self) -> str:
+        return f"<ClassifiedResponse {self.outcome.value} root={self.root}>"
+
+    @property
+    def is_error(self) -> bool:
+        """True if the body carries an ``errorMessage``, benign or not."""
+        return self.error_message is not None
+
+    @cached_property
+    def text(self) -> str:
+        text = getattr(self.response, "text", None)
+        return text if isinstance(text, str) else self.body.decode("utf-8", "replace")
+
+    @cached_property
+    def document(self) -> Any:
+        """The ``xmltodict`` parse of the body (with attributes)."""
+        start = time.perf_counter()
+        document = xmltodict.parse(self.body, xml_attribs=True)
+        if self.on_parse is not None:
+            self.on_parse(time.perf_counter() - start)
+        return document
+
+
+def parse_xml(r: Any) -> Any:
+    """``xmltodict`` document of a response, reusing a ``ClassifiedResponse``'s parse."""
+    if isinstance(r, ClassifiedResponse):
+        return r.document
+    return xmltodict.parse(r.content, xml_attribs=True)
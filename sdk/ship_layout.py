@@ -9,13 +9,31 @@ rooms in the game client.
 
 This module is pure-function: it takes already-fetched dicts and returns data
 structures / strings.  It never touches the network.
+
+Archived ``GetShipByUserId`` snapshots can be analyzed in bulk::
+
+    python -m sdk.ship_layout batch <dir> --designs room_designs.xml > layouts.jsonl
+
+which writes one JSON line per snapshot (see ``analyze_snapshots``).
 """
 
 from __future__ import annotations
 
+import argparse
+import gzip
+import json
 import math
-from dataclasses import dataclass, field
-from typing import Optional
+import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+import xmltodict
+
+from .models import Room, Ship
 
 
 # ---------------------------------------------------------------------------
@@ -62,8 +80,19 @@ _SECURITY_KEYWORDS = frozenset({"security", "gas", "trap", "anti-boarder", "anti
 # Corridor / lift keywords
 _CORRIDOR_KEYWORDS = frozenset({"lift", "corridor", "hallway", "walkway", "passage"})
 
+# Rooms whose protection and repair cover the defense score.
+CRITICAL_CATEGORIES = frozenset({"reactor", "weapon", "shield", "repair"})
 
-def _get_attr(design: dict, name: str, default=""):
+# Rooms assumed not to draw power in the power-balance estimate.
+_NON_CONSUMING_CATEGORIES = frozenset({"armor", "corridor", "storage"})
+# Rough power draw per consuming room.
+_POWER_PER_ROOM = 3
+
+# Boarder steps at which a critical room stops counting as exposed.
+_BOARDER_HORIZON = 12
+
+
+def get_attr(design: dict, name: str, default=""):
     """Safely get an @-prefixed attribute from a dict (handles xmltodict)."""
     val = design.get(name, design.get("@" + name.lstrip("@"), default))
     return val if val is not None else default
@@ -87,7 +116,7 @@ def _keyword_match(name: str, keywords: frozenset) -> bool:
 
 
 def _design_name(design: dict) -> str:
-    return str(_get_attr(design, "@RoomName", "")).lower()
+    return str(get_attr(design, "@RoomName", "")).lower()
 
 
 def classify_room(design: dict) -> str:
@@ -98,7 +127,7 @@ def classify_room(design: dict) -> str:
         'security', 'training', 'lab', 'bedroom', 'corridor',
         'storage', 'other'
     """
-    design_id = str(_get_attr(design, "@RoomDesignId", ""))
+    design_id = str(get_attr(design, "@RoomDesignId", ""))
     name = _design_name(design)
 
     # Check by design ID first (most reliable for armor)
@@ -106,7 +135,7 @@ def classify_room(design: dict) -> str:
         return "armor"
 
     # Check by capacity — bedrooms house crew
-    max_pop = _get_attr(design, "@MaxPopulation", "0")
+    max_pop = get_attr(design, "@MaxPopulation", "0")
     try:
         if int(max_pop) > 0:
             return "bedroom"
@@ -136,8 +165,8 @@ def classify_room(design: dict) -> str:
         return "storage"
 
     # Check if it's a 1×1 room with no special attributes — likely armor
-    width = int(_get_attr(design, "@ColumnWidth", "1"))
-    height = int(_get_attr(design, "@RowHeight", "1"))
+    width = int(get_attr(design, "@ColumnWidth", "1"))
+    height = int(get_attr(design, "@RowHeight", "1"))
     if width == 1 and height == 1 and design_id in _ARMOR_DESIGN_IDS:
         return "armor"
 
@@ -165,6 +194,43 @@ class RoomInfo:
     capacity: int = 0   # max population from design, if available
     upgrade_id: str = ""  # pending upgrade design ID
 
+    @classmethod
+    def from_room(cls, room: Room, design: dict) -> "RoomInfo":
+        """Combine a ship Room model with its RoomDesign dict (may be empty)."""
+        width = int(get_attr(design, "@ColumnWidth", "1"))
+        height = int(get_attr(design, "@RowHeight", "1"))
+        hp = 0
+        try:
+            hp = int(get_attr(design, "@RoomHp", "0"))
+        except (ValueError, TypeError):
+            pass
+        power = 0
+        try:
+            power = int(get_attr(design, "@PowerGenerated", "0"))
+        except (ValueError, TypeError):
+            pass
+        capacity = 0
+        try:
+            capacity = int(get_attr(design, "@MaxPopulation", "0"))
+        except (ValueError, TypeError):
+            pass
+
+        return cls(
+            room_id=room.room_id,
+            design_id=room.design_id,
+            row=room.row,
+            column=room.column,
+            status=room.status.lower(),
+            width=width,
+            height=height,
+            category=classify_room(design) if design else "other",
+            name=get_attr(design, "@RoomName", f"DesignID:{room.design_id}"),
+            hp=hp,
+            power=power,
+            capacity=capacity,
+            upgrade_id=room.upgrade_design_id,
+        )
+
 
 @dataclass
 class LayoutAnalysis:
@@ -183,78 +249,58 @@ class LayoutAnalysis:
     repair_proximity: float = 0.0  # 0-100, closeness of repairs to critical rooms
     weapon_coverage: float = 0.0  # 0-100, weapon distribution across ship
     power_balance: float = 0.0  # 0-100, power generated vs consumed
+    boarder_exposure: float = 0.0  # 0-100, mean exposure of critical rooms (lower = better)
+    boarder_ranking: list["RoomExposure"] = field(default_factory=list)  # most exposed first
 
 
 # ---------------------------------------------------------------------------
 # Core analysis
 # ---------------------------------------------------------------------------
 
-def parse_rooms(ship_data: dict, room_designs: list[dict]) -> list[RoomInfo]:
-    """Parse a ship's room data into RoomInfo objects.
-
-    Args:
-        ship_data: The parsed XML from GetShipByUserId
-                    (e.g., self.shipByUserId["ShipService"]["GetShipByUserId"]["Ship"])
-        room_designs: List of RoomDesign dicts from ListRoomDesigns2 or ListAllDesigns4
-
-    Returns:
-        List of RoomInfo, one per room on the ship.
-    """
-    # Build design lookup
+def index_room_designs(room_designs: Iterable[dict]) -> dict[str, dict]:
+    """RoomDesign dicts keyed by ``@RoomDesignId``."""
     designs_by_id = {}
     for design in room_designs:
-        did = _get_attr(design, "@RoomDesignId", "")
+        did = str(get_attr(design, "@RoomDesignId", ""))
         if did:
             designs_by_id[did] = design
+    return designs_by_id
 
-    # Extract rooms from ship data
-    rooms = ship_data.get("Rooms", {}).get("Room", [])
-    if isinstance(rooms, dict):
-        rooms = [rooms]
 
-    result = []
-    for room in rooms:
-        design_id = str(room.get("@RoomDesignId", ""))
-        design = designs_by_id.get(design_id, {})
+def snapshot_ship(snapshot: dict) -> dict:
+    """The ``Ship`` node of a GetShipByUserId payload (or the node itself)."""
+    node = snapshot
+    if "ShipService" in node:
+        node = node["ShipService"]
+    if "GetShipByUserId" in node:
+        node = node["GetShipByUserId"]
+    if "Ship" in node:
+        node = node["Ship"]
+    return node
 
-        width = int(_get_attr(design, "@ColumnWidth", "1"))
-        height = int(_get_attr(design, "@RowHeight", "1"))
-        hp = 0
-        try:
-            hp = int(_get_attr(design, "@RoomHp", "0"))
-        except (ValueError, TypeError):
-            pass
-        power = 0
-        try:
-            power = int(_get_attr(design, "@PowerGenerated", "0"))
-        except (ValueError, TypeError):
-            pass
-        capacity = 0
-        try:
-            capacity = int(_get_attr(design, "@MaxPopulation", "0"))
-        except (ValueError, TypeError):
-            pass
 
-        category = classify_room(design) if design else "other"
-        name = _get_attr(design, "@RoomName", f"DesignID:{design_id}")
+def parse_rooms(ship_data: dict | Ship, room_designs: list[dict] | dict[str, dict]) -> list[RoomInfo]:
+    """Parse a ship's room data into RoomInfo objects.
 
-        result.append(RoomInfo(
-            room_id=str(room.get("@RoomId", "")),
-            design_id=design_id,
-            row=int(room.get("@Row", 0)),
-            column=int(room.get("@Column", 0)),
-            status=str(room.get("@RoomStatus", "")).lower(),
-            width=width,
-            height=height,
-            category=category,
-            name=name,
-            hp=hp,
-            power=power,
-            capacity=capacity,
-            upgrade_id=str(room.get("@UpgradeRoomDesignId", "")),
-        ))
+    Args:
+        ship_data: A ``Ship`` model, or the parsed XML from GetShipByUserId
+                    (e.g., self.shipByUserId["ShipService"]["GetShipByUserId"]["Ship"])
+        room_designs: List of RoomDesign dicts from ListRoomDesigns2 or ListAllDesigns4,
+                      or an ``index_room_designs`` lookup shared across calls
+
+    Returns:
+        List of RoomInfo, one per room on the ship.
+    """
+    if isinstance(room_designs, dict):
+        designs_by_id = room_designs
+    else:
+        designs_by_id = index_room_designs(room_designs)
 
-    return result
+    ship = ship_data if isinstance(ship_data, Ship) else Ship.from_xml(ship_data)
+    return [
+        RoomInfo.from_room(room, designs_by_id.get(room.design_id, {}))
+        for room in ship.rooms
+    ]
 
 
 def _manhattan_distance(r1: RoomInfo, r2: RoomInfo) -> int:
@@ -268,29 +314,231 @@ def _manhattan_distance(r1: RoomInfo, r2: RoomInfo) -> int:
 
 def _rooms_overlap(a: RoomInfo, b: RoomInfo) -> bool:
     """Check if two rooms physically overlap on the grid."""
-    a_rows = range(a.row, a.row + a.height)
-    a_cols = range(a.column, a.column + a.width)
-    b_rows = range(b.row, b.row + b.height)
-    b_cols = range(b.column, b.column + b.width)
-    return bool(set(a_rows) & set(b_rows) and set(a_cols) & set(b_cols))
+    return (
+        a.row < b.row + b.height and b.row < a.row + a.height
+        and a.column < b.column + b.width and b.column < a.column + a.width
+    )
 
 
 def _is_adjacent(a: RoomInfo, b: RoomInfo) -> bool:
     """Check if two rooms are adjacent (touching, not overlapping)."""
     if _rooms_overlap(a, b):
         return False
-    # Check if any tile of A is adjacent (1 step) to any tile of B
-    a_tiles = {(r, c) for r in range(a.row, a.row + a.height) for c in range(a.column, a.column + a.width)}
-    b_tiles = {(r, c) for r in range(b.row, b.row + b.height) for c in range(b.column, b.column + b.width)}
-    for ar, ac in a_tiles:
-        for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            if (ar + dr, ac + dc) in b_tiles:
-                return True
-    return False
+    rows_touch = a.row < b.row + b.height and b.row < a.row + a.height
+    cols_touch = a.column < b.column + b.width and b.column < a.column + a.width
+    side_by_side = rows_touch and (a.column + a.width == b.column or b.column + b.width == a.column)
+    stacked = cols_touch and (a.row + a.height == b.row or b.row + b.height == a.row)
+    return side_by_side or stacked
+
+
+@dataclass(frozen=True)
+class LayoutGrid:
+    """Tile occupancy and room adjacency for one layout.
+
+    Built in a single pass over the rooms' tiles: every tile records the
+    index (into the ``rooms`` list) of the room covering it, and neighbouring
+    tiles owned by different rooms become edges of the adjacency graph.
+    Rooms that overlap each other are never adjacent, matching
+    ``_is_adjacent``.
+    """
+    row_offset: int
+    col_offset: int
+    cells: tuple[tuple[int, ...], ...]  # room index per tile, -1 if empty
+    adjacency: tuple[frozenset[int], ...]
+    overlaps: frozenset[tuple[int, int]]  # (i, j) with i < j
+
+    @classmethod
+    def from_rooms(cls, rooms: list[RoomInfo]) -> "LayoutGrid":
+        if not rooms:
+            return cls(0, 0, (), (), frozenset())
+        row_offset = min(r.row for r in rooms)
+        col_offset = min(r.column for r in rooms)
+        n_rows = max(r.row + max(r.height, 1) for r in rooms) - row_offset
+        n_cols = max(r.column + max(r.width, 1) for r in rooms) - col_offset
+        cells = [[-1] * n_cols for _ in range(n_rows)]
+        # Tiles claimed by more than one room keep every occupant here.
+        shared: dict[tuple[int, int], list[int]] = {}
+        overlaps: set[tuple[int, int]] = set()
+
+        for index, room in enumerate(rooms):
+            r0, c0 = room.row - row_offset, room.column - col_offset
+            for r in range(r0, r0 + max(room.height, 1)):
+                row = cells[r]
+                for c in range(c0, c0 + max(room.width, 1)):
+                    owner = row[c]
+                    if owner == -1:
+                        row[c] = index
+                        continue
+                    occupants = shared.setdefault((r, c), [owner])
+                    for other in occupants:
+                        overlaps.add((other, index) if other < index else (index, other))
+                    occupants.append(index)
+
+        neighbours: list[set[int]] = [set() for _ in rooms]
+
+        def link(a: int, b: int) -> None:
+            if a != b and (min(a, b), max(a, b)) not in overlaps:
+                neighbours[a].add(b)
+                neighbours[b].add(a)
+
+        for r in range(n_rows):
+            row = cells[r]
+            below = cells[r + 1] if r + 1 < n_rows else None
+            for c in range(n_cols):
+                here = row[c]
+                if here == -1:
+                    continue
+                right = row[c + 1] if c + 1 < n_cols else -1
+                down = below[c] if below is not None else -1
+                for other in (right, down):
+                    if other != -1 and other != here:
+                        link(here, other)
+
+        # Rooms hidden under a shared tile still touch that tile's neighbours.
+        for (r, c), occupants in shared.items():
+            for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < n_rows and 0 <= nc < n_cols) or cells[nr][nc] == -1:
+                    continue
+                for other in shared.get((nr, nc), [cells[nr][nc]]):
+                    for index in occupants:
+                        link(index, other)
+
+        return cls(
+            row_offset=row_offset,
+            col_offset=col_offset,
+            cells=tuple(tuple(row) for row in cells),
+            adjacency=tuple(frozenset(n) for n in neighbours),
+            overlaps=frozenset(overlaps),
+        )
+
+    def room_at(self, row: int, column: int) -> int:
+        """Index of the room covering a tile, or -1."""
+        r, c = row - self.row_offset, column - self.col_offset
+        if 0 <= r < len(self.cells) and 0 <= c < len(self.cells[r]):
+            return self.cells[r][c]
+        return -1
+
+    def neighbours(self, index: int) -> frozenset[int]:
+        return self.adjacency[index]
+
+
+@dataclass(frozen=True)
+class RoomExposure:
+    """How quickly boarders can reach one critical room."""
+    room: RoomInfo
+    distance: Optional[int]  # boarder steps from the nearest entry; None if unreachable
+    exposure: float          # 0-100, 100 = boarders start inside the room
+
+
+@dataclass(frozen=True)
+class BoarderMap:
+    """Walkable tiles and the boarder distance field for one layout.
+
+    Boarders walk room interiors and corridors: they step sideways between
+    any two walkable tiles, but only change rows inside one room or through
+    stacked lifts/corridors (``_CORRIDOR_KEYWORDS``).  Armor is solid.  By
+    default they enter on hull-edge tiles — walkable tiles with open space
+    beside them.  One multi-source BFS from every entry gives the distance
+    field, so each room's exposure is a lookup over its tiles.
+    """
+    row_offset: int
+    col_offset: int
+    distance: tuple[tuple[int, ...], ...]  # steps per tile, -1 if unreachable or solid
+    entries: frozenset[tuple[int, int]]    # absolute (row, column)
+
+    @classmethod
+    def from_grid(cls, rooms: list[RoomInfo], grid: LayoutGrid,
+                  entries: Optional[Iterable[tuple[int, int]]] = None) -> "BoarderMap":
+        cells = grid.cells
+        n_rows = len(cells)
+        n_cols = len(cells[0]) if cells else 0
+
+        def walkable(r: int, c: int) -> bool:
+            if not (0 <= r < n_rows and 0 <= c < n_cols):
+                return False
+            owner = cells[r][c]
+            return owner != -1 and rooms[owner].category != "armor"
+
+        def steps(r: int, c: int) -> Iterator[tuple[int, int]]:
+            owner = cells[r][c]
+            for nc in (c - 1, c + 1):
+                if walkable(r, nc):
+                    yield (r, nc)
+            for nr in (r - 1, r + 1):
+                if not walkable(nr, c):
+                    continue
+                other = cells[nr][c]
+                if other == owner or (rooms[owner].category == "corridor"
+                                      and rooms[other].category == "corridor"):
+                    yield (nr, c)
+
+        if entries is None:
+            starts = [
+                (r, c) for r in range(n_rows) for c in range(n_cols)
+                if walkable(r, c) and any(
+                    not (0 <= nr < n_rows and 0 <= nc < n_cols) or cells[nr][nc] == -1
+                    for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                )
+            ]
+        else:
+            starts = [
+                (row - grid.row_offset, col - grid.col_offset) for row, col in entries
+                if walkable(row - grid.row_offset, col - grid.col_offset)
+            ]
+
+        distance = [[-1] * n_cols for _ in range(n_rows)]
+        queue = deque()
+        for r, c in starts:
+            if distance[r][c] == -1:
+                distance[r][c] = 0
+                queue.append((r, c))
+        while queue:
+            r, c = queue.popleft()
+            for nr, nc in steps(r, c):
+                if distance[nr][nc] == -1:
+                    distance[nr][nc] = distance[r][c] + 1
+                    queue.append((nr, nc))
+
+        return cls(
+            row_offset=grid.row_offset,
+            col_offset=grid.col_offset,
+            distance=tuple(tuple(row) for row in distance),
+            entries=frozenset((r + grid.row_offset, c + grid.col_offset) for r, c in starts),
+        )
+
+    def distance_at(self, row: int, column: int) -> Optional[int]:
+        """Boarder steps to a tile, or None if boarders cannot reach it."""
+        r, c = row - self.row_offset, column - self.col_offset
+        if 0 <= r < len(self.distance) and 0 <= c < len(self.distance[r]):
+            d = self.distance[r][c]
+            return d if d >= 0 else None
+        return None
+
+    def exposure(self, room: RoomInfo) -> RoomExposure:
+        reached = [
+            d for r in range(room.row, room.row + room.height)
+            for c in range(room.column, room.column + room.width)
+            if (d := self.distance_at(r, c)) is not None
+        ]
+        if not reached:
+            return RoomExposure(room=room, distance=None, exposure=0.0)
+        nearest = min(reached)
+        return RoomExposure(
+            room=room, distance=nearest,
+            exposure=max(0.0, 100 - (nearest / _BOARDER_HORIZON) * 100),
+        )
+
+    def rank(self, rooms: Iterable[RoomInfo]) -> list[RoomExposure]:
+        """Exposure of ``rooms``, most exposed first."""
+        return sorted(
+            (self.exposure(room) for room in rooms),
+            key=lambda e: (-e.exposure, e.room.row, e.room.column),
+        )
 
 
 def analyze_layout(rooms: list[RoomInfo], ship_name: str = "", ship_level: int = 0,
-                   ship_design_id: str = "") -> LayoutAnalysis:
+                   ship_design_id: str = "", grid: Optional[LayoutGrid] = None) -> LayoutAnalysis:
     """Analyze a complete ship layout and provide strategic recommendations.
 
     This is a read-only analysis — it does not modify the ship. It evaluates:
@@ -305,6 +553,8 @@ def analyze_layout(rooms: list[RoomInfo], ship_name: str = "", ship_level: int =
         ship_name: Ship name for reporting
         ship_level: Ship level for context
         ship_design_id: Ship design ID for context
+        grid: Precomputed ``LayoutGrid.from_rooms(rooms)``, if the caller
+            already has one
 
     Returns:
         LayoutAnalysis with scores and recommendations.
@@ -327,30 +577,25 @@ def analyze_layout(rooms: list[RoomInfo], ship_name: str = "", ship_level: int =
     analysis.grid_cols = (min(all_cols), max(all_cols))
 
     # Count by category
-    from collections import Counter
     cat_counts = Counter(r.category for r in rooms)
     analysis.rooms_by_category = dict(cat_counts)
 
     # Identify critical rooms (reactors, weapons, shields, repair)
-    critical_categories = {"reactor", "weapon", "shield", "repair"}
-    critical_rooms = [r for r in rooms if r.category in critical_categories]
-    armor_rooms = [r for r in rooms if r.category == "armor"]
+    critical_indexes = [i for i, r in enumerate(rooms) if r.category in CRITICAL_CATEGORIES]
+    critical_rooms = [rooms[i] for i in critical_indexes]
+    if grid is None:
+        grid = LayoutGrid.from_rooms(rooms)
 
     # ========================================
     # 1. Armor Coverage
     # ========================================
     protected_count = 0
     exposed_critical = []
-    for crit in critical_rooms:
-        is_protected = False
-        for armor in armor_rooms:
-            if _is_adjacent(crit, armor):
-                is_protected = True
-                break
-        if is_protected:
+    for index in critical_indexes:
+        if any(rooms[n].category == "armor" for n in grid.adjacency[index]):
             protected_count += 1
         else:
-            exposed_critical.append(crit)
+            exposed_critical.append(rooms[index])
 
     if critical_rooms:
         analysis.armor_coverage = (protected_count / len(critical_rooms)) * 100
@@ -426,8 +671,8 @@ def analyze_layout(rooms: list[RoomInfo], ship_name: str = "", ship_level: int =
     reactor_rooms = [r for r in rooms if r.category == "reactor"]
     total_power = sum(r.power for r in reactor_rooms)
     # Estimate power consumption: each non-armor room consumes some power
-    consuming_rooms = [r for r in rooms if r.category not in ("armor", "corridor", "storage")]
-    estimated_consumption = len(consuming_rooms) * 3  # rough estimate
+    consuming_rooms = [r for r in rooms if r.category not in _NON_CONSUMING_CATEGORIES]
+    estimated_consumption = len(consuming_rooms) * _POWER_PER_ROOM  # rough estimate
     if total_power > 0:
         analysis.power_balance = min(100, (total_power / max(1, estimated_consumption)) * 50)
     elif reactor_rooms:
@@ -440,7 +685,24 @@ def analyze_layout(rooms: list[RoomInfo], ship_name: str = "", ship_level: int =
         analysis.power_balance = 0
 
     # ========================================
-    # 5. Overall Defense Score
+    # 5. Boarder Exposure
+    # ========================================
+    boarders = BoarderMap.from_grid(rooms, grid)
+    analysis.boarder_ranking = boarders.rank(critical_rooms)
+    if analysis.boarder_ranking:
+        analysis.boarder_exposure = (
+            sum(e.exposure for e in analysis.boarder_ranking) / len(analysis.boarder_ranking)
+        )
+        breached = [e for e in analysis.boarder_ranking if e.distance is not None and e.distance <= 2]
+        if breached:
+            names = [e.room.name for e in breached[:5]]
+            analysis.recommendations.append(
+                f"Boarder exposure: {len(breached)} critical room(s) are within 2 steps of a "
+                f"hull entry: {', '.join(names)}. Wall them off with armor or move them inward."
+            )
+
+    # ========================================
+    # 6. Overall Defense Score
     # ========================================
     analysis.defense_score = (
         analysis.armor_coverage * 0.35 +
@@ -450,7 +712,7 @@ def analyze_layout(rooms: list[RoomInfo], ship_name: str = "", ship_level: int =
     )
 
     # ========================================
-    # 6. Additional checks
+    # 7. Additional checks
     # ========================================
     # Check for rooms under construction
     constructing = [r for r in rooms if r.status == "constructing"]
@@ -481,6 +743,268 @@ def analyze_layout(rooms: list[RoomInfo], ship_name: str = "", ship_level: int =
     return analysis
 
 
+class LayoutState:
+    """Incrementally maintained defense-score terms for a mutable layout.
+
+    Answers what-if questions ("move this reactor two tiles left") without
+    re-running ``analyze_layout``.  Keeps the tile occupancy, per-critical-room
+    armor neighbour counts, nearest-repair distances, the column tally behind
+    the weapon left/right split and the power totals, and updates them in
+    O(affected rooms) per ``add`` / ``remove`` / ``move``.
+
+    Scores equal ``analyze_layout(state.rooms)`` for layouts without
+    overlapping rooms.
+    """
+
+    def __init__(self, rooms: Iterable[RoomInfo] = ()):
+        self._rooms: dict[str, RoomInfo] = {}
+        self._occupancy: dict[tuple[int, int], str] = {}
+        self._columns: Counter[int] = Counter()
+        self._weapon_columns: Counter[int] = Counter()
+        self._repairs: set[str] = set()
+        self._armor_count: dict[str, int] = {}   # critical room -> adjacent armor rooms
+        self._protected = 0                      # critical rooms with armor_count > 0
+        self._nearest_repair: dict[str, int] = {}
+        self._nearest_total = 0
+        self._reactors = 0
+        self._total_power = 0
+        self._consuming = 0
+        for room in rooms:
+            self.add(room)
+
+    # -- queries ------------------------------------------------------------
+
+    @property
+    def rooms(self) -> list[RoomInfo]:
+        return list(self._rooms.values())
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def __contains__(self, room_id: str) -> bool:
+        return room_id in self._rooms
+
+    def room(self, room_id: str) -> RoomInfo:
+        return self._rooms[room_id]
+
+    def room_at(self, row: int, column: int) -> Optional[str]:
+        """Room ID covering a tile, or None."""
+        return self._occupancy.get((row, column))
+
+    def neighbours(self, room_id: str) -> set[str]:
+        return self._neighbours(self._rooms[room_id])
+
+    def fits(self, room: RoomInfo, row: int, column: int,
+             bounds: Optional[tuple[int, int, int, int]] = None,
+             allowed: Optional[frozenset[tuple[int, int]]] = None,
+             ignore: Iterable[str] = ()) -> bool:
+        """True if ``room`` can sit at (row, column) without overlapping others.
+
+        Args:
+            bounds: Optional (min_row, max_row, min_col, max_col), inclusive.
+            allowed: Optional set of tiles rooms may occupy.
+            ignore: Room IDs whose tiles count as free (e.g. a swap partner).
+        """
+        if bounds is not None:
+            min_row, max_row, min_col, max_col = bounds
+            if row < min_row or column < min_col:
+                return False
+            if row + room.height - 1 > max_row or column + room.width - 1 > max_col:
+                return False
+        skip = {room.room_id, *ignore}
+        for tile in _tiles(room, row, column):
+            owner = self._occupancy.get(tile)
+            if owner is not None and owner not in skip:
+                return False
+            if allowed is not None and tile not in allowed:
+                return False
+        return True
+
+    # -- scores ---------------------------------------------------------------
+
+    @property
+    def armor_coverage(self) -> float:
+        critical = len(self._armor_count)
+        if not critical:
+            return 100 if self._rooms else 0
+        return (self._protected / critical) * 100
+
+    @property
+    def repair_proximity(self) -> float:
+        critical = len(self._armor_count)
+        if not self._repairs or not critical:
+            return 0
+        average = self._nearest_total / critical
+        return max(0, 100 - (average / 20) * 100)
+
+    @property
+    def weapon_coverage(self) -> float:
+        weapons = sum(self._weapon_columns.values())
+        if not weapons:
+            return 0
+        low, high = min(self._columns), max(self._columns)
+        if high == low:
+            return 100
+        mid = low + (high - low) // 2
+        left = sum(n for column, n in self._weapon_columns.items() if column < mid)
+        right = weapons - left
+        balance = min(left, right) / max(left, right) if max(left, right) > 0 else 1
+        return balance * 100
+
+    @property
+    def power_balance(self) -> float:
+        if self._total_power > 0:
+            return min(100, (self._total_power / max(1, self._consuming * _POWER_PER_ROOM)) * 50)
+        if self._reactors:
+            return 50
+        return 0
+
+    @property
+    def defense_score(self) -> float:
+        """Same weighting as ``analyze_layout``."""
+        return (
+            self.armor_coverage * 0.35 +
+            self.repair_proximity * 0.25 +
+            self.weapon_coverage * 0.20 +
+            self.power_balance * 0.20
+        )
+
+    # -- mutations --------------------------------------------------------------
+
+    def add(self, room: RoomInfo) -> None:
+        """Place a room; its tiles must be free (see ``fits``)."""
+        if room.room_id in self._rooms:
+            raise ValueError(f"room {room.room_id!r} is already placed")
+        self._rooms[room.room_id] = room
+        for tile in _tiles(room, room.row, room.column):
+            self._occupancy.setdefault(tile, room.room_id)
+        self._columns[room.column] += 1
+
+        category = room.category
+        if category == "weapon":
+            self._weapon_columns[room.column] += 1
+        if category == "reactor":
+            self._reactors += 1
+            self._total_power += room.power
+        if category not in _NON_CONSUMING_CATEGORIES:
+            self._consuming += 1
+
+        neighbours = self._neighbours(room)
+        if category == "armor":
+            for other in neighbours:
+                if other in self._armor_count:
+                    self._adjust_armor(other, +1)
+        if category == "repair":
+            self._repairs.add(room.room_id)
+            for other in self._nearest_repair:
+                distance = _manhattan_distance(self._rooms[other], room)
+                if len(self._repairs) == 1 or distance < self._nearest_repair[other]:
+                    self._set_nearest(other, distance)
+        if category in CRITICAL_CATEGORIES:
+            count = sum(1 for other in neighbours if self._rooms[other].category == "armor")
+            self._armor_count[room.room_id] = count
+            self._protected += count > 0
+            distance = min(
+                (_manhattan_distance(room, self._rooms[rep]) for rep in self._repairs), default=0
+            )
+            self._nearest_repair[room.room_id] = distance
+            self._nearest_total += distance
+
+    def remove(self, room_id: str) -> RoomInfo:
+        """Take a room off the layout and return it."""
+        room = self._rooms[room_id]
+        category = room.category
+        if category in CRITICAL_CATEGORIES:
+            self._protected -= self._armor_count.pop(room_id) > 0
+            self._nearest_total -= self._nearest_repair.pop(room_id)
+        if category == "armor":
+            for other in self._neighbours(room):
+                if other in self._armor_count:
+                    self._adjust_armor(other, -1)
+
+        for tile in _tiles(room, room.row, room.column):
+            if self._occupancy.get(tile) == room_id:
+                del self._occupancy[tile]
+        del self._rooms[room_id]
+        _decrement(self._columns, room.column)
+        if category == "weapon":
+            _decrement(self._weapon_columns, room.column)
+        if category == "reactor":
+            self._reactors -= 1
+            self._total_power -= room.power
+        if category not in _NON_CONSUMING_CATEGORIES:
+            self._consuming -= 1
+
+        if category == "repair":
+            self._repairs.discard(room_id)
+            for other, distance in self._nearest_repair.items():
+                if distance == _manhattan_distance(self._rooms[other], room):
+                    self._set_nearest(other, min(
+                        (_manhattan_distance(self._rooms[other], self._rooms[rep]) for rep in self._repairs),
+                        default=0,
+                    ))
+        return room
+
+    def move(self, room_id: str, row: int, column: int) -> RoomInfo:
+        """Move a room to (row, column); returns the room as it was."""
+        return self.relocate({room_id: (row, column)})[room_id]
+
+    def relocate(self, moves: dict[str, tuple[int, int]]) -> dict[str, RoomInfo]:
+        """Move several rooms at once (e.g. a swap); returns the rooms as they were.
+
+        ``state.restore(previous)`` undoes the change.
+        """
+        previous = {room_id: self.remove(room_id) for room_id in moves}
+        for room_id, (row, column) in moves.items():
+            self.add(replace(previous[room_id], row=row, column=column))
+        return previous
+
+    def restore(self, previous: dict[str, RoomInfo]) -> None:
+        """Put rooms back as returned by ``relocate``."""
+        for room_id in previous:
+            self.remove(room_id)
+        for room in previous.values():
+            self.add(room)
+
+    # -- helpers -----------------------------------------------------------------
+
+    def _neighbours(self, room: RoomInfo) -> set[str]:
+        found = set()
+        row, column = room.row, room.column
+        for c in range(column, column + room.width):
+            for tile in ((row - 1, c), (row + room.height, c)):
+                other = self._occupancy.get(tile)
+                if other is not None and other != room.room_id:
+                    found.add(other)
+        for r in range(row, row + room.height):
+            for tile in ((r, column - 1), (r, column + room.width)):
+                other = self._occupancy.get(tile)
+                if other is not None and other != room.room_id:
+                    found.add(other)
+        return found
+
+    def _adjust_armor(self, room_id: str, delta: int) -> None:
+        before = self._armor_count[room_id] > 0
+        self._armor_count[room_id] += delta
+        self._protected += (self._armor_count[room_id] > 0) - before
+
+    def _set_nearest(self, room_id: str, distance: int) -> None:
+        self._nearest_total += distance - self._nearest_repair[room_id]
+        self._nearest_repair[room_id] = distance
+
+
+def _tiles(room: RoomInfo, row: int, column: int) -> Iterator[tuple[int, int]]:
+    for r in range(row, row + room.height):
+        for c in range(column, column + room.width):
+            yield (r, c)
+
+
+def _decrement(counter: Counter, key) -> None:
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
+
+
 def format_analysis_report(analysis: LayoutAnalysis) -> str:
     """Format a LayoutAnalysis into a human-readable report."""
     lines = []
@@ -512,6 +1036,14 @@ def format_analysis_report(analysis: LayoutAnalysis) -> str:
             lines.append(f"  ... and {len(analysis.critical_rooms) - 10} more")
         lines.append("")
 
+    if analysis.boarder_ranking:
+        lines.append(f"--- Boarder Exposure: {analysis.boarder_exposure:.0f}/100 (lower is better) ---")
+        for e in analysis.boarder_ranking[:5]:
+            steps = f"{e.distance} step(s) from entry" if e.distance is not None else "unreachable"
+            lines.append(f"  {e.room.name} (Row {e.room.row}, Col {e.room.column}) — "
+                         f"{e.exposure:.0f}/100, {steps}")
+        lines.append("")
+
     if analysis.recommendations:
         lines.append("--- Recommendations ---")
         for i, rec in enumerate(analysis.recommendations, 1):
@@ -520,3 +1052,175 @@ def format_analysis_report(analysis: LayoutAnalysis) -> str:
         lines.append("--- No recommendations: layout looks solid! ---")
 
     return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Batch analysis of archived snapshots
+# ---------------------------------------------------------------------------
+
+_SNAPSHOT_SUFFIXES = (".xml", ".json", ".xml.gz", ".json.gz")
+
+# Room-design index shared by the batch worker processes.
+_batch_designs: dict[str, dict] = {}
+
+
+def _load_payload(path: Path) -> Any:
+    """Read an XML or JSON (optionally gzipped) API payload."""
+    name = path.name.lower()  # same matching as iter_snapshots
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        raw = f.read()
+    if name.removesuffix(".gz").endswith(".xml"):
+        return xmltodict.parse(raw, xml_attribs=True)
+    return json.loads(raw)
+
+
+def _find_key(data: Any, key: str) -> Any:
+    """First value stored under ``key`` anywhere in a nested payload."""
+    if isinstance(data, dict):
+        if key in data:
+            return data[key]
+        values = data.values()
+    elif isinstance(data, list):
+        values = data
+    else:
+        return None
+    for value in values:
+        found = _find_key(value, key)
+        if found is not None:
+            return found
+    return None
+
+
+def load_room_designs(path: str | os.PathLike) -> dict[str, dict]:
+    """Room-design index from a saved ListRoomDesigns2 / ListAllDesigns4 payload.
+
+    Accepts XML or JSON (optionally gzipped); a JSON file may also hold a
+    plain list of RoomDesign dicts.
+    """
+    data = _load_payload(Path(path))
+    designs = data if isinstance(data, list) else _find_key(data, "RoomDesign")
+    if isinstance(designs, dict):
+        designs = [designs]
+    return index_room_designs(designs or [])
+
+
+def iter_snapshots(directory: str | os.PathLike) -> Iterator[Path]:
+    """Snapshot files in ``directory``, in name order."""
+    with os.scandir(directory) as entries:
+        names = sorted(
+            e.name for e in entries
+            if e.is_file() and e.name.lower().endswith(_SNAPSHOT_SUFFIXES)
+        )
+    for name in names:
+        yield Path(directory, name)
+
+
+def analysis_record(analysis: LayoutAnalysis) -> dict:
+    """JSON-ready summary of a LayoutAnalysis."""
+    return {
+        "ship_name": analysis.ship_name,
+        "ship_level": analysis.ship_level,
+        "ship_design_id": analysis.ship_design_id,
+        "total_rooms": analysis.total_rooms,
+        "rooms_by_category": analysis.rooms_by_category,
+        "defense_score": round(analysis.defense_score, 2),
+        "armor_coverage": round(analysis.armor_coverage, 2),
+        "repair_proximity": round(analysis.repair_proximity, 2),
+        "weapon_coverage": round(analysis.weapon_coverage, 2),
+        "power_balance": round(analysis.power_balance, 2),
+        "boarder_exposure": round(analysis.boarder_exposure, 2),
+        "exposed_critical_rooms": [r.name for r in analysis.critical_rooms],
+        "boarder_ranking": [
+            {"room": e.room.name, "distance": e.distance, "exposure": round(e.exposure, 2)}
+            for e in analysis.boarder_ranking
+        ],
+        "recommendations": analysis.recommendations,
+    }
+
+
+def _init_batch_worker(designs_by_id: dict[str, dict]) -> None:
+    global _batch_designs
+    _batch_designs = designs_by_id
+
+
+def _analyze_snapshot(path: Path) -> dict:
+    try:
+        # Ship.from_xml tolerates malformed header fields (they read as 0/""),
+        # so a bad @ShipLevel does not cost the whole layout.
+        ship = Ship.from_xml(snapshot_ship(_load_payload(path)))
+        analysis = analyze_layout(
+            parse_rooms(ship, _batch_designs),
+            ship_name=ship.name,
+            ship_level=ship.level,
+            ship_design_id=ship.design_id,
+        )
+        return {"file": path.name, **analysis_record(analysis)}
+    except Exception as e:
+        return {"file": path.name, "error": f"{type(e).__name__}: {e}"}
+
+
+def analyze_snapshots(paths: Iterable[Path], designs_by_id: dict[str, dict],
+                      processes: Optional[int] = None) -> Iterator[dict]:
+    """Analyze snapshot files, yielding one record per file in input order.
+
+    Workers read and parse their own files, so the parent only streams
+    paths and results.  A file that cannot be read or parsed yields
+    ``{"file": ..., "error": ...}`` instead of stopping the batch.
+
+    Args:
+        processes: Worker processes; ``None`` uses the CPU count and ``1``
+            runs in-process.
+    """
+    if processes == 1:
+        _init_batch_worker(designs_by_id)
+        for path in paths:
+            yield _analyze_snapshot(path)
+        return
+
+    paths = list(paths)
+    workers = processes or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(designs_by_id,)) as pool:
+        yield from pool.map(_analyze_snapshot, paths, chunksize=chunksize)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """CLI entry point: ``python -m sdk.ship_layout batch <dir>``."""
+    parser = argparse.ArgumentParser(
+        prog="python -m sdk.ship_layout",
+        description="Analyze archived GetShipByUserId snapshots",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    batch = commands.add_parser("batch", help="analyze every snapshot in a directory")
+    batch.add_argument("directory", help="directory of .xml/.json(.gz) snapshots")
+    batch.add_argument(
+        "--designs",
+        required=True,
+        help="saved ListRoomDesigns2 or ListAllDesigns4 payload (XML or JSON)",
+    )
+    batch.add_argument("--output", "-o", default=None, help="JSON-lines file (default: stdout)")
+    batch.add_argument(
+        "--processes", "-j",
+        type=int,
+        default=None,
+        help="worker processes (default: CPU count; 1 runs in-process)",
+    )
+    args = parser.parse_args(argv)
+
+    designs_by_id = load_room_designs(args.designs)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failures = 0
+    try:
+        for record in analyze_snapshots(iter_snapshots(args.directory), designs_by_id, args.processes):
+            failures += "error" in record
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
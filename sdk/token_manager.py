@@ -0,0 +1,123 @@
+"""Single-flight access-token refresh for one account — no network of its own.
+
+Every API URL carries the session's ``accessToken``.  When the server answers
+"Failed to authorize access token" the session has to be re-established with
+DeviceLogin17, the slowest call a run makes.  ``TokenManager`` makes sure that
+happens once per expired token:
+
+- ``refresh(stale)`` runs the login callback only if ``stale`` is still the
+  current token and no refresh is in flight; other callers that hit the same
+  error block until that refresh finishes and then get the new token.
+- ``ensure_fresh()`` refreshes ahead of time when the token's lifetime is known
+  (``lifetime`` seconds after it was issued, minus ``margin``).
+
+``with_access_token`` rewrites a URL's ``accessToken`` parameter so a request
+built with the old token can be replayed with the new one.  That only works
+for unsigned URLs: a ``checksum`` parameter is usually computed over the
+token, so a signed URL has to be rebuilt from scratch (``is_signed``).
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+_ACCESS_TOKEN_PARAM = re.compile(r"([?&]accessToken=)([^&]*)")
+_CHECKSUM_PARAM = re.compile(r"[?&]checksum=")
+
+
+def access_token_of(url: str) -> Optional[str]:
+    """The ``accessToken`` query parameter of ``url``, if any."""
+    match = _ACCESS_TOKEN_PARAM.search(url)
+    return match.group(2) if match else None
+
+
+def with_access_token(url: str, token: str) -> str:
+    """``url`` with its ``accessToken`` parameter replaced by ``token``."""
+    return _ACCESS_TOKEN_PARAM.sub(lambda m: m.group(1) + token, url)
+
+
+def is_signed(url: str) -> bool:
+    """True if ``url`` carries a ``checksum`` parameter."""
+    return _CHECKSUM_PARAM.search(url) is not None
+
+
+class TokenManager:
+    """Holds the access token and serialises its refreshes.
+
+    ``renew`` is called without the lock held and returns the new token (or
+    None if the login failed).
+    """
+
+    def __init__(self, renew: Callable[[], Optional[str]], lifetime: Optional[float] = None,
+                 margin: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self._renew = renew
+        self.lifetime = lifetime
+        self.margin = margin
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._token: Optional[str] = None
+        self._issued: Optional[float] = None
+        self._refreshing = False
+        self._generation = 0
+        self.refreshes = 0
+        self.coalesced = 0
+
+    @property
+    def token(self) -> Optional[str]:
+        with self._cond:
+            return self._token
+
+    def set(self, token: Optional[str]) -> None:
+        """Record a token obtained outside ``refresh`` (e.g. by ``login``)."""
+        with self._cond:
+            if token != self._token:
+                self._token = token
+                self._issued = self._clock() if token else None
+
+    def expiring(self) -> bool:
+        """True if the token's known lifetime is within ``margin`` of ending."""
+        with self._cond:
+            if self.lifetime is None or self._issued is None:
+                return False
+            return self._clock() >= self._issued + self.lifetime - self.margin
+
+    def refresh(self, stale: Optional[str] = None) -> Optional[str]:
+        """Replace ``stale`` with a new token; return the current token.
+
+        If another caller already replaced ``stale`` the current token is
+        returned at once; if a refresh is in flight this waits for it.
+        """
+        with self._cond:
+            if self._token and self._token != stale:
+                self.coalesced += 1
+                return self._token
+            if self._refreshing:
+                # Share the in-flight refresh, whether it succeeds or not.
+                generation = self._generation
+                while self._generation == generation:
+                    self._cond.wait()
+                self.coalesced += 1
+                return self._token
+            self._refreshing = True
+        token = None
+        try:
+            token = self._renew()
+        finally:
+            with self._cond:
+                self._refreshing = False
+                self._generation += 1
+                self.refreshes += 1
+                if token:
+                    self._token = token
+                    self._issued = self._clock()
+                self._cond.notify_all()
+        return token
+
+    def ensure_fresh(self) -> Optional[str]:
+        """The current token, refreshed first if it is about to expire."""
+        if self.expiring():
+            return self.refresh(self.token)
+        return self.token
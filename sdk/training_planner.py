@@ -0,0 +1,355 @@
+"""Crew training planner — pure decisions, no HTTP.
+
+Given snapshots of the roster, the rooms crew are standing in, the design
+catalog and the research state, ``plan_training`` decides in one pass which
+trainings to finish and start and which consumables to use.  The Client
+only executes the resulting ``TrainingPlan``.
+
+Role assignments (which crew train which stats in which rooms) are data, not
+code: they live in ``training_roles.json`` next to this module.
+
+Tier rules, by training completion percent:
+
+    primary room:    T1 < 51%, T2 51-64%, T3 65-71%
+    > 71% outside the secondary room: ask the player to move the crew
+    secondary room:  T1 72-73%, T2 74-84%, T3 85-89%
+    > 89%: training complete
+
+T2/T3 require Fitness or Education research at 201/203 (T1 in the primary
+room requires 101).  A new training only starts once the previous one ended
+at least the tier's cooldown ago.
+
+Consumables are only planned with ``use_consumables=True``: until this
+planner was extracted the consumable branch never matched a stat, so runs
+did not spend the player's items and still do not by default.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Mapping, Optional
+
+from .crew_leveling import parse_server_datetime
+from .design_catalog import DesignCatalog
+from .models import TRAINING_STATS, Character
+
+ROLES_PATH = Path(__file__).with_name("training_roles.json")
+
+# Rooms in which crew can train at all.
+TRAINING_ROOMS = ("Academy", "GYM", "Galaxy Gym", "Lunar College")
+
+# Training stat -> consumable stat abbreviation used in item names.
+STAT_TO_CONSUMABLE = {
+    "@WeaponImprovement": "WPN",
+    "@ScienceImprovement": "SCI",
+    "@EngineImprovement": "ENG",
+    "@PilotImprovement": "PLT",
+    "@HpImprovement": "HP",
+    "@AttackImprovement": "ATK",
+    "@AbilityImprovement": "ABL",
+    "@StaminaImprovement": "STA",
+    "@RepairImprovement": "STA",
+}
+
+# Grey consumables are used below this percent while the crew has no fatigue.
+GREY_CONSUMABLE_MAX_PERCENT = 30
+# Hero consumables are used above this percent once fatigue reaches the cap.
+HERO_CONSUMABLE_MIN_PERCENT = 89
+HERO_CONSUMABLE_MIN_FATIGUE = 100
+
+TIER_COLORS = {1: "Green", 2: "Blue", 3: "Yellow"}
+CONSUMABLE_COLORS = {"Common": "grey", "Hero": "hero"}
+
+
+@dataclass(frozen=True)
+class _TierRule:
+    stage: str            # "primary" or "secondary"
+    tier: int             # 1-3
+    above: Optional[int]  # percent must be > above (None: no lower bound)
+    below: int            # percent must be < below
+    research: Optional[int]  # required Fitness/Education level
+    cooldown: timedelta   # time since the previous training ended
+
+
+_PRIMARY_RULES = (
+    _TierRule("primary", 1, None, 51, 101, timedelta(hours=1)),
+    _TierRule("primary", 2, 50, 65, 201, timedelta(hours=3, minutes=15)),
+    _TierRule("primary", 3, 64, 72, 203, timedelta(hours=12, minutes=15)),
+)
+_MOVE_ABOVE = 71
+_SECONDARY_RULES = (
+    _TierRule("secondary", 1, 71, 74, None, timedelta(hours=1)),
+    _TierRule("secondary", 2, 73, 85, 201, timedelta(hours=3, minutes=15)),
+    _TierRule("secondary", 3, 84, 90, 203, timedelta(hours=12, minutes=15)),
+)
+_COMPLETE_ABOVE = 89
+
+
+@dataclass(frozen=True)
+class TrainingRole:
+    """Which crew a role covers and the trainings it uses per room."""
+    name: str
+    characters: frozenset[str]
+    primary_rooms: tuple[str, ...]
+    primary_trainings: tuple[str, str, str]
+    secondary_rooms: tuple[str, ...]
+    secondary_trainings: tuple[str, str, str]
+
+    def trainings(self, stage: str) -> tuple[str, str, str]:
+        return self.primary_trainings if stage == "primary" else self.secondary_trainings
+
+    def rooms(self, stage: str) -> tuple[str, ...]:
+        return self.primary_rooms if stage == "primary" else self.secondary_rooms
+
+
+@lru_cache(maxsize=None)
+def load_roles(path: Path = ROLES_PATH) -> tuple[TrainingRole, ...]:
+    """Load role configuration from JSON (cached per path)."""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    return tuple(
+        TrainingRole(
+            name=name,
+            characters=frozenset(data.get("characters", [])),
+            primary_rooms=tuple(data["primaryRoom"]),
+            primary_trainings=tuple(data["primaryTrainings"]),
+            secondary_rooms=tuple(data["secondaryRoom"]),
+            secondary_trainings=tuple(data["secondaryTrainings"]),
+        )
+        for name, data in raw.items()
+    )
+
+
+def _roles_by_character(roles: Iterable[TrainingRole]) -> dict[str, TrainingRole]:
+    # Later roles win, as they did in the original role table scan.
+    return {name: role for role in roles for name in role.characters}
+
+
+def _in_any(room_name: str, rooms: Iterable[str]) -> bool:
+    return any(room in room_name for room in rooms)
+
+
+class TrainingActionKind(Enum):
+    FINISH = "finish"
+    START = "start"
+    CONSUMABLE = "consumable"
+
+
+@dataclass(frozen=True)
+class TrainingAction:
+    """One step of a training plan."""
+    kind: TrainingActionKind
+    character: Character
+    room_name: str
+    percent: int
+    training_name: str = ""
+    training_design_id: str = ""
+    stage: str = ""
+    tier: int = 0
+    consumable_type: str = ""
+    consumable_tier: str = ""
+    consumable_design_id: int = 0
+
+    def describe(self) -> str:
+        if self.kind is TrainingActionKind.CONSUMABLE:
+            return (
+                f"Using {CONSUMABLE_COLORS.get(self.consumable_tier, self.consumable_tier)} {self.consumable_type} consumable for "
+                f"{self.character.name} ({self.percent:.1f}% TP)"
+            )
+        return (
+            f"Use {TIER_COLORS.get(self.tier, '')} (T{self.tier}) {self.training_name} {self.stage} "
+            f"training for {self.character.name} in {self.room_name} with {self.percent:.2f}% "
+            f"training complete and {self.character.fatigue} fatigue."
+        )
+
+
+@dataclass(frozen=True)
+class TrainingNotice:
+    """Something the player has to act on (logged as an error)."""
+    character_name: str
+    message: str
+
+
+@dataclass
+class TrainingPlan:
+    """Ordered training actions plus notices for the player."""
+    actions: list[TrainingAction] = field(default_factory=list)
+    notices: list[TrainingNotice] = field(default_factory=list)
+
+    def of_kind(self, kind: TrainingActionKind) -> list[TrainingAction]:
+        return [a for a in self.actions if a.kind is kind]
+
+
+@dataclass(frozen=True)
+class ResearchGates:
+    """Which training-research levels are complete."""
+    levels: frozenset[int]
+
+    @classmethod
+    def from_lookup(cls, has: Callable[[str, int], bool]) -> "ResearchGates":
+        """Build from a ``has(name, level)`` lookup such as ResearchIndex.has."""
+        return cls(frozenset(
+            level for level in (101, 201, 202, 203)
+            if has("Fitness", level) or has("Education", level)
+        ))
+
+    def allows(self, level: Optional[int]) -> bool:
+        return level is None or level in self.levels
+
+
+def _cooled_down(end_date: Optional[datetime], cooldown: timedelta, now: datetime) -> bool:
+    return end_date is None or end_date < now - cooldown
+
+
+def _choose_tier(
+    role: TrainingRole, character: Character, room_name: str, percent: int,
+    research: ResearchGates, now: datetime,
+) -> tuple[Optional[_TierRule], Optional[str]]:
+    """Return (rule, notice) for a crew member in a training room."""
+    end_date = parse_server_datetime(character.training_end_date)
+    in_primary = _in_any(room_name, role.primary_rooms)
+    in_secondary = _in_any(room_name, role.secondary_rooms)
+
+    def matches(rule: _TierRule) -> bool:
+        return (
+            (rule.above is None or percent > rule.above)
+            and percent < rule.below
+            and research.allows(rule.research)
+            and _cooled_down(end_date, rule.cooldown, now)
+        )
+
+    if in_primary:
+        for rule in _PRIMARY_RULES:
+            if matches(rule):
+                return rule, None
+    if percent > _MOVE_ABOVE and not in_secondary:
+        return None, (
+            f"Move {character.name} with {percent}% training and {character.fatigue} fatigue "
+            f"in {room_name} to the {' or '.join(role.secondary_rooms)} to complete training."
+        )
+    if in_secondary:
+        for rule in _SECONDARY_RULES:
+            if matches(rule):
+                return rule, None
+    if percent > _COMPLETE_ABOVE:
+        return None, (
+            f"Training complete for {character.name} with {percent}% training and "
+            f"{character.fatigue} fatigue in {room_name}, please move this crew to its "
+            f"designated room."
+        )
+    return None, None
+
+
+def _consumable(
+    character: Character, design: dict, percent: int,
+    consumable_id: Callable[[str, str], int],
+) -> Optional[tuple[str, str, int]]:
+    """Return (stat type, tier, design id) of the consumable to use, if any."""
+    if not character.character_id:
+        return None
+    if percent < GREY_CONSUMABLE_MAX_PERCENT and character.fatigue == 0:
+        for stat, value in zip(TRAINING_STATS, character.improvements):
+            if value > 0:
+                cons_type = STAT_TO_CONSUMABLE[stat]
+                design_id = consumable_id(cons_type, "Common")
+                return (cons_type, "Common", design_id) if design_id else None
+        return None
+    if percent > HERO_CONSUMABLE_MIN_PERCENT and character.fatigue >= HERO_CONSUMABLE_MIN_FATIGUE:
+        for stat, value in zip(TRAINING_STATS, character.improvements):
+            try:
+                max_value = int(design.get(stat, "0"))
+            except (ValueError, TypeError):
+                continue
+            if value < max_value:
+                cons_type = STAT_TO_CONSUMABLE[stat]
+                design_id = consumable_id(cons_type, "Hero")
+                if design_id:
+                    return cons_type, "Hero", design_id
+    return None
+
+
+def plan_training(
+    characters: Iterable[Character],
+    room_names: Mapping[str, str],
+    catalog: DesignCatalog,
+    research: ResearchGates,
+    now: datetime,
+    consumable_id: Optional[Callable[[str, str], int]] = None,
+    roles: Optional[Iterable[TrainingRole]] = None,
+    use_consumables: bool = False,
+) -> TrainingPlan:
+    """Plan training for every crew member in one pass.
+
+    Args:
+        characters: Roster snapshot.
+        room_names: Room ID -> room name of the room the crew is in.
+        catalog: Design catalog (character designs and training designs).
+        research: Completed training research.
+        now: Current UTC time (timezone-aware).
+        consumable_id: ``(stat type, tier) -> ItemDesignId`` lookup; defaults
+            to ``catalog.consumable_design_id``.
+        roles: Role configuration; defaults to ``load_roles()``.
+        use_consumables: Also plan grey/hero CONSUMABLE actions (off by
+            default, as they spend the player's items).
+
+    Returns:
+        TrainingPlan with FINISH/START pairs and CONSUMABLE actions, grouped
+        per crew member in roster order, plus notices for the player.
+    """
+    role_map = _roles_by_character(load_roles() if roles is None else roles)
+    if consumable_id is None:
+        consumable_id = catalog.consumable_design_id
+    plan = TrainingPlan()
+
+    for character in characters:
+        room_name = room_names.get(character.room_id, "")
+        if not _in_any(room_name, TRAINING_ROOMS):
+            continue
+
+        design = catalog.character(character.design_id)
+        try:
+            capacity = int(design.get("@TrainingCapacity", "0")) if design else 0
+        except (ValueError, TypeError):
+            capacity = 0
+        if capacity <= 0:
+            continue
+        percent = math.ceil(character.training_points / capacity * 100)
+
+        role = role_map.get(character.name)
+        if role is not None:
+            rule, notice = _choose_tier(role, character, room_name, percent, research, now)
+            if notice:
+                plan.notices.append(TrainingNotice(character.name, notice))
+            if rule is not None:
+                training_name = role.trainings(rule.stage)[rule.tier - 1]
+                training = catalog.training(training_name)
+                if training is None:
+                    plan.notices.append(TrainingNotice(
+                        character.name, f"Training design {training_name!r} not found."
+                    ))
+                else:
+                    common = dict(
+                        character=character, room_name=room_name, percent=percent,
+                        training_name=training_name,
+                        training_design_id=training.get("@TrainingDesignId", ""),
+                        stage=rule.stage, tier=rule.tier,
+                    )
+                    plan.actions.append(TrainingAction(TrainingActionKind.FINISH, **common))
+                    plan.actions.append(TrainingAction(TrainingActionKind.START, **common))
+
+        consumable = _consumable(character, design, percent, consumable_id) if use_consumables else None
+        if consumable is not None:
+            cons_type, cons_tier, cons_id = consumable
+            plan.actions.append(TrainingAction(
+                TrainingActionKind.CONSUMABLE, character=character, room_name=room_name,
+                percent=percent, consumable_type=cons_type, consumable_tier=cons_tier,
+                consumable_design_id=cons_id,
+            ))
+
+    return plan
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Pixel Starships API, for load and latency tests.
+
+``FakePssServer`` is a threaded ``http.server`` on 127.0.0.1 that answers the
+read endpoints ``run.py`` relies on (UserService, ShipService,
+CharacterService, RoomService, ItemService, ResearchService, TaskService,
+MessageService, GalaxyService) with the XML shapes the live API returns,
+built from synthetic fixtures — no captured account data.  Unlike the unit
+tests, which mock single methods, it lets a real ``Client`` exercise the
+whole stack: request scheduler, resilient adapter, token refresh, response
+classification and metrics.
+
+Faults are injected per request from a seeded RNG, so a run is repeatable:
+
+- ``latency`` / ``jitter``: seconds to sleep before answering;
+- ``error_rate``: share of 200 responses carrying an ``errorMessage``;
+- ``server_error_rate``: share of bare 5xx responses (``server_error_status``).
+
+Access tokens are issued by ``DeviceLogin17``; ``expire_tokens()`` revokes
+them so the next call gets "Failed to authorize access token".  Unknown
+endpoints answer 404 and are counted in ``unknown``.
+
+    with FakePssServer(FaultConfig(latency=0.02, server_error_rate=0.05)) as server:
+        client = client_for(server)
+        client.login()
+        client.listAllResearches()
+
+Run it as a script to measure end-to-end throughput and tail latency of the
+``Client`` stack against it:
+
+    python -m tests.fake_pss_server --requests 500 --latency 0.01 --server-error-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import quoteattr
+
+from sdk.client import Client
+from sdk.request_scheduler import RequestScheduler
+from sdk.resilience import CircuitBreaker, LatencyTracker, Resilience, ResilientHTTPAdapter, RetryBudget
+
+from .synthetic_fixtures import SYNTHETIC_DEVICE_KEY_IOS
+
+USER_ID = "424242"
+USER_NAME = "SyntheticCaptain"
+SHIP_ID = "9001"
+
+
+@dataclass
+class FaultConfig:
+    """What the server injects into its answers."""
+    latency: float = 0.0          # seconds added to every response
+    jitter: float = 0.0           # up to this many extra seconds, uniformly
+    error_rate: float = 0.0       # 200 with an errorMessage
+    server_error_rate: float = 0.0  # bare 5xx
+    server_error_status: int = 503
+    seed: int = 0
+
+
+def _element(tag: str, attrs: Optional[dict] = None, children: str = "") -> str:
+    rendered = "".join(f" {key}={quoteattr(str(value))}" for key, value in (attrs or {}).items())
+    return f"<{tag}{rendered}>{children}</{tag}>" if children else f"<{tag}{rendered} />"
+
+
+def _collection(tag: str, records: list[dict]) -> str:
+    return "".join(_element(tag, record) for record in records)
+
+
+@dataclass
+class SyntheticAccount:
+    """Deterministic account state the endpoints are rendered from."""
+    rooms: int = 12
+    characters: int = 6
+    researches: int = 8
+    items: int = 10
+    tasks: int = 4
+    messages: int = 3
+    markers: int = 2
+
+    def user(self) -> dict:
+        return {
+            "Id": USER_ID, "Name": USER_NAME, "Credits": 1500, "DailyRewardStatus": 0,
+            "FreeStarbuxReceivedToday": 0, "LastHeartBeatDate": "2026-01-01T00:00:00",
+        }
+
+    def room_records(self) -> list[dict]:
+        return [
+            {"RoomId": 100 + i, "RoomDesignId": 1 + i % 9, "Row": 10 + i // 6, "Column": 20 + i % 6 * 2,
+             "RoomStatus": "Normal", "UpgradeRoomDesignId": 0, "ShipId": SHIP_ID}
+            for i in range(self.rooms)
+        ]
+
+    def research_records(self) -> list[dict]:
+        return [
+            {"ResearchId": 300 + i, "ResearchDesignId": 1 + i, "ResearchState": "Completed"}
+            for i in range(self.researches)
+        ]
+
+    def character_records(self) -> list[dict]:
+        return [
+            {"CharacterId": 500 + i, "CharacterName": f"Crew {i}", "CharacterDesignId": 10 + i,
+             "RoomId": 100 + i % max(self.rooms, 1), "Level": 1 + i, "Xp": 10 * i, "Fatigue": 0,
+             "HpImprovement": 0, "PilotImprovement": i % 3, "RepairImprovement": 0,
+             "WeaponImprovement": i % 2, "ScienceImprovement": 0, "EngineImprovement": 0,
+             "AttackImprovement": 0, "AbilityImprovement": 0, "StaminaImprovement": 0,
+             "TrainingEndDate": "2026-01-01T00:00:00"}
+            for i in range(self.characters)
+        ]
+
+    def ship(self) -> str:
+        return _element(
+            "Ship",
+            {"ShipId": SHIP_ID, "UserId": USER_ID, "ShipName": "Synthetic", "ShipDesignId": 1,
+             "ShipLevel": 3, "Hp": 4000},
+            _element("Rooms", children=_collection("Room", self.room_records()))
+            + _element("Researches", children=_collection("Research", self.research_records())),
+        )
+
+    def item_records(self) -> list[dict]:
+        return [{"ItemId": 700 + i, "ItemDesignId": 20 + i, "Quantity": 5 * (i + 1)} for i in range(self.items)]
+
+    def task_records(self) -> list[dict]:
+        return [{"TaskId": 800 + i, "TaskDesignId": 1 + i, "TaskStatus": "Started"} for i in range(self.tasks)]
+
+    def message_records(self) -> list[dict]:
+        return [
+            {"MessageId": 900 + i, "UserId": USER_ID, "Message": f"Synthetic message {i}",
+             "MessageType": "Important"}
+            for i in range(self.messages)
+        ]
+
+    def marker_records(self) -> list[dict]:
+        return [
+            {"StarSystemMarkerId": 1000 + i, "StarSystemId": 1 + i, "MarkerType": "MiningDrone",
+             "UserId": USER_ID}
+            for i in range(self.markers)
+        ]
+
+
+def _wrap(service: str, call: str, children: str = "", attrs: Optional[dict] = None) -> str:
+    return _element(service, children=_element(call, attrs, children) if children or attrs else _element(call))
+
+
+def _designs(tag: str, count: int) -> str:
+    kind = tag.removesuffix("Design")
+    return _collection(tag, [{f"{tag}Id": 1 + i, f"{kind}Name": f"{kind} {i}"} for i in range(count)])
+
+
+def _routes(account: SyntheticAccount) -> dict[tuple[str, str], Callable[[], str]]:
+    """``(service, call)`` -> body renderer, for every authenticated endpoint."""
+    return {
+        ("UserService", "HeartBeat4"): lambda: _element(
+            "UserService", children=_element("HeartBeat", {"success": "true"})),
+        ("ShipService", "GetShipByUserId"): lambda: _wrap("ShipService", "GetShipByUserId", account.ship()),
+        ("CharacterService", "ListAllCharactersOfUser"): lambda: _wrap(
+            "CharacterService", "ListAllCharactersOfUser",
+            _element("Characters", children=_collection("Character", account.character_records()))),
+        ("RoomService", "ListRoomsViaAccessToken"): lambda: _wrap(
+            "RoomService", "ListRoomsViaAccessToken",
+            _element("Rooms", children=_collection("Room", account.room_records()))),
+        ("RoomService", "ListRoomDesigns2"): lambda: _element(
+            "RoomService", children=_element("ListRoomDesigns", children=_element(
+                "RoomDesigns", children=_designs("RoomDesign", 9)))),
+        ("ItemService", "ListItemsOfAShip"): lambda: _wrap(
+            "ItemService", "ListItemsOfAShip", _element("Items", children=_collection("Item", account.item_records()))),
+        ("ResearchService", "ListAllResearches"): lambda: _wrap(
+            "ResearchService", "ListAllResearches",
+            _element("Researches", children=_collection("Research", account.research_records()))),
+        ("ResearchService", "ListAllResearchDesigns2"): lambda: _element(
+            "ResearchService", children=_element("ListAllResearchDesigns", children=_element(
+                "ResearchDesigns", children=_designs("ResearchDesign", account.researches)))),
+        ("TaskService", "ListTasksOfAUser"): lambda: _wrap(
+            "TaskService", "ListTasksOfAUser", _element("Tasks", children=_collection("Task", account.task_records()))),
+        ("MessageService", "ListImportantMessagesForUser"): lambda: _wrap(
+            "MessageService", "ListImportantMessagesForUser",
+            _element("Messages", children=_collection("Message", account.message_records()))),
+        ("GalaxyService", "ListUserStarSystems"): lambda: _wrap(
+            "GalaxyService", "ListUserStarSystems",
+            _element("UserStarSystems", children=_collection(
+                "UserStarSystem", [{"StarSystemId": 1, "UserId": USER_ID, "Status": "Explored"}]))),
+        ("GalaxyService", "ListStarSystemMarkersAndUserMarkers"): lambda: _element(
+            "GalaxyService", children=_element("StarSystemMarkers", children=_collection(
+                "StarSystemMarker", account.marker_records())) + _element("UserMarkers")),
+    }
+
+
+class FakePssServer:
+    """Threaded local HTTP server speaking the Pixel Starships XML dialect.
+
+    Counters (``requests`` per endpoint, ``injected`` per fault kind,
+    ``unknown`` paths) are safe to read while the server runs.
+    """
+
+    def __init__(self, faults: Optional[FaultConfig] = None, account: Optional[SyntheticAccount] = None,
+                 host: str = "127.0.0.1", port: int = 0, sleep: Callable[[float], None] = time.sleep):
+        self.faults = faults or FaultConfig()
+        self.account = account or SyntheticAccount()
+        self._routes = _routes(self.account)
+        self._rng = random.Random(self.faults.seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens: set[str] = set()
+        self.requests: Counter = Counter()
+        self.injected: Counter = Counter()
+        self.unknown: Counter = Counter()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakePssServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-pss", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakePssServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def expire_tokens(self) -> None:
+        """Revoke every issued access token."""
+        with self._lock:
+            self._tokens.clear()
+
+    def _issue_token(self) -> str:
+        token = str(uuid.UUID(int=self._rng.getrandbits(128)))
+        self._tokens.add(token)
+        return token
+
+    def _draw(self) -> tuple[float, Optional[str]]:
+        """Delay and fault (None, "error" or "server_error") for one request."""
+        faults = self.faults
+        with self._lock:
+            delay = faults.latency + (self._rng.uniform(0, faults.jitter) if faults.jitter else 0.0)
+            roll = self._rng.random()
+        if roll < faults.server_error_rate:
+            return delay, "server_error"
+        if roll < faults.server_error_rate + faults.error_rate:
+            return delay, "error"
+        return delay, None
+
+    def handle(self, method: str, target: str) -> tuple[int, str]:
+        """Status and XML body for one request (the HTTP handler's core)."""
+        parts = urlsplit(target)
+        segments = [s for s in parts.path.split("/") if s]
+        service, call = (segments + ["", ""])[:2]
+        delay, fault = self._draw()
+        with self._lock:
+            self.requests[call or parts.path] += 1
+            if fault:
+                self.injected[fault] += 1
+        if delay > 0:
+            self._sleep(delay)
+        if fault == "server_error":
+            return self.faults.server_error_status, ""
+        if fault == "error":
+            return 200, _wrap(service, call, attrs={"errorMessage": "Synthetic failure, please try again."})
+
+        if (service, call) == ("UserService", "DeviceLogin17") and method == "POST":
+            with self._lock:
+                token = self._issue_token()
+            login = _element("UserLogin", {"accessToken": token, "UserId": USER_ID},
+                             _element("User", self.account.user()))
+            return 200, _element("UserService", children=login)
+
+        render = self._routes.get((service, call))
+        if render is None:
+            with self._lock:
+                self.unknown[parts.path] += 1
+            return 404, _element("Error", {"errorMessage": f"Unknown endpoint {parts.path}"})
+
+        token = (parse_qs(parts.query).get("accessToken") or [""])[0]
+        with self._lock:
+            authorized = token in self._tokens
+        if not authorized:
+            return 200, _wrap(service, call, attrs={"errorMessage": "Failed to authorize access token"})
+        return 200, render()
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                status, body = server.handle(self.command, self.path)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = _answer
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def client_for(server: FakePssServer, resilience: Optional[Resilience] = None,
+               calls_per_minute: int = 100_000, settings: Optional[dict] = None) -> Client:
+    """A ``Client`` pointed at ``server`` with a test policy and its own scheduler.
+
+    The class-level scheduler is shared by every ``Client`` in the process,
+    so each one gets an instance-level replacement here; ``calls_per_minute``
+    sets its budget.
+    """
+    device = SimpleNamespace(key=SYNTHETIC_DEVICE_KEY_IOS, refreshToken=None, languageKey="en")
+    client = Client(device=device, settings={"request_cache": False, **(settings or {})})
+    client.baseUrl = server.base_url
+    client.resilience = resilience or Resilience(
+        budget=RetryBudget(per_run=10_000, per_endpoint=10_000), latency=LatencyTracker(initial=5.0),
+        breaker=CircuitBreaker(threshold=1_000), backoff=0.01, backoff_cap=0.1,
+    )
+    client.adapter = ResilientHTTPAdapter(client.resilience)
+    client.session.mount("http://", client.adapter)
+    client.scheduler = RequestScheduler(calls=calls_per_minute, period=60)
+    return client
+
+
+WORKLOAD = (
+    "getShipByUserId", "listAllCharactersOfUser", "listRoomsViaAccessToken", "listAllResearches", "listTasksOfAUser", "listImportantMessagesForUser", "listUserStarSystems",
+    "listStarSystemMarkersAndUserMarkers", "heartbeat",
+)
+
+
+def measure(server: FakePssServer, calls: int = 200, threads: int = 4,
+            calls_per_minute: int = 100_000) -> dict[str, Any]:
+    """Log in, then make ``calls`` ``WORKLOAD`` calls from ``threads`` workers.
+
+    Returns wall-clock throughput, end-to-end call latency percentiles (which
+    include scheduler waits and transport retries), the client's per-endpoint
+    metrics summary and the server's counters.
+    """
+    client = client_for(server, calls_per_minute=calls_per_minute)
+    # Injected faults can hit DeviceLogin17 too.
+    if not any(client.login() for _ in range(3)):
+        raise RuntimeError("login against the fake server failed")
+    latencies: list[float] = []
+    failures: Counter = Counter()
+    lock = threading.Lock()
+
+    def call(n: int) -> None:
+        name = WORKLOAD[n % len(WORKLOAD)]
+        start = time.perf_counter()
+        try:
+            if name == "heartbeat":
+                client.heartbeat(force=True)
+            else:
+                getattr(client, name)()
+        except Exception as e:
+            with lock:
+                failures[type(e).__name__] += 1
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(calls)))
+    elapsed = time.perf_counter() - start
+    ordered = sorted(latencies)
+
+    def percentile(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4) if ordered else 0.0
+
+    return {
+        "calls": len(ordered),
+        "seconds": round(elapsed, 3),
+        "calls_per_s": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "latency_p50_s": percentile(0.5),
+        "latency_p95_s": percentile(0.95),
+        "latency_p99_s": percentile(0.99),
+        "failures": dict(failures),
+        "transport": client.resilience.summary(),
+        "server": {"requests": sum(server.requests.values()), "injected": dict(server.injected),
+                   "unknown": dict(server.unknown)},
+        "metrics": client.metrics.summary(),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the Client stack against a local fake PSS API.")
+    parser.add_argument("--requests", type=int, default=200, help="Client calls to make")
+    parser.add_argument("--threads", type=int, default=4, help="concurrent callers")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of errorMessage responses")
+    parser.add_argument("--server-error-rate", type=float, default=0.0, help="share of 5xx responses")
+    parser.add_argument("--calls-per-minute", type=int, default=100_000, help="request scheduler budget")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    faults = FaultConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         server_error_rate=args.server_error_rate, seed=args.seed)
+    with FakePssServer(faults) as server:
+        report = measure(server, calls=args.requests, threads=args.threads,
+                         calls_per_minute=args.calls_per_minute)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{report['calls']} calls in {report['seconds']}s ({report['calls_per_s']}/s); "
+            f"p50 {report['latency_p50_s']}s, p95 {report['latency_p95_s']}s, p99 {report['latency_p99_s']}s; "
+            f"failures {report['failures'] or 0}; transport: {report['transport']}; "
+            f"server injected {report['server']['injected'] or 0}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""Tests for concurrent Client reads — no network."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from sdk.async_client import DEFAULT_PREFETCH, READ_METHODS, AsyncClient
+from sdk.client import Client
+from sdk.device import Device
+from sdk.request_cache import RequestCache
+
+
+class _SlowClient:
+    """Read methods that take a fixed time and record peak concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        for name in READ_METHODS:
+            setattr(self, name, self._method(name))
+
+    def _method(self, name):
+        def read():
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                self.calls.append(name)
+            try:
+                time.sleep(self.delay)
+                if name == "listTasksOfAUser":
+                    raise RuntimeError("boom")
+                return name
+            finally:
+                with self.lock:
+                    self.active -= 1
+        return read
+
+
+class TestAsyncClient(unittest.TestCase):
+
+    def test_reads_overlap_under_cap(self):
+        slow = _SlowClient()
+        start = time.perf_counter()
+        with AsyncClient(slow, max_in_flight=3) as reads:
+            results = reads.prefetch()
+        elapsed = time.perf_counter() - start
+        self.assertEqual(set(results), set(DEFAULT_PREFETCH))
+        self.assertEqual(slow.peak, 3)
+        # 12 reads of 50ms each, three at a time: ~0.2s instead of 0.6s.
+        self.assertLess(elapsed, len(DEFAULT_PREFETCH) * slow.delay * 0.75)
+
+    def test_failed_read_does_not_cancel_others(self):
+        with AsyncClient(_SlowClient(delay=0)) as reads:
+            results = reads.prefetch(["listTasksOfAUser", "listAllResearches"])
+        self.assertIsInstance(results["listTasksOfAUser"], RuntimeError)
+        self.assertEqual(results["listAllResearches"], "listAllResearches")
+
+    def test_only_read_methods(self):
+        with AsyncClient(MagicMock()) as reads:
+            with self.assertRaises(ValueError):
+                reads.prefetch(["upgradeRooms"])
+            with self.assertRaises(ValueError):
+                asyncio.run(reads.call("collectAllResources"))
+        with self.assertRaises(ValueError):
+            AsyncClient(MagicMock(), max_in_flight=0)
+
+    def test_requests_share_client_transport(self):
+        """Concurrent identical GETs go through Client.request and coalesce."""
+        client = Client(device=MagicMock(spec=Device))
+        client.requestCache = RequestCache()
+        sent = []
+
+        def send(url, method, data=None, **kwargs):
+            sent.append(url)
+            time.sleep(0.05)
+            return MagicMock(status_code=200, text="<ok/>")
+
+        client._send = send  # type: ignore
+        url = "https://api.pixelstarships.com/TaskService/ListTasksOfAUser?accessToken=x"
+
+        async def both(reads):
+            return await asyncio.gather(reads.get(url), reads.get(url))
+
+        with AsyncClient(client, max_in_flight=2) as reads:
+            first, second = asyncio.run(both(reads))
+        self.assertIs(first, second)
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(client.requestCache.coalesced, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Tests for the offline battle simulator — no HTTP."""
+
+from __future__ import annotations
+
+import unittest
+
+from sdk.battle_sim import (
+    TICK_SECONDS,
+    SimShip,
+    SimWeapon,
+    run_batch,
+    ship_from_snapshot,
+    simulate,
+)
+from sdk.game_formulas import effective_damage
+from sdk.ship_layout import RoomInfo
+
+
+def _room(room_id="1", category="weapon", hp=10):
+    return RoomInfo(
+        room_id=room_id, design_id="100", row=0, column=0, status="normal",
+        width=1, height=1, category=category, name="Laser", hp=hp,
+    )
+
+
+def _ship(name, hp=100.0, damage=10.0, reload=1.0, dodge=0.0, armor=0.0, **weapon):
+    return SimShip(
+        name=name, hp=hp, armor=armor, dodge=dodge,
+        weapons=(SimWeapon(room=_room(), base_reload=reload, damage=damage, **weapon),),
+    )
+
+
+class TestSimulate(unittest.TestCase):
+    """Single battles."""
+
+    def test_deterministic_for_seed(self):
+        a, b = _ship("A", dodge=40), _ship("B", dodge=40)
+        self.assertEqual(simulate(a, b, seed=7), simulate(a, b, seed=7))
+        outcomes = {simulate(a, b, seed=s).hits_a for s in range(20)}
+        self.assertGreater(len(outcomes), 1)
+
+    def test_stronger_ship_wins(self):
+        result = simulate(_ship("A", damage=30), _ship("B", damage=10))
+        self.assertEqual(result.winner, "a")
+        # 4 volleys of 30 sink 100 HP; B fires in the same ticks.
+        self.assertAlmostEqual(result.seconds, 4.0)
+        self.assertEqual(result.shots_b, 4)
+
+    def test_armor_reduces_damage(self):
+        result = simulate(_ship("A", damage=10), _ship("B", armor=100, damage=0), max_seconds=1.0)
+        self.assertAlmostEqual(result.damage_a, effective_damage(10, 100))
+        self.assertAlmostEqual(result.reduction_b, 50.0)
+
+    def test_crew_stat_speeds_reload(self):
+        slow = simulate(_ship("A"), _ship("B", hp=1e9, damage=0), max_seconds=10)
+        fast = simulate(_ship("A", crew_stat=100), _ship("B", hp=1e9, damage=0), max_seconds=10)
+        self.assertEqual(slow.shots_a, 10)
+        self.assertEqual(fast.shots_a, 20)
+
+    def test_fire_burns_over_time(self):
+        a = _ship("A", damage=0, reload=100, fire_damage=2.0)
+        result = simulate(a, _ship("B", hp=1000, damage=0), max_seconds=200)
+        # One hit: 2 HP/s for 10 s.
+        self.assertAlmostEqual(1000 - result.hp_b, 20.0, places=6)
+
+    def test_timeout_is_draw(self):
+        result = simulate(_ship("A", damage=0), _ship("B", damage=0), max_seconds=5)
+        self.assertIsNone(result.winner)
+        self.assertLessEqual(result.seconds, 5 + TICK_SECONDS)
+
+
+class TestSnapshot(unittest.TestCase):
+    """Ships built from saved GetShipByUserId payloads."""
+
+    def test_ship_from_snapshot(self):
+        snapshot = {"ShipService": {"GetShipByUserId": {"Ship": {
+            "@ShipName": "Saved", "@Hp": "500",
+            "Rooms": {"Room": [
+                {"@RoomId": "1", "@RoomDesignId": "100", "@Row": "0", "@Column": "0", "@RoomStatus": "Normal"},
+                {"@RoomId": "2", "@RoomDesignId": "256", "@Row": "0", "@Column": "2", "@RoomStatus": "Normal"},
+            ]},
+        }}}}
+        designs = [
+            {"@RoomDesignId": "100", "@RoomName": "Laser Cannon", "@ReloadTime": "200",
+             "MissileDesign": {"@HullDamage": "3"}},
+            {"@RoomDesignId": "256", "@RoomName": "Heavy Armor", "@RoomHp": "40", "@Capacity": "3"},
+        ]
+        ship = ship_from_snapshot(snapshot, designs)
+        # Armor comes from the armor design's capacity, not its HP.
+        self.assertEqual((ship.name, ship.hp, ship.armor), ("Saved", 500.0, 3.0))
+        (weapon,) = ship.weapons
+        self.assertAlmostEqual(weapon.base_reload, 5.0)
+        self.assertEqual(weapon.damage, 3.0)
+
+    def test_hull_hp_is_required(self):
+        snapshot = {"Ship": {"@ShipName": "NoHp", "Rooms": {"Room": []}}}
+        with self.assertRaises(ValueError):
+            ship_from_snapshot(snapshot, [])
+        self.assertEqual(ship_from_snapshot(snapshot, [], hp=250).hp, 250.0)
+
+
+class TestBatch(unittest.TestCase):
+    """Batch mode gives identical results in-process and across processes."""
+
+    def test_pool_matches_serial(self):
+        a, b = _ship("A", dodge=30), _ship("B", dodge=30, damage=11)
+        serial = run_batch(a, b, battles=40, processes=1)
+        pooled = run_batch(a, b, battles=40, processes=2)
+        self.assertEqual(serial.results, pooled.results)
+        self.assertEqual(serial.battles, 40)
+        self.assertAlmostEqual(serial.win_rate("a") + serial.win_rate("b") + serial.draw_rate, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""Tests for cassette recording and offline replay — local file I/O only, no HTTP."""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import requests
+
+from sdk.cassette import Cassette, CassetteMiss, RecordingSession, ReplaySession
+from sdk.client import Client
+from sdk.device import Device
+from sdk.dotnet import DotNet
+from sdk.request_scheduler import RequestScheduler
+from sdk.response import parse_xml
+
+BASE = "https://api.pixelstarships.com"
+TOKEN = "0f1e2d3c-aaaa-bbbb-cccc-123456789abc"
+
+
+def _response(body: bytes, status=200):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/xml"
+    return response
+
+
+class _FakeSession:
+    """Answers each request with a numbered body."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        return _response(f'<A n="{self.calls}" accessToken="{TOKEN}"/>'.encode())
+
+
+class _SpyReplaySession(ReplaySession):
+    """Keeps the URLs it was asked for."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = []
+
+    def request(self, method, url, **kwargs):
+        self.sent.append(url)
+        return super().request(method, url, **kwargs)
+
+
+class TestCassette(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name, "run.cassette.gz")
+        restore = DotNet.clock
+        self.addCleanup(setattr, DotNet, "clock", restore)
+
+    def _record(self):
+        with Cassette.record(self.path) as cassette:
+            session = RecordingSession(_FakeSession(), cassette)
+            session.request("GET", f"{BASE}/TaskService/ListTasksOfAUser?accessToken={TOKEN}&clientDateTime=a")
+            session.request("GET", f"{BASE}/TaskService/ListTasksOfAUser?accessToken={TOKEN}&clientDateTime=b")
+            session.post(f"{BASE}/UserService/DeviceLogin17", json={"DeviceKey": "device-secret"})
+        return cassette
+
+    def test_recording_is_redacted(self):
+        cassette = self._record()
+        self.assertEqual(cassette.interactions, 3)
+        raw = gzip.decompress(self.path.read_bytes()).decode()
+        self.assertNotIn(TOKEN, raw)
+        self.assertNotIn("device-secret", raw)
+
+    def test_replay_in_recorded_order(self):
+        self._record()
+        replay = ReplaySession.load(self.path)
+        url = f"{BASE}/TaskService/ListTasksOfAUser?accessToken=other&clientDateTime=z"
+        bodies = [replay.get(url).text for _ in range(3)]
+        self.assertIn('n="1"', bodies[0])
+        self.assertIn('n="2"', bodies[1])
+        self.assertEqual(bodies[1], bodies[2])  # last response is served again
+        self.assertIn('n="3"', replay.post(f"{BASE}/UserService/DeviceLogin17", json={}).text)
+        with self.assertRaises(CassetteMiss):
+            replay.get(f"{BASE}/ShipService/GetShipByUserId?userId=1")
+
+    def test_replay_clock_is_deterministic(self):
+        started = datetime.datetime(2026, 1, 2, 3, 4, 5)
+        interactions = [
+            {"method": "GET", "url": f"{BASE}/S/A", "status": 200, "body": "<A/>", "elapsed": 0.5, "offset": 0.0},
+            {"method": "GET", "url": f"{BASE}/S/B", "status": 200, "body": "<B/>", "elapsed": 0.25, "offset": 90.0},
+        ]
+        sleeps = []
+        replay = ReplaySession(interactions, started, emulate_timing=True, sleep=sleeps.append)
+        replay.install_clock()
+        self.assertEqual(DotNet.validDateTime(), started)
+        replay.get(f"{BASE}/S/A")
+        replay.get(f"{BASE}/S/B")
+        self.assertEqual(DotNet.validDateTime(), started + datetime.timedelta(seconds=90))
+        self.assertEqual(sleeps, [0.5, 0.25])
+
+    def test_client_round_trip(self):
+        client = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        client.accessToken = TOKEN
+        body = b"<ResearchService><ListAllResearches><Researches><Research ResearchDesignId='7'/></Researches></ListAllResearches></ResearchService>"
+        live = MagicMock()
+        live.request.return_value = _response(body)
+        with Cassette.record(self.path) as cassette:
+            client.session = RecordingSession(live, cassette)
+            client.listAllResearches()
+
+        replaying = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        replaying.accessToken = "different-token"
+        replay = ReplaySession.load(self.path)
+        replay.install_clock()
+        replaying.session = replay
+        replaying.listAllResearches()
+        self.assertEqual(replaying.allResearches, client.allResearches)
+        self.assertEqual(replay.served, 1)
+        self.assertEqual(parse_xml(_response(body)), replaying.allResearches)
+
+    def _read_state(self, session):
+        client = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        client.scheduler = RequestScheduler(calls=10000, period=60)
+        client.accessToken = TOKEN
+        client.session = session
+        for _ in range(2):
+            client.listTasksOfAUser()
+            client.listAllResearches()
+            client.listSituations()
+
+    def test_replay_sends_the_same_urls_every_time(self):
+        ticks = iter(range(0, 1000, 37))
+        started = datetime.datetime(2026, 1, 2, 3, 4, 5)
+        with Cassette(gzip.open(self.path, "wt", encoding="utf-8"), started, clock=lambda: next(ticks)) as cassette:
+            self._read_state(RecordingSession(_FakeSession(), cassette))
+
+        def replay_urls():
+            replay = _SpyReplaySession.load(self.path)
+            restore = replay.install_clock()
+            self._read_state(replay)
+            restore()
+            return replay.sent
+
+        first, second = replay_urls(), replay_urls()
+        self.assertEqual(len(first), 6)
+        self.assertEqual(first, second)
+        # The cassette clock moved between requests, so the timestamps differ.
+        self.assertGreater(len({url.rsplit("clientDateTime=", 1)[1] for url in first}), 1)
+
+if __name__ == "__main__":
+    unittest.main()
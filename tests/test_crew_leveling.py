@@ -2,6 +2,7 @@ from __future__ import annotations
 
 """Tests for crew leveling logic."""
 
+import itertools
 import unittest
 from datetime import datetime, timezone, timedelta
 
@@ -12,6 +13,9 @@ from sdk.crew_leveling import (
     get_gas_required,
     evaluate_upgrade,
     plan_upgrades,
+    plan_optimal_upgrades,
+    total_xp_required,
+    upgrade_ladder,
     MAX_CHARACTER_LEVEL,
     STANDARD_XP_REQUIRED,
     STANDARD_GAS_REQUIRED,
@@ -72,16 +76,17 @@ class TestCostTables(unittest.TestCase):
     def test_get_gas_required_standard(self):
         """Test standard gas lookup."""
         self.assertEqual(get_gas_required(1, False), 0)
-        self.assertEqual(get_gas_required(2, False), 0)
-        self.assertEqual(get_gas_required(3, False), 17)
-        self.assertEqual(get_gas_required(4, False), 33)
-        self.assertEqual(get_gas_required(5, False), 65)
+        self.assertEqual(get_gas_required(2, False), 17)
+        self.assertEqual(get_gas_required(3, False), 33)
+        self.assertEqual(get_gas_required(5, False), 130)
+        self.assertEqual(get_gas_required(8, False), 1300)
+        self.assertEqual(get_gas_required(39, False), 715000)
 
     def test_get_gas_required_legendary(self):
         """Test legendary gas lookup."""
-        self.assertEqual(get_gas_required(1, True), 0)
-        self.assertEqual(get_gas_required(2, True), 130000)
-        self.assertEqual(get_gas_required(3, True), 162500)
+        self.assertEqual(get_gas_required(1, True), 130000)
+        self.assertEqual(get_gas_required(2, True), 162500)
+        self.assertEqual(get_gas_required(39, True), 1365000)
 
     def test_get_gas_required_max_level(self):
         """Test max level returns 0 gas."""
@@ -114,7 +119,7 @@ class TestEvaluateUpgrade(unittest.TestCase):
         design = {**self.base_design, "@Rarity": "Standard"}
         
         decision = evaluate_upgrade(
-            character, design, gas_available=104000, now=datetime(2026, 8, 2, 12, 0, 0, tzinfo=timezone.utc)
+            character, design, gas_available=84500, now=datetime(2026, 8, 2, 12, 0, 0, tzinfo=timezone.utc)
         )
         
         self.assertEqual(decision.reason, UpgradeBlockReason.ELIGIBLE)
@@ -128,9 +133,9 @@ class TestEvaluateUpgrade(unittest.TestCase):
         character = {**self.base_character, "@Level": "20", "@Xp": "100000"}
         design = {**self.base_design, "@Rarity": "Legendary"}
         
-        # Legendary gas cost for level 20 is 877500
+        # Legendary gas cost for level 20 is 747500
         decision = evaluate_upgrade(
-            character, design, gas_available=877500, now=datetime(2026, 8, 2, 12, 0, 0, tzinfo=timezone.utc)
+            character, design, gas_available=747500, now=datetime(2026, 8, 2, 12, 0, 0, tzinfo=timezone.utc)
         )
         
         self.assertEqual(decision.reason, UpgradeBlockReason.ELIGIBLE)
@@ -138,7 +143,7 @@ class TestEvaluateUpgrade(unittest.TestCase):
         # Legendary XP is 3x
         self.assertEqual(decision.xp_required, 4860 * 3)
         # Legendary gas from table
-        self.assertEqual(decision.gas_required, 877500)
+        self.assertEqual(decision.gas_required, 747500)
 
     def test_max_level_blocked(self):
         """Test max level (40) cannot be upgraded."""
@@ -205,8 +210,8 @@ class TestEvaluateUpgrade(unittest.TestCase):
         character = {**self.base_character, "@Level": "20", "@Xp": "10000"}
         design = {**self.base_design, "@Rarity": "Standard"}
         
-        # Gas cost for level 20 is 104000
-        decision = evaluate_upgrade(character, design, 104000, self.now)
+        # Gas cost for level 20 is 84500
+        decision = evaluate_upgrade(character, design, 84500, self.now)
         
         self.assertEqual(decision.character_id, "12345")
         self.assertEqual(decision.character_name, "Test Character")
@@ -214,9 +219,9 @@ class TestEvaluateUpgrade(unittest.TestCase):
         self.assertEqual(decision.next_level, 21)
         self.assertEqual(decision.xp_available, 10000)
         self.assertEqual(decision.xp_required, 4860)
-        self.assertEqual(decision.gas_available, 104000)
+        self.assertEqual(decision.gas_available, 84500)
         # Gas cost for level 20 from STANDARD_GAS_REQUIRED table
-        self.assertEqual(decision.gas_required, 104000)
+        self.assertEqual(decision.gas_required, 84500)
         self.assertEqual(decision.reason, UpgradeBlockReason.ELIGIBLE)
         self.assertFalse(decision.is_legendary)
         self.assertTrue(decision.is_eligible)
@@ -246,8 +251,8 @@ class TestPlanUpgrades(unittest.TestCase):
         characters = [{**self.base_character, "@Level": "20", "@Xp": "10000"}]
         designs = [{**self.base_design, "@Rarity": "Standard", "@CharacterDesignId": "DESIGN_1"}]
         
-        # Gas cost for level 20 is 104000
-        eligible, remaining_gas = plan_upgrades(characters, designs, 104000, self.now)
+        # Gas cost for level 20 is 84500
+        eligible, remaining_gas = plan_upgrades(characters, designs, 84500, self.now)
         
         self.assertEqual(len(eligible), 1)
         self.assertEqual(eligible[0].reason, UpgradeBlockReason.ELIGIBLE)
@@ -264,8 +269,8 @@ class TestPlanUpgrades(unittest.TestCase):
             {**self.base_design, "@CharacterDesignId": "DESIGN_2"},
         ]
         
-        # Each upgrade costs 104000 gas
-        eligible, remaining_gas = plan_upgrades(characters, designs, 208000, self.now)
+        # Each upgrade costs 84500 gas
+        eligible, remaining_gas = plan_upgrades(characters, designs, 169000, self.now)
         
         self.assertEqual(len(eligible), 2)
 
@@ -295,8 +300,8 @@ class TestPlanUpgrades(unittest.TestCase):
             {**self.base_design, "@CharacterDesignId": "DESIGN_2"},
         ]
         
-        # Gas enough for only 1 upgrade (104000)
-        eligible, remaining_gas = plan_upgrades(characters, designs, 104000 + 100, self.now)
+        # Gas enough for only 1 upgrade (84500)
+        eligible, remaining_gas = plan_upgrades(characters, designs, 84500 + 100, self.now)
         
         self.assertEqual(len(eligible), 1)
         self.assertEqual(remaining_gas, 100)
@@ -312,10 +317,10 @@ class TestPlanUpgrades(unittest.TestCase):
             {**self.base_design, "@CharacterDesignId": "DESIGN_2"},
         ]
         
-        # Each upgrade costs 104000 gas
-        eligible, remaining_gas = plan_upgrades(characters, designs, 208000, self.now)
+        # Each upgrade costs 84500 gas
+        eligible, remaining_gas = plan_upgrades(characters, designs, 169000, self.now)
         
-        expected_remaining = 208000 - 2 * 104000
+        expected_remaining = 169000 - 2 * 84500
         self.assertEqual(remaining_gas, expected_remaining)
 
     def test_plan_upgrades_insufficient_gas_second(self):
@@ -329,12 +334,81 @@ class TestPlanUpgrades(unittest.TestCase):
             {**self.base_design, "@CharacterDesignId": "DESIGN_2"},
         ]
         
-        # Only enough for 1 upgrade (104000)
+        # Only enough for 1 upgrade (84500)
         eligible, _ = plan_upgrades(characters, designs, 150000, self.now)
         
         self.assertEqual(len(eligible), 1)
 
 
+class TestPlanOptimalUpgrades(unittest.TestCase):
+    """Tests for the gas-budget upgrade optimizer."""
+
+    def setUp(self):
+        self.now = datetime(2026, 8, 2, 12, 0, 0, tzinfo=timezone.utc)
+        self.designs = [
+            {"@CharacterDesignId": "S", "@Rarity": "Standard"},
+            {"@CharacterDesignId": "L", "@Rarity": "Legendary"},
+        ]
+
+    def crew(self, cid, level, xp, design="S"):
+        return {
+            "@CharacterId": cid, "@CharacterName": f"Char{cid}", "@Level": str(level),
+            "@Xp": str(xp), "@AvailableDate": "", "@RoomId": "1", "@CharacterDesignId": design,
+        }
+
+    def test_total_xp_required(self):
+        self.assertEqual(total_xp_required(1, False), 90)
+        self.assertEqual(total_xp_required(10, False), 9450)
+        self.assertEqual(total_xp_required(10, True), 9450 * 3)
+
+    def test_ladder_uses_lifetime_xp_thresholds(self):
+        ladder = upgrade_ladder(self.crew("1", 10, 9450 + 2130), self.designs[0], self.now)
+        self.assertEqual(ladder, [(6500, 9450), (6500 + 9700, 9450 + 2130)])
+        self.assertEqual(upgrade_ladder(self.crew("1", 10, 10000), self.designs[0], self.now), [(6500, 9450)])
+        self.assertEqual(upgrade_ladder(self.crew("1", 10, 4000), self.designs[0], self.now), [])
+
+    def test_ladder_respects_cap_and_availability(self):
+        crew = self.crew("1", 10, 100000)
+        self.assertEqual(len(upgrade_ladder(crew, self.designs[0], self.now, level_cap=12)), 2)
+        crew["@AvailableDate"] = "2026-08-03T00:00:00"
+        self.assertEqual(upgrade_ladder(crew, self.designs[0], self.now), [])
+
+    def test_beats_greedy_roster_order(self):
+        # Greedy takes Char1's single expensive level; two cheap levels are worth more.
+        characters = [self.crew("1", 20, total_xp_required(20, False)), self.crew("2", 10, 9450 + 2130)]
+        plan = plan_optimal_upgrades(characters, self.designs, 84500, self.now)
+        self.assertEqual(plan.level_ups, 2)
+        self.assertEqual([p.character_id for p in plan.purchases], ["2"])
+        self.assertEqual(plan.remaining_gas, 84500 - 6500 - 9700)
+
+    def test_custom_value_function(self):
+        characters = [self.crew("1", 20, total_xp_required(20, False)), self.crew("2", 10, 9450 + 2130)]
+
+        def prefer_high_level(character, design, from_level, to_level):
+            return sum(level ** 2 for level in range(from_level + 1, to_level + 1))
+
+        plan = plan_optimal_upgrades(characters, self.designs, 84500, self.now, value=prefer_high_level)
+        self.assertEqual([p.character_id for p in plan.purchases], ["1"])
+
+    def test_matches_exhaustive_search(self):
+        characters = [self.crew(str(i), 8 + i, 9000 + 2500 * i) for i in range(4)]
+        budget = 30000
+        plan = plan_optimal_upgrades(characters, self.designs, budget, self.now)
+        ladders = [upgrade_ladder(c, self.designs[0], self.now) for c in characters]
+        best = 0
+        for picks in itertools.product(*[range(len(lad) + 1) for lad in ladders]):
+            gas = sum(lad[k - 1][0] for lad, k in zip(ladders, picks) if k)
+            if gas <= budget:
+                best = max(best, sum(picks))
+        self.assertEqual(plan.level_ups, best)
+        self.assertLessEqual(plan.gas_spent, budget)
+
+    def test_nothing_affordable(self):
+        plan = plan_optimal_upgrades([self.crew("1", 20, 10000)], self.designs, 0, self.now)
+        self.assertEqual(plan.purchases, ())
+        self.assertEqual(plan.remaining_gas, 0)
+
+
 class TestConstants(unittest.TestCase):
     """Test constant values are correct."""
 
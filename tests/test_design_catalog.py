@@ -0,0 +1,114 @@
+"""Tests for DesignCatalog indexed lookups — pure data, no HTTP."""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock
+
+from sdk.client import Client
+from sdk.design_catalog import DesignCatalog
+from sdk.device import Device
+
+
+ROOM_DESIGNS = [
+    {"@RoomDesignId": "100", "@RoomName": "Laser", "@UpgradeFromRoomDesignId": "0"},
+    {"@RoomDesignId": "101", "@RoomName": "Laser Lv2", "@UpgradeFromRoomDesignId": "100"},
+    {"@RoomDesignId": "102", "@RoomName": "Laser Lv3", "@UpgradeFromRoomDesignId": "101"},
+]
+
+ITEM_DESIGNS = [
+    {"@ItemDesignId": "1", "@ItemName": "Sword", "@ItemSubType": "Weapon"},
+    {"@ItemDesignId": "2", "@ItemName": "Common WPN Consumable", "@ItemSubType": "None"},
+    {"@ItemDesignId": "3", "@ItemName": "Hero WPN Potion", "@ItemSubType": "Consumable"},
+]
+
+
+class TestDesignCatalog(unittest.TestCase):
+    """Forward and reverse maps."""
+
+    def setUp(self):
+        self.catalog = DesignCatalog(
+            room_designs=ROOM_DESIGNS,
+            item_designs=ITEM_DESIGNS,
+            training_designs=[{"@TrainingDesignId": "7", "@TrainingName": "Bench Press"}],
+            ship_designs=[{"@ShipDesignId": "5", "@Hp": "12"}],
+        )
+
+    def test_room_lookup(self):
+        self.assertEqual(self.catalog.room("101")["@RoomName"], "Laser Lv2")
+        self.assertEqual(self.catalog.room_name("102"), "Laser Lv3")
+        self.assertIsNone(self.catalog.room("999"))
+        self.assertEqual(self.catalog.room_name("999"), "")
+
+    def test_upgrade_reverse_map(self):
+        self.assertEqual(
+            [d["@RoomDesignId"] for d in self.catalog.upgrades_from("100")], ["101"],
+        )
+        self.assertEqual(self.catalog.upgrades_from("102"), [])
+
+    def test_training_and_ship_lookup(self):
+        self.assertEqual(self.catalog.training("Bench Press")["@TrainingDesignId"], "7")
+        self.assertEqual(self.catalog.ship("5")["@Hp"], "12")
+
+    def test_first_occurrence_wins(self):
+        catalog = DesignCatalog(room_designs=[
+            {"@RoomDesignId": "1", "@RoomName": "First"},
+            {"@RoomDesignId": "1", "@RoomName": "Second"},
+        ])
+        self.assertEqual(catalog.room_name("1"), "First")
+
+    def test_consumable_lookup(self):
+        self.assertEqual(self.catalog.consumable_design_id("wpn", "common"), 2)
+        self.assertEqual(self.catalog.consumable_design_id("WPN", "hero"), 3)
+        self.assertEqual(self.catalog.consumable_design_id("ENG", "hero"), 0)
+
+    def test_empty_catalog(self):
+        catalog = DesignCatalog()
+        self.assertIsNone(catalog.character("1"))
+        self.assertEqual(catalog.consumable_design_id("WPN", "hero"), 0)
+
+
+class TestClientDesignCatalog(unittest.TestCase):
+    """Client.designCatalog caching."""
+
+    def setUp(self):
+        self.device = MagicMock(spec=Device)  # type: ignore
+        self.device.languageKey = "en"
+        self.client = Client(device=self.device)
+        self.client.roomDesigns = {"RoomDesigns": {"RoomDesign": ROOM_DESIGNS}}
+
+    def test_catalog_reused_until_source_replaced(self):
+        first = self.client.designCatalog()
+        self.assertIs(self.client.designCatalog(), first)
+
+        self.client.roomDesigns = {"RoomDesigns": {"RoomDesign": ROOM_DESIGNS[:1]}}
+        second = self.client.designCatalog()
+        self.assertIsNot(second, first)
+        self.assertIsNone(second.room("101"))
+
+    def test_get_room_name(self):
+        self.assertTrue(self.client.getRoomName("101"))
+        self.assertEqual(self.client.roomName, "Laser Lv2")
+        self.assertFalse(self.client.getRoomName("999"))
+        self.assertEqual(self.client.roomName, "")
+
+    def test_upgrade_rooms_uses_reverse_map(self):
+        self.client.listUpgradingRooms = MagicMock()  # type: ignore
+        self.client.getShipByUserId = MagicMock()  # type: ignore
+        self.client.collectAllResources = MagicMock()  # type: ignore
+        self.client.request = MagicMock(return_value=MagicMock(text="<UpgradeRoom2/>"))  # type: ignore
+        self.client.accessToken = "token"
+        self.client.info = {"@Name": "Captain"}
+        self.client.mineralTotal = 1000
+        self.client.gasTotal = 1000
+        self.client.shipByUserId = {"ShipService": {"GetShipByUserId": {"Ship": {"Rooms": {"Room": [
+            {"@RoomId": "1", "@RoomStatus": "Normal", "@RoomDesignId": "101"},
+        ]}}}}}
+
+        self.assertTrue(self.client.upgradeRooms())
+        url = self.client.request.call_args[0][0]
+        self.assertIn("upgradeRoomDesignId=102", url)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Tests for the versioned design cache — local file I/O only, no HTTP."""
+
+from __future__ import annotations
+
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from sdk.design_store import DesignStore, design_versions
+
+
+def _latest_version(**versions):
+    return {"SettingService": {"GetLatestSetting": {"Setting": {
+        f"@{name}": value for name, value in versions.items()
+    }}}}
+
+
+class TestDesignVersions(unittest.TestCase):
+    """design_versions extracts @...Version attributes."""
+
+    def test_extracts_versions(self):
+        latest = _latest_version(RoomDesignVersion="42", CharacterDesignVersion="7")
+        latest["SettingService"]["GetLatestSetting"]["Setting"]["@MaintenanceMessage"] = "x"
+        self.assertEqual(
+            design_versions(latest),
+            {"@RoomDesignVersion": "42", "@CharacterDesignVersion": "7"},
+        )
+
+    def test_malformed_response(self):
+        self.assertEqual(design_versions(None), {})
+        self.assertEqual(design_versions({}), {})
+        self.assertEqual(design_versions({"SettingService": "oops"}), {})
+
+
+class TestDesignStore(unittest.TestCase):
+    """DesignStore get/put/prune behaviour."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.store = DesignStore(self.root, "en")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        data = {"RoomService": {"RoomDesigns": {"RoomDesign": [{"@RoomDesignId": "1"}]}}}
+        self.assertTrue(self.store.put("ListRoomDesigns2", "42", data))
+        self.assertEqual(self.store.get("ListRoomDesigns2", "42"), data)
+        self.assertEqual(self.store.hits, 1)
+
+    def test_miss_on_other_version(self):
+        self.store.put("ListRoomDesigns2", "42", {"a": 1})
+        self.assertIsNone(self.store.get("ListRoomDesigns2", "43"))
+        self.assertEqual(self.store.misses, 1)
+
+    def test_empty_version_is_never_cached(self):
+        self.assertFalse(self.store.put("ListRoomDesigns2", "", {"a": 1}))
+        self.assertEqual(self.store.get("ListRoomDesigns2", "", "default"), "default")
+
+    def test_new_version_prunes_old(self):
+        self.store.put("ListRoomDesigns2", "1", {"a": 1})
+        self.store.put("ListRoomDesigns2", "2", {"a": 2})
+        files = sorted(p.name for p in (self.root / "en" / "ListRoomDesigns2").iterdir())
+        self.assertEqual(files, ["2.json.gz"])
+
+    def test_corrupt_entry_is_a_miss(self):
+        self.store.put("ListRoomDesigns2", "1", {"a": 1})
+        path = self.root / "en" / "ListRoomDesigns2" / "1.json.gz"
+        path.write_bytes(b"not gzip")
+        self.assertEqual(self.store.get("ListRoomDesigns2", "1", "default"), "default")
+
+    def test_languages_are_separate(self):
+        self.store.put("ListRoomDesigns2", "1", {"lang": "en"})
+        other = DesignStore(self.root, "de")
+        self.assertIsNone(other.get("ListRoomDesigns2", "1"))
+
+    def test_path_components_are_sanitized(self):
+        self.store.put("../escape", "../../1", {"a": 1})
+        written = list(self.root.rglob("*.json.gz"))
+        self.assertEqual(len(written), 1)
+        self.assertTrue(written[0].resolve().is_relative_to(self.root.resolve()))
+        with gzip.open(written[0], "rt") as f:
+            self.assertIn('"data"', f.read())
+
+
+class TestClientDesignCache(unittest.TestCase):
+    """Client design endpoints consult the cache before the network."""
+
+    ROOM_XML = (
+        '<RoomService><ListRoomDesigns><RoomDesigns>'
+        '<RoomDesign RoomDesignId="1" RoomName="Laser" />'
+        '</RoomDesigns></ListRoomDesigns></RoomService>'
+    )
+
+    def setUp(self):
+        from sdk.client import Client
+        from sdk.device import Device
+        self._tmp = tempfile.TemporaryDirectory()
+        self.device = Device(language="en")
+        self.settings = {"design_cache_dir": self._tmp.name}
+        self.client = Client(device=self.device, settings=self.settings)
+        self.client.latestVersion = _latest_version(RoomDesignVersion="42")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _response(self, text):
+        r = MagicMock()
+        r.text = text
+        r.content = text.encode()
+        return r
+
+    def test_cache_disabled_by_default(self):
+        from sdk.client import Client
+        self.assertIsNone(Client(device=self.device).designStore)
+
+    def test_second_call_served_from_cache(self):
+        with patch("sdk.client.Client.request", return_value=self._response(self.ROOM_XML)) as req:
+            self.assertTrue(self.client.listRoomDesigns2())
+            self.assertTrue(self.client.listRoomDesigns2())
+        self.assertEqual(req.call_count, 1)
+        self.assertIn("RoomService", self.client.roomDesigns)
+
+    def test_version_change_refetches(self):
+        with patch("sdk.client.Client.request", return_value=self._response(self.ROOM_XML)) as req:
+            self.client.listRoomDesigns2()
+            self.client.latestVersion = _latest_version(RoomDesignVersion="43")
+            self.client.listRoomDesigns2()
+        self.assertEqual(req.call_count, 2)
+
+    def test_error_response_not_cached(self):
+        error = '<RoomService><ListRoomDesigns errorMessage="Busy" /></RoomService>'
+        with patch("sdk.client.Client.request", return_value=self._response(error)) as req:
+            self.client.listRoomDesigns2()
+            self.client.listRoomDesigns2()
+        self.assertEqual(req.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Tests for the streaming ListAllDesigns4 parser — no HTTP."""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock
+
+import xmltodict
+
+from sdk.client import Client, _ALL_DESIGN_COLLECTIONS, _extract_collection
+from sdk.design_stream import iter_design_collections, parse_all_designs
+from sdk.device import Device
+
+
+SAMPLE = (
+    b'<DesignService><ListAllDesigns>'
+    b'<RoomDesigns>'
+    b'<RoomDesign RoomDesignId="1" RoomName="Laser" UpgradeFromRoomDesignId="0" />'
+    b'<RoomDesign RoomDesignId="2" RoomName="Laser Lv2" UpgradeFromRoomDesignId="1" />'
+    b'</RoomDesigns>'
+    b'<ShipDesigns><ShipDesign ShipDesignId="5" Hp="12"><Note>hull</Note></ShipDesign></ShipDesigns>'
+    b'<Files />'
+    b'</ListAllDesigns></DesignService>'
+)
+
+
+def _full_document() -> bytes:
+    parts = [b"<DesignService><ListAllDesigns>"]
+    for key, _attr, _version in _ALL_DESIGN_COLLECTIONS:
+        record = key[:-1] if key.endswith("s") else key
+        parts.append(f'<{key}><{record} Id="1" Name="{key}" /></{key}>'.encode())
+    parts.append(b"</ListAllDesigns></DesignService>")
+    return b"".join(parts)
+
+
+class TestDesignStream(unittest.TestCase):
+    """Streaming output matches the xmltodict shape."""
+
+    def test_records_match_xmltodict(self):
+        streamed = parse_all_designs(SAMPLE)
+        reference = xmltodict.parse(SAMPLE, xml_attribs=True)["DesignService"]["ListAllDesigns"]
+        self.assertEqual(
+            _extract_collection(streamed["RoomDesigns"], "RoomDesign"),
+            _extract_collection(reference["RoomDesigns"], "RoomDesign"),
+        )
+        self.assertEqual(
+            _extract_collection(streamed["ShipDesigns"], "ShipDesign"),
+            _extract_collection(reference["ShipDesigns"], "ShipDesign"),
+        )
+
+    def test_single_record_is_a_list(self):
+        streamed = parse_all_designs(SAMPLE)
+        self.assertIsInstance(streamed["ShipDesigns"]["ShipDesign"], list)
+
+    def test_empty_collection_is_none(self):
+        self.assertIsNone(parse_all_designs(SAMPLE)["Files"])
+
+    def test_collections_are_yielded_in_order(self):
+        names = [name for name, _ in iter_design_collections(SAMPLE)]
+        self.assertEqual(names, ["RoomDesigns", "ShipDesigns", "Files"])
+
+    def test_error_message(self):
+        error = b'<DesignService><ListAllDesigns errorMessage="Busy" /></DesignService>'
+        self.assertIsNone(parse_all_designs(error))
+
+    def test_malformed_document(self):
+        self.assertIsNone(parse_all_designs(b"<DesignService><ListAllDesigns>"))
+
+    def test_unexpected_root(self):
+        self.assertEqual(parse_all_designs(b"<Other><ListAllDesigns><Files /></ListAllDesigns></Other>"), {})
+
+
+class TestClientListAllDesigns4(unittest.TestCase):
+    """listAllDesigns4 populates attributes from the stream."""
+
+    def setUp(self):
+        self.device = MagicMock(spec=Device)  # type: ignore
+        self.device.languageKey = "en"
+        self.client = Client(device=self.device)
+        self.client.latestVersion = {"SettingService": {"GetLatestSetting": {"Setting": {
+            version: "1" for _key, _attr, version in _ALL_DESIGN_COLLECTIONS
+        } | {"@TaskDesignVersion": "1", "@ActionTypeVersion": "1", "@ConditionTypeVersion": "1"}}}}
+
+    def test_populates_all_collections(self):
+        self.client.request = MagicMock(return_value=MagicMock(content=_full_document()))  # type: ignore
+        self.assertTrue(self.client.listAllDesigns4())
+        self.assertEqual(self.client.roomDesigns["RoomDesign"][0]["@Name"], "RoomDesigns")
+        self.assertEqual(self.client.starSystemMarkerGenerators["StarSystemMarkerGenerator"][0]["@Id"], "1")
+
+    def test_missing_collection(self):
+        self.client.request = MagicMock(return_value=MagicMock(content=SAMPLE))  # type: ignore
+        self.assertFalse(self.client.listAllDesigns4())
+
+
+if __name__ == "__main__":
+    unittest.main()
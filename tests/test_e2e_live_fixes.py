@@ -9,6 +9,7 @@ import os
 
 from sdk.client import Client
 from sdk.device import Device
+from sdk.response import ClassifiedResponse
 import scripts.provision_account_secrets as provision_script
 
 
@@ -212,6 +213,44 @@ class TestE2ELiveFixes(unittest.TestCase):
         res = self.client.upgradeCharacters()
         self.assertTrue(res)
 
+    def _crew(self, xp, count=3):
+        self.client.listItemsOfAShip = MagicMock()
+        self.client.allCharactersOfUser = {"Character": [
+            {"@CharacterId": str(i), "@CharacterDesignId": "1", "@RoomId": "100", "@Level": "10",
+             "@Xp": str(xp), "@CharacterName": f"Crew{i}", "@AvailableDate": ""}
+            for i in range(count)
+        ]}
+        self.client.allCharacterDesigns = {"CharacterDesign": [{"@CharacterDesignId": "1", "@Rarity": "Common"}]}
+
+        def collect():
+            self.client.gasTotal = "17000"
+            return True
+
+        self.client.collectAllResources = MagicMock(side_effect=collect)
+        self.client.upgradeCharacter = MagicMock(return_value=True)
+
+    def test_upgrade_characters_needs_cumulative_xp(self):
+        """@Xp is lifetime XP: level 10 needs 9450 before the next upgrade."""
+        self._crew(xp=4000)
+        self.assertTrue(self.client.upgradeCharacters())
+        self.client.collectAllResources.assert_not_called()
+        self.client.upgradeCharacter.assert_not_called()
+
+    def test_upgrade_characters_collects_once_and_plans(self):
+        """upgradeCharacters refreshes gas once and buys the planned levels."""
+        self._crew(xp=9450)
+        self.assertTrue(self.client.upgradeCharacters())
+        self.client.collectAllResources.assert_called_once()
+        # 6500 gas per level 10 upgrade; 17000 buys two of them.
+        self.assertEqual(self.client.upgradeCharacter.call_count, 2)
+
+    def test_upgrade_characters_stops_ladder_on_failure(self):
+        """A failed UpgradeCharacter stops that crew member's remaining levels."""
+        self._crew(xp=9450 + 2130, count=1)  # covers levels 10 and 11: 6500 + 9700 gas
+        self.client.upgradeCharacter.return_value = False
+        self.assertTrue(self.client.upgradeCharacters())
+        self.client.upgradeCharacter.assert_called_once_with("0")
+
     # 6. Marketplace Fixes
 
     def test_list_active_marketplace_messages_empty_and_dict(self):
@@ -221,9 +260,7 @@ class TestE2ELiveFixes(unittest.TestCase):
             b'<Messages><Message Message="Laser Cannon" ActivityArgument="starbux:50"/></Messages>'
             b'</ListActiveMarketplaceMessages></MessageService>'
         )
-        with patch.object(self.client, "request") as mock_req:
-            mock_req.return_value.content = xml
-            mock_req.return_value.text = xml.decode("utf-8")
+        with patch.object(self.client, "request", return_value=ClassifiedResponse(MagicMock(content=xml))):
             res = self.client.listActiveMarketplaceMessages()
             self.assertTrue(res)
 
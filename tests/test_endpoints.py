@@ -0,0 +1,93 @@
+"""Tests for the declarative endpoint table — no network."""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from sdk.client import Client
+from sdk.device import Device
+from sdk.endpoints import ALL_DESIGNS4_VERSIONS, ENDPOINTS, Endpoint
+from sdk.request_cache import endpoint_name
+from sdk.request_scheduler import Priority
+
+BASE = "https://api.pixelstarships.com"
+TS = "2026-01-02T03:04:05"
+
+
+class TestEndpoint(unittest.TestCase):
+
+    def test_url_in_wire_order(self):
+        url = ENDPOINTS["ListPvPBattles2"].url(BASE, take=25, skip=0, accessToken="tok", clientDateTime=TS)
+        self.assertEqual(url, f"{BASE}/BattleService/ListPvPBattles2?take=25&skip=0&accessToken=tok&clientDateTime={TS}")
+
+    def test_timestamp_filled_in(self):
+        with patch("sdk.endpoints.client_date_time", return_value=TS):
+            url = ENDPOINTS["ListAllResearches"].url(BASE, accessToken="tok")
+        self.assertTrue(url.endswith(f"accessToken=tok&clientDateTime={TS}"))
+
+    def test_missing_parameter(self):
+        with self.assertRaises(KeyError):
+            ENDPOINTS["GetShipByUserId"].url(BASE, accessToken="tok")
+
+    def test_checksum_from_values(self):
+        endpoint = Endpoint("S", "Call", ("a", "checksum"), checksum=lambda v: f"sum-{v['a']}")
+        self.assertEqual(endpoint.url(BASE, a="1"), f"{BASE}/S/Call?a=1&checksum=sum-1")
+
+    def test_names_match_urls(self):
+        for name, endpoint in ENDPOINTS.items():
+            with self.subTest(name=name):
+                values = {param: "x" for param in endpoint.params}
+                self.assertEqual(endpoint_name(endpoint.url(BASE, **values)), name)
+
+    def test_records(self):
+        endpoint = ENDPOINTS["ListAllCharactersOfUser"]
+        one = {"CharacterService": {"ListAllCharactersOfUser": {"Characters": {"Character": {"@CharacterId": "1"}}}}}
+        many = {"CharacterService": {"ListAllCharactersOfUser": {"Characters": {"Character": [
+            {"@CharacterId": "1"}, {"@CharacterId": "2"},
+        ]}}}}
+        self.assertEqual(endpoint.records(one), [{"@CharacterId": "1"}])
+        self.assertEqual(len(endpoint.records(many)), 2)
+        self.assertEqual(endpoint.records({"Other": {}}), [])
+        self.assertEqual(endpoint.records(None), [])
+
+    def test_table_lookups(self):
+        self.assertIs(ENDPOINTS["HeartBeat4"].priority, Priority.CRITICAL)
+        self.assertIsNotNone(ENDPOINTS["GetShipByUserId"].ttl)
+        self.assertIsNone(ENDPOINTS["HeartBeat4"].ttl)
+
+
+class TestClientEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        self.client.accessToken = "abcd-1234"
+
+    def test_list_all_designs4_url_unchanged(self):
+        versions = {attr: attr.strip("@").lower() for _, attr in ALL_DESIGNS4_VERSIONS}
+        url = self.client._endpoint_url(
+            "ListAllDesigns4", LanguageKey="en", **{p: versions[a] for p, a in ALL_DESIGNS4_VERSIONS},
+        )
+        self.assertTrue(url.startswith(f"{BASE}/DesignService/ListAllDesigns4?LanguageKey=en&ListFileVersion=fileversion&"))
+        self.assertTrue(url.endswith("&ListMarkerGeneratorDesignVersion=markergeneratordesignversion"))
+        self.assertEqual(url.count("&"), len(ALL_DESIGNS4_VERSIONS))
+
+    def test_access_token_defaults_to_session(self):
+        url = self.client._endpoint_url("ListTasksOfAUser", clientDateTime=TS)
+        self.assertEqual(url, f"{BASE}/TaskService/ListTasksOfAUser?accessToken=abcd-1234&clientDateTime={TS}")
+
+    def test_heartbeat_url_carries_checksum(self):
+        url = self.client._endpoint_url("HeartBeat4", clientDateTime=TS)
+        self.assertRegex(url, rf"^{BASE}/UserService/HeartBeat4\?clientDateTime={TS}&checksum=[^&]+&accessToken=abcd-1234$")
+
+    def test_method_comes_from_table(self):
+        self.client.request = MagicMock(return_value=None)  # type: ignore
+        with patch.dict(ENDPOINTS, {"ListAllResearches": Endpoint(
+            "ResearchService", "ListAllResearches", ("accessToken",), method="POST",
+        )}):
+            self.client.listAllResearches()
+        self.assertEqual(self.client.request.call_args[0], (f"{BASE}/ResearchService/ListAllResearches?accessToken=abcd-1234", "POST"))
+
+
+if __name__ == "__main__":
+    unittest.main()
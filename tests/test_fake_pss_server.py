@@ -0,0 +1,84 @@
+"""End-to-end tests of the Client stack against the local fake PSS server (127.0.0.1 only)."""
+
+from __future__ import annotations
+
+import unittest
+
+from sdk.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, Resilience, RetryBudget
+
+from .fake_pss_server import USER_NAME, FakePssServer, FaultConfig, SyntheticAccount, client_for, measure
+
+
+class TestFakePssServer(unittest.TestCase):
+
+    def _server(self, **faults):
+        server = FakePssServer(FaultConfig(**faults), SyntheticAccount(rooms=5, characters=3)).start()
+        self.addCleanup(server.stop)
+        return server
+
+    def test_reads_parse_over_http(self):
+        server = self._server()
+        client = client_for(server)
+        self.assertTrue(client.login())
+        self.assertEqual(client.info["@Name"], USER_NAME)
+        self.assertTrue(client.getShipByUserId())
+        self.assertEqual((len(client.ship.rooms), len(client.ship.researches)), (5, 8))
+        self.assertTrue(client.listAllCharactersOfUser())
+        self.assertEqual([c.name for c in client.characters], ["Crew 0", "Crew 1", "Crew 2"])
+        client.listTasksOfAUser()
+        self.assertIn("TaskService", client.tasksOfAUser)
+        self.assertTrue(client.heartbeat(force=True))
+        self.assertFalse(server.unknown)
+
+    def test_expired_token_is_refreshed_and_replayed(self):
+        server = self._server()
+        client = client_for(server)
+        client.login()
+        first = client.accessToken
+        server.expire_tokens()
+        client.listAllResearches()
+        self.assertNotEqual(client.accessToken, first)
+        self.assertIn("ResearchService", client.allResearches)
+        self.assertEqual(server.requests["DeviceLogin17"], 2)
+
+    def test_server_errors_are_retried(self):
+        server = self._server(server_error_rate=0.3, seed=7)
+        report = measure(server, calls=30, threads=1)
+        self.assertEqual(report["failures"], {})
+        self.assertGreater(server.injected["server_error"], 0)
+        self.assertGreater(report["metrics"]["totals"]["retries"], 0)
+        self.assertEqual(report["calls"], 30)
+
+    def test_persistent_server_errors_open_the_circuit(self):
+        server = self._server(server_error_rate=1.0, server_error_status=502)
+        resilience = Resilience(budget=RetryBudget(), latency=LatencyTracker(initial=2.0),
+                                breaker=CircuitBreaker(threshold=3), backoff=0.0)
+        client = client_for(server, resilience=resilience)
+        r = client.request(f"{server.base_url}/ResearchService/ListAllResearches?accessToken=x", "GET")
+        self.assertEqual(r.status_code, 502)
+        self.assertEqual(server.requests["ListAllResearches"], 3)
+        with self.assertRaises(CircuitOpenError):
+            client.request(f"{server.base_url}/ResearchService/ListAllResearches?accessToken=x", "GET")
+
+    def test_latency_shows_in_metrics(self):
+        server = self._server(latency=0.05)
+        client = client_for(server)
+        client.login()
+        client.listAllResearches()
+        stats = client.metrics.endpoints()["ListAllResearches"]
+        self.assertGreaterEqual(stats.latency[0], 0.05)
+        self.assertGreater(stats.bytes, 0)
+
+    def test_error_injection_and_unknown_endpoints(self):
+        server = self._server(error_rate=1.0)
+        client = client_for(server)
+        r = client.request(f"{server.base_url}/TaskService/ListTasksOfAUser?accessToken=x", "GET")
+        self.assertEqual(r.error_message, "Synthetic failure, please try again.")
+        clean = self._server()
+        r = client_for(clean).request(f"{clean.base_url}/NoService/Nothing", "GET")
+        self.assertEqual(r.status_code, 404)
+        self.assertEqual(clean.unknown["/NoService/Nothing"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
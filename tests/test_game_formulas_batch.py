@@ -0,0 +1,99 @@
+"""Tests for the vectorized game formulas — element-wise parity with the scalars."""
+
+import itertools
+import unittest
+
+import numpy as np
+
+from sdk import game_formulas as gf
+from sdk import game_formulas_batch as gfb
+
+
+def scalar_grid(fn, *columns):
+    return np.array([fn(*args) for args in zip(*columns)])
+
+
+class TestParity(unittest.TestCase):
+    """Batch results equal the scalar functions element by element."""
+
+    def assertParity(self, batch_fn, scalar_fn, *columns):
+        expected = scalar_grid(scalar_fn, *columns)
+        np.testing.assert_allclose(batch_fn(*[np.array(c) for c in columns]), expected, rtol=1e-12)
+
+    def test_room_reload(self):
+        grid = list(itertools.product([0, 120, 300.5], [0, 35, 250], [4, 10], [1, 4, 12]))
+        self.assertParity(gfb.room_reload, gf.room_reload, *zip(*grid))
+
+    def test_escape(self):
+        mods, stats = [0.5, 0.25, 1.0], [0, 50, 120]
+        self.assertParity(gfb.escape_chance, gf.escape_chance, mods, stats)
+        self.assertParity(gfb.escape_rate, gf.escape_rate, [10, 0, 33.3], [5, 7, 66.6])
+
+    def test_dodge(self):
+        values = [-5, 0, 1, 25, 50, 99.9, 100.28, 150]
+        self.assertParity(gfb.dodge_evasion, gf.dodge_evasion, values)
+
+    def test_damage(self):
+        armor = [0, 1, 10, 75, 1000]
+        self.assertParity(gfb.damage_reduction, gf.damage_reduction, armor)
+        self.assertParity(gfb.effective_damage, gf.effective_damage, [100] * 5, armor)
+
+    def test_fire(self):
+        self.assertParity(gfb.fire_damage_reduced, gf.fire_damage_reduced, [10, 20], [0, 50])
+        self.assertParity(gfb.fire_crew_damage, gf.fire_crew_damage, [0, 400], [0, 60])
+        self.assertParity(gfb.fire_ap_damage, gf.fire_ap_damage, [0, 1000])
+
+    def test_crew_stat_every_level(self):
+        levels = np.arange(1, 41)
+        for ease in ("ease_out", "linear", "ease_in"):
+            expected = [gf.crew_stat_at_level(int(lv), 12.5, 87.0, ease) for lv in levels]
+            np.testing.assert_allclose(gfb.crew_stat_at_level(levels, 12.5, 87.0, ease), expected)
+        self.assertEqual(gfb.crew_stat_at_level(40, 1.0, 3.0)[()], 3.0)
+
+    def test_crew_stat_broadcasts_over_roster(self):
+        lvl1 = np.array([[10.0], [20.0]])
+        result = gfb.crew_stat_at_level(np.arange(1, 41), lvl1, lvl1 * 4)
+        self.assertEqual(result.shape, (2, 40))
+        self.assertAlmostEqual(result[1, 19], gf.crew_stat_at_level(20, 20.0, 80.0))
+
+    def test_gas_draw_price(self):
+        counts, dna = [0, 3, 10, 40, 200], [0, 500, 0, 0, 0]
+        self.assertParity(gfb.gas_draw_price, gf.gas_draw_price, counts, dna)
+
+    def test_trophy_gain(self):
+        losers, winners = [1000, 1500, 100, 2000, 1189], [1000, 1000, 2000, 1000, 1000]
+        self.assertParity(gfb.trophy_gain, gf.trophy_gain, losers, winners)
+        self.assertEqual(gfb.trophy_gain(losers, winners).dtype, np.int64)
+
+
+class TestValidation(unittest.TestCase):
+    """Invalid elements raise for the whole batch or are masked."""
+
+    def test_raise_rejects_whole_batch(self):
+        with self.assertRaisesRegex(ValueError, "armor must be non-negative"):
+            gfb.damage_reduction([10, -1, 5])
+        with self.assertRaisesRegex(ValueError, "current_power must be non-zero"):
+            gfb.room_reload_powered([10, 10], [4, 4], [4, 0])
+        with self.assertRaisesRegex(ValueError, "level must be 1-40, got 41"):
+            gfb.crew_stat_at_level([1, 41], 1.0, 2.0)
+
+    def test_mask_marks_invalid_elements(self):
+        result = gfb.trophy_gain([1000, 1000, -5], [1000, 0, 1000], errors="mask")
+        self.assertIsInstance(result, np.ma.MaskedArray)
+        self.assertEqual(result.mask.tolist(), [False, True, True])
+        self.assertEqual(result[0], 20)
+
+    def test_mask_on_valid_batch(self):
+        result = gfb.effective_damage(100, [0, 100], errors="mask")
+        self.assertFalse(result.mask.any())
+        self.assertEqual(result.tolist(), [100.0, 50.0])
+
+    def test_invalid_ease_and_errors_always_raise(self):
+        with self.assertRaises(ValueError):
+            gfb.crew_stat_at_level([1, 2], 1.0, 2.0, "bogus", errors="mask")
+        with self.assertRaises(ValueError):
+            gfb.fire_ap_damage([1], errors="ignore")
+
+
+if __name__ == "__main__":
+    unittest.main()
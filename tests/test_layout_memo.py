@@ -0,0 +1,153 @@
+"""Tests for the layout analysis memo — local file I/O only, no HTTP."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from sdk.client import Client
+from sdk.device import Device
+from sdk.layout_memo import LayoutMemo, layout_fingerprint
+from sdk.models import Room, Ship
+
+from tests.test_ship_layout import TEST_DESIGNS, _make_room
+
+
+def _ship(*rooms, name="Memo"):
+    return Ship(ship_id="9", name=name, design_id="233", level=10, rooms=tuple(rooms))
+
+
+class TestFingerprint(unittest.TestCase):
+    """The hash covers room tuples and the room-design version."""
+
+    def test_room_order_does_not_matter(self):
+        a, b = Room("1", "300", 0, 0, "Normal"), Room("2", "100", 0, 2, "Normal")
+        self.assertEqual(
+            layout_fingerprint(_ship(a, b), [a, b], "7"),
+            layout_fingerprint(_ship(b, a), [b, a], "7"),
+        )
+
+    def test_changes_with_layout_and_version(self):
+        a = Room("1", "300", 0, 0, "Normal")
+        base = layout_fingerprint(_ship(a), [a], "7")
+        moved = Room("1", "300", 0, 1, "Normal")
+        upgrading = Room("1", "300", 0, 0, "Upgrading", "301")
+        self.assertNotEqual(base, layout_fingerprint(_ship(moved), [moved], "7"))
+        self.assertNotEqual(base, layout_fingerprint(_ship(upgrading), [upgrading], "7"))
+        self.assertNotEqual(base, layout_fingerprint(_ship(a), [a], "8"))
+        # Room IDs are not part of the layout.
+        renumbered = Room("5", "300", 0, 0, "Normal")
+        self.assertEqual(base, layout_fingerprint(_ship(renumbered), [renumbered], "7"))
+
+
+class TestLayoutMemo(unittest.TestCase):
+    """LRU eviction, persistence and score history."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name, "memo", "layout_memo.json")
+
+    def test_lru_eviction(self):
+        memo = LayoutMemo(self.path, max_entries=2)
+        memo.put("a", {"report": "A"})
+        memo.put("b", {"report": "B"})
+        self.assertIsNotNone(memo.get("a"))  # "b" is now least recently used
+        memo.put("c", {"report": "C"})
+        self.assertIsNone(memo.get("b"))
+        self.assertEqual(len(memo), 2)
+        self.assertEqual((memo.hits, memo.misses), (1, 1))
+
+    def test_round_trip(self):
+        memo = LayoutMemo(self.path)
+        memo.put("a", {"report": "A", "defense_score": 50.0})
+        memo.record_score("ship", "a", 50.0)
+        self.assertTrue(memo.save())
+        reloaded = LayoutMemo(self.path)
+        self.assertEqual(reloaded.get("a")["report"], "A")
+        self.assertEqual(reloaded.previous_score("ship"), 50.0)
+        self.assertIsNone(reloaded.previous_score("other"))
+
+    def test_concurrent_writers_merge(self):
+        first, second = LayoutMemo(self.path), LayoutMemo(self.path)
+        first.put("a", {"report": "A"})
+        first.record_score("ship-a", "a", 50.0)
+        second.put("b", {"report": "B"})
+        second.record_score("ship-b", "b", 60.0)
+        self.assertTrue(first.save())
+        self.assertTrue(second.save())
+        reloaded = LayoutMemo(self.path)
+        self.assertEqual((reloaded.get("a")["report"], reloaded.get("b")["report"]), ("A", "B"))
+        self.assertEqual((reloaded.previous_score("ship-a"), reloaded.previous_score("ship-b")), (50.0, 60.0))
+        self.assertEqual(second.previous_score("ship-a"), 50.0)
+
+    def test_corrupt_file_is_empty(self):
+        self.path.parent.mkdir(parents=True)
+        self.path.write_text("{broken")
+        memo = LayoutMemo(self.path)
+        self.assertEqual(len(memo), 0)
+        self.assertTrue(memo.save())
+
+
+class TestClientLayoutMemo(unittest.TestCase):
+    """Client.analyzeShipLayout skips unchanged layouts and reports deltas."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.memo_file = str(Path(self.tmp.name, "layout_memo.json"))
+        self.client = self._client()
+
+    def _client(self):
+        client = Client(device=Device(language="en"), settings={"layout_memo_file": self.memo_file})
+        client.info = {"@Name": "TestCaptain"}
+        client.latestVersion = {"SettingService": {"GetLatestSetting": {"Setting": {
+            "@RoomDesignVersion": "12",
+        }}}}
+        client.roomDesigns = {"RoomDesigns": {"RoomDesign": TEST_DESIGNS}}
+        return client
+
+    def _set_rooms(self, client, *rooms):
+        client.shipByUserId = {"ShipService": {"GetShipByUserId": {"Ship": {
+            "@ShipId": "9", "@ShipName": "MemoShip", "@ShipLevel": "10", "@ShipDesignId": "233",
+            "Rooms": {"Room": list(rooms)},
+        }}}}
+
+    def test_unchanged_layout_served_from_memo(self):
+        self._set_rooms(self.client, _make_room("1", "256", 10, 20), _make_room("2", "300", 12, 20))
+        self.assertTrue(self.client.analyzeShipLayout())
+
+        # A later run: same layout, nothing re-analyzed.
+        client = self._client()
+        client.roomDesigns = None
+        self._set_rooms(client, _make_room("1", "256", 10, 20), _make_room("2", "300", 12, 20))
+        with patch("sdk.ship_layout.analyze_layout") as analyze, \
+                patch.object(Client, "listRoomDesigns2") as list_designs, \
+                self.assertLogs(level="INFO") as logs:
+            self.assertTrue(client.analyzeShipLayout())
+        analyze.assert_not_called()
+        list_designs.assert_not_called()
+        self.assertTrue(any("unchanged" in line for line in logs.output))
+        self.assertTrue(any("OVERALL DEFENSE" in line for line in logs.output))
+
+    def test_changed_layout_reports_delta(self):
+        self._set_rooms(self.client, _make_room("2", "300", 12, 20))
+        self.assertTrue(self.client.analyzeShipLayout())
+
+        client = self._client()
+        self._set_rooms(client, _make_room("1", "256", 11, 20), _make_room("2", "300", 12, 20))
+        with self.assertLogs(level="INFO") as logs:
+            self.assertTrue(client.analyzeShipLayout())
+        self.assertTrue(any("Layout changed: defense score" in line for line in logs.output))
+
+    def test_no_memo_without_design_version(self):
+        self.client.latestVersion = None
+        self._set_rooms(self.client, _make_room("2", "300", 12, 20))
+        self.assertTrue(self.client.analyzeShipLayout())
+        self.assertFalse(Path(self.memo_file).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
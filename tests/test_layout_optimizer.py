@@ -0,0 +1,88 @@
+"""Tests for the layout optimizer — pure functions, no HTTP."""
+
+from __future__ import annotations
+
+import dataclasses
+import unittest
+
+from sdk.layout_optimizer import layout_bounds, optimize_layout, suggest_moves
+from sdk.ship_layout import RoomInfo, analyze_layout
+
+
+def _room(room_id, category, row, col, width=1, height=1, power=0):
+    return RoomInfo(
+        room_id=str(room_id), design_id=str(room_id), row=row, column=col, status="normal",
+        width=width, height=height, category=category, name=f"{category}{room_id}", power=power,
+    )
+
+
+def _layout():
+    """A deliberately poor layout: armor far from everything, weapons on one side."""
+    return [
+        _room(1, "reactor", 0, 0, 2, 2, power=20),
+        _room(2, "weapon", 0, 2, 2, 1),
+        _room(3, "weapon", 1, 2, 2, 1),
+        _room(4, "repair", 0, 9, 2, 2),
+        _room(5, "shield", 3, 0, 2, 1),
+        _room(6, "armor", 3, 9),
+        _room(7, "armor", 3, 10),
+        _room(8, "armor", 3, 11),
+        _room(9, "corridor", 2, 5),
+    ]
+
+
+def _moved(rooms, positions):
+    return [dataclasses.replace(r, row=positions[i][0], column=positions[i][1]) for i, r in enumerate(rooms)]
+
+
+class TestOptimizeLayout(unittest.TestCase):
+    """Annealing search and suggestions."""
+
+    def test_improves_poor_layout(self):
+        rooms = _layout()
+        result = optimize_layout(rooms, seed=1, time_budget=10, max_iterations=3000)
+        self.assertGreater(result.best_score, result.initial_score)
+        self.assertAlmostEqual(
+            result.best_score,
+            analyze_layout(_moved(rooms, [result.positions[r.room_id] for r in rooms])).defense_score,
+        )
+        # Corridors are not movable by default.
+        self.assertEqual(result.positions["9"], (2, 5))
+
+    def test_deterministic_with_iteration_cap(self):
+        rooms = _layout()
+        a = optimize_layout(rooms, seed=3, time_budget=10, max_iterations=500)
+        b = optimize_layout(rooms, seed=3, time_budget=10, max_iterations=500)
+        self.assertEqual(a.positions, b.positions)
+        self.assertEqual(a.suggestions, b.suggestions)
+
+    def test_suggestions_replay_to_best_score(self):
+        rooms = _layout()
+        result = optimize_layout(rooms, seed=2, time_budget=10, max_iterations=2000)
+        self.assertTrue(result.suggestions)
+        self.assertAlmostEqual(result.suggestions[-1].score_after, result.best_score)
+        self.assertAlmostEqual(
+            sum(s.gain for s in result.suggestions), result.best_score - result.initial_score
+        )
+        self.assertIn("→", result.suggestions[0].describe())
+
+    def test_suggest_swap(self):
+        rooms = [_room(1, "armor", 0, 0), _room(2, "weapon", 0, 5), _room(3, "other", 0, 4)]
+        target = {"1": (0, 5), "2": (0, 0)}
+        (suggestion,) = suggest_moves(rooms, target)
+        self.assertEqual(suggestion.kind, "swap")
+
+    def test_restarts_across_processes(self):
+        rooms = _layout()
+        serial = optimize_layout(rooms, seed=0, time_budget=10, max_iterations=300, restarts=3, processes=1)
+        pooled = optimize_layout(rooms, seed=0, time_budget=10, max_iterations=300, restarts=3, processes=2)
+        self.assertEqual(serial.positions, pooled.positions)
+        self.assertEqual(serial.iterations, 900)
+
+    def test_bounds(self):
+        self.assertEqual(layout_bounds(_layout()), (0, 3, 0, 11))
+        self.assertEqual(optimize_layout([], time_budget=0.1).suggestions, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for per-endpoint request metrics — local file I/O only, no HTTP."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import requests
+
+from sdk.client import Client
+from sdk.device import Device
+from sdk.metrics import RequestMetrics
+from sdk.response import parse_xml
+
+URL = "https://api.pixelstarships.com/ResearchService/ListAllResearches?accessToken=secret-token-value&clientDateTime=x"
+
+
+class TestRequestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = RequestMetrics()
+        self.metrics.record_request("ListAllResearches", URL, 0.2, nbytes=2048, limiter_wait=0.5)
+        self.metrics.record_request("ListAllResearches", URL, 0.04, nbytes=1024, retries=2, error="error")
+        self.metrics.record_request("HeartBeat4", URL, 3.0)
+        self.metrics.record_parse("ListAllResearches", 0.01)
+
+    def test_summary(self):
+        summary = self.metrics.summary()
+        research = summary["endpoints"]["ListAllResearches"]
+        self.assertEqual((research["calls"], research["retries"], research["bytes"]), (2, 2, 3072))
+        self.assertEqual(research["errors"], {"error": 1})
+        self.assertAlmostEqual(research["latency_p95_s"], 0.2)
+        self.assertEqual(summary["totals"]["calls"], 3)
+        self.assertEqual(summary["totals"]["errors"], 1)
+        # Slowest endpoint first.
+        self.assertEqual(next(iter(summary["endpoints"])), "HeartBeat4")
+
+    def test_urls_redacted(self):
+        dumped = json.dumps(self.metrics.summary())
+        self.assertNotIn("secret-token-value", dumped)
+        self.assertNotIn("secret-token-value", self.metrics.table())
+
+    def test_table_histogram(self):
+        lines = self.metrics.table().splitlines()
+        self.assertIn("<50ms", lines[0])
+        research = next(line for line in lines if line.startswith("ListAllResearches"))
+        # One call under 50ms, one under 250ms.
+        self.assertTrue(research.rstrip().endswith("1      0      1      0      0      0      0      0"))
+
+    def test_write_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "out", "metrics.json")
+            self.assertTrue(self.metrics.write_json(path))
+            self.assertEqual(json.loads(path.read_text())["totals"]["calls"], 3)
+
+
+class TestClientInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        self.client.session = MagicMock()
+
+    def test_request_and_parse_recorded(self):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"<ResearchService><ListAllResearches/></ResearchService>"
+        self.client.session.request.return_value = response
+        r = self.client.request(URL, "GET")
+        parse_xml(r)
+        parse_xml(r)
+        stats = self.client.metrics.endpoints()["ListAllResearches"]
+        self.assertEqual((stats.calls, stats.bytes, stats.parses), (1, len(response._content), 1))
+        self.assertFalse(stats.errors)
+
+    def test_transport_error_recorded(self):
+        self.client.session.request.side_effect = requests.exceptions.ConnectTimeout()
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            self.client.request(URL, "GET")
+        stats = self.client.metrics.endpoints()["ListAllResearches"]
+        self.assertEqual(dict(stats.errors), {"ConnectTimeout": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
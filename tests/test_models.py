@@ -0,0 +1,102 @@
+"""Tests for typed ship/crew models — pure data, no HTTP."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+
+from sdk.crew_leveling import UpgradeBlockReason, evaluate_upgrade
+from sdk.models import Character, Item, Research, Room, Ship
+from sdk.ship_layout import parse_rooms
+
+
+SHIP_XML = {
+    "@ShipId": "9",
+    "@ShipName": "Tachikoma",
+    "@ShipDesignId": "233",
+    "@ShipLevel": "10",
+    "@Hp": "1200.0",
+    "Rooms": {"Room": [
+        {"@RoomId": "1", "@RoomDesignId": "256", "@Row": "3", "@Column": "4", "@RoomStatus": "Normal"},
+        {"@RoomId": "2", "@RoomDesignId": "300", "@Row": "5", "@Column": "6",
+         "@RoomStatus": "Upgrading", "@UpgradeRoomDesignId": "301"},
+    ]},
+    "Researches": {"Research": {"@ResearchId": "7", "@ResearchDesignId": "70", "@ResearchState": "Completed"}},
+}
+
+CHARACTER_XML = {
+    "@CharacterId": "11",
+    "@CharacterName": "Delish",
+    "@CharacterDesignId": "42",
+    "@RoomId": "1",
+    "@Level": "20",
+    "@Xp": "10000",
+    "@Fatigue": "5",
+    "@HpImprovement": "3",
+    "@WeaponImprovement": "10",
+    "@StaminaImprovement": "2",
+}
+
+
+class TestModels(unittest.TestCase):
+    """from_xml conversion."""
+
+    def test_ship(self):
+        ship = Ship.from_xml(SHIP_XML)
+        self.assertEqual(ship.name, "Tachikoma")
+        self.assertEqual(ship.level, 10)
+        self.assertEqual(ship.hp, 1200)
+        self.assertEqual(len(ship.rooms), 2)
+        self.assertEqual(ship.rooms[1], Room("2", "300", 5, 6, "Upgrading", "301"))
+        self.assertEqual(ship.researches, (Research("7", "70", "Completed"),))
+
+    def test_character(self):
+        character = Character.from_xml(CHARACTER_XML)
+        self.assertEqual(character.level, 20)
+        self.assertEqual(character.xp, 10000)
+        self.assertEqual(character.training_points, 15)
+
+    def test_missing_and_malformed_values(self):
+        character = Character.from_xml({"@Level": "abc", "@Xp": ""})
+        self.assertEqual(character.level, 0)
+        self.assertEqual(character.xp, 0)
+        self.assertEqual(character.room_id, "0")
+        self.assertEqual(Ship.from_xml({"Rooms": None}).rooms, ())
+
+    def test_item(self):
+        self.assertEqual(
+            Item.from_xml({"@ItemId": "1", "@ItemDesignId": "2", "@Quantity": "3"}),
+            Item("1", "2", 3),
+        )
+
+    def test_strings_are_interned(self):
+        a = Character.from_xml(CHARACTER_XML)
+        b = Character.from_xml({k: "".join(v) for k, v in CHARACTER_XML.items()})
+        self.assertIs(a.name, b.name)
+
+    def test_models_are_slotted(self):
+        self.assertFalse(hasattr(Character.from_xml(CHARACTER_XML), "__dict__"))
+
+
+class TestModelConsumers(unittest.TestCase):
+    """ship_layout and crew_leveling accept models directly."""
+
+    def test_parse_rooms_accepts_ship_model(self):
+        designs = [{"@RoomDesignId": "256", "@RoomName": "Armor"}]
+        from_model = parse_rooms(Ship.from_xml(SHIP_XML), designs)
+        from_dict = parse_rooms(SHIP_XML, designs)
+        self.assertEqual(from_model, from_dict)
+        self.assertEqual(from_model[1].status, "upgrading")
+        self.assertEqual(from_model[1].upgrade_id, "301")
+
+    def test_evaluate_upgrade_accepts_character_model(self):
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        design = {"@CharacterDesignId": "42", "@Rarity": "Epic"}
+        from_model = evaluate_upgrade(Character.from_xml(CHARACTER_XML), design, 1_000_000, now)
+        from_dict = evaluate_upgrade(CHARACTER_XML, design, 1_000_000, now)
+        self.assertEqual(from_model, from_dict)
+        self.assertEqual(from_model.reason, UpgradeBlockReason.ELIGIBLE)
+
+
+if __name__ == "__main__":
+    unittest.main()
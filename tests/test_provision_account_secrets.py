@@ -22,11 +22,12 @@ class TestProvisionAccountSecrets(unittest.TestCase):
     def tearDown(self):
         self.env_cleaner.stop()
 
-    def test_missing_ratelimit_dependency(self):
-        """Verify regression behavior when ratelimit module is absent."""
-        with patch.dict("sys.modules", {"ratelimit": None}):
+    def test_missing_runtime_dependency(self):
+        """Verify regression behavior when a runtime dependency is absent."""
+        with patch.dict("sys.modules", {"xmltodict": None}):
             # Clear cached imports
-            sys.modules.pop("sdk.client", None)
+            for name in [m for m in sys.modules if m.startswith("sdk.")]:
+                sys.modules.pop(name, None)
             sys.modules.pop("scripts.provision_account_secrets", None)
             with self.assertRaises(SystemExit) as cm:
                 __import__("scripts.provision_account_secrets")
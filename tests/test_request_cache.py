@@ -0,0 +1,150 @@
+"""Tests for the per-run request cache — no network."""
+
+from __future__ import annotations
+
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from sdk.client import Client
+from sdk.device import Device
+from sdk.request_cache import RequestCache, cache_key, endpoint_name
+
+BASE = "https://api.pixelstarships.com"
+SHIP_URL = f"{BASE}/ShipService/GetShipByUserId?userId=1&accessToken=a&clientDateTime=2026-01-01T00:00:00"
+
+
+def _ok(text="<ShipService/>"):
+    r = MagicMock()
+    r.status_code = 200
+    r.text = text
+    r.content = text.encode()
+    return r
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCacheKey(unittest.TestCase):
+    """Keys ignore volatile parameters."""
+
+    def test_volatile_params_ignored(self):
+        other = f"{BASE}/ShipService/GetShipByUserId?clientDateTime=2027-01-01T00:00:00&userId=1&accessToken=b"
+        self.assertEqual(cache_key(SHIP_URL), cache_key(other))
+
+    def test_stable_params_distinguish(self):
+        other = f"{BASE}/ShipService/GetShipByUserId?userId=2&accessToken=a"
+        self.assertNotEqual(cache_key(SHIP_URL), cache_key(other))
+
+    def test_endpoint_name(self):
+        self.assertEqual(endpoint_name(SHIP_URL), "GetShipByUserId")
+
+
+class TestRequestCache(unittest.TestCase):
+    """TTL, invalidation and coalescing."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = RequestCache(clock=self.clock)
+        self.send = MagicMock(side_effect=lambda: _ok())
+
+    def test_hit_within_ttl(self):
+        first = self.cache.fetch("GET", SHIP_URL, self.send)
+        second = self.cache.fetch("GET", SHIP_URL, self.send)
+        self.assertIs(first, second)
+        self.assertEqual(self.send.call_count, 1)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_expiry(self):
+        self.cache.fetch("GET", SHIP_URL, self.send)
+        self.clock.now = 31
+        self.cache.fetch("GET", SHIP_URL, self.send)
+        self.assertEqual(self.send.call_count, 2)
+
+    def test_post_is_never_cached(self):
+        self.cache.fetch("POST", SHIP_URL, self.send)
+        self.cache.fetch("POST", SHIP_URL, self.send)
+        self.assertEqual(self.send.call_count, 2)
+
+    def test_error_response_not_cached(self):
+        send = MagicMock(side_effect=lambda: _ok('<ShipService errorMessage="x"/>'))
+        self.cache.fetch("GET", SHIP_URL, send)
+        self.cache.fetch("GET", SHIP_URL, send)
+        self.assertEqual(send.call_count, 2)
+
+    def test_mutation_invalidates_only_affected(self):
+        tasks_url = f"{BASE}/TaskService/ListTasksOfAUser?accessToken=a"
+        self.cache.fetch("GET", SHIP_URL, self.send)
+        self.cache.fetch("GET", tasks_url, self.send)
+        self.cache.fetch("POST", f"{BASE}/RoomService/UpgradeRoom2?roomId=1", MagicMock())
+        self.cache.fetch("GET", SHIP_URL, self.send)
+        self.cache.fetch("GET", tasks_url, self.send)
+        self.assertEqual(self.send.call_count, 3)
+
+    def test_read_only_endpoint_keeps_cache(self):
+        self.cache.fetch("GET", SHIP_URL, self.send)
+        self.cache.fetch("POST", f"{BASE}/UserService/HeartBeat4?accessToken=a", MagicMock())
+        self.cache.fetch("GET", SHIP_URL, self.send)
+        self.assertEqual(self.send.call_count, 1)
+
+    def test_unknown_endpoint_clears_everything(self):
+        self.cache.fetch("GET", SHIP_URL, self.send)
+        self.cache.fetch("POST", f"{BASE}/BattleService/CreateBattle9", MagicMock())
+        self.cache.fetch("GET", SHIP_URL, self.send)
+        self.assertEqual(self.send.call_count, 2)
+
+    def test_concurrent_reads_are_coalesced(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_send():
+            calls.append(1)
+            release.wait(5)
+            return _ok()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.fetch("GET", SHIP_URL, slow_send)))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        while self.cache.misses + self.cache.coalesced < 4:
+            threading.Event().wait(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(r) for r in results}), 1)
+
+
+class TestClientRequestCache(unittest.TestCase):
+    """Client.request routes through the cache."""
+
+    def setUp(self):
+        self.device = MagicMock(spec=Device)  # type: ignore
+        self.device.languageKey = "en"
+
+    def test_repeated_reads_hit_network_once(self):
+        client = Client(device=self.device)
+        with patch.object(client.session, "request", return_value=_ok()) as send:
+            client.request(SHIP_URL, "GET")
+            client.request(SHIP_URL, "GET")
+        self.assertEqual(send.call_count, 1)
+
+    def test_cache_can_be_disabled(self):
+        client = Client(device=self.device, settings={"request_cache": False})
+        self.assertIsNone(client.requestCache)
+        with patch.object(client.session, "request", return_value=_ok()) as send:
+            client.request(SHIP_URL, "GET")
+            client.request(SHIP_URL, "GET")
+        self.assertEqual(send.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Tests for the priority request scheduler — no network."""
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from sdk.client import Client
+from sdk.device import Device
+from sdk.request_scheduler import (
+    DeadlineExceeded,
+    Priority,
+    RequestScheduler,
+    endpoint_priority,
+)
+
+
+class TestRequestScheduler(unittest.TestCase):
+
+    def test_budget_per_period(self):
+        scheduler = RequestScheduler(calls=3, period=0.2)
+        start = time.monotonic()
+        for _ in range(3):
+            self.assertLess(scheduler.acquire(), 0.01)
+        self.assertEqual(scheduler.available(), 0)
+        waited = scheduler.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        self.assertGreater(waited, 0.1)
+
+    def test_waiters_released_by_priority(self):
+        scheduler = RequestScheduler(calls=1, period=0.15)
+        scheduler.acquire()  # budget now exhausted
+        order = []
+
+        def worker(priority, label):
+            scheduler.acquire(priority)
+            order.append(label)
+
+        threads = [
+            threading.Thread(target=worker, args=(Priority.LOW, "low")),
+            threading.Thread(target=worker, args=(Priority.NORMAL, "normal")),
+        ]
+        for t in threads:
+            t.start()
+            time.sleep(0.02)
+        urgent = threading.Thread(target=worker, args=(Priority.CRITICAL, "critical"))
+        urgent.start()
+        for t in threads + [urgent]:
+            t.join(timeout=5)
+        self.assertEqual(order, ["critical", "normal", "low"])
+
+    def test_deadline(self):
+        scheduler = RequestScheduler(calls=1, period=10)
+        scheduler.acquire()
+        with self.assertRaises(DeadlineExceeded):
+            scheduler.acquire(Priority.HIGH, deadline=time.monotonic() + 0.05)
+        self.assertEqual(scheduler.metrics()[Priority.HIGH].expired, 1)
+        # The expired request no longer blocks the queue.
+        self.assertEqual(scheduler._waiting, [])
+
+    def test_metrics_and_summary(self):
+        scheduler = RequestScheduler(calls=1, period=0.05)
+        scheduler.acquire(Priority.CRITICAL)
+        scheduler.acquire(Priority.LOW)
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics[Priority.CRITICAL].requests, 1)
+        self.assertGreater(metrics[Priority.LOW].max_wait, 0)
+        self.assertAlmostEqual(scheduler.total_wait, metrics[Priority.LOW].total_wait, places=3)
+        self.assertIn("2 request(s)", scheduler.summary())
+        self.assertIn("low 1 req", scheduler.summary())
+
+    def test_endpoint_priorities(self):
+        base = "https://api.pixelstarships.com"
+        self.assertEqual(endpoint_priority(f"{base}/UserService/HeartBeat4?x=1"), Priority.CRITICAL)
+        self.assertEqual(endpoint_priority(f"{base}/GalaxyService/CollectMarker2"), Priority.HIGH)
+        self.assertEqual(endpoint_priority(f"{base}/RoomService/ListRoomDesigns2"), Priority.LOW)
+        self.assertEqual(endpoint_priority(f"{base}/ShipService/GetShipByUserId"), Priority.NORMAL)
+
+
+class TestClientUsesScheduler(unittest.TestCase):
+
+    def test_send_acquires_with_endpoint_priority(self):
+        client = Client(device=MagicMock(spec=Device))
+        client.requestCache = None
+        client.info = {"@Name": "tester"}
+        response = MagicMock(text="<ok/>")
+        with patch.object(Client, "scheduler") as scheduler, \
+                patch.object(client.session, "request", return_value=response):
+            client.request("https://api.pixelstarships.com/UserService/HeartBeat4", "POST")
+            client.request(
+                "https://api.pixelstarships.com/RoomService/ListRoomDesigns2", "GET",
+                priority=Priority.HIGH, deadline=5.0,
+            )
+        self.assertEqual(scheduler.acquire.call_args_list[0].args, (Priority.CRITICAL, None))
+        self.assertEqual(scheduler.acquire.call_args_list[1].args, (Priority.HIGH, 5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
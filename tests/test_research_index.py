@@ -0,0 +1,98 @@
+"""Tests for the research state snapshot — pure data, no HTTP."""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock
+
+from sdk.client import Client
+from sdk.device import Device
+from sdk.research_index import ResearchIndex, research_family
+from sdk.response import ClassifiedResponse
+
+
+RESEARCHES = [
+    {"@ResearchDesignId": "1", "@ResearchName": "Fitness 201", "@ResearchLevel": "201", "@ResearchState": "Completed"},
+    {"@ResearchDesignId": "2", "@ResearchName": "Education 101", "@ResearchLevel": "101", "@ResearchState": "Researching"},
+    {"@ResearchDesignId": "3", "@ResearchName": "Fitness 202", "@ResearchLevel": "202", "@ResearchState": "Completed"},
+]
+
+
+class TestResearchIndex(unittest.TestCase):
+    """Family/level lookups."""
+
+    def setUp(self):
+        self.index = ResearchIndex(RESEARCHES)
+
+    def test_family(self):
+        self.assertEqual(research_family("Fitness 201"), "Fitness")
+        self.assertEqual(research_family(""), "")
+
+    def test_level_uses_first_record_in_family(self):
+        self.assertEqual(self.index.level("Fitness"), 201)
+        self.assertEqual(self.index.level("Fitness 101"), 201)
+        self.assertEqual(self.index.level("Unknown"), 0)
+
+    def test_prefix_match(self):
+        self.assertEqual(self.index.level("Fit"), 201)
+
+    def test_has(self):
+        self.assertTrue(self.index.has("Fitness", 201))
+        self.assertFalse(self.index.has("Fitness", 202))
+        self.assertFalse(self.index.has("Engineering", 1))
+
+    def test_state_by_family_and_level(self):
+        self.assertEqual(self.index.state("Fitness", 202), "Completed")
+        self.assertEqual(self.index.state("Education", 101), "Researching")
+        self.assertIsNone(self.index.state("Fitness", 203))
+
+    def test_researching(self):
+        self.assertEqual(self.index.researching(), ["2"])
+        self.assertIn("1", self.index)
+
+    def test_records_without_name_are_ignored(self):
+        index = ResearchIndex([{"@ResearchDesignId": "9", "@ResearchLevel": "203", "@ResearchState": "Completed"}])
+        self.assertEqual(index.level("Education"), 0)
+        self.assertIn("9", index)
+
+    def test_malformed_level_falls_through_to_next_record(self):
+        index = ResearchIndex([
+            {"@ResearchName": "Fitness 201", "@ResearchLevel": "n/a"},
+            {"@ResearchName": "Fitness 202", "@ResearchLevel": "202"},
+        ])
+        self.assertEqual(index.level("Fitness"), 202)
+
+
+class TestClientResearchIndex(unittest.TestCase):
+    """Client.hasResearch uses one snapshot per fetch."""
+
+    def setUp(self):
+        self.device = MagicMock(spec=Device)  # type: ignore
+        self.device.languageKey = "en"
+        self.client = Client(device=self.device)
+        self.client.allResearches = {"Research": RESEARCHES}
+        self.client.listAllResearches = MagicMock()  # type: ignore
+
+    def test_snapshot_reused(self):
+        self.assertTrue(self.client.hasResearch("Fitness", 201))
+        index = self.client.researchIndex()
+        self.assertTrue(self.client.hasResearch("Education", 101))
+        self.assertIs(self.client.researchIndex(), index)
+        self.client.listAllResearches.assert_not_called()
+
+    def test_add_research_invalidates(self):
+        index = self.client.researchIndex()
+        self.client.request = MagicMock(return_value=ClassifiedResponse(MagicMock(content=b"<AddResearch/>")))  # type: ignore
+
+        def refetch():
+            self.client.allResearches = {"Research": RESEARCHES[:1]}
+
+        self.client.listAllResearches.side_effect = refetch
+        self.assertTrue(self.client.addResearch("5"))
+        self.assertIsNot(self.client.researchIndex(), index)
+        self.client.listAllResearches.assert_called_once()
+        self.assertEqual(self.client.getResearchLevel("Education"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""Tests for retry budgets, adaptive timeouts and circuit breakers — no network."""
+
+from __future__ import annotations
+
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from sdk.client import Client
+from sdk.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    Resilience,
+    ResilientHTTPAdapter,
+    RetryBudget,
+)
+
+URL = "https://api.pixelstarships.com/UserService/HeartBeat4?accessToken=x"
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+class TestRetryBudget(unittest.TestCase):
+
+    def test_per_endpoint_and_per_run_limits(self):
+        budget = RetryBudget(per_run=3, per_endpoint=2)
+        self.assertTrue(budget.take("a"))
+        self.assertTrue(budget.take("a"))
+        self.assertFalse(budget.take("a"))
+        self.assertTrue(budget.take("b"))
+        self.assertFalse(budget.take("c"))
+        self.assertEqual((budget.used(), budget.used("a")), (3, 2))
+
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def test_initial_until_enough_samples(self):
+        tracker = LatencyTracker(initial=15, min_samples=3)
+        tracker.record("a", 0.5)
+        self.assertEqual(tracker.timeout("a"), 15)
+
+    def test_percentile_scaled_and_clamped(self):
+        tracker = LatencyTracker(floor=2, ceiling=30, factor=3, percentile=0.95, min_samples=5)
+        for seconds in (1.0, 1.0, 1.0, 1.0, 4.0):
+            tracker.record("slow", seconds)
+        self.assertEqual(tracker.timeout("slow"), 12.0)
+        for _ in range(5):
+            tracker.record("fast", 0.05)
+        self.assertEqual(tracker.timeout("fast"), 2)
+        for _ in range(5):
+            tracker.record("hung", 20.0)
+        self.assertEqual(tracker.timeout("hung"), 30)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_then_half_open_trial(self):
+        clock = _FakeClock()
+        breaker = CircuitBreaker(threshold=2, cooldown=60, clock=clock)
+        breaker.failure("a")
+        self.assertTrue(breaker.allow("a"))
+        breaker.failure("a")
+        self.assertFalse(breaker.allow("a"))
+        self.assertTrue(breaker.allow("b"))
+
+        clock.now += 60
+        self.assertTrue(breaker.allow("a"))   # the single trial call
+        self.assertFalse(breaker.allow("a"))
+        breaker.failure("a")                  # trial failed: open again
+        clock.now += 30
+        self.assertFalse(breaker.allow("a"))
+        clock.now += 30
+        self.assertTrue(breaker.allow("a"))
+        breaker.success("a")
+        self.assertTrue(breaker.allow("a"))
+        self.assertEqual(breaker.open_endpoints(), [])
+
+
+class TestResilientHTTPAdapter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = _FakeClock()
+        self.policy = Resilience(
+            budget=RetryBudget(per_run=10, per_endpoint=5),
+            latency=LatencyTracker(initial=10),
+            breaker=CircuitBreaker(threshold=3, cooldown=60, clock=self.clock),
+        )
+        self.adapter = ResilientHTTPAdapter(self.policy, clock=self.clock, sleep=self.clock.sleep)
+        self.request = requests.Request("GET", URL).prepare()
+
+    def _send(self, *outcomes, request=None):
+        outcomes = list(outcomes)
+        timeouts = []
+
+        def fake_send(adapter, request, **kwargs):
+            timeouts.append(kwargs["timeout"])
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return _response(outcome)
+
+        with patch("requests.adapters.HTTPAdapter.send", fake_send):
+            return self.adapter.send(request or self.request), timeouts
+
+    def test_retries_server_errors_with_backoff(self):
+        response, timeouts = self._send(503, 502, 200)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(timeouts), 3)
+        self.assertEqual(self.clock.now, 1000.0 + 0.5 + 1.0)
+        self.assertEqual(self.policy.budget.used("HeartBeat4"), 2)
+
+    def test_client_errors_are_not_retried(self):
+        response, timeouts = self._send(404)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(timeouts), 1)
+
+    def test_attempt_cap_returns_last_response(self):
+        response, timeouts = self._send(500, 500, 500, 500, 500)
+        self.assertEqual(response.status_code, 500)
+        # The breaker (threshold 3) stops the call before the per-call cap of 4.
+        self.assertEqual(len(timeouts), 3)
+        with self.assertRaises(CircuitOpenError):
+            self._send(200)
+
+    def test_budget_exhausted_raises_last_error(self):
+        self.policy.budget = RetryBudget(per_run=1, per_endpoint=1)
+        with self.assertRaises(requests.exceptions.ConnectTimeout):
+            self._send(requests.exceptions.ConnectTimeout(), requests.exceptions.ConnectTimeout())
+
+    def test_deadline_caps_timeout_and_stops_retries(self):
+        self.policy.breaker = CircuitBreaker(threshold=10, clock=self.clock)
+        self.policy.deadline = self.clock.now + 3
+        response, timeouts = self._send(503, 503, 503)
+        # Each try gets only the time left; the 2s backoff after the third
+        # would pass the deadline, so the call gives up.
+        self.assertEqual(timeouts, [3, 2.5, 1.5])
+        self.assertEqual(response.status_code, 503)
+        self.clock.now = self.policy.deadline
+        with self.assertRaises(requests.exceptions.Timeout):
+            self._send(200)
+
+    def test_post_is_not_resent_after_it_may_have_arrived(self):
+        post = requests.Request("POST", URL.replace("HeartBeat4", "UpgradeCharacter")).prepare()
+        response, timeouts = self._send(503, 200, request=post)
+        self.assertEqual((response.status_code, len(timeouts)), (503, 1))
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self._send(requests.exceptions.ReadTimeout(), 200, request=post)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self._send(requests.exceptions.ConnectionError("Connection aborted."), 200, request=post)
+        self.assertEqual(self.policy.budget.used(), 0)
+
+    def test_post_is_retried_when_it_was_never_sent(self):
+        post = requests.Request("POST", URL.replace("HeartBeat4", "UpgradeCharacter")).prepare()
+        response, timeouts = self._send(requests.exceptions.ConnectTimeout(), 200, request=post)
+        self.assertEqual((response.status_code, len(timeouts)), (200, 2))
+
+    def test_explicit_timeout_wins(self):
+        request = self.request
+        with patch("requests.adapters.HTTPAdapter.send", return_value=_response(200)) as send:
+            self.adapter.send(request, timeout=(1, 2))
+        self.assertEqual(send.call_args.kwargs["timeout"], (1, 2))
+
+
+class TestClientTransport(unittest.TestCase):
+
+    def test_client_session_uses_resilient_adapter(self):
+        client = Client(device=MagicMock())
+        adapter = client.session.get_adapter(URL)
+        self.assertIsInstance(adapter, ResilientHTTPAdapter)
+        self.assertIs(adapter.resilience, client.resilience)
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertIn("retries used", client.resilience.summary())
+
+    def test_each_client_has_its_own_policy(self):
+        first, second = Client(device=MagicMock()), Client(device=MagicMock())
+        self.assertIsNot(first.session, second.session)
+        self.assertIsNot(first.resilience, second.resilience)
+        first.resilience.budget.take("HeartBeat4")
+        first.resilience.deadline = 0.0
+        self.assertEqual(second.resilience.budget.used(), 0)
+        self.assertIsNone(second.resilience.deadline)
+
+
+if __name__ == "__main__":
+    unittest.main()
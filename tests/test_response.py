@@ -0,0 +1,113 @@
+"""Tests for response classification — no network."""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import requests
+
+from sdk.client import Client
+from sdk.device import Device
+from sdk.request_cache import is_cacheable_response
+from sdk.request_scheduler import RequestScheduler
+from sdk.response import ClassifiedResponse, Outcome, parse_xml
+
+
+def _response(body: bytes, status=200):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.encoding = "utf-8"
+    return response
+
+
+class TestClassifiedResponse(unittest.TestCase):
+
+    def test_ok(self):
+        r = ClassifiedResponse(_response(b'<?xml version="1.0"?><UserService><HeartBeat success="true"/></UserService>'))
+        self.assertIs(r.outcome, Outcome.OK)
+        self.assertEqual(r.root, "UserService")
+        self.assertFalse(r.is_error)
+        self.assertEqual(r.document["UserService"]["HeartBeat"]["@success"], "true")
+        self.assertTrue(r)
+        self.assertEqual(r.status_code, 200)
+
+    def test_error_fields(self):
+        r = ClassifiedResponse(_response(
+            b'<RoomService><UpgradeRoom errorCode="12" errorMessage="Not enough &quot;gas&quot;."/></RoomService>'
+        ))
+        self.assertIs(r.outcome, Outcome.ERROR)
+        self.assertEqual((r.root, r.error_code, r.error_message), ("RoomService", "12", 'Not enough "gas".'))
+
+    def test_benign_and_auth_outcomes(self):
+        cases = {
+            b'<X errorMessage="You cannot collect this reward as your storage is full."/>': Outcome.STORAGE_FULL,
+            b'<X errorMessage="Please upgrade your lab room."/>': Outcome.LAB_UPGRADE_REQUIRED,
+            b'<X errorMessage="Failed to authorize access token."/>': Outcome.UNAUTHORIZED,
+        }
+        for body, outcome in cases.items():
+            with self.subTest(outcome=outcome):
+                self.assertIs(ClassifiedResponse(_response(body)).outcome, outcome)
+
+    def test_document_parsed_once(self):
+        r = ClassifiedResponse(_response(b"<A><B x='1'/></A>"))
+        with patch("sdk.response.xmltodict.parse", wraps=__import__("xmltodict").parse) as parse:
+            self.assertIs(parse_xml(r), parse_xml(r))
+            self.assertIs(r.text, r.text)
+        self.assertEqual(parse.call_count, 1)
+
+    def test_cacheable(self):
+        self.assertTrue(is_cacheable_response(ClassifiedResponse(_response(b"<A/>"))))
+        self.assertFalse(is_cacheable_response(ClassifiedResponse(_response(b'<A errorMessage="x"/>'))))
+        self.assertFalse(is_cacheable_response(ClassifiedResponse(_response(b"<A/>", status=503))))
+
+    def test_text_only_double(self):
+        double = MagicMock(text='<A errorMessage="boom"/>', status_code=200)
+        r = ClassifiedResponse(double)
+        self.assertEqual(r.error_message, "boom")
+
+
+class TestClientRequest(unittest.TestCase):
+
+    def test_endpoint_reuses_request_parse(self):
+        client = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        client.accessToken = "t"
+        client.session = MagicMock()
+        client.session.request.return_value = _response(
+            b'<ResearchService><ListAllResearches><Researches/></ListAllResearches></ResearchService>'
+        )
+        with patch("sdk.response.xmltodict.parse", wraps=__import__("xmltodict").parse) as parse:
+            client.listAllResearches()
+        self.assertEqual(parse.call_count, 1)
+
+    def test_error_logged_without_parsing(self):
+        client = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        client.session = MagicMock()
+        client.session.request.return_value = _response(b'<RoomService errorMessage="Room is busy."/>')
+        with patch("sdk.response.xmltodict.parse") as parse, self.assertLogs(level="ERROR") as logs:
+            r = client.request("https://api.pixelstarships.com/RoomService/UpgradeRoom2?accessToken=t", "POST")
+        parse.assert_not_called()
+        self.assertIs(r.outcome, Outcome.ERROR)
+        self.assertIn("RoomService: Room is busy.", logs.output[0])
+
+    def test_endpoint_methods_branch_on_outcome(self):
+        client = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        client.accessToken = "t"
+        client.session = MagicMock()
+        client.scheduler = RequestScheduler(calls=10000, period=60)
+        failing = {
+            "finishTraining": ("7",), "getTrainingUpdate": ("7",), "addTraining": ("3", "7"),
+            "upgradeCharacter": ("7",), "addResearch": ("5",),
+        }
+        with patch.object(ClassifiedResponse, "text", new_callable=PropertyMock, side_effect=AssertionError("decoded")):
+            for name, args in failing.items():
+                with self.subTest(name):
+                    client.session.request.return_value = _response(b'<X errorMessage="Nope."/>')
+                    self.assertIs(getattr(client, name)(*args), False)
+            client.session.request.return_value = _response(b'<X errorMessage="Please upgrade your lab room."/>')
+            self.assertEqual(client.addResearch("5"), "LAB_UPGRADE_REQUIRED")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,7 @@ from unittest.mock import MagicMock, patch
 
 from sdk.client import Client, _extract_collection
 from sdk.device import Device
+from sdk.response import ClassifiedResponse
 
 
 class TestExtractCollectionHelper(unittest.TestCase):
@@ -195,8 +196,7 @@ class TestResearchOutcomeClassification(unittest.TestCase):
         self.client.accessToken = "synthetic_token"
 
     def test_add_research_lab_upgrade_required_logged_as_skip(self):
-        mock_resp = MagicMock()  # type: ignore
-        mock_resp.text = '<AddResearch errorMessage="Please upgrade your lab room."/>'
+        mock_resp = ClassifiedResponse(MagicMock(content=b'<AddResearch errorMessage="Please upgrade your lab room."/>'))
         self.client.request = MagicMock(return_value=mock_resp)  # type: ignore
 
         with patch("logging.info") as mock_info, patch("logging.error") as mock_error:
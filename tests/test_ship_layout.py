@@ -3,6 +3,7 @@ from __future__ import annotations
 """Tests for ship layout analysis — pure functions, no HTTP."""
 
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from sdk.ship_layout import (
@@ -12,6 +13,15 @@ from sdk.ship_layout import (
     classify_room,
     RoomInfo,
     LayoutAnalysis,
+    BoarderMap,
+    LayoutGrid,
+    LayoutState,
+    _is_adjacent,
+    analyze_snapshots,
+    get_attr,
+    iter_snapshots,
+    load_room_designs,
+    main,
 )
 
 
@@ -67,6 +77,12 @@ TEST_DESIGNS = [
 class TestClassifyRoom(unittest.TestCase):
     """Tests for room classification."""
 
+    def test_get_attr_accepts_bare_or_prefixed_names(self):
+        design = {"@RoomName": "Laser", "@ReloadTime": None}
+        self.assertEqual(get_attr(design, "RoomName"), "Laser")
+        self.assertEqual(get_attr(design, "@RoomName"), "Laser")
+        self.assertEqual(get_attr(design, "@ReloadTime", 0), 0)
+
     def test_armor_by_design_id(self):
         """Known armor design IDs are classified as armor."""
         d = _make_design("256", "Some Random Name")
@@ -254,6 +270,169 @@ class TestAnalyzeLayout(unittest.TestCase):
         self.assertLessEqual(analysis.defense_score, 100)
 
 
+class TestLayoutGrid(unittest.TestCase):
+    """Occupancy grid and adjacency graph."""
+
+    @staticmethod
+    def _info(index, row, col, width=1, height=1, category="other"):
+        return RoomInfo(
+            room_id=str(index), design_id="1", row=row, column=col, status="normal",
+            width=width, height=height, category=category, name=f"R{index}",
+        )
+
+    def test_adjacency_matches_pairwise_check(self):
+        import random
+
+        rng = random.Random(3)
+        for _ in range(30):
+            rooms = [
+                self._info(i, rng.randrange(8), rng.randrange(12), rng.randint(1, 3), rng.randint(1, 2))
+                for i in range(12)
+            ]
+            grid = LayoutGrid.from_rooms(rooms)
+            for i, a in enumerate(rooms):
+                expected = {j for j, b in enumerate(rooms) if j != i and _is_adjacent(a, b)}
+                self.assertEqual(set(grid.adjacency[i]), expected)
+
+    def test_overlapping_rooms_are_not_adjacent(self):
+        rooms = [self._info(0, 0, 0, 2, 1), self._info(1, 0, 1, 2, 1), self._info(2, 1, 0)]
+        grid = LayoutGrid.from_rooms(rooms)
+        self.assertIn((0, 1), grid.overlaps)
+        self.assertNotIn(1, grid.adjacency[0])
+        self.assertEqual(grid.adjacency[2], frozenset({0}))
+
+    def test_room_at(self):
+        grid = LayoutGrid.from_rooms([self._info(0, 5, 7, 2, 2)])
+        self.assertEqual(grid.room_at(6, 8), 0)
+        self.assertEqual(grid.room_at(4, 7), -1)
+        self.assertEqual(grid.room_at(100, 100), -1)
+
+
+class TestBoarderMap(unittest.TestCase):
+    """Boarder distance field and exposure ranking."""
+
+    _info = staticmethod(TestLayoutGrid._info)
+
+    def _ship(self):
+        # Row 0: [armor][lift][reactor  ][weapon]
+        # Row 1: [armor][lift][shield   ][bedroom]
+        return [
+            self._info(0, 0, 0, category="armor"),
+            self._info(1, 1, 0, category="armor"),
+            self._info(2, 0, 1, 1, 2, category="corridor"),
+            self._info(3, 0, 2, 2, 1, category="reactor"),
+            self._info(4, 0, 4, category="weapon"),
+            self._info(5, 1, 2, 2, 1, category="shield"),
+            self._info(6, 1, 4, category="bedroom"),
+        ]
+
+    def test_distance_field_respects_walls_and_lifts(self):
+        rooms = self._ship()
+        boarders = BoarderMap.from_grid(rooms, LayoutGrid.from_rooms(rooms), entries=[(1, 4)])
+        self.assertEqual(boarders.distance_at(1, 2), 2)
+        # Reactor is only reachable through the lift: 1,4 -> 1,1 -> 0,1 -> 0,2.
+        self.assertEqual(boarders.distance_at(0, 2), 5)
+        self.assertIsNone(boarders.distance_at(0, 0))   # armor is solid
+        self.assertIsNone(boarders.distance_at(9, 9))
+
+    def test_ranking_most_exposed_first(self):
+        rooms = self._ship()
+        boarders = BoarderMap.from_grid(rooms, LayoutGrid.from_rooms(rooms), entries=[(1, 4)])
+        ranking = boarders.rank([r for r in rooms if r.category in ("reactor", "weapon", "shield")])
+        self.assertEqual([e.room.category for e in ranking], ["shield", "reactor", "weapon"])
+        self.assertEqual(ranking[0].distance, 1)
+        self.assertGreater(ranking[0].exposure, ranking[-1].exposure)
+
+    def test_default_entries_are_hull_edges(self):
+        rooms = self._ship()
+        boarders = BoarderMap.from_grid(rooms, LayoutGrid.from_rooms(rooms))
+        self.assertNotIn((0, 0), boarders.entries)
+        self.assertIn((0, 4), boarders.entries)
+
+    def test_unreachable_room(self):
+        rooms = [
+            self._info(0, 0, 0, category="armor"), self._info(1, 0, 1, category="reactor"),
+            self._info(2, 0, 2, category="armor"),
+        ]
+        boarders = BoarderMap.from_grid(rooms, LayoutGrid.from_rooms(rooms), entries=[(0, 0)])
+        (exposure,) = boarders.rank([rooms[1]])
+        self.assertIsNone(exposure.distance)
+        self.assertEqual(exposure.exposure, 0)
+
+    def test_analysis_and_report_include_exposure(self):
+        analysis = analyze_layout(self._ship())
+        self.assertEqual(len(analysis.boarder_ranking), 3)
+        self.assertGreater(analysis.boarder_exposure, 0)
+        self.assertTrue(any("Boarder exposure" in r for r in analysis.recommendations))
+        self.assertIn("Boarder Exposure", format_analysis_report(analysis))
+
+
+class TestLayoutState(unittest.TestCase):
+    """Incremental scores agree with a full analyze_layout."""
+
+    _info = staticmethod(TestLayoutGrid._info)
+
+    CATEGORIES = ("reactor", "weapon", "shield", "repair", "armor", "armor", "corridor", "storage", "other")
+
+    def assertMatchesAnalysis(self, state):
+        analysis = analyze_layout(state.rooms)
+        for term in ("armor_coverage", "repair_proximity", "weapon_coverage", "power_balance", "defense_score"):
+            self.assertAlmostEqual(getattr(state, term), getattr(analysis, term), msg=term)
+
+    def test_random_add_remove_move(self):
+        import dataclasses
+        import random
+
+        rng = random.Random(11)
+        state = LayoutState()
+        self.assertMatchesAnalysis(state)
+        next_id = 0
+        for _ in range(400):
+            action = rng.random()
+            if action < 0.4 or len(state) < 2:
+                room = self._info(
+                    next_id, rng.randrange(8), rng.randrange(12), rng.randint(1, 2), rng.randint(1, 2),
+                    category=rng.choice(self.CATEGORIES),
+                )
+                room = dataclasses.replace(room, power=rng.choice((0, 6, 12)))
+                next_id += 1
+                if state.fits(room, room.row, room.column):
+                    state.add(room)
+            elif action < 0.6:
+                state.remove(rng.choice(state.rooms).room_id)
+            else:
+                room = rng.choice(state.rooms)
+                row, col = rng.randrange(8), rng.randrange(12)
+                if state.fits(room, row, col):
+                    state.move(room.room_id, row, col)
+            self.assertMatchesAnalysis(state)
+
+    def test_swap_and_restore(self):
+        rooms = [
+            self._info(0, 0, 0, 2, 2, "reactor"), self._info(1, 0, 2, category="armor"),
+            self._info(2, 0, 5, category="weapon"), self._info(3, 3, 5, category="repair"),
+        ]
+        state = LayoutState(rooms)
+        before = state.defense_score
+        previous = state.relocate({"1": (0, 5), "2": (0, 2)})
+        self.assertEqual(state.room("2").column, 2)
+        self.assertMatchesAnalysis(state)
+        state.restore(previous)
+        self.assertAlmostEqual(state.defense_score, before)
+        self.assertEqual(state.neighbours("0"), {"1"})
+
+    def test_fits(self):
+        state = LayoutState([self._info(0, 0, 0, 2, 2)])
+        new = self._info(1, 0, 0)
+        self.assertFalse(state.fits(new, 1, 1))
+        self.assertTrue(state.fits(new, 1, 2))
+        self.assertFalse(state.fits(new, 1, 2, bounds=(0, 1, 0, 1)))
+        self.assertTrue(state.fits(new, 0, 0, ignore=("0",)))
+        self.assertFalse(state.fits(new, 2, 2, allowed=frozenset({(0, 2)})))
+        with self.assertRaises(ValueError):
+            state.add(self._info(0, 4, 4))
+
+
 class TestFormatReport(unittest.TestCase):
     """Tests for format_analysis_report."""
 
@@ -282,6 +461,83 @@ class TestFormatReport(unittest.TestCase):
         self.assertIn("armor: 3", report)
 
 
+class TestBatchAnalysis(unittest.TestCase):
+    """python -m sdk.ship_layout batch over archived snapshots."""
+
+    def setUp(self):
+        import gzip
+        import json
+        import tempfile
+
+        import xmltodict
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name, "snapshots")
+        self.dir.mkdir()
+        self.designs = Path(self.tmp.name, "designs.xml")
+        self.designs.write_text(xmltodict.unparse(
+            {"RoomService": {"ListRoomDesigns": {"RoomDesigns": {"RoomDesign": TEST_DESIGNS}}}}
+        ))
+
+        def snapshot(name, rooms):
+            ship = dict(_make_ship(rooms), **{"@ShipName": name, "@ShipLevel": "7"})
+            return {"ShipService": {"GetShipByUserId": {"Ship": ship}}}
+
+        reactor = _make_room(1, 300, 0, 0)
+        weapon = _make_room(2, 100, 0, 2)
+        (self.dir / "a.xml").write_text(xmltodict.unparse(snapshot("Alpha", [reactor, weapon])))
+        with gzip.open(self.dir / "b.json.gz", "wt") as f:
+            json.dump(snapshot("Beta", [reactor]), f)
+        (self.dir / "c.json").write_text("{not json")
+        (self.dir / "notes.txt").write_text("ignored")
+
+    def test_records_in_name_order(self):
+        designs = load_room_designs(self.designs)
+        self.assertIn("300", designs)
+        records = list(analyze_snapshots(iter_snapshots(self.dir), designs, processes=1))
+        self.assertEqual([r["file"] for r in records], ["a.xml", "b.json.gz", "c.json"])
+        self.assertEqual((records[0]["ship_name"], records[0]["ship_level"]), ("Alpha", 7))
+        self.assertEqual(records[0]["rooms_by_category"], {"reactor": 1, "weapon": 1})
+        self.assertIn("defense_score", records[1])
+        self.assertTrue(records[1]["recommendations"])
+        self.assertIn("error", records[2])
+
+    def test_malformed_header_keeps_layout(self):
+        text = (self.dir / "a.xml").read_text().replace('ShipLevel="7"', 'ShipLevel="seven"')
+        (self.dir / "a.xml").write_text(text)
+        records = list(analyze_snapshots([self.dir / "a.xml"], load_room_designs(self.designs), processes=1))
+        self.assertNotIn("error", records[0])
+        self.assertEqual((records[0]["ship_level"], records[0]["total_rooms"]), (0, 2))
+
+    def test_uppercase_suffixes(self):
+        import gzip
+        import shutil
+
+        with open(self.dir / "a.xml", "rb") as src, gzip.open(self.dir / "SHIP.XML.GZ", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        records = list(analyze_snapshots(iter_snapshots(self.dir), load_room_designs(self.designs), processes=1))
+        upper = next(r for r in records if r["file"] == "SHIP.XML.GZ")
+        self.assertNotIn("error", upper)
+        self.assertEqual(upper["ship_name"], "Alpha")
+
+    def test_pool_matches_in_process(self):
+        designs = load_room_designs(self.designs)
+        serial = list(analyze_snapshots(iter_snapshots(self.dir), designs, processes=1))
+        pooled = list(analyze_snapshots(iter_snapshots(self.dir), designs, processes=2))
+        self.assertEqual(serial, pooled)
+
+    def test_cli_writes_json_lines(self):
+        import json
+
+        output = Path(self.tmp.name, "out.jsonl")
+        code = main(["batch", str(self.dir), "--designs", str(self.designs), "-o", str(output), "-j", "1"])
+        self.assertEqual(code, 1)  # c.json is unreadable
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[1]["ship_name"], "Beta")
+
+
 class TestClientAnalyzeShipLayout(unittest.TestCase):
     """Tests for Client.analyzeShipLayout integration."""
 
@@ -0,0 +1,164 @@
+"""Tests for single-flight access-token refresh — no network."""
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlsplit
+
+from sdk.client import Client
+from sdk.device import Device
+from sdk.token_manager import TokenManager, access_token_of, is_signed, with_access_token
+
+
+class _Renewer:
+    """Login callback that takes a while and hands out numbered tokens."""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return None if self.fail else f"token-{self.calls}"
+
+
+def _concurrently(fn, n=8):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def run(i):
+        barrier.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestUrlRewrite(unittest.TestCase):
+
+    def test_access_token_parameter(self):
+        url = "https://api.pixelstarships.com/X/Y?a=1&accessToken=old&clientDateTime=z"
+        self.assertEqual(access_token_of(url), "old")
+        self.assertEqual(
+            with_access_token(url, "new"),
+            "https://api.pixelstarships.com/X/Y?a=1&accessToken=new&clientDateTime=z",
+        )
+        self.assertIsNone(access_token_of("https://api.pixelstarships.com/UserService/DeviceLogin17"))
+        self.assertFalse(is_signed(url))
+        self.assertTrue(is_signed("https://api.pixelstarships.com/X/Y?checksum=abc&accessToken=old"))
+
+
+class TestTokenManager(unittest.TestCase):
+
+    def test_concurrent_refreshes_share_one_login(self):
+        renew = _Renewer()
+        tokens = TokenManager(renew)
+        tokens.set("token-0")
+        results = _concurrently(lambda: tokens.refresh("token-0"))
+        self.assertEqual(renew.calls, 1)
+        self.assertEqual(set(results), {"token-1"})
+        self.assertEqual(tokens.coalesced, 7)
+        # A caller still holding the old token gets the new one at once.
+        self.assertEqual(tokens.refresh("token-0"), "token-1")
+        self.assertEqual(renew.calls, 1)
+
+    def test_failed_refresh_is_shared(self):
+        renew = _Renewer(fail=True)
+        tokens = TokenManager(renew)
+        results = _concurrently(lambda: tokens.refresh(None))
+        self.assertEqual(renew.calls, 1)
+        self.assertEqual(set(results), {None})
+
+    def test_proactive_refresh_before_expiry(self):
+        now = [0.0]
+        renew = _Renewer(delay=0)
+        tokens = TokenManager(renew, lifetime=600, margin=60, clock=lambda: now[0])
+        tokens.set("token-0")
+        now[0] = 539
+        self.assertEqual(tokens.ensure_fresh(), "token-0")
+        now[0] = 540
+        self.assertEqual(tokens.ensure_fresh(), "token-1")
+        self.assertFalse(tokens.expiring())
+
+    def test_unknown_lifetime_never_expires(self):
+        tokens = TokenManager(_Renewer(delay=0))
+        tokens.set("token-0")
+        self.assertFalse(tokens.expiring())
+        self.assertEqual(tokens.ensure_fresh(), "token-0")
+
+
+class TestClientReauthorization(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(device=MagicMock(spec=Device), settings={"request_cache": False})
+        self.client.user = MagicMock()
+        self.client.accessToken = "old"
+        self.logins = 0
+
+        def create_device_session():
+            self.logins += 1
+            time.sleep(0.05)
+            self.client.accessToken = "new"
+            return True
+
+        self.client.create_device_session = create_device_session
+        self.sent = []
+
+        def session_request(method, url, headers=None, data=None):
+            self.sent.append(url)
+            token = access_token_of(url)
+            text = "<ok/>" if token == "new" else '<X errorMessage="Failed to authorize access token."/>'
+            return MagicMock(status_code=200, text=text, content=text.encode())
+
+        self.client.session = MagicMock(request=session_request)
+
+    def test_concurrent_auth_failures_log_in_once_and_replay(self):
+        url = "https://api.pixelstarships.com/TaskService/ListTasksOfAUser?accessToken=old"
+        results = _concurrently(lambda: self.client.request(url, "GET"), n=4)
+        self.assertEqual(self.logins, 1)
+        self.assertTrue(all(r.text == "<ok/>" for r in results))
+        self.assertEqual(sum(1 for u in self.sent if u.endswith("accessToken=new")), 4)
+
+    def test_rebuild_used_for_replay(self):
+        url = "https://api.pixelstarships.com/UserService/HeartBeat4?checksum=c-old&accessToken=old"
+
+        def rebuild():
+            token = self.client.accessToken
+            return f"https://api.pixelstarships.com/UserService/HeartBeat4?checksum=c-{token}&accessToken={token}"
+
+        r = self.client.request(url, "POST", rebuild=rebuild)
+        self.assertEqual(r.text, "<ok/>")
+        self.assertEqual(self.sent[-1], "https://api.pixelstarships.com/UserService/HeartBeat4?checksum=c-new&accessToken=new")
+
+    def test_signed_url_without_rebuild_is_not_replayed(self):
+        url = "https://api.pixelstarships.com/BattleService/CreateBattle9?checksum=c-old&accessToken=old"
+        r = self.client.request(url, "POST")
+        self.assertIn("Failed to authorize", r.text)
+        self.assertEqual(self.sent, [url])
+        self.assertEqual(self.client.accessToken, "new")  # later requests use the new session
+
+    def test_signed_action_is_rebuilt_with_new_checksum(self):
+        self.client.info = {"@Name": "test"}
+        self.client.AddStarbux2(quantity=2)
+        self.assertEqual(len(self.sent), 2)
+        checksums = [parse_qs(urlsplit(u).query)["checksum"][0] for u in self.sent]
+        self.assertTrue(self.sent[-1].endswith("accessToken=new"))
+        self.assertNotEqual(checksums[0], checksums[1])
+
+    def test_quick_reload_uses_token_manager(self):
+        self.assertEqual(self.client.quickReload(), "new")
+        self.assertEqual(self.client.accessToken, "new")
+        self.assertEqual(self.client.tokens.refreshes, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
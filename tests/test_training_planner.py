@@ -0,0 +1,186 @@
+"""Tests for the training planner — pure decisions, no HTTP."""
+
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from sdk.client import Client
+from sdk.design_catalog import DesignCatalog
+from sdk.device import Device
+from sdk.models import Character
+from sdk.training_planner import (
+    ResearchGates,
+    TrainingActionKind,
+    TrainingRole,
+    load_roles,
+    plan_training,
+)
+
+NOW = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+ROLE = TrainingRole(
+    name="weapons",
+    characters=frozenset({"Gunner"}),
+    primary_rooms=("Academy",),
+    primary_trainings=("P1", "P2", "P3"),
+    secondary_rooms=("GYM",),
+    secondary_trainings=("S1", "S2", "S3"),
+)
+
+CATALOG = DesignCatalog(
+    character_designs=[
+        {"@CharacterDesignId": "10", "@TrainingCapacity": "100", "@WeaponImprovement": "60"},
+    ],
+    training_designs=[
+        {"@TrainingDesignId": str(i), "@TrainingName": name}
+        for i, name in enumerate(("P1", "P2", "P3", "S1", "S2", "S3"), start=1)
+    ],
+)
+
+ROOMS = {"1": "Academy Lv5", "2": "GYM Lv3", "3": "Bridge"}
+ALL_RESEARCH = ResearchGates(frozenset({101, 201, 202, 203}))
+
+
+def crew(name="Gunner", room="1", weapon=0, hp=0, fatigue=5, end=""):
+    return Character(
+        character_id="7", name=name, design_id="10", room_id=room, fatigue=fatigue,
+        training_end_date=end, weapon_improvement=weapon, hp_improvement=hp,
+    )
+
+
+def plan(characters, research=ALL_RESEARCH, consumable_id=None, use_consumables=False):
+    return plan_training(
+        characters, ROOMS, CATALOG, research, NOW,
+        consumable_id=consumable_id or (lambda stat, tier: 0), roles=[ROLE],
+        use_consumables=use_consumables,
+    )
+
+
+class TestTierSelection(unittest.TestCase):
+    """Room, percent, research and cooldown decide the training tier."""
+
+    def assertTraining(self, result, name, tier):
+        starts = result.of_kind(TrainingActionKind.START)
+        self.assertEqual(len(starts), 1)
+        self.assertEqual((starts[0].training_name, starts[0].tier), (name, tier))
+        self.assertEqual(result.actions[0].kind, TrainingActionKind.FINISH)
+
+    def test_primary_tiers(self):
+        self.assertTraining(plan([crew(weapon=10)]), "P1", 1)
+        self.assertTraining(plan([crew(weapon=55)]), "P2", 2)
+        self.assertTraining(plan([crew(weapon=70)]), "P3", 3)
+
+    def test_secondary_tiers(self):
+        self.assertTraining(plan([crew(room="2", weapon=72)]), "S1", 1)
+        self.assertTraining(plan([crew(room="2", weapon=80)]), "S2", 2)
+        self.assertTraining(plan([crew(room="2", weapon=88)]), "S3", 3)
+
+    def test_research_gate(self):
+        self.assertEqual(plan([crew(weapon=55)], ResearchGates(frozenset({101}))).actions, [])
+        # Secondary T1 has no research requirement.
+        result = plan([crew(room="2", weapon=72)], ResearchGates(frozenset()))
+        self.assertTraining(result, "S1", 1)
+
+    def test_cooldown(self):
+        recent = "2026-01-01T11:30:00"
+        self.assertEqual(plan([crew(weapon=10, end=recent)]).actions, [])
+        self.assertTraining(plan([crew(weapon=10, end="2026-01-01T10:30:00")]), "P1", 1)
+
+    def test_move_and_complete_notices(self):
+        result = plan([crew(weapon=75)])
+        self.assertEqual(result.actions, [])
+        self.assertIn("to the GYM", result.notices[0].message)
+        result = plan([crew(room="2", weapon=95)])
+        self.assertIn("Training complete", result.notices[0].message)
+
+    def test_non_training_room_and_unknown_crew_skipped(self):
+        self.assertEqual(plan([crew(room="3", weapon=10)]).actions, [])
+        self.assertEqual(plan([crew(name="Nobody", weapon=50)]).actions, [])
+
+    def test_training_design_ids(self):
+        start = plan([crew(weapon=55)]).of_kind(TrainingActionKind.START)[0]
+        self.assertEqual(start.training_design_id, "2")
+
+
+class TestConsumables(unittest.TestCase):
+    """Grey consumables early, hero consumables at full fatigue — only when enabled."""
+
+    def test_off_by_default(self):
+        lookup = MagicMock(return_value=42)
+        result = plan([crew(name="Nobody", weapon=5, fatigue=0)], consumable_id=lookup)
+        lookup.assert_not_called()
+        self.assertEqual(result.actions, [])
+
+    def test_grey_for_first_trained_stat(self):
+        lookup = MagicMock(return_value=42)
+        result = plan([crew(name="Nobody", weapon=5, fatigue=0)], consumable_id=lookup, use_consumables=True)
+        lookup.assert_called_once_with("WPN", "Common")
+        (action,) = result.of_kind(TrainingActionKind.CONSUMABLE)
+        self.assertEqual(action.consumable_design_id, 42)
+
+    def test_hero_for_first_unmaxed_stat(self):
+        lookup = MagicMock(return_value=43)
+        result = plan([crew(room="2", weapon=50, hp=45, fatigue=100)], consumable_id=lookup, use_consumables=True)
+        lookup.assert_called_once_with("WPN", "Hero")
+        self.assertEqual(len(result.of_kind(TrainingActionKind.CONSUMABLE)), 1)
+
+    def test_no_consumable_without_design(self):
+        result = plan([crew(name="Nobody", weapon=5, fatigue=0)], use_consumables=True)
+        self.assertEqual(result.actions, [])
+
+
+class TestRoleConfig(unittest.TestCase):
+    """Shipped role data loads."""
+
+    def test_load_roles(self):
+        roles = {role.name: role for role in load_roles()}
+        self.assertIn("weapons", roles)
+        self.assertEqual(len(roles["weapons"].primary_trainings), 3)
+        self.assertIn("Delish", roles["weapons"].characters)
+
+
+class TestClientManageTraining(unittest.TestCase):
+    """Client.manageTraining executes the plan."""
+
+    def setUp(self):
+        self.device = MagicMock(spec=Device)  # type: ignore
+        self.device.languageKey = "en"
+        self.client = Client(device=self.device)
+        self.client.info = {"@Name": "tester"}
+        self.client.allCharactersOfUser = {"Character": [{
+            "@CharacterId": "7", "@CharacterName": "Delish", "@CharacterDesignId": "10",
+            "@RoomId": "1", "@Fatigue": "5", "@TrainingEndDate": "", "@WeaponImprovement": "10",
+        }]}
+        self.client.allCharacterDesigns = {"CharacterDesign": [
+            {"@CharacterDesignId": "10", "@TrainingCapacity": "100"},
+        ]}
+        self.client.roomsViaAccessToken = {"RoomService": {"Room": [{"@RoomId": "1", "@RoomDesignId": "5"}]}}
+        self.client.roomDesigns = {"RoomDesign": [{"@RoomDesignId": "5", "@RoomName": "Academy"}]}
+        self.client.trainingDesigns = {"TrainingDesign": [
+            {"@TrainingDesignId": "3", "@TrainingName": "Read Expert Weapon Theory"},
+        ]}
+        self.client.hasResearch = MagicMock(return_value=True)  # type: ignore
+        self.client.finishTraining = MagicMock(return_value=True)  # type: ignore
+        self.client.addTraining = MagicMock(return_value=True)  # type: ignore
+
+    def test_finish_then_start(self):
+        self.assertTrue(self.client.manageTraining())
+        self.client.finishTraining.assert_called_once_with("7")
+        self.client.addTraining.assert_called_once_with("3", "7")
+
+    def test_consumables_only_with_setting(self):
+        self.client.allCharactersOfUser["Character"][0]["@Fatigue"] = "0"
+        self.client.findConsumableDesignId = MagicMock(return_value=42)  # type: ignore
+        self.client.useConsumable = MagicMock(return_value=True)  # type: ignore
+        self.client.manageTraining()
+        self.client.useConsumable.assert_not_called()
+
+        self.client.settings["use_consumables"] = True
+        self.client.manageTraining()
+        self.client.useConsumable.assert_called_once_with(42, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()